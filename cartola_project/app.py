@@ -12,7 +12,7 @@ import utils.coleta_historico
 import utils.dashboard
 
 # Importa as funções dos nossos módulos
-from utils.modelagem import treinar_modelo, prever_pontuacao, verificar_features_modelo
+from utils.modelagem import treinar_modelo, prever_pontuacao, verificar_features_modelo, carregar_explicacoes
 from utils.simulacao import simular_melhor_risco, simular_desempenho_recente
 from utils.analise_performance import gerar_dados_comparativos
 from utils.coleta_historico import coletar_dados_historicos
@@ -30,6 +30,9 @@ from utils.coleta_dados import (
     HISTORICAL_MATCHES_PATH # Constante importada
 )
 from utils.consolidar_tudo import consolidar
+from utils.armazenamento import tabela_disponivel
+from utils.arquivos import salvar_csv
+from utils.acesso_dados import ler_csv
 from utils.analise_times import gerar_estatisticas_times # Importando gerador de estatísticas
 from utils.analise_estatisticas import (
     analise_times,
@@ -64,17 +67,14 @@ st.set_page_config(
 
 # --- Inicialização de Dados Essenciais ---
 # Verifica se o histórico de partidas existe. Se não, baixa automaticamente.
-if not os.path.exists(config.HISTORICAL_MATCHES_PATH):
+if not tabela_disponivel('partidas'):
     with st.spinner(f"Inicializando sistema: Baixando histórico de partidas (2022-{config.CURRENT_YEAR})..."):
         coletar_historico_partidas()
 
 # --- Funções de Cache ---
-@st.cache_data
 def carregar_dados(caminho_arquivo):
-    """Carrega um arquivo CSV e o armazena em cache."""
-    if os.path.exists(caminho_arquivo):
-        return pd.read_csv(caminho_arquivo)
-    return None
+    """Carrega um arquivo CSV pelo cache do processo (recarrega sozinho quando o arquivo muda)."""
+    return ler_csv(caminho_arquivo)
 
 def obter_analise_estatistica(func_analise, nome_cache, ano, clubes_filtro=None, forcar_atualizacao=False, **kwargs):
     """
@@ -83,7 +83,7 @@ def obter_analise_estatistica(func_analise, nome_cache, ano, clubes_filtro=None,
     cache_path = os.path.join(config.CACHE_DIR_PATH, f"{nome_cache}_{ano}.csv")
     
     if not forcar_atualizacao and os.path.exists(cache_path):
-        df = pd.read_csv(cache_path)
+        df = ler_csv(cache_path)
         # Aplica filtro de clubes no resultado carregado do cache
         if clubes_filtro and 'Clube' in df.columns:
             df = df[df['Clube'].isin(clubes_filtro)]
@@ -95,7 +95,7 @@ def obter_analise_estatistica(func_analise, nome_cache, ano, clubes_filtro=None,
     df_resultado, erro = func_analise(ano=ano, clubes_filtro=None, **kwargs)
     
     if df_resultado is not None and not df_resultado.empty:
-        df_resultado.to_csv(cache_path, index=False)
+        salvar_csv(df_resultado, cache_path, index=False)
         # Após salvar, aplica o filtro para exibição
         if clubes_filtro and 'Clube' in df_resultado.columns:
             df_resultado = df_resultado[df_resultado['Clube'].isin(clubes_filtro)]
@@ -147,10 +147,15 @@ with tab_escalacao:
             st.markdown("#### 🎓 Treinamento do Modelo")
             limit_ano = st.number_input("Ano Limite para Treino", min_value=2022, max_value=2026, value=config.CURRENT_YEAR)
             limit_rodada = st.number_input("Rodada Limite para Treino", min_value=1, max_value=38, value=38, help="Define até qual rodada o modelo 'enxerga' os dados.")
+            grupos_treino = st.multiselect(
+                "Modelos a Treinar",
+                options=['gol', 'def', 'mei', 'ata', 'tec'],
+                help="Deixe vazio para treinar todos. Treinar só alguns grupos constrói apenas as features que eles usam."
+            )
             
             if st.button("Treinar Novo Modelo Preditivo (XGBoost)"):
                 with st.spinner(f"Treinando modelo até Rodada {limit_rodada}/{limit_ano}..."):
-                    modelo = treinar_modelo(ano_limite=limit_ano, rodada_limite=limit_rodada)
+                    modelo = treinar_modelo(ano_limite=limit_ano, rodada_limite=limit_rodada, grupos=grupos_treino or None)
                     if modelo:
                         st.cache_data.clear() # Limpa o cache para forçar recarga dos dados e previsões
                         st.success("Modelo treinado com sucesso! Cache limpo.")
@@ -383,9 +388,11 @@ with tab_escalacao:
                 # ... Diagnóstico de Dados ...
                 if tipo_modelo == "IA Avançada (XGBoost)":
                     st.write("Aplicando Inteligência Artificial (XGBoost)...")
-                    df_processado = prever_pontuacao(df_processado)
+                    df_processado = prever_pontuacao(df_processado, explicar=True)
+                    st.session_state.explicacoes = carregar_explicacoes()
                 else:
                     st.write("Aplicando Regra de Negócios (Clássico)...")
+                    st.session_state.explicacoes = None
                 
                 st.write("Otimizando a escalação...")
                 time_ideal = otimizar_escalacao(
@@ -453,6 +460,37 @@ with tab_escalacao:
             fig_campo = desenhar_campo(time, formacao)
             st.pyplot(fig_campo)
         
+        df_explicacoes = st.session_state.get('explicacoes')
+        if df_explicacoes is not None and not df_explicacoes.empty:
+            with st.expander("🧠 Por que a IA escalou cada jogador?"):
+                import plotly.express as px
+                
+                nomes_time = dict(zip(time['atleta_id'], time['nome']))
+                df_exp_time = df_explicacoes[df_explicacoes['atleta_id'].isin(nomes_time.keys())]
+                if df_exp_time.empty:
+                    st.info("Nenhuma explicação disponível para os jogadores escalados.")
+                else:
+                    atleta_sel = st.selectbox(
+                        "Jogador",
+                        options=df_exp_time['atleta_id'].tolist(),
+                        format_func=lambda x: nomes_time.get(x, str(x))
+                    )
+                    linha = df_exp_time[df_exp_time['atleta_id'] == atleta_sel].iloc[0]
+                    colunas_id = ['atleta_id', 'rodada', 'grupo', 'modelo', 'bias']
+                    contribs = linha.drop(labels=[c for c in colunas_id if c in linha.index]).astype(float)
+                    contribs = contribs[contribs != 0]
+                    
+                    df_contrib = pd.DataFrame({'Feature': contribs.index, 'Contribuição': contribs.values})
+                    df_contrib = df_contrib.reindex(df_contrib['Contribuição'].abs().sort_values().index).tail(12)
+                    df_contrib['Efeito'] = df_contrib['Contribuição'].apply(lambda x: 'Aumenta' if x > 0 else 'Reduz')
+                    
+                    st.caption(f"Base do modelo ({linha['grupo']}): {linha['bias']:.2f} pts. As barras mostram quanto cada variável somou ou tirou da previsão base (antes do bônus tático).")
+                    fig = px.bar(
+                        df_contrib, x='Contribuição', y='Feature', orientation='h', color='Efeito',
+                        color_discrete_map={'Aumenta': '#00C853', 'Reduz': '#FF4B4B'}
+                    )
+                    st.plotly_chart(fig)
+        
         if 'reservas' in st.session_state and not st.session_state.reservas.empty:
             with st.expander("🏦 Banco de Reservas de Luxo"):
                 st.dataframe(st.session_state.reservas[['nome', 'clube', 'posicao', 'preco_num', 'pontuacao_prevista']], hide_index=True)
@@ -10,40 +10,27 @@ Requisitos:
     pip install soccerdata
 
 Nota: O FBref tem rate limiting (1 requisição a cada 6 segundos).
-Este script respeita essa limitação automaticamente.
+Este script respeita essa limitação automaticamente (limite por host em utils/cliente_http.py).
 """
 
 import os
 import sys
 import pandas as pd
-import time
-import requests
+from contextlib import nullcontext
 from datetime import datetime
-from bs4 import BeautifulSoup
-
-# Tenta importar cloudscraper para contornar proteção anti-bot
-try:
-    import cloudscraper
-    CLOUDSCRAPER_AVAILABLE = True
-except ImportError:
-    CLOUDSCRAPER_AVAILABLE = False
-
-# Tenta importar Selenium como alternativa
-try:
-    from selenium import webdriver
-    from selenium.webdriver.chrome.options import Options
-    from selenium.webdriver.chrome.service import Service
-    from selenium.webdriver.common.by import By
-    from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
-    SELENIUM_AVAILABLE = True
-except ImportError:
-    SELENIUM_AVAILABLE = False
 
 # Adiciona o diretório do projeto ao path
 PROJECT_ROOT = os.path.abspath(os.path.dirname(__file__))
 sys.path.insert(0, PROJECT_ROOT)
 
+from utils.arquivos import salvar_csv
+from utils.cliente_http import aguardar_limite
+# Páginas via HTTP simples (cloudscraper, se instalado) ou, se o FBref bloquear, pelo pool de Chrome headless
+from utils.navegadores import PoolNavegadores, SELENIUM_DISPONIVEL
+# Cache das páginas (data/fbref/html) e extração das tabelas numa passada do lxml
+from utils.fbref_html import (baixar_html, baixar_htmls, guardar_html, extrair_tabelas, links_clubes,
+                              jogadores_de_pagina, jogadores_do_cache)
+
 # Tenta importar soccerdata
 try:
     from soccerdata import FBref
@@ -74,34 +61,25 @@ def mapear_ano_para_temporada(ano):
     return str(ano)
 
 
-def coletar_dados_fbref_selenium(ano=2025, tipo='times'):
+def coletar_dados_fbref_selenium(ano=2025, tipo='times', pool=None):
     """
     Coleta dados do FBref usando Selenium (contorna proteção anti-bot).
     
     Args:
         ano: Ano da temporada
         tipo: 'times' ou 'jogadores'
+        pool: PoolNavegadores já aberto (opcional; sem ele, um navegador é aberto só para esta coleta)
     
     Returns:
         DataFrame com os dados coletados ou None
     """
-    if not SELENIUM_AVAILABLE:
+    if not SELENIUM_DISPONIVEL:
         print("AVISO: Selenium nao esta disponivel. Instale com: pip install selenium")
         return None
     
     try:
         print(f"\nTentando coleta com Selenium...")
         
-        # Configura opções do Chrome
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')  # Executa em background
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-        
         # URLs possíveis
         urls_tentativas = [
             "https://fbref.com/en/comps/24",
@@ -109,99 +87,71 @@ def coletar_dados_fbref_selenium(ano=2025, tipo='times'):
             "https://fbref.com/en/comps/24/Serie-A-Stats"
         ]
         
-        driver = None
-        for url in urls_tentativas:
-            try:
-                print(f"Tentando URL com Selenium: {url}")
+        with (nullcontext(pool) if pool is not None else PoolNavegadores(1)) as navegadores:
+            for url in urls_tentativas:
+                try:
+                    print(f"Tentando URL com Selenium: {url}")
+                    html = navegadores.html(url)
+                    guardar_html(url, ano, html)
+                except Exception as e:
+                    print(f"AVISO: Erro ao acessar {url} com Selenium: {e}")
+                    continue
                 
-                # Cria driver (usa ChromeDriver que deve estar no PATH)
-                driver = webdriver.Chrome(options=chrome_options)
-                driver.get(url)
-                
-                # Aguarda a página carregar
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "table"))
-                )
-                
-                # Obtém o HTML da página
-                html = driver.page_source
-                
-                # Parse com BeautifulSoup
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                # Procura tabelas
-                tabelas = soup.find_all('table', class_='stats_table')
+                # Tabelas de estatísticas (inclusive as que vêm em comentários HTML)
+                tabelas = list(extrair_tabelas(html).values())
                 
                 if tabelas:
                     print(f"SUCESSO: Encontradas {len(tabelas)} tabelas")
                     
                     # Extrai dados da primeira tabela
-                    if tipo == 'times' and len(tabelas) > 0:
-                        df = pd.read_html(str(tabelas[0]))[0]
+                    if tipo == 'times':
+                        df = tabelas[0]
                         print(f"SUCESSO: Extraidos {len(df)} registros de times")
-                        driver.quit()
                         return df
                     elif tipo == 'jogadores':
                         # Procura tabela de jogadores (pode ter várias)
                         # Geralmente a primeira tabela grande com muitos registros é a de jogadores
                         dfs_jogadores = []
-                        for i, tabela in enumerate(tabelas):
-                            try:
-                                df_temp = pd.read_html(str(tabela))[0]
-                                # Verifica se parece ser uma tabela de jogadores
-                                colunas_lower = [str(col).lower() for col in df_temp.columns]
-                                if any(keyword in ' '.join(colunas_lower) for keyword in ['player', 'name', 'jogador', 'squad', 'team']):
-                                    if len(df_temp) > 5:  # Tabela com muitos registros
-                                        print(f"Tabela {i+1}: {len(df_temp)} registros encontrados")
-                                        dfs_jogadores.append(df_temp)
-                            except Exception as e:
-                                print(f"AVISO: Erro ao processar tabela {i+1}: {e}")
-                                continue
+                        for i, df_temp in enumerate(tabelas):
+                            # Verifica se parece ser uma tabela de jogadores
+                            colunas_lower = [str(col).lower() for col in df_temp.columns]
+                            if any(keyword in ' '.join(colunas_lower) for keyword in ['player', 'name', 'jogador', 'squad', 'team']):
+                                if len(df_temp) > 5:  # Tabela com muitos registros
+                                    print(f"Tabela {i+1}: {len(df_temp)} registros encontrados")
+                                    dfs_jogadores.append(df_temp)
                         
                         if dfs_jogadores:
                             # Combina todas as tabelas de jogadores encontradas
                             df_final = pd.concat(dfs_jogadores, ignore_index=True)
                             print(f"SUCESSO: Extraidos {len(df_final)} registros de jogadores (de {len(dfs_jogadores)} tabelas)")
-                            driver.quit()
                             return df_final
-                        else:
+                        elif len(tabelas) > 1 and len(tabelas[1]) > 10:
                             # Se não encontrou, tenta a primeira tabela grande
-                            if len(tabelas) > 1:
-                                df_temp = pd.read_html(str(tabelas[1]))[0]
-                                if len(df_temp) > 10:
-                                    print(f"SUCESSO: Extraidos {len(df_temp)} registros de jogadores (tabela alternativa)")
-                                    driver.quit()
-                                    return df_temp
-                
-                driver.quit()
+                            print(f"SUCESSO: Extraidos {len(tabelas[1])} registros de jogadores (tabela alternativa)")
+                            return tabelas[1]
                 break
-                
-            except Exception as e:
-                print(f"AVISO: Erro ao acessar {url} com Selenium: {e}")
-                if driver:
-                    driver.quit()
-                continue
         
         print("ERRO: Nao foi possivel coletar dados com Selenium")
         return None
         
     except Exception as e:
         print(f"ERRO ao usar Selenium: {e}")
-        if driver:
-            driver.quit()
         import traceback
         traceback.print_exc()
         return None
 
 
-def coletar_dados_fbref_direto(ano=2025, tipo='times'):
+def coletar_dados_fbref_direto(ano=2025, tipo='times', pool=None):
     """
     Coleta dados diretamente do FBref usando scraping.
     URL base: https://fbref.com/en/comps/24/Serie-A-Stats
     
+    As páginas vêm do cache (data/fbref/html) ou por HTTP simples; se o FBref bloquear, pelo navegador (pool).
+    
     Args:
         ano: Ano da temporada
         tipo: 'times' ou 'jogadores'
+        pool: PoolNavegadores já aberto (opcional)
     
     Returns:
         DataFrame com os dados coletados ou None
@@ -217,41 +167,24 @@ def coletar_dados_fbref_direto(ano=2025, tipo='times'):
         
         print(f"\nTentando coleta direta do FBref via scraping...")
         
-        response = None
-        base_url = None
+        html = None
         
-        # Tenta cada URL até uma funcionar
-        for url in urls_tentativas:
-            try:
+        # Tenta cada URL até uma funcionar (um só navegador para todas, se o HTTP simples for bloqueado)
+        with (nullcontext(pool) if pool is not None or not SELENIUM_DISPONIVEL else PoolNavegadores(1)) as navegadores:
+            for url in urls_tentativas:
                 print(f"Tentando URL: {url}")
-                if CLOUDSCRAPER_AVAILABLE:
-                    scraper = cloudscraper.create_scraper()
-                    response = scraper.get(url, timeout=30)
-                else:
-                    headers = {
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                    }
-                    response = requests.get(url, headers=headers, timeout=30)
-                response.raise_for_status()
-                base_url = url
-                print(f"SUCESSO: Conseguiu acessar {url}")
-                break
-            except Exception as e:
-                print(f"AVISO: Falha ao acessar {url}: {e}")
-                continue
-        
-        if response is None or base_url is None:
-            # Se cloudscraper falhar, tenta Selenium
-            print("\nTentando com Selenium como alternativa...")
-            return coletar_dados_fbref_selenium(ano=ano, tipo=tipo)
-        
+                html = baixar_html(url, ano, navegadores)
+                if html is not None:
+                    print(f"SUCESSO: Conseguiu acessar {url}")
+                    break
+                print(f"AVISO: Falha ao acessar {url}")
         
-        # Parse HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
+        if html is None:
+            return None
         
         # Procura por tabelas de estatísticas
         # O FBref usa tabelas com classe 'stats_table'
-        tabelas = soup.find_all('table', class_='stats_table')
+        tabelas = list(extrair_tabelas(html).values())
         
         if not tabelas:
             print("AVISO: Nenhuma tabela encontrada na página")
@@ -260,17 +193,14 @@ def coletar_dados_fbref_direto(ano=2025, tipo='times'):
         print(f"Encontradas {len(tabelas)} tabelas na página")
         
         # Tenta extrair dados da primeira tabela (geralmente é a de times)
-        if tipo == 'times' and len(tabelas) > 0:
-            # Extrai a tabela de times
-            df = pd.read_html(str(tabelas[0]))[0]
+        if tipo == 'times':
+            df = tabelas[0]
             print(f"SUCESSO: Extraídos {len(df)} registros de times")
             return df
         elif tipo == 'jogadores' and len(tabelas) > 1:
-            # Tenta encontrar tabela de jogadores
-            for tabela in tabelas:
-                df = pd.read_html(str(tabela))[0]
-                # Verifica se parece ser uma tabela de jogadores (tem coluna 'Player')
-                if 'Player' in df.columns or 'player' in df.columns:
+            # Tenta encontrar tabela de jogadores (tem coluna 'Player')
+            for df in tabelas:
+                if 'Player' in df.columns:
                     print(f"SUCESSO: Extraídos {len(df)} registros de jogadores")
                     return df
         
@@ -326,6 +256,7 @@ def coletar_dados_clubes_serie_a(ano=2025):
                 
                 # Coleta estatísticas dos times
                 print("Coletando estatísticas dos times...")
+                aguardar_limite('fbref.com')
                 df_times = fbref.read_team_stats()
                 
                 if df_times is not None and not df_times.empty:
@@ -334,11 +265,9 @@ def coletar_dados_clubes_serie_a(ano=2025):
                     break
                 else:
                     print(f"AVISO: Nenhum dado encontrado com codigo: {codigo}")
-                    time.sleep(7)  # Rate limiting antes de tentar próximo
                     
             except Exception as e:
                 print(f"AVISO: Erro com codigo {codigo}: {e}")
-                time.sleep(7)  # Rate limiting antes de tentar próximo
                 continue
         
         if df_times is not None and not df_times.empty:
@@ -346,20 +275,19 @@ def coletar_dados_clubes_serie_a(ano=2025):
             print(f"\nColunas disponíveis: {list(df_times.columns)}")
             
             # Salva dados dos times
-            df_times.to_csv(ESTATISTICAS_TIMES_PATH, index=False, encoding='utf-8-sig')
+            salvar_csv(df_times, ESTATISTICAS_TIMES_PATH, index=False, encoding='utf-8-sig')
             print(f"SUCESSO: Dados salvos em: {ESTATISTICAS_TIMES_PATH}")
             
             return df_times, codigo_liga_usado
         else:
             print("\nAVISO: Nenhum dado de times encontrado com soccerdata")
             print("Tentando coleta direta via scraping...")
-            time.sleep(7)  # Rate limiting
             
             # Tenta coleta direta como fallback
             df_times = coletar_dados_fbref_direto(ano=ano, tipo='times')
             if df_times is not None and not df_times.empty:
                 print(f"SUCESSO: {len(df_times)} times encontrados via scraping")
-                df_times.to_csv(ESTATISTICAS_TIMES_PATH, index=False, encoding='utf-8-sig')
+                salvar_csv(df_times, ESTATISTICAS_TIMES_PATH, index=False, encoding='utf-8-sig')
                 print(f"SUCESSO: Dados salvos em: {ESTATISTICAS_TIMES_PATH}")
                 return df_times, 'scraping_direto'
             else:
@@ -374,17 +302,16 @@ def coletar_dados_clubes_serie_a(ano=2025):
         return None, None
 
 
-def coletar_urls_clubes_serie_a(ano=2025):
+def coletar_urls_clubes_serie_a(ano=2025, pool=None):
     """
     Coleta as URLs de todos os clubes da Série A acessando a página principal.
     
+    Args:
+        pool: PoolNavegadores já aberto, usado se o FBref bloquear o HTTP simples (opcional)
+    
     Returns:
         Lista de dicionários com 'nome' e 'url' de cada clube
     """
-    if not SELENIUM_AVAILABLE:
-        print("ERRO: Selenium nao esta disponivel")
-        return []
-    
     try:
         print(f"\n{'='*60}")
         print(f"Coletando URLs dos CLUBES da Série A - {ano}")
@@ -393,67 +320,18 @@ def coletar_urls_clubes_serie_a(ano=2025):
         # URL principal do Brasileirão
         url_principal = "https://fbref.com/en/comps/24"
         
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-        
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.get(url_principal)
-        
-        # Aguarda a tabela carregar
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.TAG_NAME, "table"))
-        )
-        
-        # Obtém o HTML
-        html = driver.page_source
-        soup = BeautifulSoup(html, 'html.parser')
+        html = baixar_html(url_principal, ano, pool)
+        if html is None:
+            print("ERRO: Nao foi possivel acessar a pagina principal")
+            return []
         
-        # Procura a tabela principal de times
-        tabela_principal = soup.find('table', {'id': 'results'}) or soup.find('table', class_='stats_table')
+        # Links da coluna "Squad" da tabela de classificação, sem repetir URLs
+        links_unicos = links_clubes(html)
         
-        if not tabela_principal:
+        if not links_unicos:
             print("AVISO: Tabela principal nao encontrada")
-            driver.quit()
             return []
         
-        # Procura todos os links de times na tabela
-        # Os links geralmente estão na coluna "Squad"
-        links_clubes = []
-        linhas = tabela_principal.find_all('tr')
-        
-        for linha in linhas:
-            # Procura link na célula do time
-            link_tag = linha.find('a', href=True)
-            if link_tag and '/squads/' in link_tag['href']:
-                nome_time = link_tag.get_text(strip=True)
-                url_time = link_tag['href']
-                
-                # Converte URL relativa para absoluta
-                if url_time.startswith('/'):
-                    url_time = f"https://fbref.com{url_time}"
-                
-                if nome_time and url_time:
-                    links_clubes.append({
-                        'nome': nome_time,
-                        'url': url_time
-                    })
-        
-        driver.quit()
-        
-        # Remove duplicatas mantendo a primeira ocorrência
-        seen = set()
-        links_unicos = []
-        for clube in links_clubes:
-            if clube['url'] not in seen:
-                seen.add(clube['url'])
-                links_unicos.append(clube)
-        
         print(f"SUCESSO: Encontradas {len(links_unicos)} URLs de clubes")
         for clube in links_unicos:
             print(f"  - {clube['nome']}: {clube['url']}")
@@ -464,115 +342,42 @@ def coletar_urls_clubes_serie_a(ano=2025):
         print(f"ERRO ao coletar URLs dos clubes: {e}")
         import traceback
         traceback.print_exc()
-        if 'driver' in locals():
-            driver.quit()
         return []
 
 
-def coletar_jogadores_de_clube(url_clube, nome_clube):
+def coletar_jogadores_de_clube(url_clube, nome_clube, pool=None, html=None, ano=2025):
     """
     Coleta dados dos jogadores de um clube específico.
     
     Args:
         url_clube: URL da página do clube
         nome_clube: Nome do clube
+        pool: PoolNavegadores já aberto, usado se o FBref bloquear o HTTP simples (opcional)
+        html: HTML da página já baixado (ex: por baixar_htmls); se None, vem do cache ou é baixado aqui
+        ano: Temporada (chave do cache de páginas)
     
     Returns:
         DataFrame com dados dos jogadores ou None
     """
-    if not SELENIUM_AVAILABLE:
-        return None
-    
     try:
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-        
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.get(url_clube)
-        
-        # Aguarda a página carregar
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.TAG_NAME, "table"))
-        )
-        
-        # Aguarda um pouco mais para garantir que tudo carregou
-        time.sleep(2)
-        
-        html = driver.page_source
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Procura tabelas de jogadores
-        # Geralmente há uma tabela com id específico ou classe 'stats_table'
-        tabelas = soup.find_all('table', class_='stats_table')
-        
-        # Procura especificamente a tabela de jogadores (não de times)
-        df_jogadores = None
-        
-        for tabela in tabelas:
-            try:
-                # Tenta ler a tabela
-                df_temp = pd.read_html(str(tabela))[0]
-                
-                # Verifica se parece ser uma tabela de jogadores individuais
-                # Deve ter colunas como Player, Name, ou muitas linhas (jogadores)
-                colunas_lower = [str(col).lower() for col in df_temp.columns]
-                tem_player = any('player' in str(col).lower() or 'name' in str(col).lower() for col in df_temp.columns)
-                tem_muitas_linhas = len(df_temp) > 5
-                
-                # Se tem coluna de jogador e muitas linhas, provavelmente é a tabela certa
-                if tem_player and tem_muitas_linhas:
-                    # Remove linhas que são cabeçalhos duplicados
-                    # Verifica se a primeira coluna é "Player" (cabeçalho)
-                    primeira_col = df_temp.columns[0] if len(df_temp.columns) > 0 else None
-                    if primeira_col and 'Player' in str(primeira_col):
-                        # Remove linhas onde a primeira coluna é "Player" (cabeçalho duplicado)
-                        df_temp = df_temp[df_temp.iloc[:, 0].astype(str) != 'Player'].copy()
-                    
-                    # Remove linhas onde a primeira coluna começa com vírgulas (sub-cabeçalhos)
-                    if len(df_temp) > 0:
-                        primeira_col_valores = df_temp.iloc[:, 0].astype(str)
-                        df_temp = df_temp[~primeira_col_valores.str.startswith(',')].copy()
-                    
-                    # Remove linhas vazias
-                    df_temp = df_temp.dropna(subset=[df_temp.columns[0]]).copy()
-                    
-                    if len(df_temp) == 0:
-                        continue
-                    
-                    # Adiciona coluna com nome do clube
-                    df_temp['Clube'] = nome_clube
-                    df_temp['URL_Clube'] = url_clube
-                    
-                    if df_jogadores is None:
-                        df_jogadores = df_temp
-                    else:
-                        # Combina com dados anteriores (sem incluir cabeçalho novamente)
-                        df_jogadores = pd.concat([df_jogadores, df_temp], ignore_index=True)
-                    
-                    print(f"  Encontrados {len(df_temp)} jogadores de {nome_clube}")
-                    break
-                    
-            except Exception as e:
-                continue
+        if html is None:
+            html = baixar_html(url_clube, ano, pool, clube=nome_clube)
+        if html is None:
+            print(f"  ERRO: Nao foi possivel acessar a pagina de {nome_clube}")
+            return None
         
-        driver.quit()
+        # Tabela de jogadores já sem cabeçalhos repetidos nem sub-cabeçalhos (limpos na extração)
+        df_jogadores = jogadores_de_pagina(html, nome_clube, url_clube)
         
         if df_jogadores is None or df_jogadores.empty:
             print(f"  AVISO: Nenhum jogador encontrado para {nome_clube}")
             return None
         
+        print(f"  Encontrados {len(df_jogadores)} jogadores de {nome_clube}")
         return df_jogadores
         
     except Exception as e:
         print(f"  ERRO ao coletar jogadores de {nome_clube}: {e}")
-        if 'driver' in locals():
-            driver.quit()
         return None
 
 
@@ -623,6 +428,7 @@ def coletar_dados_jogadores_serie_a(ano=2025, codigo_liga=None):
                 
                 # Coleta estatísticas dos jogadores
                 print("Coletando estatísticas dos jogadores...")
+                aguardar_limite('fbref.com')
                 df_jogadores = fbref.read_player_season_stats(stat_type='standard')
                 
                 if df_jogadores is not None and not df_jogadores.empty:
@@ -631,77 +437,44 @@ def coletar_dados_jogadores_serie_a(ano=2025, codigo_liga=None):
                     break
                 else:
                     print(f"AVISO: Nenhum dado encontrado com codigo: {codigo}")
-                    time.sleep(7)  # Rate limiting
                     
             except Exception as e:
                 print(f"AVISO: Erro com codigo {codigo}: {e}")
-                time.sleep(7)  # Rate limiting
                 continue
         
         if df_jogadores is None or df_jogadores.empty:
             print("\nAVISO: Nao foi possivel coletar dados com nenhum codigo de liga testado")
             print("Tentando coleta clube por clube...")
-            time.sleep(7)  # Rate limiting
             
-            # Coleta URLs dos clubes
-            links_clubes = coletar_urls_clubes_serie_a(ano=ano)
-            
-            if not links_clubes:
-                print("ERRO: Nao foi possivel coletar URLs dos clubes")
-                return None
-            
-            # Coleta jogadores de cada clube
-            print(f"\nColetando jogadores de {len(links_clubes)} clubes...")
-            dfs_jogadores = []
-            
-            for i, clube in enumerate(links_clubes, 1):
-                print(f"\n[{i}/{len(links_clubes)}] Coletando jogadores de {clube['nome']}...")
-                df_clube = coletar_jogadores_de_clube(clube['url'], clube['nome'])
+            # Um único pool de navegadores para a página principal e as páginas dos clubes:
+            # o Chrome sobe uma vez (e só se o FBref bloquear o HTTP simples)
+            with (PoolNavegadores() if SELENIUM_DISPONIVEL else nullcontext()) as pool:
+                # Coleta URLs dos clubes
+                links_clubes = coletar_urls_clubes_serie_a(ano=ano, pool=pool)
                 
-                if df_clube is not None and not df_clube.empty:
-                    dfs_jogadores.append(df_clube)
+                if not links_clubes:
+                    print("ERRO: Nao foi possivel coletar URLs dos clubes")
+                    return None
                 
-                # Rate limiting entre requisições
-                if i < len(links_clubes):
-                    time.sleep(5)  # Aguarda 5 segundos entre clubes
+                # Baixa as páginas de todos os clubes (no limite de taxa do FBref; com navegador,
+                # a renderização de uma página sobrepõe a espera pela próxima)
+                print(f"\nColetando jogadores de {len(links_clubes)} clubes...")
+                paginas = baixar_htmls([clube['url'] for clube in links_clubes], ano, pool,
+                                       clubes={clube['url']: clube['nome'] for clube in links_clubes})
             
-            # Consolida todos os dados
-            if dfs_jogadores:
-                # IMPORTANTE: Primeiro, identifica qual DataFrame tem o cabeçalho correto
-                # O primeiro DataFrame deve ter o cabeçalho, os demais não devem ter
-                df_final = None
-                
-                for idx, df_temp in enumerate(dfs_jogadores):
-                    # Remove cabeçalhos duplicados de cada DataFrame
-                    if 'Player' in df_temp.columns:
-                        # Remove linhas onde Player é "Player" (cabeçalho duplicado)
-                        df_temp = df_temp[df_temp['Player'].astype(str) != 'Player'].copy()
-                        # Remove linhas onde Player começa com vírgulas (sub-cabeçalhos)
-                        df_temp = df_temp[~df_temp['Player'].astype(str).str.startswith(',')].copy()
-                        # Remove linhas vazias
-                        df_temp = df_temp[df_temp['Player'].notna()].copy()
-                        df_temp = df_temp[df_temp['Player'] != ''].copy()
-                    
-                    if df_final is None:
-                        # Primeiro DataFrame: mantém cabeçalho (já está nas colunas)
-                        df_final = df_temp.copy()
-                    else:
-                        # Demais DataFrames: concatena apenas os dados (sem cabeçalho)
-                        df_final = pd.concat([df_final, df_temp], ignore_index=True)
-                
-                df_jogadores = df_final
-                
-                # Garante que a coluna Clube está preenchida
-                if 'Clube' in df_jogadores.columns:
-                    df_jogadores['Clube'] = df_jogadores['Clube'].fillna(method='ffill')
-                    df_jogadores['Clube'] = df_jogadores['Clube'].fillna(method='bfill')
-                
-                # Remove duplicatas finais
-                df_jogadores = df_jogadores.drop_duplicates(subset=['Player', 'Clube'] if 'Clube' in df_jogadores.columns else ['Player']).copy()
-                
+            baixadas = {clube['url']: clube['nome'] for clube in links_clubes if paginas.get(clube['url']) is not None}
+            for clube in links_clubes:
+                if clube['url'] not in baixadas:
+                    print(f"  ERRO: Nao foi possivel acessar a pagina de {clube['nome']}")
+            
+            # Extrai e limpa as páginas guardadas em paralelo (um processo por núcleo) e consolida
+            # numa única tabela; os cabeçalhos já saem limpos da extração de cada página
+            df_jogadores = jogadores_do_cache(ano, clubes=baixadas) if baixadas else None
+            if df_jogadores is not None:
+                for nome_clube, total in df_jogadores.groupby('Clube', sort=False).size().items():
+                    print(f"  Encontrados {total} jogadores de {nome_clube}")
+            if df_jogadores is not None:
                 print(f"\nSUCESSO: Total de {len(df_jogadores)} registros de jogadores coletados")
-                print(f"  - Cabeçalho único: Sim")
-                print(f"  - Coluna Clube preenchida: {'Sim' if 'Clube' in df_jogadores.columns and not df_jogadores['Clube'].isna().all() else 'Não'}")
             else:
                 print("ERRO: Nenhum jogador foi coletado")
                 return None
@@ -712,9 +485,9 @@ def coletar_dados_jogadores_serie_a(ano=2025, codigo_liga=None):
             
             # Tenta coletar estatísticas avançadas também
             print("\n2. Coletando estatísticas avançadas (xG, xA)...")
-            time.sleep(7)  # Rate limiting
             
             try:
+                aguardar_limite('fbref.com')
                 df_avancado = fbref.read_player_season_stats(stat_type='shooting')
                 if df_avancado is not None and not df_avancado.empty:
                     print(f"SUCESSO: {len(df_avancado)} registros de estatisticas avancadas")
@@ -731,9 +504,9 @@ def coletar_dados_jogadores_serie_a(ano=2025, codigo_liga=None):
             
             # Tenta coletar estatísticas de passes (para xA)
             print("\n3. Coletando estatísticas de passes (xA)...")
-            time.sleep(7)  # Rate limiting
             
             try:
+                aguardar_limite('fbref.com')
                 df_passes = fbref.read_player_season_stats(stat_type='passing')
                 if df_passes is not None and not df_passes.empty:
                     print(f"SUCESSO: {len(df_passes)} registros de passes")
@@ -749,12 +522,7 @@ def coletar_dados_jogadores_serie_a(ano=2025, codigo_liga=None):
                 print(f"AVISO: Nao foi possivel coletar estatisticas de passes: {e}")
             
             # Salva dados dos jogadores
-            # Garante que não há cabeçalhos duplicados antes de salvar
-            if 'Player' in df_jogadores.columns:
-                df_jogadores = df_jogadores[df_jogadores['Player'].astype(str) != 'Player'].copy()
-                df_jogadores = df_jogadores[~df_jogadores['Player'].astype(str).str.startswith(',')].copy()
-            
-            df_jogadores.to_csv(JOGADORES_FBREF_PATH, index=False, encoding='utf-8-sig')
+            salvar_csv(df_jogadores, JOGADORES_FBREF_PATH, index=False, encoding='utf-8-sig')
             print(f"\nSUCESSO: Dados salvos em: {JOGADORES_FBREF_PATH}")
             print(f"  - Arquivo limpo: Sem cabeçalhos duplicados")
             print(f"  - Coluna Clube: {'Presente' if 'Clube' in df_jogadores.columns else 'Ausente'}")
@@ -797,11 +565,6 @@ def coletar_dados_completos(ano=2025):
     # Coleta dados dos clubes e captura o código de liga que funcionou
     df_clubes, codigo_liga_usado = coletar_dados_clubes_serie_a(ano=ano)
     
-    # Aguarda antes de coletar dados dos jogadores (rate limiting)
-    if df_clubes is not None:
-        print("\nAguardando 7 segundos antes de coletar dados dos jogadores...")
-        time.sleep(7)
-    
     # Coleta dados dos jogadores (usa mesmo código de liga que funcionou)
     df_jogadores = coletar_dados_jogadores_serie_a(ano=ano, codigo_liga=codigo_liga_usado)
     
@@ -3,10 +3,21 @@ Script para limpar o arquivo fbref_jogadores_serie_a.csv:
 - Remove cabeçalhos duplicados
 - Remove linhas de sub-cabeçalhos
 - Garante que a coluna 'Clube' está preenchida
+
+Com --cache (ou reconstruir=True), o arquivo é refeito a partir das páginas dos clubes guardadas
+(data/fbref/html, ver utils/fbref_html.py), sem acessar o FBref: a extração já sai sem cabeçalhos
+repetidos. Sem a opção, isso só acontece quando o arquivo atual não existe ou já veio das páginas
+dos clubes; um arquivo do soccerdata nunca é substituído sem pedido. A limpeza linha a linha abaixo
+fica para CSVs gerados antes do cache.
+
+Uso: python limpar_fbref_jogadores.py [ano] [--cache]
 """
 
+import sys
 import pandas as pd
 import os
+from utils.arquivos import salvar_csv
+from utils.fbref_html import temporadas_em_cache, paginas_em_cache, jogadores_do_cache
 
 PROJECT_ROOT = os.path.abspath(os.path.dirname(__file__))
 DATA_DIR = os.path.join(PROJECT_ROOT, "data")
@@ -14,8 +25,47 @@ FBREF_DIR = os.path.join(DATA_DIR, "fbref")
 FBREF_JOGADORES_PATH = os.path.join(FBREF_DIR, "fbref_jogadores_serie_a.csv")
 FBREF_JOGADORES_LIMPO_PATH = os.path.join(FBREF_DIR, "fbref_jogadores_serie_a_limpo.csv")
 
-def limpar_arquivo_fbref():
-    """Limpa o arquivo FBref removendo cabeçalhos duplicados."""
+def _salvar_limpo(df):
+    """Grava o arquivo limpo e o coloca no lugar do original."""
+    print(f"\nSalvando arquivo limpo: {FBREF_JOGADORES_LIMPO_PATH}")
+    salvar_csv(df, FBREF_JOGADORES_LIMPO_PATH, index=False, encoding='utf-8-sig')
+    print(f"Substituindo arquivo original...")
+    os.replace(FBREF_JOGADORES_LIMPO_PATH, FBREF_JOGADORES_PATH)
+
+def veio_das_paginas_de_clubes(caminho=FBREF_JOGADORES_PATH):
+    """True se o CSV tem o formato da extração das páginas de clubes ('Player' e 'Clube'), e não o do soccerdata."""
+    colunas = set(pd.read_csv(caminho, nrows=0, encoding='utf-8-sig').columns)
+    return {'Player', 'Clube'} <= colunas and 'team' not in colunas
+
+def reconstruir_jogadores_fbref(ano):
+    """Refaz o fbref_jogadores_serie_a.csv a partir das páginas de clubes em cache (sem rede)."""
+    df = jogadores_do_cache(ano)
+    if df is None:
+        print(f"ERRO: Nenhuma página de clube em cache para {ano}")
+        return None
+    _salvar_limpo(df)
+    print(f"SUCESSO: {len(df)} jogadores de {df['Clube'].nunique()} clubes salvos em {FBREF_JOGADORES_PATH}")
+    return df
+
+def limpar_arquivo_fbref(ano=None, reconstruir=False):
+    """
+    Limpa o arquivo FBref removendo cabeçalhos duplicados (ou o reconstrói do cache de páginas).
+
+    Args:
+        reconstruir (bool): Refaz o arquivo a partir das páginas em cache mesmo que ele tenha
+            vindo do soccerdata. Sem isso, só reconstrói um arquivo ausente ou já extraído das páginas.
+    """
+    
+    if ano is None:  # Temporada mais recente do cache
+        ano = max(temporadas_em_cache(), default=None)
+    em_cache = ano is not None and paginas_em_cache(ano, apenas_clubes=True)
+    if reconstruir and not em_cache:
+        print(f"ERRO: Nenhuma página de clube em cache para {ano}")
+        return
+    if em_cache and (reconstruir or not os.path.exists(FBREF_JOGADORES_PATH) or veio_das_paginas_de_clubes()):
+        print(f"Páginas do FBref em cache para {ano}: reconstruindo a partir delas.")
+        reconstruir_jogadores_fbref(ano)
+        return
     
     if not os.path.exists(FBREF_JOGADORES_PATH):
         print(f"ERRO: Arquivo não encontrado: {FBREF_JOGADORES_PATH}")
@@ -239,13 +289,8 @@ def limpar_arquivo_fbref():
     if 'Clube' in df.columns:
         print(f"\nClubes encontrados: {df['Clube'].value_counts().to_dict()}")
     
-    # Salva arquivo limpo
-    print(f"\nSalvando arquivo limpo: {FBREF_JOGADORES_LIMPO_PATH}")
-    df.to_csv(FBREF_JOGADORES_LIMPO_PATH, index=False, encoding='utf-8-sig')
-    
-    # Substitui o arquivo original
-    print(f"Substituindo arquivo original...")
-    os.replace(FBREF_JOGADORES_LIMPO_PATH, FBREF_JOGADORES_PATH)
+    # Salva arquivo limpo e substitui o original
+    _salvar_limpo(df)
     
     print(f"\nSUCESSO: Arquivo limpo e salvo!")
     print(f"  - Linhas removidas: {len(linhas_validas) - len(df)}")
@@ -253,5 +298,6 @@ def limpar_arquivo_fbref():
     print(f"  - Coluna 'Clube' preenchida: {'Sim' if 'Clube' in df.columns and not df['Clube'].isna().all() else 'Não'}")
 
 if __name__ == "__main__":
-    limpar_arquivo_fbref()
+    argumentos = [a for a in sys.argv[1:] if a != '--cache']
+    limpar_arquivo_fbref(int(argumentos[0]) if argumentos else None, reconstruir='--cache' in sys.argv[1:])
 
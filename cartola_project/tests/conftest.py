@@ -0,0 +1,19 @@
+import os
+import sys
+import pytest
+
+# Os módulos importam 'utils.*' a partir de cartola_project/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.config import config
+from utils import armazenamento
+
+@pytest.fixture
+def armazem(tmp_path, monkeypatch):
+    """Armazém e CSVs legados num diretório temporário (nada de data/ é lido ou gravado)."""
+    monkeypatch.setattr(config, 'WAREHOUSE_DIR', str(tmp_path / 'warehouse'))
+    for nome in armazenamento.TABELAS:
+        monkeypatch.setitem(armazenamento.TABELAS[nome], 'csv', str(tmp_path / f'historico_{nome}.csv'))
+    monkeypatch.setattr(armazenamento, 'CSV_JOGADORES_POR_ANO', str(tmp_path / 'historico_{ano}.csv'))
+    os.makedirs(config.WAREHOUSE_DIR)
+    return tmp_path
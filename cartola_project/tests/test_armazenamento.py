@@ -0,0 +1,65 @@
+import pandas as pd
+import pytest
+from utils import armazenamento
+from utils.armazenamento import salvar_particoes, carregar_tabela, compactar_tabela, migrar_csvs
+
+def _rodada(rodada, pontos, atletas=(1, 2, 3), ano=2025):
+    return pd.DataFrame({'ano': ano, 'atleta_id': list(atletas), 'rodada': rodada,
+                         'apelido': [f'atleta {a}' for a in atletas], 'clube_id': 262, 'posicao_id': 5,
+                         'pontuacao': pontos, 'G': 0.0})
+
+def _pontos(df):
+    return df.sort_values(['rodada', 'atleta_id']).set_index(['rodada', 'atleta_id'])['pontuacao'].astype(float).to_dict()
+
+@pytest.fixture(params=['parquet', 'csv'])
+def formato(request, armazem, monkeypatch):
+    if request.param == 'parquet' and not armazenamento.PYARROW_DISPONIVEL:
+        pytest.skip("pyarrow não instalado")
+    if request.param == 'csv':
+        monkeypatch.setattr(armazenamento, 'PYARROW_DISPONIVEL', False)
+    return request.param
+
+def test_regravar_rodada_substitui_so_a_particao(formato):
+    salvar_particoes(_rodada(1, 1.0), 'jogadores')
+    salvar_particoes(_rodada(2, 2.0), 'jogadores')
+    salvar_particoes(_rodada(2, 5.0, atletas=(1, 2)), 'jogadores')  # Rodada 2 coletada de novo
+
+    esperado = {(1, 1): 1.0, (1, 2): 1.0, (1, 3): 1.0, (2, 1): 5.0, (2, 2): 5.0}
+    assert _pontos(carregar_tabela('jogadores')) == esperado
+    assert _pontos(carregar_tabela('jogadores', anos=[2025], rodadas=[2])) == {(2, 1): 5.0, (2, 2): 5.0}
+
+    assert compactar_tabela('jogadores', carencia_seg=0) > 0
+    assert _pontos(carregar_tabela('jogadores')) == esperado
+    assert compactar_tabela('jogadores', carencia_seg=0) == 0
+
+def test_segmentos_csv_ficam_ao_lado_do_csv_da_tabela(formato, armazem):
+    if formato != 'csv':
+        pytest.skip("só o fallback CSV grava segmentos CSV")
+    salvar_particoes(_rodada(1, 1.0, ano=2026), 'jogadores')
+    pastas = [p.name for p in armazem.iterdir() if p.name.endswith('_segmentos')]
+    assert pastas == ['historico_jogadores_segmentos']
+    assert _pontos(carregar_tabela('jogadores', anos=[2026])) == {(1, 1): 1.0, (1, 2): 1.0, (1, 3): 1.0}
+
+def test_migracao_incorpora_segmentos_do_fallback_csv(armazem, monkeypatch):
+    if not armazenamento.PYARROW_DISPONIVEL:
+        pytest.skip("pyarrow não instalado")
+    _rodada(1, 1.0).to_csv(armazenamento.TABELAS['jogadores']['csv'], index=False)
+    monkeypatch.setattr(armazenamento, 'PYARROW_DISPONIVEL', False)
+    salvar_particoes(_rodada(1, 4.0), 'jogadores')
+    salvar_particoes(_rodada(2, 2.0), 'jogadores')
+    antes = _pontos(carregar_tabela('jogadores'))
+
+    monkeypatch.setattr(armazenamento, 'PYARROW_DISPONIVEL', True)
+    assert migrar_csvs(['jogadores'])
+    assert armazenamento.armazem_disponivel('jogadores')
+    assert _pontos(carregar_tabela('jogadores')) == antes
+    assert antes[(1, 1)] == 4.0
+
+def test_migracao_prefere_o_csv_da_temporada_ao_consolidado(armazem):
+    if not armazenamento.PYARROW_DISPONIVEL:
+        pytest.skip("pyarrow não instalado")
+    _rodada(1, 1.0).to_csv(armazenamento.TABELAS['jogadores']['csv'], index=False)
+    pd.concat([_rodada(1, 7.0), _rodada(2, 2.0)]).to_csv(armazenamento.CSV_JOGADORES_POR_ANO.format(ano=2025), index=False)
+
+    assert migrar_csvs(['jogadores'])
+    assert _pontos(carregar_tabela('jogadores')) == {(1, 1): 7.0, (1, 2): 7.0, (1, 3): 7.0, (2, 1): 2.0, (2, 2): 2.0, (2, 3): 2.0}
@@ -0,0 +1,62 @@
+import asyncio
+import json
+import pandas as pd
+import pytest
+from utils import coleta_concorrente
+from utils.coleta_concorrente import coletar_pontuados_async
+from utils.armazenamento import carregar_tabela
+from utils.servidor_mock import servidor_mock
+
+ANO = 2025
+RODADAS = range(1, 7)
+
+def _corpo(rodada):
+    atletas = {str(100 + i): {'scout': {'G': i % 2, 'DS': rodada}, 'apelido': f'atleta {i}', 'pontuacao': rodada + i / 10,
+                              'posicao_id': 5, 'clube_id': 262, 'entrou_em_campo': True} for i in range(5)}
+    return json.dumps({'atletas': atletas, 'rodada': rodada, 'total_atletas': len(atletas)}).encode()
+
+@pytest.fixture
+def respostas():
+    return {('pontuados', r): _corpo(r) for r in RODADAS}
+
+def _coletar(base_url, **kwargs):
+    # Limite de tempo: uma coleta travada falha o teste em vez de pendurar a suíte
+    return asyncio.run(asyncio.wait_for(
+        coletar_pontuados_async(ANO, RODADAS, concorrencia=3, base_url=base_url, arquivar=False, **kwargs), 30))
+
+def test_coleta_e_grava_todas_as_rodadas(armazem, respostas):
+    with servidor_mock(ANO, RODADAS, latencia=0.01, respostas=respostas) as base_url:
+        df = _coletar(base_url)
+    assert len(df) == 5 * len(RODADAS)
+    assert sorted(df['rodada'].unique()) == list(RODADAS)
+    gravado = carregar_tabela('jogadores', anos=[ANO])
+    assert len(gravado) == len(df)
+    assert sorted(gravado['rodada'].unique()) == list(RODADAS)
+
+def test_falha_do_gravador_nao_trava_a_coleta(armazem, respostas, monkeypatch):
+    def falhar(*args, **kwargs):
+        raise OSError("disco cheio")
+    monkeypatch.setattr(coleta_concorrente, 'salvar_particoes', falhar)
+    with servidor_mock(ANO, RODADAS, latencia=0.01, respostas=respostas) as base_url:
+        df = _coletar(base_url)
+    assert sorted(df['rodada'].unique()) == list(RODADAS)  # Coletadas, embora não gravadas
+    assert carregar_tabela('jogadores') is None
+
+def test_resposta_invalida_pula_so_a_rodada(respostas):
+    respostas[('pontuados', 3)] = b'{"atletas": '
+    del respostas[('pontuados', 5)]  # 404
+    with servidor_mock(ANO, RODADAS, latencia=0.01, respostas=respostas) as base_url:
+        df = _coletar(base_url, gravar=False)
+    assert sorted(df['rodada'].unique()) == [1, 2, 4, 6]
+
+def test_respeita_retry_after_do_429(respostas, monkeypatch):
+    esperas = []
+    original = coleta_concorrente._espera_retentativa
+    def espera(resposta, tentativa):
+        esperas.append(original(resposta, tentativa))
+        return esperas[-1]
+    monkeypatch.setattr(coleta_concorrente, '_espera_retentativa', espera)
+    with servidor_mock(ANO, RODADAS, latencia=0.01, respostas=respostas, limite_rps=3) as base_url:
+        df = _coletar(base_url, gravar=False)
+    assert sorted(df['rodada'].unique()) == list(RODADAS)
+    assert esperas and all(e == 1.0 for e in esperas)  # Retry-After: 1
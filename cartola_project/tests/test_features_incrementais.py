@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+from utils.config import config
+from utils.feature_engineering import preparar_features_historicas
+from utils.features_incrementais import (
+    atualizar_features_rodada, carregar_estado_features, construir_estado_features, rodadas_aplicadas
+)
+
+def _historico(rodadas, atletas=range(1, 6), ano=2025):
+    gerador = np.random.default_rng(0)
+    linhas = [{'ano': ano, 'atleta_id': a, 'rodada': r, 'clube_id': 262, 'posicao_id': 5,
+               'pontuacao': float(gerador.choice([-2, 1, 3.7, 8, 12.4])), 'G': float(gerador.integers(0, 2)), 'DS': float(gerador.integers(0, 4))}
+              for r in rodadas for a in atletas if (a + r) % 4]  # Alguns atletas não jogam todas as rodadas
+    return pd.DataFrame(linhas)
+
+def test_rodada_incremental_igual_ao_recalculo_e_idempotente(armazem):
+    caminho = str(armazem / 'estado.sqlite')
+    df = _historico(range(1, 6))
+    anterior, rodada = df[df['rodada'] < 5], df[df['rodada'] == 5]
+
+    novas = atualizar_features_rodada(rodada, anterior, caminho_estado=caminho)
+    assert len(novas) == len(rodada)
+    assert (2025, 5) in rodadas_aplicadas(caminho)
+
+    completo = construir_estado_features(df).sort_index()
+    estado = carregar_estado_features(caminho).sort_index()
+    assert estado.index.equals(completo.index)
+    np.testing.assert_allclose(estado.to_numpy(), completo[estado.columns].to_numpy(), equal_nan=True)
+
+    # Coletar a mesma rodada de novo não a aplica duas vezes
+    assert atualizar_features_rodada(rodada, anterior, caminho_estado=caminho).empty
+    np.testing.assert_allclose(carregar_estado_features(caminho).sort_index().to_numpy(), estado.to_numpy(), equal_nan=True)
+
+def test_le_so_os_atletas_da_rodada(armazem):
+    caminho = str(armazem / 'estado.sqlite')
+    df = _historico(range(1, 4), atletas=range(1, 50))
+    atualizar_features_rodada(df[df['rodada'] == 3], df[df['rodada'] < 3], caminho_estado=caminho)
+    chaves = pd.MultiIndex.from_tuples([(2025, 1), (2025, 2), (2025, 999)], names=['ano', 'atleta_id'])
+    assert sorted(carregar_estado_features(caminho, chaves).index.tolist()) == [(2025, 1), (2025, 2)]
+
+def test_preparar_features_le_o_estado_e_aplica_so_a_rodada_nova(armazem, monkeypatch):
+    monkeypatch.setattr(config, 'FEATURE_STATE_PATH', str(armazem / 'estado.sqlite'))
+    df = _historico(range(1, 7))
+    atualizar_features_rodada(df[df['rodada'] == 5], df[df['rodada'] < 5])
+
+    # Rodada 6 ainda não aplicada: preparar_features_historicas a incorpora ao estado
+    via_estado = preparar_features_historicas(df, usar_cache=False)
+    assert (2025, 6) in rodadas_aplicadas()
+    completo = preparar_features_historicas(df, usar_cache=False, usar_estado=False)
+    pd.testing.assert_frame_equal(via_estado.reset_index(drop=True), completo.reset_index(drop=True))
+
+def test_historico_divergente_do_estado_recalcula_tudo(armazem, monkeypatch):
+    monkeypatch.setattr(config, 'FEATURE_STATE_PATH', str(armazem / 'estado.sqlite'))
+    df = _historico(range(1, 5))
+    atualizar_features_rodada(df[df['rodada'] == 4], df[df['rodada'] < 4])
+
+    corrigido = df.copy()
+    corrigido.loc[corrigido['rodada'] == 2, 'pontuacao'] += 1.0
+    via_estado = preparar_features_historicas(corrigido, usar_cache=False)
+    completo = preparar_features_historicas(corrigido, usar_cache=False, usar_estado=False)
+    pd.testing.assert_frame_equal(via_estado.reset_index(drop=True), completo.reset_index(drop=True))
+
+def test_verificacao_sem_historico_usa_o_armazem(armazem):
+    from utils.armazenamento import salvar_particoes
+    caminho = str(armazem / 'estado.sqlite')
+    df = _historico(range(1, 5))
+    salvar_particoes(df, 'jogadores')
+    assert len(atualizar_features_rodada(df[df['rodada'] == 4], verificar=True, caminho_estado=caminho))
+    assert (2025, 4) in rodadas_aplicadas(caminho)
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+from pytest import approx
+from utils.feature_engineering import calcular_forca_times, anexar_forca_adversario
+
+def _partidas(placares):
+    """placares: {rodada: (gols do clube 1 em casa, gols do clube 2 fora)}."""
+    return pd.DataFrame([{'ano': 2025, 'rodada': r, 'mandante_id': 1, 'visitante_id': 2,
+                          'placar_mandante': g1, 'placar_visitante': g2} for r, (g1, g2) in placares.items()])
+
+def _forca_do_adversario_2(partidas, rodadas):
+    jogos = pd.DataFrame({'ano': 2025, 'rodada': rodadas, 'adversario_id': 2})
+    return anexar_forca_adversario(jogos, calcular_forca_times(partidas, janela=38))
+
+def test_usa_so_rodadas_anteriores_ao_jogo():
+    df = _forca_do_adversario_2(_partidas({1: (0, 3), 2: (0, 1), 3: (5, 0)}), [2, 3, 4])
+    # Rodada 2: só o jogo da rodada 1 (3 gols); rodada 3: média de 3 e 1; rodada 4: inclui a goleada sofrida
+    assert df['adv_media_gols_feitos'].tolist() == approx([3.0, 2.0, 4 / 3])
+    assert df['adv_media_gols_sofridos'].tolist() == approx([0.0, 0.0, 5 / 3])
+    assert df['adv_aproveitamento'].tolist() == approx([100.0, 100.0, 200 / 3])
+
+def test_resultados_futuros_nao_alteram_rodadas_passadas():
+    rodadas = [1, 2, 3]
+    base = _forca_do_adversario_2(_partidas({1: (0, 3), 2: (0, 1), 3: (1, 1)}), rodadas)
+    alterada = _forca_do_adversario_2(_partidas({1: (0, 3), 2: (0, 1), 3: (9, 0), 4: (7, 0)}), rodadas)
+    colunas = [c for c in base.columns if c.startswith('adv_')]
+    np.testing.assert_array_equal(base[colunas].to_numpy(), alterada[colunas].to_numpy())
+
+def test_primeira_rodada_sem_historico_recebe_padrao():
+    df = _forca_do_adversario_2(_partidas({1: (2, 2)}), [1])
+    assert df['adv_media_gols_feitos'].iloc[0] == 1.0
+    assert df['adv_aproveitamento'].iloc[0] == 50.0
+    assert np.isnan(df['adv_taxa_sg'].iloc[0])  # Nem a média da liga existe antes da primeira rodada
+
+def test_preserva_ordem_e_indice_das_linhas():
+    jogos = pd.DataFrame({'ano': 2025, 'rodada': [3, 2, 3], 'adversario_id': [2, 2, 1]}, index=[10, 5, 7])
+    df = anexar_forca_adversario(jogos, calcular_forca_times(_partidas({1: (0, 3), 2: (0, 1)}), janela=38))
+    assert df.index.tolist() == [10, 5, 7]
+    assert df['rodada'].tolist() == [3, 2, 3]
+    assert df['adv_media_gols_feitos'].tolist() == [2.0, 3.0, 0.0]
@@ -0,0 +1,44 @@
+import glob
+import json
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from utils.config import config
+from utils.leitura_colunar import pontuados_colunar, _pontuados_por_registros
+
+def _comparar(conteudo, ano=2025, rodada=7):
+    novo = pontuados_colunar(conteudo, ano, rodada).sort_values('atleta_id', ignore_index=True)
+    antigo = _pontuados_por_registros(conteudo, ano, rodada).sort_values('atleta_id', ignore_index=True)
+    assert len(novo) == len(antigo)
+    for coluna in antigo.columns:
+        assert coluna in novo.columns
+        if coluna == 'apelido':
+            assert novo[coluna].tolist() == antigo[coluna].tolist()
+        else:
+            np.testing.assert_allclose(novo[coluna].to_numpy(dtype=float), antigo[coluna].to_numpy(dtype=float), err_msg=coluna)
+    # Scouts que nenhum atleta teve existem no colunar, zerados
+    for coluna in set(novo.columns) - set(antigo.columns):
+        assert (novo[coluna] == 0).all()
+
+def test_mesmo_resultado_da_conversao_antiga():
+    atletas = {
+        '10': {'scout': {'G': 1, 'A': 2, 'DS': 3}, 'apelido': 'Fulano', 'pontuacao': 12.5, 'posicao_id': 5, 'clube_id': 262},
+        '11': {'scout': {'SG': 1, 'DE': 4}, 'apelido': 'Goleiro', 'pontuacao': 9.0, 'posicao_id': 1, 'clube_id': 275},
+        '12': {'scout': None, 'apelido': 'Sem scout', 'pontuacao': 0, 'posicao_id': 6, 'clube_id': 262},
+        '13': {'scout': {'XX': 2}, 'apelido': 'Scout novo', 'pontuacao': -1.2, 'posicao_id': 3, 'clube_id': None},
+    }
+    _comparar(json.dumps({'atletas': atletas}).encode())
+
+@pytest.mark.parametrize('arquivo', sorted(glob.glob(os.path.join(config.DATA_DIR, 'api_rodada*.json'))) or [None])
+def test_respostas_gravadas(arquivo):
+    if arquivo is None:
+        pytest.skip("nenhum api_rodada*.json em data/")
+    with open(arquivo, 'rb') as f:
+        conteudo = f.read()
+    if not json.loads(conteudo).get('atletas'):
+        pytest.skip("resposta sem atletas")
+    _comparar(conteudo)
+
+def test_resposta_sem_atletas_vira_dataframe_vazio():
+    assert pontuados_colunar(b'{"atletas": null}', 2025, 1).empty
@@ -0,0 +1,24 @@
+import pandas as pd
+from utils.parciais import EscalacaoAoVivo, ler_jogos_encerrados
+
+def _escalacao():
+    titulares = pd.DataFrame({'atleta_id': [1, 2], 'posicao': ['Atacante', 'Meia'], 'clube_id': [262, 263],
+                              'pontuacao_prevista': [6.0, 4.0]})
+    reservas = pd.DataFrame({'atleta_id': [10], 'posicao': ['Atacante'], 'clube_id': [264], 'pontuacao_prevista': [3.0]})
+    return EscalacaoAoVivo(titulares, capitao_id=1, reservas=reservas)
+
+def _parcial(pontuacao, entrou, clube_id):
+    return {'apelido': None, 'clube_id': clube_id, 'posicao_id': 5, 'pontuacao': pontuacao, 'scout': {}, 'entrou_em_campo': entrou}
+
+def test_reserva_so_entra_depois_do_jogo_do_titular_e_sem_capitania():
+    escalacao = _escalacao()
+    parciais = {10: _parcial(5.0, True, 264), 2: _parcial(2.0, True, 263)}
+    escalacao.aplicar([{'atleta_id': 10}, {'atleta_id': 2}], parciais)
+    # Jogo do capitão (clube 262) ainda não terminou: ele segue na projeção com a pontuação prevista x1.5
+    assert escalacao.resumo['substituicoes'] == []
+    assert escalacao.resumo['projecao'] == 6.0 * 1.5 + 2.0
+
+    jogos = {'partidas': [{'clube_casa_id': 262, 'clube_visitante_id': 265, 'status_transmissao_tr': 'ENCERRADA'}]}
+    assert escalacao.atualizar_jogos(ler_jogos_encerrados(jogos))
+    assert escalacao.resumo['substituicoes'] == [(1, 10)]
+    assert escalacao.resumo['parcial'] == 5.0 + 2.0  # O reserva não herda o x1.5
@@ -0,0 +1,20 @@
+import pandas as pd
+import pytest
+from utils import armazenamento
+from utils.config import config
+from utils.armazenamento import salvar_particoes
+from utils.tensores import construir_tensores, carregar_tensores, tensores_atualizados
+
+def test_build_parcial_nao_serve_a_carga_completa(armazem, monkeypatch):
+    if not armazenamento.PYARROW_DISPONIVEL:
+        pytest.skip("pyarrow não instalado")
+    monkeypatch.setattr(config, 'TENSORES_DIR', str(armazem / 'tensores'))
+    for ano in (2024, 2025):
+        salvar_particoes(pd.DataFrame({'ano': ano, 'atleta_id': [1, 2], 'rodada': 1, 'posicao_id': 5,
+                                       'clube_id': 262, 'pontuacao': 3.0, 'preco_num': 5.0}), 'jogadores')
+
+    assert construir_tensores(anos=[2024])['anos'] == [2024]
+    assert tensores_atualizados([2024])
+    assert not tensores_atualizados()
+    assert carregar_tensores()['anos'] == [2024, 2025]
+    assert tensores_atualizados()
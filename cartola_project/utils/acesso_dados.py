@@ -0,0 +1,113 @@
+"""
+Acesso centralizado aos arquivos de dados (clubes.json, CSVs da rodada, estatísticas de times...).
+
+Cada arquivo é lido do disco uma única vez por processo e mantido em memória enquanto não
+mudar: a validade é conferida pelo os.stat (mtime, tamanho e inode), então uma nova coleta ou
+uma escrita atômica (utils.arquivos) invalida a cópia na próxima leitura, sem TTL.
+Os carregadores devolvem cópias, para que um consumidor não altere os dados dos outros.
+"""
+
+import os
+import copy
+import json
+import threading
+import pandas as pd
+from utils.config import config, logger
+
+# Escalações reais do usuário (separador ';'), comparadas com as da IA nas análises de desempenho
+HISTORICO_USUARIO_PATH = os.path.join(os.path.dirname(config.RAW_DATA_PATH), "historico_vini.csv")
+
+# caminho + argumentos de leitura -> (assinatura do arquivo, valor)
+_CACHE = {}
+_CACHE_GUARDA = threading.Lock()
+_CONTADORES = {'leituras_disco': 0, 'leituras_evitadas': 0}
+
+def _assinatura(caminho):
+    estado = os.stat(caminho)
+    return (estado.st_mtime_ns, estado.st_size, estado.st_ino)
+
+def _carregar(caminho, leitor, chave):
+    """Devolve o valor em memória se o arquivo não mudou; senão lê do disco com 'leitor'."""
+    try:
+        assinatura = _assinatura(caminho)
+    except FileNotFoundError:
+        return None
+    with _CACHE_GUARDA:
+        guardado = _CACHE.get(chave)
+        if guardado is not None and guardado[0] == assinatura:
+            _CONTADORES['leituras_evitadas'] += 1
+            return guardado[1]
+    valor = leitor(caminho)
+    with _CACHE_GUARDA:
+        _CACHE[chave] = (assinatura, valor)
+        _CONTADORES['leituras_disco'] += 1
+    return valor
+
+# --- Carregadores genéricos ---
+
+def ler_json(caminho):
+    """json.load com cache. Retorna None se o arquivo não existir."""
+    def leitor(c):
+        with open(c, 'r', encoding='utf8') as f:
+            return json.load(f)
+    valor = _carregar(caminho, leitor, ('json', os.path.abspath(caminho)))
+    return copy.deepcopy(valor) if valor is not None else None
+
+def ler_csv(caminho, **kwargs):
+    """pd.read_csv com cache (mesmos argumentos). Retorna None se o arquivo não existir."""
+    chave = ('csv', os.path.abspath(caminho), repr(sorted(kwargs.items())))
+    df = _carregar(caminho, lambda c: pd.read_csv(c, **kwargs), chave)
+    return df.copy() if df is not None else None
+
+# --- Carregadores tipados ---
+
+def carregar_clubes_json():
+    """Conteúdo do clubes.json com chaves inteiras: {clube_id: {'nome', 'nome_fantasia', ...}} (vazio se não existir)."""
+    try:
+        clubes = ler_json(config.CLUBS_DATA_PATH)
+    except Exception as e:
+        logger.warning(f"Erro ao ler '{config.CLUBS_DATA_PATH}': {e}")
+        return {}
+    return {int(k): v for k, v in clubes.items()} if clubes else {}
+
+def mapa_clubes(campo='nome'):
+    """{clube_id: campo} a partir do clubes.json (ex: 'nome', 'nome_fantasia', 'abreviacao')."""
+    return {cid: dados[campo] for cid, dados in carregar_clubes_json().items() if campo in dados}
+
+def carregar_estatisticas_times():
+    """Estatísticas agregadas por clube (gerar_estatisticas_times), ou None se ainda não geradas."""
+    return ler_csv(config.ESTATISTICAS_TIMES_PATH)
+
+def carregar_rodada_atual():
+    """Mercado da rodada atual coletado da API (rodada_atual.csv), ou None."""
+    return ler_csv(config.RAW_DATA_PATH)
+
+def carregar_partidas_rodada():
+    """Partidas da rodada atual, ou None."""
+    return ler_csv(config.MATCHES_DATA_PATH)
+
+def carregar_odds():
+    """Odds coletadas para a rodada atual, ou None."""
+    return ler_csv(config.ODDS_DATA_PATH)
+
+def carregar_historico_usuario():
+    """Histórico de escalações do usuário (historico_vini.csv), ou None."""
+    return ler_csv(HISTORICO_USUARIO_PATH, sep=';')
+
+# --- Diagnóstico ---
+
+def estatisticas_cache():
+    """Contadores do cache: leituras feitas no disco, leituras evitadas e arquivos em memória."""
+    with _CACHE_GUARDA:
+        return dict(_CONTADORES, arquivos_em_memoria=len(_CACHE))
+
+def limpar_cache():
+    """Esvazia o cache em memória (os contadores são mantidos)."""
+    with _CACHE_GUARDA:
+        _CACHE.clear()
+
+if __name__ == "__main__":
+    for _ in range(3):
+        carregar_clubes_json()
+        carregar_estatisticas_times()
+    print(estatisticas_cache())
@@ -1,34 +1,143 @@
 import pandas as pd
-import numpy as np
 import os
-import json
 import re
 from difflib import SequenceMatcher
 from utils.config import config
+from utils.armazenamento import carregar_tabela, tabela_disponivel
+from utils.banco_analitico import consultar, colunas_disponiveis
+from utils.carregamento import MAPA_POSICOES
+from utils.acesso_dados import ler_csv, mapa_clubes, carregar_clubes_json, carregar_estatisticas_times, carregar_odds
 
 # --- CAMINHOS ---
-HISTORICAL_MATCHES_PATH = config.HISTORICAL_MATCHES_PATH
-HISTORICAL_PLAYERS_PATH = config.HISTORICAL_DATA_PATH
-TEAM_STATS_PATH = config.ESTATISTICAS_TIMES_PATH
-ODDS_PATH = config.ODDS_HISTORY_PATH
-CLUBS_DATA_PATH = config.CLUBS_DATA_PATH
 DATA_DIR = os.path.dirname(config.RAW_DATA_PATH)
 
 def carregar_clubes():
     """Carrega o mapeamento de clubes."""
-    if os.path.exists(CLUBS_DATA_PATH):
-        with open(CLUBS_DATA_PATH, 'r', encoding='utf8') as f:
-            clubes = json.load(f)
-            return {int(k): v['nome'] for k, v in clubes.items()}
-    return {}
+    return mapa_clubes('nome')
 
 def carregar_clubes_nome_fantasia():
     """Carrega o mapeamento de clubes usando nome_fantasia (para matching com odds)."""
-    if os.path.exists(CLUBS_DATA_PATH):
-        with open(CLUBS_DATA_PATH, 'r', encoding='utf8') as f:
-            clubes = json.load(f)
-            return {int(k): v.get('nome_fantasia', v.get('nome', '')) for k, v in clubes.items()}
-    return {}
+    return {k: v.get('nome_fantasia', v.get('nome', '')) for k, v in carregar_clubes_json().items()}
+
+SIGLAS_POSICAO = {1: 'GOL', 2: 'LAT', 3: 'ZAG', 4: 'MEI', 5: 'ATA', 6: 'TEC'}
+
+def _coluna(colunas, nome, padrao='NULL'):
+    """Referência SQL à coluna, ou um valor padrão se ela não existir no histórico."""
+    return f'"{nome}"' if nome in colunas else padrao
+
+def _filtro_jogadores(colunas, ano, clubes_filtro=None, posicao_filtro=None, status_filtro=None):
+    """Monta o WHERE (e parâmetros) comum às análises de jogadores."""
+    condicoes, parametros = ["ano = ?"], [ano]
+
+    if clubes_filtro:
+        clubes_id_filtro = [k for k, v in carregar_clubes().items() if v in clubes_filtro]
+        condicoes.append(f"clube_id IN ({', '.join('?' * len(clubes_id_filtro))})")
+        parametros += clubes_id_filtro
+
+    if posicao_filtro:
+        # posicao_id já é normalizado (1-6) no banco; aceita tanto número quanto string ('gol')
+        posicao = MAPA_POSICOES.get(str(posicao_filtro).lower(), posicao_filtro)
+        condicoes.append("posicao_id = ?")
+        parametros.append(int(posicao))
+
+    if status_filtro:
+        status_filtro_lower = [s.lower() if isinstance(s, str) else str(s).lower() for s in status_filtro]
+        status = _coluna(colunas, 'status_id')
+        condicoes.append(f"lower(CAST({status} AS TEXT)) IN ({', '.join('?' * len(status_filtro_lower))})")
+        parametros += status_filtro_lower
+
+    return " AND ".join(condicoes), parametros
+
+def _estatisticas_atletas(ano, clubes_filtro=None, posicao_filtro=None, status_filtro=None):
+    """
+    Agrega o histórico do ano por atleta numa única consulta ao banco analítico.
+    Jogo disputado = pontuacao > 0. Nome, clube e posição vêm da primeira rodada do atleta;
+    o status, da mais recente.
+    """
+    colunas = colunas_disponiveis('jogadores')
+    where, parametros = _filtro_jogadores(colunas, ano, clubes_filtro, posicao_filtro, status_filtro)
+    status = _coluna(colunas, 'status_id')
+    g, a = _coluna(colunas, 'G', '0'), _coluna(colunas, 'A', '0')
+    sg, fs, ff = _coluna(colunas, 'SG', '0'), _coluna(colunas, 'FS', '0'), _coluna(colunas, 'FF', '0')
+
+    sql = f"""
+        WITH base AS (
+            SELECT atleta_id, rodada, apelido, clube_id, posicao_id, pontuacao,
+                   CAST({status} AS TEXT) AS status,
+                   COALESCE({g}, 0) AS g, COALESCE({a}, 0) AS a, COALESCE({sg}, 0) AS sg,
+                   COALESCE({fs}, 0) AS fs, COALESCE({ff}, 0) AS ff,
+                   pontuacao > 0 AS jogou,
+                   ROW_NUMBER() OVER (PARTITION BY atleta_id ORDER BY rodada) AS ordem_asc,
+                   ROW_NUMBER() OVER (PARTITION BY atleta_id ORDER BY rodada DESC) AS ordem_desc,
+                   ROW_NUMBER() OVER (PARTITION BY atleta_id, pontuacao > 0 ORDER BY rodada DESC) AS ordem_jogo,
+                   DENSE_RANK() OVER (ORDER BY rodada) AS ordem_rodada
+            FROM jogadores
+            WHERE {where}
+        )
+        SELECT atleta_id,
+               MAX(CASE WHEN ordem_asc = 1 THEN apelido END) AS nome,
+               MAX(CASE WHEN ordem_asc = 1 THEN clube_id END) AS clube_id,
+               MAX(CASE WHEN ordem_asc = 1 THEN posicao_id END) AS posicao_id,
+               COALESCE(MAX(CASE WHEN ordem_desc = 1 THEN status END), 'N/A') AS status,
+               COUNT(CASE WHEN jogou THEN 1 END) AS jogos,
+               COUNT(CASE WHEN jogou AND lower(status) IN ('provável', 'provavel') THEN 1 END) AS jogos_titular,
+               COUNT(DISTINCT rodada) AS rodadas,
+               MAX(MAX(ordem_rodada)) OVER () AS rodadas_ano,
+               AVG(pontuacao) AS media,
+               AVG(CASE WHEN jogou THEN pontuacao END) AS media_basica,
+               COUNT(CASE WHEN sg > 0 THEN 1 END) AS jogos_sg,
+               COUNT(CASE WHEN g > 0 OR a > 0 THEN 1 END) AS jogos_participacao,
+               TOTAL(CASE WHEN jogou THEN g END) AS gols,
+               TOTAL(CASE WHEN jogou THEN a END) AS assistencias,
+               TOTAL(CASE WHEN jogou THEN fs END) AS fs,
+               TOTAL(CASE WHEN jogou THEN ff END) AS ff,
+               AVG(CASE WHEN jogou AND ordem_jogo <= 3 THEN pontuacao END) AS media_3,
+               AVG(CASE WHEN jogou AND ordem_jogo <= 5 THEN pontuacao END) AS media_5,
+               COUNT(CASE WHEN jogou AND ordem_jogo <= 3 THEN 1 END) AS max_3,
+               COUNT(CASE WHEN jogou AND ordem_jogo <= 5 THEN 1 END) AS max_5,
+               COUNT(CASE WHEN jogou AND ordem_desc <= 3 THEN 1 END) AS jogou_ultimas_3
+        FROM base
+        GROUP BY atleta_id
+        ORDER BY atleta_id
+    """
+    df = consultar(sql, parametros, tabelas=['jogadores'])
+
+    clubes_map = carregar_clubes()
+    df['clube'] = [clubes_map.get(c, f'Clube {c}') for c in df['clube_id']]
+    df['pos'] = [SIGLAS_POSICAO.get(p, f'POS {p}') for p in df['posicao_id']]
+    return df
+
+def _probabilidades_vitoria(ano):
+    """
+    Probabilidade de vitória (%) de cada clube na rodada atual, pelas odds normalizadas (1/odd).
+    Usa odds_rodada.csv e, se não houver odds do ano, a rodada mais recente do histórico de odds.
+    """
+    df_odds = carregar_odds()
+    if df_odds is not None:
+        df_odds = df_odds[df_odds['ano'] == ano]
+
+    if (df_odds is None or df_odds.empty) and tabela_disponivel('odds'):
+        df_odds = consultar(
+            "SELECT * FROM odds WHERE ano = ? AND rodada_id = (SELECT MAX(rodada_id) FROM odds WHERE ano = ?)",
+            (ano, ano), tabelas=['odds']
+        )
+
+    if df_odds is None or df_odds.empty:
+        return {}
+
+    # Matching com as odds pelo nome_fantasia
+    clubes_por_nome = {}
+    for clube_id, nome_fantasia in carregar_clubes_nome_fantasia().items():
+        clubes_por_nome.setdefault(nome_fantasia, []).append(clube_id)
+
+    probabilidades = {}
+    df_odds = df_odds.dropna(subset=['odd_casa', 'odd_empate', 'odd_visitante'])
+    for row in df_odds.itertuples(index=False):
+        soma_inverso = (1 / row.odd_casa) + (1 / row.odd_empate) + (1 / row.odd_visitante)
+        for time, odd in ((row.time_casa, row.odd_casa), (row.time_visitante, row.odd_visitante)):
+            for clube_id in clubes_por_nome.get(time, []):
+                probabilidades.setdefault(clube_id, (1 / odd) / soma_inverso * 100)
+    return probabilidades
 
 def analise_times(ano=config.CURRENT_YEAR, clubes_filtro=None):
     """
@@ -40,156 +149,89 @@ def analise_times(ano=config.CURRENT_YEAR, clubes_filtro=None):
     - Gols marcados pelo adversário
     - SG's cedidos pelo adversário
     """
-    if not os.path.exists(HISTORICAL_MATCHES_PATH):
+    if not tabela_disponivel('partidas'):
         return None, "Arquivo de histórico de partidas não encontrado."
-    
-    if not os.path.exists(TEAM_STATS_PATH):
+
+    df_stats = carregar_estatisticas_times()
+    if df_stats is None:
         return None, "Arquivo de estatísticas de times não encontrado."
-    
+
     try:
-        # Carrega dados
-        df_partidas = pd.read_csv(HISTORICAL_MATCHES_PATH)
-        df_stats = pd.read_csv(TEAM_STATS_PATH)
-        clubes_map = carregar_clubes()
-        clubes_map_fantasia = carregar_clubes_nome_fantasia()  # Para matching com odds
-        
-        # Filtra por ano
-        df_partidas = df_partidas[df_partidas['ano'] == ano].copy()
-        
+        # Cada partida vira duas linhas (perspectiva do mandante e do visitante)
+        df_partidas = consultar("""
+            WITH lados AS (
+                SELECT mandante_id AS clube_id, placar_mandante AS gols_pro, placar_visitante AS gols_contra
+                FROM partidas WHERE ano = ?
+                UNION ALL
+                SELECT visitante_id, placar_visitante, placar_mandante
+                FROM partidas WHERE ano = ?
+            ),
+            jogos AS (
+                SELECT clube_id, gols_pro, gols_contra,
+                       gols_pro IS NOT NULL AND gols_contra IS NOT NULL AS valido
+                FROM lados
+            )
+            SELECT clube_id,
+                   NULLIF(SUM(valido), 0) AS jogos,
+                   SUM(valido AND gols_contra = 0) AS sg_conquistados,
+                   SUM(valido AND gols_pro = 0) AS sg_cedidos_adv,
+                   AVG(CASE WHEN valido THEN gols_contra END) AS gols_marcados_adv_media
+            FROM jogos
+            GROUP BY clube_id
+        """, (ano, ano), tabelas=['partidas'])
+
         if df_partidas.empty:
             return None, f"Nenhum dado encontrado para o ano {ano}."
-        
+
+
         # Filtra clubes se especificado
         if clubes_filtro:
             df_stats = df_stats[df_stats['clube_nome'].isin(clubes_filtro)].copy()
-        
-        # Calcula probabilidade de vitória via odds da rodada atual
-        prob_vitoria_media = {}
-        
-        # Tenta primeiro odds_rodada.csv (rodada atual)
-        odds_rodada_path = os.path.join(DATA_DIR, "odds_rodada.csv")
-        df_odds = None
-        
-        if os.path.exists(odds_rodada_path):
-            df_odds = pd.read_csv(odds_rodada_path)
-            df_odds = df_odds[df_odds['ano'] == ano].copy()
-        
-        # Se não tiver ou estiver vazio, tenta historico_odds.csv
-        if df_odds is None or df_odds.empty:
-            if os.path.exists(ODDS_PATH):
-                df_odds = pd.read_csv(ODDS_PATH)
-                df_odds = df_odds[df_odds['ano'] == ano].copy()
-                # Pega a rodada mais recente
-                if not df_odds.empty and 'rodada_id' in df_odds.columns:
-                    rodada_max = df_odds['rodada_id'].max()
-                    df_odds = df_odds[df_odds['rodada_id'] == rodada_max].copy()
-        
-        # Calcula probabilidade de vitória para cada time na rodada atual
-        if df_odds is not None and not df_odds.empty:
-            for _, row in df_odds.iterrows():
-                if pd.notna(row['odd_casa']) and pd.notna(row['odd_empate']) and pd.notna(row['odd_visitante']):
-                    # Calcula probabilidade: 1/odd normalizado
-                    soma_inverso = (1/row['odd_casa']) + (1/row['odd_empate']) + (1/row['odd_visitante'])
-                    prob_casa = (1/row['odd_casa']) / soma_inverso
-                    prob_visitante = (1/row['odd_visitante']) / soma_inverso
-                    
-                    # Mapeia nomes para IDs usando nome_fantasia
-                    time_casa = row['time_casa']
-                    time_visitante = row['time_visitante']
-                    
-                    # Encontra IDs dos times usando nome_fantasia
-                    for clube_id, clube_nome_fantasia in clubes_map_fantasia.items():
-                        if clube_nome_fantasia == time_casa:
-                            prob_vitoria_media[clube_id] = prob_casa * 100
-                        elif clube_nome_fantasia == time_visitante:
-                            prob_vitoria_media[clube_id] = prob_visitante * 100
-        
-        # Calcula SG's conquistados e cedidos
-        sg_conquistados = {}
-        sg_cedidos_adv = {}
-        gols_marcados_adv = {}
-        gols_sofridos_adv = {}
-        
-        for _, row in df_partidas.iterrows():
-            mandante_id = row['mandante_id']
-            visitante_id = row['visitante_id']
-            placar_m = row['placar_mandante']
-            placar_v = row['placar_visitante']
-            
-            if pd.isna(placar_m) or pd.isna(placar_v):
-                continue
-            
-            # SG conquistado (time não tomou gol)
-            if placar_v == 0:
-                if mandante_id not in sg_conquistados:
-                    sg_conquistados[mandante_id] = 0
-                sg_conquistados[mandante_id] += 1
-            
-            if placar_m == 0:
-                if visitante_id not in sg_conquistados:
-                    sg_conquistados[visitante_id] = 0
-                sg_conquistados[visitante_id] += 1
-            
-            # SG cedido pelo adversário (adversário não marcou)
-            if placar_v == 0:
-                if visitante_id not in sg_cedidos_adv:
-                    sg_cedidos_adv[visitante_id] = 0
-                sg_cedidos_adv[visitante_id] += 1
-            
-            if placar_m == 0:
-                if mandante_id not in sg_cedidos_adv:
-                    sg_cedidos_adv[mandante_id] = 0
-                sg_cedidos_adv[mandante_id] += 1
-            
-            # Gols marcados pelo adversário
-            if visitante_id not in gols_marcados_adv:
-                gols_marcados_adv[visitante_id] = []
-            gols_marcados_adv[visitante_id].append(placar_m)
-            
-            if mandante_id not in gols_marcados_adv:
-                gols_marcados_adv[mandante_id] = []
-            gols_marcados_adv[mandante_id].append(placar_v)
-        
-        # Calcula médias
-        gols_marcados_adv_media = {k: np.mean(v) for k, v in gols_marcados_adv.items()}
-        
-        # Conta jogos por time
-        jogos_por_time = {}
-        for _, row in df_partidas.iterrows():
-            mandante_id = row['mandante_id']
-            visitante_id = row['visitante_id']
-            if pd.notna(row['placar_mandante']) and pd.notna(row['placar_visitante']):
-                jogos_por_time[mandante_id] = jogos_por_time.get(mandante_id, 0) + 1
-                jogos_por_time[visitante_id] = jogos_por_time.get(visitante_id, 0) + 1
-        
-        # Monta DataFrame final
-        resultados = []
-        for _, row in df_stats.iterrows():
-            clube_id = row['clube_id']
-            clube_nome = row.get('clube_nome', f'Clube {clube_id}')
-            
-            jogos = jogos_por_time.get(clube_id, row['jogos'])
-            sg_conq = sg_conquistados.get(clube_id, 0)
-            sg_ced = sg_cedidos_adv.get(clube_id, 0)
-            
-            resultados.append({
-                'Clube': clube_nome,
-                'Probabilidade de Vitória (%)': prob_vitoria_media.get(clube_id, 0),
-                'Gols Sofridos (Média)': row['media_gols_sofridos'],
-                "SG's Conquistados (%)": (sg_conq / jogos * 100) if jogos > 0 else 0,
-                'Gols Marcados - Adversário (Média)': gols_marcados_adv_media.get(clube_id, 0),
-                "SG's Cedidos - Adversário (%)": (sg_ced / jogos * 100) if jogos > 0 else 0,
-            })
-        
-        df_resultado = pd.DataFrame(resultados)
+
+        df = df_stats.merge(df_partidas, on='clube_id', how='left', suffixes=('_stats', ''))
+        jogos = df['jogos'].fillna(df['jogos_stats'])
+        prob_vitoria = _probabilidades_vitoria(ano)
+
+        df_resultado = pd.DataFrame({
+            'Clube': df['clube_nome'] if 'clube_nome' in df.columns else 'Clube ' + df['clube_id'].astype(str),
+            'Probabilidade de Vitória (%)': df['clube_id'].map(prob_vitoria).fillna(0),
+            'Gols Sofridos (Média)': df['media_gols_sofridos'],
+            "SG's Conquistados (%)": (df['sg_conquistados'].fillna(0) / jogos * 100).where(jogos > 0, 0),
+            'Gols Marcados - Adversário (Média)': df['gols_marcados_adv_media'].fillna(0),
+            "SG's Cedidos - Adversário (%)": (df['sg_cedidos_adv'].fillna(0) / jogos * 100).where(jogos > 0, 0),
+        })
         df_resultado = df_resultado.sort_values('Probabilidade de Vitória (%)', ascending=False)
-        
+
         return df_resultado, None
-        
+
     except Exception as e:
         return None, f"Erro ao gerar análise de times: {str(e)}"
 
 
+def _analise_posicao(ano, posicao, clubes_filtro, coluna_prob, coluna_jogos_prob):
+    """Base das análises de goleiros e atacantes (mesmas colunas, muda a probabilidade específica)."""
+    df = _estatisticas_atletas(ano, clubes_filtro=clubes_filtro, posicao_filtro=posicao)
+    if df.empty:
+        return None
+
+    prob_vitoria = _probabilidades_vitoria(ano)
+    jogos = df['jogos']
+
+    return pd.DataFrame({
+        'Clube': df['clube'],
+        'Pos': SIGLAS_POSICAO[posicao],
+        'Nome': df['nome'],
+        'Jogos': jogos,
+        # Minutos estimados: 90 por jogo disputado (titular: jogou com status Provável)
+        'Minutos': jogos * 90,
+        'Minutos Titular': df['jogos_titular'] * 90,
+        'Média': df['media'].round(2),
+        'M. Básica': df['media_basica'].round(2),
+        coluna_prob: (df[coluna_jogos_prob] / jogos * 100).where(jogos > 0, 0).round(1),
+        'Prob. Vitória (%)': df['clube_id'].map(prob_vitoria).fillna(50).round(1),
+    }).sort_values('Prob. Vitória (%)', ascending=False)
+
+
 def analise_goleiros(ano=config.CURRENT_YEAR, clubes_filtro=None):
     """
     Análise de goleiros similar à BIA:
@@ -198,118 +240,15 @@ def analise_goleiros(ano=config.CURRENT_YEAR, clubes_filtro=None):
     - Probabilidade de SG
     - Probabilidade de Vitória
     """
-    if not os.path.exists(HISTORICAL_PLAYERS_PATH):
+    if not tabela_disponivel('jogadores'):
         return None, "Arquivo de histórico de jogadores não encontrado."
-    
+
     try:
-        df_historico = pd.read_csv(HISTORICAL_PLAYERS_PATH)
-        clubes_map = carregar_clubes()
-        clubes_map_fantasia = carregar_clubes_nome_fantasia()  # Para matching com odds
-        
-        # Filtra por ano e posição (goleiro = 'gol' ou 1)
-        # Aceita tanto string quanto número
-        mask_posicao = (df_historico['posicao_id'] == 'gol') | (df_historico['posicao_id'] == 1)
-        df_goleiros = df_historico[
-            (df_historico['ano'] == ano) & mask_posicao
-        ].copy()
-        
-        if df_goleiros.empty:
+        df_resultado = _analise_posicao(ano, 1, clubes_filtro, 'Prob. de SG (%)', 'jogos_sg')
+        if df_resultado is None:
             return None, f"Nenhum dado de goleiros encontrado para o ano {ano}."
-        
-        # Filtra clubes se especificado
-        if clubes_filtro:
-            # Converte nomes para IDs
-            clubes_id_filtro = [k for k, v in clubes_map.items() if v in clubes_filtro]
-            df_goleiros = df_goleiros[df_goleiros['clube_id'].isin(clubes_id_filtro)].copy()
-        
-        # Agrupa por atleta
-        resultados = []
-        
-        for atleta_id in df_goleiros['atleta_id'].unique():
-            df_atleta = df_goleiros[df_goleiros['atleta_id'] == atleta_id].copy()
-            
-            # Estima minutos: assume 90 min quando pontuacao > 0
-            df_atleta['minutos_estimado'] = df_atleta['pontuacao'].apply(lambda x: 90 if x > 0 else 0)
-            # Minutos titular: assume 90 min quando jogou e status é Provável
-            df_atleta['minutos_titular_estimado'] = df_atleta.apply(
-                lambda row: 90 if (row['pontuacao'] > 0 and 
-                                   str(row.get('status_id', '')).lower() in ['provável', 'provavel']) else 0, 
-                axis=1
-            )
-            
-            jogos = len(df_atleta[df_atleta['pontuacao'] > 0])
-            minutos_total = df_atleta['minutos_estimado'].sum()
-            minutos_titular = df_atleta['minutos_titular_estimado'].sum()
-            
-            # Médias
-            media = df_atleta['pontuacao'].mean()
-            # Média básica (sem bônus de capitão, etc) - aproximação usando média quando jogou
-            media_basica = df_atleta[df_atleta['pontuacao'] > 0]['pontuacao'].mean()
-            
-            # Probabilidade de SG (conta quantas vezes teve SG > 0, não soma os valores)
-            if 'SG' in df_atleta.columns and pd.notna(df_atleta['SG']).any():
-                sg_count = len(df_atleta[df_atleta['SG'] > 0])
-            else:
-                sg_count = 0
-            prob_sg = (sg_count / jogos * 100) if jogos > 0 else 0
-            
-            # Probabilidade de vitória do time (usa odds da rodada atual)
-            clube_id = df_atleta.iloc[0]['clube_id']
-            clube_nome = clubes_map.get(clube_id, f'Clube {clube_id}')
-            clube_nome_fantasia = clubes_map_fantasia.get(clube_id, '')
-            
-            # Busca probabilidade do time na rodada atual
-            prob_vitoria = 50  # Default
-            
-            # Tenta primeiro odds_rodada.csv
-            odds_rodada_path = os.path.join(DATA_DIR, "odds_rodada.csv")
-            df_odds = None
-            
-            if os.path.exists(odds_rodada_path):
-                df_odds = pd.read_csv(odds_rodada_path)
-                df_odds = df_odds[df_odds['ano'] == ano].copy()
-            
-            # Se não tiver, tenta historico_odds.csv (rodada mais recente)
-            if df_odds is None or df_odds.empty:
-                if os.path.exists(ODDS_PATH):
-                    df_odds = pd.read_csv(ODDS_PATH)
-                    df_odds = df_odds[df_odds['ano'] == ano].copy()
-                    if not df_odds.empty and 'rodada_id' in df_odds.columns:
-                        rodada_max = df_odds['rodada_id'].max()
-                        df_odds = df_odds[df_odds['rodada_id'] == rodada_max].copy()
-            
-            # Busca odds do clube usando nome_fantasia
-            if df_odds is not None and not df_odds.empty:
-                for _, row in df_odds.iterrows():
-                    if row['time_casa'] == clube_nome_fantasia or row['time_visitante'] == clube_nome_fantasia:
-                        if pd.notna(row['odd_casa']) and pd.notna(row['odd_empate']) and pd.notna(row['odd_visitante']):
-                            soma_inverso = (1/row['odd_casa']) + (1/row['odd_empate']) + (1/row['odd_visitante'])
-                            if row['time_casa'] == clube_nome_fantasia:
-                                prob_vitoria = (1/row['odd_casa']) / soma_inverso * 100
-                            else:
-                                prob_vitoria = (1/row['odd_visitante']) / soma_inverso * 100
-                            break
-            
-            nome = df_atleta.iloc[0]['apelido']
-            
-            resultados.append({
-                'Clube': clube_nome,
-                'Pos': 'GOL',
-                'Nome': nome,
-                'Jogos': jogos,
-                'Minutos': minutos_total,
-                'Minutos Titular': minutos_titular,
-                'Média': round(media, 2),
-                'M. Básica': round(media_basica, 2),
-                'Prob. de SG (%)': round(prob_sg, 1),
-                'Prob. Vitória (%)': round(prob_vitoria, 1)
-            })
-        
-        df_resultado = pd.DataFrame(resultados)
-        df_resultado = df_resultado.sort_values('Prob. Vitória (%)', ascending=False)
-        
         return df_resultado, None
-        
+
     except Exception as e:
         return None, f"Erro ao gerar análise de goleiros: {str(e)}"
 
@@ -319,113 +258,18 @@ def analise_atacantes(ano=config.CURRENT_YEAR, clubes_filtro=None):
     Análise de atacantes similar à BIA:
     - Jogos, Minutos (estimado), Minutos Titular (estimado)
     - Média, Média Básica
-    - Probabilidade de Ataque
+    - Probabilidade de Ataque (jogos com gol ou assistência)
     - Probabilidade de Vitória
     """
-    if not os.path.exists(HISTORICAL_PLAYERS_PATH):
+    if not tabela_disponivel('jogadores'):
         return None, "Arquivo de histórico de jogadores não encontrado."
-    
+
     try:
-        df_historico = pd.read_csv(HISTORICAL_PLAYERS_PATH)
-        clubes_map = carregar_clubes()
-        clubes_map_fantasia = carregar_clubes_nome_fantasia()  # Para matching com odds
-        
-        # Filtra por ano e posição (atacante = 'ata' ou 5)
-        mask_posicao = (df_historico['posicao_id'] == 'ata') | (df_historico['posicao_id'] == 5)
-        df_atacantes = df_historico[
-            (df_historico['ano'] == ano) & mask_posicao
-        ].copy()
-        
-        if df_atacantes.empty:
+        df_resultado = _analise_posicao(ano, 5, clubes_filtro, 'Prob. Ataque (%)', 'jogos_participacao')
+        if df_resultado is None:
             return None, f"Nenhum dado de atacantes encontrado para o ano {ano}."
-        
-        # Filtra clubes se especificado
-        if clubes_filtro:
-            clubes_id_filtro = [k for k, v in clubes_map.items() if v in clubes_filtro]
-            df_atacantes = df_atacantes[df_atacantes['clube_id'].isin(clubes_id_filtro)].copy()
-        
-        resultados = []
-        
-        for atleta_id in df_atacantes['atleta_id'].unique():
-            df_atleta = df_atacantes[df_atacantes['atleta_id'] == atleta_id].copy()
-            
-            # Estima minutos
-            df_atleta['minutos_estimado'] = df_atleta['pontuacao'].apply(lambda x: 90 if x > 0 else 0)
-            df_atleta['minutos_titular_estimado'] = df_atleta.apply(
-                lambda row: 90 if (row['pontuacao'] > 0 and 
-                                   str(row.get('status_id', '')).lower() in ['provável', 'provavel']) else 0, 
-                axis=1
-            )
-            
-            jogos = len(df_atleta[df_atleta['pontuacao'] > 0])
-            minutos_total = df_atleta['minutos_estimado'].sum()
-            minutos_titular = df_atleta['minutos_titular_estimado'].sum()
-            
-            # Médias
-            media = df_atleta['pontuacao'].mean()
-            media_basica = df_atleta[df_atleta['pontuacao'] > 0]['pontuacao'].mean()
-            
-            # Probabilidade de ataque (chance de marcar/assistir)
-            g_col = df_atleta['G'] if 'G' in df_atleta.columns else pd.Series([0] * len(df_atleta))
-            a_col = df_atleta['A'] if 'A' in df_atleta.columns else pd.Series([0] * len(df_atleta))
-            jogos_com_gol_ou_assist = len(df_atleta[(g_col > 0) | (a_col > 0)])
-            prob_ataque = (jogos_com_gol_ou_assist / jogos * 100) if jogos > 0 else 0
-            
-            # Probabilidade de vitória do time (usa odds da rodada atual)
-            clube_id = df_atleta.iloc[0]['clube_id']
-            clube_nome = clubes_map.get(clube_id, f'Clube {clube_id}')
-            clube_nome_fantasia = clubes_map_fantasia.get(clube_id, '')
-            prob_vitoria = 50  # Default
-            
-            # Tenta primeiro odds_rodada.csv
-            odds_rodada_path = os.path.join(DATA_DIR, "odds_rodada.csv")
-            df_odds = None
-            
-            if os.path.exists(odds_rodada_path):
-                df_odds = pd.read_csv(odds_rodada_path)
-                df_odds = df_odds[df_odds['ano'] == ano].copy()
-            
-            # Se não tiver, tenta historico_odds.csv (rodada mais recente)
-            if df_odds is None or df_odds.empty:
-                if os.path.exists(ODDS_PATH):
-                    df_odds = pd.read_csv(ODDS_PATH)
-                    df_odds = df_odds[df_odds['ano'] == ano].copy()
-                    if not df_odds.empty and 'rodada_id' in df_odds.columns:
-                        rodada_max = df_odds['rodada_id'].max()
-                        df_odds = df_odds[df_odds['rodada_id'] == rodada_max].copy()
-            
-            # Busca odds do clube usando nome_fantasia
-            if df_odds is not None and not df_odds.empty:
-                for _, row in df_odds.iterrows():
-                    if row['time_casa'] == clube_nome_fantasia or row['time_visitante'] == clube_nome_fantasia:
-                        if pd.notna(row['odd_casa']) and pd.notna(row['odd_empate']) and pd.notna(row['odd_visitante']):
-                            soma_inverso = (1/row['odd_casa']) + (1/row['odd_empate']) + (1/row['odd_visitante'])
-                            if row['time_casa'] == clube_nome_fantasia:
-                                prob_vitoria = (1/row['odd_casa']) / soma_inverso * 100
-                            else:
-                                prob_vitoria = (1/row['odd_visitante']) / soma_inverso * 100
-                            break
-            
-            nome = df_atleta.iloc[0]['apelido']
-            
-            resultados.append({
-                'Clube': clube_nome,
-                'Pos': 'ATA',
-                'Nome': nome,
-                'Jogos': jogos,
-                'Minutos': minutos_total,
-                'Minutos Titular': minutos_titular,
-                'Média': round(media, 2),
-                'M. Básica': round(media_basica, 2),
-                'Prob. Ataque (%)': round(prob_ataque, 1),
-                'Prob. Vitória (%)': round(prob_vitoria, 1)
-            })
-        
-        df_resultado = pd.DataFrame(resultados)
-        df_resultado = df_resultado.sort_values('Prob. Vitória (%)', ascending=False)
-        
         return df_resultado, None
-        
+
     except Exception as e:
         return None, f"Erro ao gerar análise de atacantes: {str(e)}"
 
@@ -438,96 +282,32 @@ def analise_recorrencia(ano=config.CURRENT_YEAR, clubes_filtro=None, posicao_fil
     - Máximo de jogos nos últimos 3/5
     - Percentual de jogos disputados
     """
-    if not os.path.exists(HISTORICAL_PLAYERS_PATH):
+    if not tabela_disponivel('jogadores'):
         return None, "Arquivo de histórico de jogadores não encontrado."
-    
+
     try:
-        df_historico = pd.read_csv(HISTORICAL_PLAYERS_PATH)
-        clubes_map = carregar_clubes()
-        
-        # Filtra por ano
-        df_players = df_historico[df_historico['ano'] == ano].copy()
-        
-        if df_players.empty:
+        df = _estatisticas_atletas(ano, clubes_filtro=clubes_filtro, posicao_filtro=posicao_filtro)
+        df = df[df['jogos'] > 0]
+
+        if df.empty:
             return None, f"Nenhum dado encontrado para o ano {ano}."
-        
-        # Filtra clubes se especificado
-        if clubes_filtro:
-            clubes_id_filtro = [k for k, v in clubes_map.items() if v in clubes_filtro]
-            df_players = df_players[df_players['clube_id'].isin(clubes_id_filtro)].copy()
-        
-        # Filtra posição se especificado
-        if posicao_filtro:
-            # Mapeia número para string
-            pos_map = {1: 'gol', 2: 'lat', 3: 'zag', 4: 'mei', 5: 'ata', 6: 'tec'}
-            pos_string = pos_map.get(posicao_filtro, posicao_filtro)
-            # Aceita tanto string quanto número
-            mask_pos = (df_players['posicao_id'] == pos_string) | (df_players['posicao_id'] == posicao_filtro)
-            df_players = df_players[mask_pos].copy()
-        
-        resultados = []
-        
-        for atleta_id in df_players['atleta_id'].unique():
-            df_atleta = df_players[df_players['atleta_id'] == atleta_id].copy()
-            
-            # Ordena por rodada
-            df_atleta = df_atleta.sort_values('rodada').copy()
-            
-            # Filtra apenas jogos onde jogou (pontuacao > 0)
-            df_atleta_jogou = df_atleta[df_atleta['pontuacao'] > 0].copy()
-            
-            if len(df_atleta_jogou) == 0:
-                continue
-            
-            # Últimos 3 e 5 jogos
-            ultimos_3 = df_atleta_jogou.tail(3)
-            ultimos_5 = df_atleta_jogou.tail(5)
-            
-            # Médias
-            media_3 = ultimos_3['pontuacao'].mean() if len(ultimos_3) > 0 else 0
-            media_5 = ultimos_5['pontuacao'].mean() if len(ultimos_5) > 0 else 0
-            
-            # Máximo de jogos
-            max_3 = len(ultimos_3)
-            max_5 = len(ultimos_5)
-            
-            # Percentual de jogos disputados
-            total_rodadas = df_atleta['rodada'].nunique()
-            jogos_disputados = len(df_atleta_jogou)
-            perc_disputados = (jogos_disputados / total_rodadas * 100) if total_rodadas > 0 else 0
-            
-            # Últimos 3 jogos (%)
-            ultimas_3_rodadas = df_atleta.tail(3)
-            jogou_ultimas_3 = len(ultimas_3_rodadas[ultimas_3_rodadas['pontuacao'] > 0])
-            perc_ultimas_3 = (jogou_ultimas_3 / 3 * 100) if len(ultimas_3_rodadas) > 0 else 0
-            
-            nome = df_atleta.iloc[0].get('apelido', 'N/A')
-            clube_id = df_atleta.iloc[0].get('clube_id', 0)
-            clube_nome = clubes_map.get(clube_id, f'Clube {clube_id}')
-            posicao = df_atleta.iloc[0].get('posicao_id', 'N/A')
-            status = str(df_atleta.iloc[-1].get('status_id', 'N/A'))  # Status mais recente
-            
-            # Mapeia posição
-            pos_map = {1: 'GOL', 2: 'LAT', 3: 'ZAG', 4: 'MEI', 5: 'ATA', 6: 'TEC'}
-            pos_nome = pos_map.get(posicao, f'POS {posicao}')
-            
-            resultados.append({
-                'Clube': clube_nome,
-                'Jogador': f"{nome} {pos_nome}",
-                'Status': status,
-                '3 Jogos': round(media_3, 2),
-                '5 Jogos': round(media_5, 2),
-                'MAX 3': max_3,
-                'MAX 5': max_5,
-                'Últimos 3 Jogos (%)': round(perc_ultimas_3, 2),
-                '% D': round(perc_disputados, 1)
-            })
-        
-        df_resultado = pd.DataFrame(resultados)
+
+        df_resultado = pd.DataFrame({
+            'Clube': df['clube'],
+            'Jogador': df['nome'] + ' ' + df['pos'],
+            'Status': df['status'],
+            '3 Jogos': df['media_3'].round(2),
+            '5 Jogos': df['media_5'].round(2),
+            'MAX 3': df['max_3'],
+            'MAX 5': df['max_5'],
+            # Das 3 rodadas mais recentes do atleta, em quantas jogou
+            'Últimos 3 Jogos (%)': (df['jogou_ultimas_3'] / 3 * 100).round(2),
+            '% D': (df['jogos'] / df['rodadas'] * 100).round(1),
+        })
         df_resultado = df_resultado.sort_values('3 Jogos', ascending=False)
-        
+
         return df_resultado, None
-        
+
     except Exception as e:
         return None, f"Erro ao gerar análise de recorrência: {str(e)}"
 
@@ -545,125 +325,40 @@ def analise_participacoes_detalhada(ano=config.CURRENT_YEAR, clubes_filtro=None,
     - GOLS: Total de gols
     - G + A: Gols + Assistências
     """
-    if not os.path.exists(HISTORICAL_PLAYERS_PATH):
+    if not tabela_disponivel('jogadores'):
         return None, "Arquivo de histórico de jogadores não encontrado."
-    
+
     try:
-        df_historico = pd.read_csv(HISTORICAL_PLAYERS_PATH)
-        clubes_map = carregar_clubes()
-        
-        # Filtra por ano
-        df_players = df_historico[df_historico['ano'] == ano].copy()
-        
-        if df_players.empty:
+        df = _estatisticas_atletas(ano, clubes_filtro, posicao_filtro, status_filtro)
+        df = df[(df['jogos'] > 0) & (df['jogos'] >= min_jogos)]
+
+        if df.empty:
             return None, f"Nenhum dado encontrado para o ano {ano}."
-        
-        # Filtra clubes se especificado
-        if clubes_filtro:
-            clubes_id_filtro = [k for k, v in clubes_map.items() if v in clubes_filtro]
-            df_players = df_players[df_players['clube_id'].isin(clubes_id_filtro)].copy()
-        
-        # Filtra posição se especificado
-        if posicao_filtro:
-            pos_map = {1: 'gol', 2: 'lat', 3: 'zag', 4: 'mei', 5: 'ata', 6: 'tec'}
-            pos_string = pos_map.get(posicao_filtro, posicao_filtro)
-            mask_pos = (df_players['posicao_id'] == pos_string) | (df_players['posicao_id'] == posicao_filtro)
-            df_players = df_players[mask_pos].copy()
-        
-        # Filtra status se especificado
-        if status_filtro:
-            df_players['status_normalizado'] = df_players['status_id'].astype(str).str.lower()
-            status_filtro_lower = [s.lower() if isinstance(s, str) else str(s).lower() for s in status_filtro]
-            df_players = df_players[df_players['status_normalizado'].isin(status_filtro_lower)].copy()
-        
-        resultados = []
-        
-        for atleta_id in df_players['atleta_id'].unique():
-            df_atleta = df_players[df_players['atleta_id'] == atleta_id].copy()
-            
-            # Filtra apenas jogos disputados (pontuacao > 0)
-            df_atleta_jogou = df_atleta[df_atleta['pontuacao'] > 0].copy()
-            
-            jogos = len(df_atleta_jogou)
-            
-            # Filtra por mínimo de jogos
-            if jogos < min_jogos:
-                continue
-            
-            if jogos == 0:
-                continue
-            
-            # MÉDIA: Média geral (inclui jogos com 0 pontos)
-            media = df_atleta['pontuacao'].mean()
-            
-            # M. BASICA: Média apenas dos jogos disputados (sem bônus de capitão, etc)
-            media_basica = df_atleta_jogou['pontuacao'].mean()
-            
-            # ASSISTENCIAS: Total de assistências
-            assistencias_total = df_atleta_jogou['A'].sum() if 'A' in df_atleta_jogou.columns and pd.notna(df_atleta_jogou['A']).any() else 0
-            
-            # GOLS: Total de gols
-            gols_total = df_atleta_jogou['G'].sum() if 'G' in df_atleta_jogou.columns and pd.notna(df_atleta_jogou['G']).any() else 0
-            
-            # G + A: Gols + Assistências
-            g_mais_a = gols_total + assistencias_total
-            
-            # XA/JOGO: Expected Assists por jogo (aproximado)
-            # Aproximação: XA ≈ Assistências + (Finalizações Certas * 0.1)
-            fs_total = df_atleta_jogou['FS'].sum() if 'FS' in df_atleta_jogou.columns and pd.notna(df_atleta_jogou['FS']).any() else 0
-            xa_aproximado = assistencias_total + (fs_total * 0.1)
-            xa_por_jogo = xa_aproximado / jogos if jogos > 0 else 0
-            
-            # XG/JOGO: Expected Goals por jogo (aproximado)
-            # Aproximação: XG ≈ Gols + (Finalizações Certas * 0.15) + (Finalizações Fora * 0.05)
-            ff_total = df_atleta_jogou['FF'].sum() if 'FF' in df_atleta_jogou.columns and pd.notna(df_atleta_jogou['FF']).any() else 0
-            xg_aproximado = gols_total + (fs_total * 0.15) + (ff_total * 0.05)
-            xg_por_jogo = xg_aproximado / jogos if jogos > 0 else 0
-            
-            # ESCANTEIOS/JOGO: Escanteios por jogo
-            # Nota: O Cartola não tem scout de escanteios diretamente
-            # Aproximação: Para meias/atacantes, podemos usar uma estimativa baseada em finalizações
-            # ou deixar como 0.00 se não tivermos dados
-            escanteios_por_jogo = 0.00  # Não temos dados de escanteios no Cartola
-            
-            # Dados do jogador
-            nome = df_atleta.iloc[0].get('apelido', 'N/A')
-            clube_id = df_atleta.iloc[0].get('clube_id', 0)
-            clube_nome = clubes_map.get(clube_id, f'Clube {clube_id}')
-            posicao = df_atleta.iloc[0].get('posicao_id', 'N/A')
-            status_atual = str(df_atleta.iloc[-1].get('status_id', 'N/A'))
-            
-            # Mapeia posição
-            pos_map_num = {1: 'GOL', 2: 'LAT', 3: 'ZAG', 4: 'MEI', 5: 'ATA', 6: 'TEC'}
-            pos_map_str = {'gol': 'GOL', 'lat': 'LAT', 'zag': 'ZAG', 'mei': 'MEI', 'ata': 'ATA', 'tec': 'TEC'}
-            
-            if isinstance(posicao, (int, float)) and not pd.isna(posicao):
-                pos_nome = pos_map_num.get(int(posicao), f'POS {int(posicao)}')
-            else:
-                pos_str = str(posicao).lower()
-                pos_nome = pos_map_str.get(pos_str, str(posicao).upper())
-            
-            resultados.append({
-                'Clube': clube_nome,
-                'Pos': pos_nome,
-                'Nome': nome,
-                'Status': status_atual,
-                'Jogos': jogos,
-                'Média': round(media, 2),
-                'M. Básica': round(media_basica, 2),
-                'Escanteios/Jogo': round(escanteios_por_jogo, 2),
-                'XA/Jogo': round(xa_por_jogo, 2),
-                'XG/Jogo': round(xg_por_jogo, 2),
-                'Assistências': int(assistencias_total),
-                'Gols': int(gols_total),
-                'G + A': int(g_mais_a)
-            })
-        
-        df_resultado = pd.DataFrame(resultados)
+
+        # XA ≈ Assistências + (Finalizações Certas * 0.1)
+        # XG ≈ Gols + (Finalizações Certas * 0.15) + (Finalizações Fora * 0.05)
+        xa = df['assistencias'] + df['fs'] * 0.1
+        xg = df['gols'] + df['fs'] * 0.15 + df['ff'] * 0.05
+
+        df_resultado = pd.DataFrame({
+            'Clube': df['clube'],
+            'Pos': df['pos'],
+            'Nome': df['nome'],
+            'Status': df['status'],
+            'Jogos': df['jogos'],
+            'Média': df['media'].round(2),
+            'M. Básica': df['media_basica'].round(2),
+            'Escanteios/Jogo': 0.00,  # O Cartola não tem scout de escanteios
+            'XA/Jogo': (xa / df['jogos']).round(2),
+            'XG/Jogo': (xg / df['jogos']).round(2),
+            'Assistências': df['assistencias'].astype(int),
+            'Gols': df['gols'].astype(int),
+            'G + A': (df['gols'] + df['assistencias']).astype(int),
+        })
         df_resultado = df_resultado.sort_values('G + A', ascending=False)
-        
+
         return df_resultado, None
-        
+
     except Exception as e:
         return None, f"Erro ao gerar análise de participações detalhada: {str(e)}"
 
@@ -677,96 +372,31 @@ def analise_participacoes(ano=config.CURRENT_YEAR, clubes_filtro=None, posicao_f
     - Status atual
     - Posição e clube
     """
-    if not os.path.exists(HISTORICAL_PLAYERS_PATH):
+    if not tabela_disponivel('jogadores'):
         return None, "Arquivo de histórico de jogadores não encontrado."
-    
+
     try:
-        df_historico = pd.read_csv(HISTORICAL_PLAYERS_PATH)
-        clubes_map = carregar_clubes()
-        
-        # Filtra por ano
-        df_players = df_historico[df_historico['ano'] == ano].copy()
-        
-        if df_players.empty:
+        df = _estatisticas_atletas(ano, clubes_filtro, posicao_filtro, status_filtro)
+
+        if df.empty:
             return None, f"Nenhum dado encontrado para o ano {ano}."
-        
-        # Filtra clubes se especificado
-        if clubes_filtro:
-            clubes_id_filtro = [k for k, v in clubes_map.items() if v in clubes_filtro]
-            df_players = df_players[df_players['clube_id'].isin(clubes_id_filtro)].copy()
-        
-        # Filtra posição se especificado
-        if posicao_filtro:
-            pos_map = {1: 'gol', 2: 'lat', 3: 'zag', 4: 'mei', 5: 'ata', 6: 'tec'}
-            pos_string = pos_map.get(posicao_filtro, posicao_filtro)
-            mask_pos = (df_players['posicao_id'] == pos_string) | (df_players['posicao_id'] == posicao_filtro)
-            df_players = df_players[mask_pos].copy()
-        
-        # Filtra status se especificado
-        if status_filtro:
-            # Normaliza status para comparação
-            df_players['status_normalizado'] = df_players['status_id'].astype(str).str.lower()
-            status_filtro_lower = [s.lower() if isinstance(s, str) else str(s).lower() for s in status_filtro]
-            df_players = df_players[df_players['status_normalizado'].isin(status_filtro_lower)].copy()
-        
-        # Conta total de rodadas disponíveis no ano
-        total_rodadas_ano = df_players['rodada'].nunique()
-        
-        resultados = []
-        
-        for atleta_id in df_players['atleta_id'].unique():
-            df_atleta = df_players[df_players['atleta_id'] == atleta_id].copy()
-            
-            # Ordena por rodada
-            df_atleta = df_atleta.sort_values('rodada').copy()
-            
-            # Jogos disputados (participações) - quando pontuacao > 0
-            jogos_disputados = len(df_atleta[df_atleta['pontuacao'] > 0])
-            
-            # Total de rodadas que o jogador apareceu no mercado
-            rodadas_no_mercado = df_atleta['rodada'].nunique()
-            
-            # Percentual de participação (jogos disputados / rodadas no mercado)
-            perc_participacao = (jogos_disputados / rodadas_no_mercado * 100) if rodadas_no_mercado > 0 else 0
-            
-            # Percentual de participação no ano (jogos disputados / total de rodadas do ano)
-            perc_participacao_ano = (jogos_disputados / total_rodadas_ano * 100) if total_rodadas_ano > 0 else 0
-            
-            # Status mais recente
-            status_atual = str(df_atleta.iloc[-1].get('status_id', 'N/A'))
-            
-            # Dados do jogador
-            nome = df_atleta.iloc[0].get('apelido', 'N/A')
-            clube_id = df_atleta.iloc[0].get('clube_id', 0)
-            clube_nome = clubes_map.get(clube_id, f'Clube {clube_id}')
-            posicao = df_atleta.iloc[0].get('posicao_id', 'N/A')
-            
-            # Mapeia posição (aceita número ou string)
-            pos_map_num = {1: 'GOL', 2: 'LAT', 3: 'ZAG', 4: 'MEI', 5: 'ATA', 6: 'TEC'}
-            pos_map_str = {'gol': 'GOL', 'lat': 'LAT', 'zag': 'ZAG', 'mei': 'MEI', 'ata': 'ATA', 'tec': 'TEC'}
-            
-            if isinstance(posicao, (int, float)) and not pd.isna(posicao):
-                pos_nome = pos_map_num.get(int(posicao), f'POS {int(posicao)}')
-            else:
-                pos_str = str(posicao).lower()
-                pos_nome = pos_map_str.get(pos_str, str(posicao).upper())
-            
-            resultados.append({
-                'Clube': clube_nome,
-                'Pos': pos_nome,
-                'Nome': nome,
-                'Status': status_atual,
-                'Jogos': jogos_disputados,
-                'Rodadas no Mercado': rodadas_no_mercado,
-                'Participação (%)': round(perc_participacao, 1),
-                'Participação no Ano (%)': round(perc_participacao_ano, 1),
-            })
-        
-        df_resultado = pd.DataFrame(resultados)
+
+        df_resultado = pd.DataFrame({
+            'Clube': df['clube'],
+            'Pos': df['pos'],
+            'Nome': df['nome'],
+            'Status': df['status'],
+            'Jogos': df['jogos'],
+            'Rodadas no Mercado': df['rodadas'],
+            # Jogos disputados / rodadas em que o atleta apareceu no mercado
+            'Participação (%)': (df['jogos'] / df['rodadas'] * 100).round(1),
+            # Jogos disputados / total de rodadas do ano
+            'Participação no Ano (%)': (df['jogos'] / df['rodadas_ano'] * 100).round(1),
+        })
         df_resultado = df_resultado.sort_values('Participação (%)', ascending=False)
-        
+
         return df_resultado, None
-        
+
     except Exception as e:
         return None, f"Erro ao gerar análise de participações: {str(e)}"
 
@@ -854,10 +484,10 @@ def analise_combinada_cartola_fbref(ano=config.CURRENT_YEAR, clubes_filtro=None,
             return None, "Arquivo de dados do FBref não encontrado. Execute o script de coleta primeiro."
         
         # Carrega dados do Cartola
-        if not os.path.exists(HISTORICAL_PLAYERS_PATH):
+        if not tabela_disponivel('jogadores'):
             return None, "Arquivo de histórico de jogadores não encontrado."
         
-        df_cartola = pd.read_csv(HISTORICAL_PLAYERS_PATH, low_memory=False)
+        df_cartola = carregar_tabela('jogadores', anos=[ano])
         # historico_2025.csv já está filtrado para 2025, mas mantém filtro para compatibilidade
         if 'ano' in df_cartola.columns:
             df_cartola = df_cartola[df_cartola['ano'] == ano].copy()
@@ -869,7 +499,7 @@ def analise_combinada_cartola_fbref(ano=config.CURRENT_YEAR, clubes_filtro=None,
         df_cartola['clube_id'] = pd.to_numeric(df_cartola['clube_id'], errors='coerce').fillna(0).astype(int)
         
         # Carrega dados do FBref (arquivo já está limpo, sem cabeçalhos duplicados)
-        df_fbref = pd.read_csv(FBREF_JOGADORES_PATH, low_memory=False)
+        df_fbref = ler_csv(FBREF_JOGADORES_PATH, low_memory=False)
         
         # Remove linhas vazias ou inválidas
         if 'Player' in df_fbref.columns:
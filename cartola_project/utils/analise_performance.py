@@ -1,6 +1,5 @@
 import pandas as pd
 import os
-import json
 import streamlit as st
 import numpy as np
 from sklearn.metrics import mean_squared_error
@@ -8,11 +7,12 @@ from utils.otimizador import otimizar_escalacao
 from utils.modelagem import prever_pontuacao
 from utils.feature_engineering import preparar_features_historicas
 from utils.config import config
+from utils.arquivos import salvar_csv
+from utils.carregamento import carregar_historico_jogadores
+from utils.acesso_dados import HISTORICO_USUARIO_PATH, carregar_historico_usuario
 
 # Caminhos baseados no config
-HISTORICAL_DATA_PATH = config.HISTORICAL_DATA_PATH
-USER_HISTORY_PATH = os.path.join(os.path.dirname(config.RAW_DATA_PATH), "historico_vini.csv")
-CLUBS_DATA_PATH = config.CLUBS_DATA_PATH
+USER_HISTORY_PATH = HISTORICO_USUARIO_PATH
 TIME_IA_34_PATH = os.path.join(os.path.dirname(config.RAW_DATA_PATH), "time_ianova_rodada_34.csv")
 
 # Força recarregamento
@@ -21,48 +21,15 @@ VERSION = "1.8_Corrected_Price_Leakage"
 @st.cache_data
 def carregar_dados_historicos():
     """Carrega e prepara os dados históricos para análise."""
-    if not os.path.exists(HISTORICAL_DATA_PATH):
-        return None
-    
     try:
-        df_hist = pd.read_csv(HISTORICAL_DATA_PATH, low_memory=False)
-        
-        # Tratamento de tipos e preenchimento básico
-        df_hist['ano'] = pd.to_numeric(df_hist['ano'], errors='coerce')
-        df_hist['rodada'] = pd.to_numeric(df_hist['rodada'], errors='coerce')
-        df_hist['atleta_id'] = pd.to_numeric(df_hist['atleta_id'], errors='coerce')
-        df_hist['pontuacao'] = pd.to_numeric(df_hist['pontuacao'], errors='coerce').fillna(0)
-        df_hist['preco_num'] = pd.to_numeric(df_hist['preco_num'], errors='coerce').fillna(0)
-        df_hist['variacao_num'] = pd.to_numeric(df_hist['variacao_num'], errors='coerce').fillna(0)
-        
-        # --- TRATAMENTO DA POSIÇÃO (CRÍTICO) ---
-        df_hist['posicao_id'] = pd.to_numeric(df_hist['posicao_id'], errors='coerce')
-        
-        if df_hist['posicao_id'].isnull().any():
-            map_str_to_id = {
-                'gol': 1, 'lat': 2, 'zag': 3, 'mei': 4, 'ata': 5, 'tec': 6,
-                'Goleiro': 1, 'Lateral': 2, 'Zagueiro': 3, 'Meia': 4, 'Atacante': 5, 'Técnico': 6
-            }
-            mask_nan = df_hist['posicao_id'].isnull()
-            raw_pos = pd.read_csv(HISTORICAL_DATA_PATH, usecols=['posicao_id'])['posicao_id']
-            mapped_values = raw_pos.map(map_str_to_id)
-            df_hist.loc[mask_nan, 'posicao_id'] = mapped_values[mask_nan]
-            
-        df_hist['posicao_id'] = df_hist['posicao_id'].fillna(0).astype(int)
-        
-        posicao_map = {1: "Goleiro", 2: "Lateral", 3: "Zagueiro", 4: "Meia", 5: "Atacante", 6: "Técnico"}
-        df_hist['posicao'] = df_hist['posicao_id'].map(posicao_map).fillna("Outros")
+        # Tipos compactos, posição normalizada e nomes de posição/clube vêm do carregador central
+        df_hist = carregar_historico_jogadores(com_nomes=True)
+        if df_hist is None:
+            return None
         
-        # Mapeamento de Clubes
-        df_hist['clube_id'] = pd.to_numeric(df_hist['clube_id'], errors='coerce').fillna(0).astype(int)
-        
-        if os.path.exists(CLUBS_DATA_PATH):
-            with open(CLUBS_DATA_PATH, 'r', encoding='utf8') as f:
-                clubes_map = json.load(f)
-                id_to_name = {int(k): v['nome_fantasia'] for k, v in clubes_map.items()}
-                df_hist['clube'] = df_hist['clube_id'].map(id_to_name).fillna("Desconhecido")
-        else:
-            df_hist['clube'] = "Desconhecido"
+        for col in ['pontuacao', 'preco_num', 'variacao_num']:
+            if col in df_hist.columns:
+                df_hist[col] = df_hist[col].fillna(0)
             
         return df_hist
     except Exception as e:
@@ -161,7 +128,7 @@ def gerar_dados_comparativos(ano=None):
         return None, "Arquivo de histórico do usuário não encontrado.", None, None
         
     try:
-        df_user = pd.read_csv(USER_HISTORY_PATH, sep=';')
+        df_user = carregar_historico_usuario()
         df_user['rodada'] = pd.to_numeric(df_user['rodada'], errors='coerce')
         df_user = df_user.dropna(subset=['rodada', 'pontuacao'])
         df_user['rodada'] = df_user['rodada'].astype(int)
@@ -374,7 +341,7 @@ def gerar_dados_comparativos(ano=None):
                         # Reordena colunas para salvar (sem rodada e capitao)
                         cols_salvar = ['C', 'atleta_id', 'apelido', 'posicao', 'clube', 'pontuacao_prevista', 'Real']
                         cols_salvar = [c for c in cols_salvar if c in df_salvar.columns]
-                        df_salvar[cols_salvar].to_csv(TIME_IA_34_PATH, index=False, encoding='utf-8-sig')
+                        salvar_csv(df_salvar[cols_salvar], TIME_IA_34_PATH, index=False, encoding='utf-8-sig')
                         print(f"✅ Arquivo time_ianova_rodada_34.csv salvo com sucesso com {len(df_salvar)} jogadores!")
                     except Exception as e:
                         print(f"⚠️ Erro ao salvar arquivo time_ianova_rodada_34.csv: {e}")
@@ -1,13 +1,14 @@
 import pandas as pd
 import os
 import numpy as np
+from utils.armazenamento import carregar_tabela, tabela_disponivel, anos_disponiveis
+from utils.arquivos import salvar_csv
+from utils.acesso_dados import mapa_clubes
 
 # --- CAMINHOS ---
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 DATA_DIR = os.path.join(PROJECT_ROOT, "data")
-HISTORICAL_MATCHES_PATH = os.path.join(DATA_DIR, "historico_partidas.csv")
 TEAM_STATS_PATH = os.path.join(DATA_DIR, "estatisticas_times.csv")
-CLUBS_DATA_PATH = os.path.join(DATA_DIR, "clubes.json")
 
 def gerar_estatisticas_times():
     """
@@ -15,18 +16,16 @@ def gerar_estatisticas_times():
     """
     print("Gerando estatísticas consolidadas dos times...")
     
-    if not os.path.exists(HISTORICAL_MATCHES_PATH):
-        print(f"Erro: Arquivo {HISTORICAL_MATCHES_PATH} não encontrado.")
+    if not tabela_disponivel('partidas'):
+        print("Erro: Histórico de partidas não encontrado.")
         return None
 
     try:
-        df_partidas = pd.read_csv(HISTORICAL_MATCHES_PATH)
-        
-        # Filtra para usar os últimos 2 anos (ano atual e anterior) para estatísticas mais robustas
-        ano_atual = df_partidas['ano'].max()
+        # Usa os últimos 2 anos (ano atual e anterior) para estatísticas mais robustas; só essas partições são lidas
+        ano_atual = max(anos_disponiveis('partidas'))
         anos_considerados = [ano_atual, ano_atual - 1]
         print(f"Calculando estatísticas com base nos anos: {anos_considerados}")
-        df_partidas = df_partidas[df_partidas['ano'].isin(anos_considerados)].copy()
+        df_partidas = carregar_tabela('partidas', anos=anos_considerados)
         
         if df_partidas.empty:
             print(f"Aviso: Nenhum dado de partida encontrado para os anos {anos_considerados}.")
@@ -103,15 +102,11 @@ def gerar_estatisticas_times():
         df_stats = pd.DataFrame(dados_finais)
         
         # Adicionar nome do clube se disponível
-        if os.path.exists(CLUBS_DATA_PATH):
-            import json
-            with open(CLUBS_DATA_PATH, 'r', encoding='utf8') as f:
-                clubes = json.load(f)
-                # O json mapeia ID string -> dados. Converter keys para int.
-                clubes_map = {int(k): v['nome'] for k, v in clubes.items()}
-                df_stats['clube_nome'] = df_stats['clube_id'].map(clubes_map)
+        clubes_map = mapa_clubes('nome')
+        if clubes_map:
+            df_stats['clube_nome'] = df_stats['clube_id'].map(clubes_map)
         
-        df_stats.to_csv(TEAM_STATS_PATH, index=False)
+        salvar_csv(df_stats, TEAM_STATS_PATH, index=False)
         print(f"Estatísticas de times salvas em {TEAM_STATS_PATH}")
         return df_stats
 
@@ -0,0 +1,407 @@
+import pandas as pd
+import os
+import glob
+import shutil
+import hashlib
+import time
+import tempfile
+from utils.config import config, logger
+from utils.arquivos import salvar_csv, trava_arquivo
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    PYARROW_DISPONIVEL = True
+except ImportError:
+    PYARROW_DISPONIVEL = False
+
+# Tabelas do histórico: CSV legado (fallback/migração) e colunas de partição no armazém Parquet
+TABELAS = {
+    'jogadores': {'csv': config.HISTORICAL_DATA_PATH, 'particoes': ['ano', 'rodada']},
+    'partidas': {'csv': config.HISTORICAL_MATCHES_PATH, 'particoes': ['ano', 'rodada']},
+    'odds': {'csv': config.ODDS_HISTORY_PATH, 'particoes': ['ano', 'rodada_id']},
+}
+
+# CSVs por temporada (historico_2025.csv, historico_2026.csv...) que também compõem 'jogadores'
+CSV_JOGADORES_POR_ANO = os.path.join(config.DATA_DIR, "historico_{ano}.csv")
+
+# Tipos fixos na gravação para que todas as partições tenham o mesmo esquema
+TIPOS_GRAVACAO = {
+    'jogadores': {'atleta_id': 'int32', 'clube_id': 'str', 'apelido': 'str',
+                  'pontuacao': 'float32', 'preco_num': 'float32', 'variacao_num': 'float32', 'media_num': 'float32'},
+    'partidas': {'mandante_id': 'int32', 'visitante_id': 'int32', 'placar_mandante': 'float64', 'placar_visitante': 'float64'},
+    'odds': {'time_casa': 'str', 'time_visitante': 'str', 'odd_casa': 'float32', 'odd_empate': 'float32', 'odd_visitante': 'float32'},
+}
+
+# Segmentos substituídos só são removidos depois deste tempo, para que leitores que já listaram
+# os arquivos da partição (snapshot) consigam terminar a leitura
+CARENCIA_COMPACTACAO_SEG = 300
+
+# Memória dos esquemas unificados: tabela -> (assinatura, esquema)
+_ESQUEMAS = {}
+
+def caminho_tabela(nome):
+    return os.path.join(config.WAREHOUSE_DIR, nome)
+
+def _arquivos_tabela(nome):
+    return sorted(glob.glob(os.path.join(caminho_tabela(nome), "**", "*.parquet"), recursive=True))
+
+def _nome_segmento(extensao):
+    """Nome de segmento imutável; o timestamp de largura fixa faz a ordem alfabética ser a cronológica."""
+    return f"seg-{time.time_ns():020d}{extensao}"
+
+def _ordem_segmento(caminho):
+    # Arquivos 'parte-*' (gravações anteriores aos segmentos) são sempre os mais antigos
+    nome = os.path.basename(caminho)
+    return (nome.startswith('seg-'), nome)
+
+def _segmentos_vigentes(nome):
+    """
+    Segmento mais recente de cada partição do armazém. Regravar uma rodada apenas acrescenta
+    um segmento novo; os anteriores ficam substituídos até a compactação removê-los.
+    """
+    por_particao = {}
+    for caminho in _arquivos_tabela(nome):
+        por_particao.setdefault(os.path.dirname(caminho), []).append(caminho)
+    return sorted(max(arquivos, key=_ordem_segmento) for arquivos in por_particao.values())
+
+def _pasta_segmentos_csv(caminho_csv):
+    return os.path.splitext(caminho_csv)[0] + "_segmentos"
+
+def _segmentos_csv(caminho_csv):
+    """Segmentos acrescentados ao CSV legado (modo sem pyarrow), do mais antigo ao mais novo."""
+    return sorted(glob.glob(os.path.join(_pasta_segmentos_csv(caminho_csv), "seg-*.csv")))
+
+def armazem_disponivel(nome):
+    """True se a tabela já existe no armazém Parquet (e o pyarrow está instalado)."""
+    return PYARROW_DISPONIVEL and bool(_arquivos_tabela(nome))
+
+def tabela_disponivel(nome):
+    """True se a tabela existe no armazém ou no CSV legado."""
+    return armazem_disponivel(nome) or bool(_csvs_tabela(nome) or _segmentos_csv(TABELAS[nome]['csv']))
+
+def assinatura_tabela(nome):
+    """Assinatura barata do conteúdo (arquivos, mtime e tamanho) para chaves de cache."""
+    h = hashlib.sha1()
+    # Só os segmentos vigentes entram: a compactação não muda a assinatura
+    arquivos = _segmentos_vigentes(nome) if PYARROW_DISPONIVEL else []
+    for caminho in arquivos or _csvs_tabela(nome) + _segmentos_csv(TABELAS[nome]['csv']):
+        stat = os.stat(caminho)
+        h.update(f"{caminho}|{stat.st_mtime_ns}|{stat.st_size}".encode())
+    return h.hexdigest()
+
+def assinaturas_particoes(nome):
+    """Assinatura de cada partição do armazém: {(ano, rodada): hash dos arquivos da partição}."""
+    col_ano, col_rodada = TABELAS[nome]['particoes']
+    arquivos_por_particao = {}
+    for caminho in _segmentos_vigentes(nome):
+        pasta_rodada = os.path.dirname(caminho)
+        pasta_ano = os.path.dirname(pasta_rodada)
+        try:
+            chave = (int(os.path.basename(pasta_ano).split('=')[1]), int(os.path.basename(pasta_rodada).split('=')[1]))
+        except (IndexError, ValueError):
+            continue
+        stat = os.stat(caminho)
+        arquivos_por_particao.setdefault(chave, []).append(f"{os.path.basename(caminho)}|{stat.st_mtime_ns}|{stat.st_size}")
+    return {chave: hashlib.sha1("|".join(sorted(v)).encode()).hexdigest() for chave, v in arquivos_por_particao.items()}
+
+def anos_disponiveis(nome):
+    """Temporadas presentes na tabela (lidas dos diretórios de partição quando possível)."""
+    if armazem_disponivel(nome):
+        pastas = glob.glob(os.path.join(caminho_tabela(nome), "ano=*"))
+        return sorted(int(os.path.basename(p).split('=')[1]) for p in pastas)
+    df = carregar_tabela(nome, colunas=['ano'])
+    return sorted(df['ano'].dropna().astype(int).unique().tolist()) if df is not None else []
+
+# --- Leitura ---
+
+def _dataset_vigente(nome, esquema=None):
+    return ds.dataset(_segmentos_vigentes(nome), format='parquet', partitioning='hive',
+                      partition_base_dir=caminho_tabela(nome), schema=esquema)
+
+def _esquema_unificado(nome):
+    assinatura = assinatura_tabela(nome)
+    memo = _ESQUEMAS.get(nome)
+    if memo and memo[0] == assinatura:
+        return memo[1]
+
+    dataset = _dataset_vigente(nome)
+    esquemas = [fragmento.physical_schema for fragmento in dataset.get_fragments()]
+    particoes = pa.schema([pa.field(col, pa.int32()) for col in TABELAS[nome]['particoes']])
+    try:
+        esquema = pa.unify_schemas(esquemas + [particoes], promote_options='permissive')
+    except TypeError:  # pyarrow < 14
+        esquema = pa.unify_schemas(esquemas + [particoes])
+    _ESQUEMAS[nome] = (assinatura, esquema)
+    return esquema
+
+def _ler_armazem(nome, colunas, anos, rodadas):
+    esquema = _esquema_unificado(nome)
+    dataset = _dataset_vigente(nome, esquema)
+    col_ano, col_rodada = TABELAS[nome]['particoes']
+
+    filtro = None
+    if anos is not None:
+        filtro = ds.field(col_ano).isin([int(a) for a in anos])
+    if rodadas is not None:
+        filtro_rodada = ds.field(col_rodada).isin([int(r) for r in rodadas])
+        filtro = filtro_rodada if filtro is None else filtro & filtro_rodada
+
+    if colunas is not None:
+        colunas = [c for c in colunas if c in esquema.names]
+    return dataset.to_table(columns=colunas, filter=filtro).to_pandas()
+
+def _csvs_tabela(nome):
+    caminho = TABELAS[nome]['csv']
+    if os.path.exists(caminho):
+        return [caminho]
+    if nome == 'jogadores':
+        return sorted(glob.glob(CSV_JOGADORES_POR_ANO.format(ano='[0-9]' * 4)))
+    return []
+
+def _chaves_particao(df, nome):
+    return pd.MultiIndex.from_arrays([pd.to_numeric(df[c], errors='coerce') for c in TABELAS[nome]['particoes']])
+
+def _ler_csv(nome, colunas, anos, rodadas, segmentos=None):
+    arquivos = _csvs_tabela(nome)
+    if segmentos is None:
+        segmentos = _segmentos_csv(TABELAS[nome]['csv'])
+    if not arquivos and not segmentos:
+        return None
+    col_ano, col_rodada = TABELAS[nome]['particoes']
+    usecols = None
+    if colunas is not None:
+        necessarias = set(colunas) | {col_ano, col_rodada}
+        usecols = lambda c: c.lstrip('\ufeff') in necessarias
+
+    def ler(caminho):
+        df = pd.read_csv(caminho, usecols=usecols, low_memory=False, encoding='utf-8-sig')
+        if anos is not None:
+            df = df[pd.to_numeric(df[col_ano], errors='coerce').isin(anos)]
+        if rodadas is not None:
+            df = df[pd.to_numeric(df[col_rodada], errors='coerce').isin(rodadas)]
+        return df
+
+    df = pd.concat([ler(caminho) for caminho in arquivos], ignore_index=True) if arquivos else None
+    if df is not None and len(arquivos) > 1 and nome == 'jogadores':
+        df = df.drop_duplicates(subset=['ano', 'rodada', 'atleta_id'], keep='last')
+
+    # Segmentos acrescentados depois do CSV base: cada um substitui as partições que contém
+    for caminho in segmentos:
+        df_segmento = ler(caminho)
+        if df is not None:
+            tocadas = _chaves_particao(df_segmento, nome).unique()
+            df = df[~_chaves_particao(df, nome).isin(tocadas)]
+        df = pd.concat([df, df_segmento], ignore_index=True)
+
+    if colunas is not None:
+        df = df[[c for c in colunas if c in df.columns]]
+    return df
+
+def carregar_tabela(nome, colunas=None, anos=None, rodadas=None):
+    """
+    Lê uma tabela do histórico carregando apenas as colunas e temporadas/rodadas pedidas.
+    Usa o armazém Parquet (partições podadas pelo filtro) e cai para o CSV legado se ele não existir.
+
+    Returns:
+        DataFrame ou None se a tabela não existir em nenhum formato.
+    """
+    if armazem_disponivel(nome):
+        return _ler_armazem(nome, colunas, anos, rodadas)
+    return _ler_csv(nome, colunas, anos, rodadas)
+
+# --- Gravação ---
+
+def _normalizar_tipos(df, nome):
+    from utils.carregamento import normalizar_posicao_id, SCOUTS_CARTOLA
+
+    df = df.copy()
+    df.columns = [str(c).lstrip('\ufeff') for c in df.columns]
+    for col in TABELAS[nome]['particoes']:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    df = df.dropna(subset=TABELAS[nome]['particoes'])
+    for col in TABELAS[nome]['particoes']:
+        df[col] = df[col].astype('int32')
+
+    tipos = dict(TIPOS_GRAVACAO.get(nome, {}))
+    if nome == 'jogadores':
+        tipos.update({col: 'float32' for col in SCOUTS_CARTOLA})
+        if 'posicao_id' in df.columns:
+            df['posicao_id'] = normalizar_posicao_id(df['posicao_id'])
+
+    for col, tipo in tipos.items():
+        if col not in df.columns:
+            continue
+        if tipo == 'str':
+            df[col] = df[col].astype(str).str.replace(r'\.0$', '', regex=True)
+        elif tipo.startswith('int'):
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(tipo)
+        else:
+            valores = df[col].astype(str).str.replace(',', '.', regex=False) if df[col].dtype == object else df[col]
+            df[col] = pd.to_numeric(valores, errors='coerce').astype(tipo)
+    return df
+
+def _gravar_armazem(df, nome, raiz):
+    """Grava um segmento novo em cada partição presente no df (nunca sobrescreve arquivos existentes)."""
+    particoes = TABELAS[nome]['particoes']
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    ds.write_dataset(
+        tabela, raiz, format='parquet',
+        partitioning=ds.partitioning(pa.schema([pa.field(c, pa.int32()) for c in particoes]), flavor='hive'),
+        existing_data_behavior='overwrite_or_ignore',
+        basename_template=_nome_segmento('-{i}.parquet'),
+    )
+
+def _gravar_csv(df, nome, substituir_tudo, caminho_csv=None):
+    caminho = caminho_csv or TABELAS[nome]['csv']
+    if not substituir_tudo:
+        # Append-only: a coleta de uma rodada custa só o tamanho da rodada; compactar_tabela() incorpora ao CSV.
+        # Os segmentos ficam sempre ao lado do CSV da tabela, onde leitura, migração e compactação os procuram
+        pasta = _pasta_segmentos_csv(TABELAS[nome]['csv'])
+        os.makedirs(pasta, exist_ok=True)
+        salvar_csv(df, os.path.join(pasta, _nome_segmento('.csv')), index=False, encoding='utf-8-sig')
+        return df
+    with trava_arquivo(caminho):
+        # Segmentos antigos descartados antes, para não se sobreporem à tabela nova
+        shutil.rmtree(_pasta_segmentos_csv(caminho), ignore_errors=True)
+        salvar_csv(df, caminho, index=False, encoding='utf-8-sig')
+    return df
+
+def salvar_particoes(df, nome):
+    """
+    Grava as linhas recebidas substituindo SOMENTE as partições (ano, rodada) presentes nelas.
+    A gravação é append-only: cada chamada acrescenta um segmento imutável por partição, que passa
+    a ser o vigente; nada do que já existe é reescrito. Sem pyarrow, acrescenta um segmento ao
+    CSV legado da tabela (TABELAS[nome]['csv']). Ver compactar_tabela().
+    """
+    if df is None or df.empty:
+        return
+    df = _normalizar_tipos(df, nome)
+    if not PYARROW_DISPONIVEL:
+        _gravar_csv(df, nome, substituir_tudo=False)
+        logger.info(f"pyarrow indisponível: '{nome}' recebeu um segmento CSV com {len(df)} linhas.")
+        return
+
+    if not armazem_disponivel(nome) and tabela_disponivel(nome):
+        # Primeira gravação: importa o histórico legado antes, para não escondê-lo atrás da nova partição
+        migrar_csvs([nome])
+    # Sem trava: cada gravação cria arquivos com nomes únicos, então coletas simultâneas não colidem
+    _gravar_armazem(df, nome, caminho_tabela(nome))
+    col_ano, col_rodada = TABELAS[nome]['particoes']
+    logger.info(f"Armazém '{nome}': {len(df)} linhas gravadas em {df[[col_ano, col_rodada]].drop_duplicates().shape[0]} partições.")
+
+def substituir_tabela(df, nome, caminho_csv=None):
+    """Substitui a tabela inteira (ex: download completo do histórico de partidas)."""
+    df = _normalizar_tipos(df, nome)
+    if not PYARROW_DISPONIVEL:
+        _gravar_csv(df, nome, substituir_tudo=True, caminho_csv=caminho_csv)
+        return
+
+    raiz = caminho_tabela(nome)
+    with trava_arquivo(raiz):
+        temporario = tempfile.mkdtemp(dir=config.WAREHOUSE_DIR, prefix=f".{nome}-")
+        _gravar_armazem(df, nome, temporario)
+        # Troca por renomeações (a versão antiga sai do caminho antes de ser apagada)
+        antigo = None
+        if os.path.exists(raiz):
+            antigo = tempfile.mkdtemp(dir=config.WAREHOUSE_DIR, prefix=f".{nome}-antigo-")
+            os.replace(raiz, os.path.join(antigo, nome))
+        os.replace(temporario, raiz)
+        if antigo:
+            shutil.rmtree(antigo, ignore_errors=True)
+    logger.info(f"Armazém '{nome}' recriado com {len(df)} linhas.")
+
+# --- Migração ---
+
+def migrar_csvs(tabelas=None, forcar=False):
+    """
+    Importa os CSVs legados para o armazém Parquet.
+    Tabelas que já existem no armazém são mantidas (o armazém passa a ser a fonte mais nova),
+    a menos que forcar=True.
+    """
+    if not PYARROW_DISPONIVEL:
+        logger.error("pyarrow não instalado. Migração para Parquet indisponível.")
+        return False
+
+    for nome in tabelas or TABELAS:
+        with trava_arquivo(caminho_tabela(nome)):
+            _migrar_tabela(nome, forcar)
+    return True
+
+def _migrar_tabela(nome, forcar):
+    # Verificado sob a trava: duas primeiras gravações simultâneas migram uma única vez
+    if armazem_disponivel(nome) and not forcar:
+        logger.info(f"'{nome}' já está no armazém. Migração ignorada (use forcar=True para recriar).")
+        return
+    arquivos = _csvs_tabela(nome)
+    if nome == 'jogadores':
+        # Histórico consolidado primeiro e os arquivos por temporada depois: com keep='last' abaixo,
+        # a linha do arquivo da temporada (gravado a cada coleta) prevalece sobre a do consolidado
+        por_ano = sorted(glob.glob(CSV_JOGADORES_POR_ANO.format(ano='[0-9]' * 4)))
+        arquivos = [a for a in arquivos if a not in por_ano] + por_ano
+    if not arquivos:
+        logger.warning(f"Nenhum CSV encontrado para '{nome}'.")
+        return
+
+    df = pd.concat([pd.read_csv(a, low_memory=False, encoding='utf-8-sig') for a in arquivos], ignore_index=True)
+    if nome == 'jogadores':
+        df = df.drop_duplicates(subset=['ano', 'rodada', 'atleta_id'], keep='last')
+    segmentos = _segmentos_csv(TABELAS[nome]['csv'])
+    if segmentos:
+        # Rodadas coletadas sem pyarrow ainda não compactadas no CSV
+        tocadas = _ler_csv(nome, None, None, None, segmentos=segmentos)
+        df = pd.concat([df[~_chaves_particao(df, nome).isin(_chaves_particao(tocadas, nome).unique())], tocadas], ignore_index=True)
+    substituir_tabela(df, nome)
+    logger.info(f"'{nome}' migrado de {len(arquivos)} CSV(s): {len(df)} linhas.")
+
+# --- Compactação ---
+
+def compactar_tabela(nome, carencia_seg=CARENCIA_COMPACTACAO_SEG):
+    """
+    Compacta os segmentos acumulados pelas gravações append-only:
+    - armazém: remove os segmentos substituídos (o vigente de cada partição não muda, então
+      leitores e assinaturas não são afetados);
+    - CSV legado: incorpora os segmentos ao CSV base e os remove.
+    Só entram segmentos substituídos/gravados há mais de carencia_seg segundos: um leitor que
+    listou os arquivos antes continua encontrando todos eles até terminar.
+
+    Returns:
+        Número de arquivos de segmento removidos.
+    """
+    limite = time.time() - carencia_seg
+    removidos = 0
+    if armazem_disponivel(nome):
+        with trava_arquivo(caminho_tabela(nome)):
+            vigentes = {os.path.dirname(c): c for c in _segmentos_vigentes(nome)}
+            for caminho in _arquivos_tabela(nome):
+                vigente = vigentes[os.path.dirname(caminho)]
+                if caminho != vigente and os.path.getmtime(vigente) <= limite:
+                    os.remove(caminho)
+                    removidos += 1
+
+    caminho_csv = TABELAS[nome]['csv']
+    if _segmentos_csv(caminho_csv) and not armazem_disponivel(nome):
+        with trava_arquivo(caminho_csv):
+            # Só os segmentos listados agora (e em ordem): os mais novos continuam sobrepostos ao CSV base
+            segmentos = []
+            for caminho in _segmentos_csv(caminho_csv):
+                if os.path.getmtime(caminho) > limite:
+                    break
+                segmentos.append(caminho)
+            if segmentos:
+                df = _ler_csv(nome, None, None, None, segmentos=segmentos)
+                salvar_csv(df, caminho_csv, index=False, encoding='utf-8-sig')
+                for caminho in segmentos:
+                    os.remove(caminho)
+                removidos += len(segmentos)
+
+    if removidos:
+        logger.info(f"'{nome}' compactada: {removidos} segmentos removidos.")
+    return removidos
+
+def compactar_armazem(tabelas=None):
+    return {nome: compactar_tabela(nome) for nome in tabelas or TABELAS}
+
+if __name__ == "__main__":
+    migrar_csvs()
+    compactar_armazem()
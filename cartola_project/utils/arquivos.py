@@ -0,0 +1,139 @@
+"""
+Escrita segura dos arquivos compartilhados entre o app, a coleta e o retreino.
+
+- Escrita atômica: o conteúdo vai para um temporário no mesmo diretório e só então substitui
+  o destino (os.replace). Leitores veem a versão antiga inteira ou a nova inteira, nunca um
+  arquivo pela metade; quem já abriu o arquivo continua lendo a sua versão (snapshot).
+- Travas consultivas por arquivo ('<arquivo>.lock'): só para sequências ler-modificar-gravar
+  entre processos. Leitores nunca travam, e escritas simples não precisam de trava.
+"""
+
+import os
+import json
+import time
+import tempfile
+import threading
+from contextlib import contextmanager
+from utils.config import logger
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# No Windows o os.replace falha enquanto outro processo mantém o destino aberto (ex: Excel)
+TENTATIVAS_SUBSTITUICAO = 20
+ESPERA_SUBSTITUICAO_SEG = 0.25
+
+# Travas já obtidas por este processo: caminho -> [RLock entre threads, descritor do .lock, profundidade]
+_TRAVAS = {}
+_TRAVAS_GUARDA = threading.Lock()
+
+def _substituir(origem, destino):
+    for tentativa in range(TENTATIVAS_SUBSTITUICAO):
+        try:
+            os.replace(origem, destino)
+            return
+        except PermissionError:
+            if tentativa == TENTATIVAS_SUBSTITUICAO - 1:
+                raise
+            time.sleep(ESPERA_SUBSTITUICAO_SEG)
+
+@contextmanager
+def escrita_atomica(caminho):
+    """
+    Fornece um caminho temporário para gravar; ao sair sem erro, ele substitui 'caminho'.
+    Serve para qualquer gravador (to_csv, joblib.dump, json...). Em caso de erro o destino não muda.
+
+    Exemplo:
+        with escrita_atomica(config.RAW_DATA_PATH) as temporario:
+            df.to_csv(temporario, index=False)
+    """
+    diretorio = os.path.dirname(os.path.abspath(caminho))
+    os.makedirs(diretorio, exist_ok=True)
+    fd, temporario = tempfile.mkstemp(dir=diretorio, prefix=f".{os.path.basename(caminho)}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        yield temporario
+        with open(temporario, 'rb+') as f:
+            os.fsync(f.fileno())  # Conteúdo no disco antes da troca de nomes
+        _substituir(temporario, caminho)
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+def salvar_csv(df, caminho, **kwargs):
+    """DataFrame.to_csv atômico (mesmos argumentos)."""
+    with escrita_atomica(caminho) as temporario:
+        df.to_csv(temporario, **kwargs)
+
+def salvar_json(dados, caminho, **kwargs):
+    """json.dump atômico em UTF-8 (mesmos argumentos)."""
+    with escrita_atomica(caminho) as temporario:
+        with open(temporario, 'w', encoding='utf8') as f:
+            json.dump(dados, f, **kwargs)
+
+def _travar_descritor(fd, caminho, timeout):
+    limite = time.monotonic() + timeout
+    while True:
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return
+        except OSError:
+            if time.monotonic() >= limite:
+                raise TimeoutError(f"Tempo esgotado aguardando a trava de '{caminho}'.")
+            time.sleep(0.05)
+
+def _liberar_descritor(fd):
+    if fcntl:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+@contextmanager
+def trava_arquivo(caminho, timeout=120):
+    """
+    Trava exclusiva entre processos para 'caminho' (reentrante na mesma thread).
+    Use em volta de ler-modificar-gravar; gravações simples já são atômicas sem ela.
+    """
+    caminho = os.path.abspath(caminho)
+    with _TRAVAS_GUARDA:
+        trava = _TRAVAS.setdefault(caminho, [threading.RLock(), None, 0])
+    if not trava[0].acquire(timeout=timeout):
+        raise TimeoutError(f"Tempo esgotado aguardando a trava de '{caminho}'.")
+    try:
+        if trava[2] == 0:
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            fd = os.open(caminho + ".lock", os.O_RDWR | os.O_CREAT)
+            try:
+                _travar_descritor(fd, caminho, timeout)
+            except Exception:
+                os.close(fd)
+                raise
+            trava[1] = fd
+        trava[2] += 1
+        try:
+            yield
+        finally:
+            trava[2] -= 1
+            if trava[2] == 0:
+                _liberar_descritor(trava[1])
+                os.close(trava[1])
+                trava[1] = None
+    finally:
+        trava[0].release()
+
+if __name__ == "__main__":
+    import pandas as pd
+    from utils.config import config
+    caminho = os.path.join(config.CACHE_DIR, "teste_escrita_atomica.csv")
+    with trava_arquivo(caminho):
+        salvar_csv(pd.DataFrame({'a': [1, 2]}), caminho, index=False)
+    logger.info(f"Escrita atômica OK: {pd.read_csv(caminho).shape}")
+    os.remove(caminho)
@@ -0,0 +1,139 @@
+import sqlite3
+import pandas as pd
+import time
+from utils.config import config, logger
+from utils.armazenamento import (
+    TABELAS, carregar_tabela, armazem_disponivel, tabela_disponivel, assinatura_tabela, assinaturas_particoes
+)
+
+# Índices das consultas das análises (filtros por temporada/rodada/atleta e por temporada/clube)
+INDICES = {
+    'jogadores': [('ano', 'rodada', 'atleta_id'), ('ano', 'clube_id')],
+    'partidas': [('ano', 'rodada')],
+    'odds': [('ano', 'rodada_id')],
+}
+
+# Afinidade INTEGER: ids vindos como texto ('262') viram inteiros; abreviações legadas continuam texto
+COLUNAS_INTEIRAS = {'ano', 'rodada', 'rodada_id', 'atleta_id', 'clube_id', 'posicao_id', 'mandante_id', 'visitante_id'}
+
+# Partição usada quando a fonte é o CSV legado (a tabela inteira é uma "partição")
+PARTICAO_CSV = (-1, -1)
+
+def _conectar():
+    con = sqlite3.connect(config.ANALYTICS_DB_PATH, timeout=30)
+    con.execute("PRAGMA journal_mode=WAL")
+    return con
+
+def _particoes_fonte(nome):
+    if armazem_disponivel(nome):
+        return assinaturas_particoes(nome)
+    if tabela_disponivel(nome):
+        return {PARTICAO_CSV: assinatura_tabela(nome)}
+    return {}
+
+def _colunas_tabela(con, nome):
+    return [linha[1] for linha in con.execute(f'PRAGMA table_info("{nome}")')]
+
+def _tipo_sql(col, serie):
+    if col in COLUNAS_INTEIRAS:
+        return 'INTEGER'
+    if pd.api.types.is_numeric_dtype(serie):
+        return 'REAL'
+    return 'TEXT'
+
+def _preparar_tabela(con, nome, df):
+    """Cria a tabela/índices na primeira carga e adiciona colunas novas que surgirem no histórico."""
+    existentes = _colunas_tabela(con, nome)
+    if not existentes:
+        colunas = ", ".join(f'"{c}" {_tipo_sql(c, df[c])}' for c in df.columns)
+        con.execute(f'CREATE TABLE "{nome}" ({colunas})')
+        for indice in INDICES.get(nome, []):
+            con.execute(f'CREATE INDEX IF NOT EXISTS "idx_{nome}_{"_".join(indice)}" ON "{nome}" ({", ".join(indice)})')
+        return
+    for col in df.columns:
+        if col not in existentes:
+            con.execute(f'ALTER TABLE "{nome}" ADD COLUMN "{col}" {_tipo_sql(col, df[col])}')
+
+def _inserir(con, nome, df):
+    if df is None or df.empty:
+        return
+    if nome == 'jogadores' and 'posicao_id' in df.columns:
+        from utils.carregamento import normalizar_posicao_id
+        df = df.assign(posicao_id=normalizar_posicao_id(df['posicao_id']))
+    _preparar_tabela(con, nome, df)
+    df = df.astype(object).where(df.notna(), None)  # Tipos nativos do Python e NaN -> NULL
+    colunas = ", ".join(f'"{c}"' for c in df.columns)
+    marcadores = ", ".join("?" for _ in df.columns)
+    con.executemany(f'INSERT INTO "{nome}" ({colunas}) VALUES ({marcadores})', df.itertuples(index=False, name=None))
+
+def atualizar_banco(tabelas=None):
+    """
+    Sincroniza o banco analítico com o armazém de forma incremental: apenas as partições
+    (ano, rodada) novas ou alteradas desde a última sincronização são recarregadas.
+    Chamado automaticamente antes de cada consulta, então uma rodada recém-coletada
+    aparece na próxima análise sem reconstruir o banco.
+    """
+    inicio = time.perf_counter()
+    con = _conectar()
+    try:
+        con.execute("BEGIN IMMEDIATE")  # Serializa atualizações concorrentes (ex: várias abas do Streamlit)
+        con.execute("CREATE TABLE IF NOT EXISTS _particoes (tabela TEXT, ano INTEGER, rodada INTEGER, assinatura TEXT, "
+                    "PRIMARY KEY (tabela, ano, rodada))")
+        total = 0
+        for nome in tabelas or TABELAS:
+            col_ano, col_rodada = TABELAS[nome]['particoes']
+            fonte = _particoes_fonte(nome)
+            banco = {(a, r): s for a, r, s in con.execute("SELECT ano, rodada, assinatura FROM _particoes WHERE tabela = ?", (nome,))}
+            alteradas = [p for p, s in fonte.items() if banco.get(p) != s]
+            removidas = [p for p in banco if p not in fonte or p in alteradas]
+            if not alteradas and not removidas:
+                continue
+
+            tabela_existe = bool(_colunas_tabela(con, nome))
+            for ano, rodada in removidas:
+                if tabela_existe:
+                    if (ano, rodada) == PARTICAO_CSV:
+                        con.execute(f'DELETE FROM "{nome}"')
+                    else:
+                        con.execute(f'DELETE FROM "{nome}" WHERE "{col_ano}" = ? AND "{col_rodada}" = ?', (ano, rodada))
+                con.execute("DELETE FROM _particoes WHERE tabela = ? AND ano = ? AND rodada = ?", (nome, ano, rodada))
+
+            if PARTICAO_CSV in alteradas:
+                _inserir(con, nome, carregar_tabela(nome))
+            else:
+                for ano in sorted({a for a, _ in alteradas}):
+                    rodadas = [r for a, r in alteradas if a == ano]
+                    _inserir(con, nome, carregar_tabela(nome, anos=[ano], rodadas=rodadas))
+
+            con.executemany("INSERT INTO _particoes VALUES (?, ?, ?, ?)", [(nome, a, r, fonte[(a, r)]) for a, r in alteradas])
+            total += len(alteradas)
+        con.commit()
+        if total:
+            logger.info(f"Banco analítico atualizado: {total} partições em {time.perf_counter() - inicio:.2f}s.")
+    except Exception:
+        con.rollback()
+        raise
+    finally:
+        con.close()
+
+def colunas_disponiveis(nome):
+    """Colunas da tabela no banco (sincronizado antes), para montar consultas sobre scouts opcionais."""
+    atualizar_banco([nome])
+    con = _conectar()
+    try:
+        return _colunas_tabela(con, nome)
+    finally:
+        con.close()
+
+def consultar(sql, parametros=(), tabelas=None):
+    """Executa uma consulta SQL no banco analítico (sincronizado antes) e devolve um DataFrame."""
+    atualizar_banco(tabelas)
+    con = _conectar()
+    try:
+        return pd.read_sql_query(sql, con, params=parametros)
+    finally:
+        con.close()
+
+if __name__ == "__main__":
+    atualizar_banco()
+    print(consultar("SELECT ano, COUNT(*) AS linhas, COUNT(DISTINCT atleta_id) AS atletas FROM jogadores GROUP BY ano"))
@@ -0,0 +1,111 @@
+import pandas as pd
+import os
+import glob
+import hashlib
+from utils.config import config, logger
+from utils.armazenamento import assinatura_tabela
+from utils.arquivos import escrita_atomica
+
+try:
+    from pyarrow import feather
+    PYARROW_DISPONIVEL = True
+except ImportError:
+    PYARROW_DISPONIVEL = False
+
+# Incrementar quando a lógica de features mudar fora dos módulos de CODIGO_FEATURES_PATHS
+VERSAO_FEATURES = "1"
+# Código que define as features: o cálculo e a leitura/tipagem das tabelas de entrada
+CODIGO_FEATURES_PATHS = [os.path.join(os.path.dirname(__file__), arquivo) for arquivo in
+                         ("feature_engineering.py", "armazenamento.py", "carregamento.py", "acesso_dados.py")]
+COLUNA_INDICE = "__indice__"
+
+# Memória de hashes já calculados: caminho -> ((mtime, tamanho), hash)
+_HASHES_ARQUIVOS = {}
+
+def hash_arquivo(caminho):
+    """Hash do conteúdo de um arquivo (reaproveitado enquanto mtime/tamanho não mudarem)."""
+    if not os.path.exists(caminho):
+        return "ausente"
+    stat = os.stat(caminho)
+    assinatura = (stat.st_mtime_ns, stat.st_size)
+    memo = _HASHES_ARQUIVOS.get(caminho)
+    if memo and memo[0] == assinatura:
+        return memo[1]
+
+    h = hashlib.sha1()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloco)
+    _HASHES_ARQUIVOS[caminho] = (assinatura, h.hexdigest())
+    return h.hexdigest()
+
+def hash_dataframe(df):
+    """Hash do conteúdo, índice, colunas e dtypes do DataFrame."""
+    h = hashlib.sha1()
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    h.update(repr(list(zip(df.columns, df.dtypes.astype(str)))).encode())
+    return h.hexdigest()
+
+def calcular_chave_features(df, grupos=None):
+    """Chave do cache: histórico de jogadores + partidas + clubes + versão do código + grupos do plano."""
+    partes = [
+        hash_dataframe(df),
+        ",".join(grupos) if grupos else "todos",
+        assinatura_tabela('partidas'),
+        hash_arquivo(config.CLUBS_DATA_PATH),
+        *(hash_arquivo(caminho) for caminho in CODIGO_FEATURES_PATHS),
+        VERSAO_FEATURES,
+    ]
+    return hashlib.sha1("|".join(partes).encode()).hexdigest()[:20]
+
+def _caminho_cache(chave):
+    return os.path.join(config.FEATURE_CACHE_DIR, f"features_{chave}.feather")
+
+def ler_cache_features(chave):
+    """Lê as features materializadas (memory-mapped) ou retorna None se não houver cache."""
+    if not PYARROW_DISPONIVEL:
+        return None
+    caminho = _caminho_cache(chave)
+    if not os.path.exists(caminho):
+        return None
+
+    try:
+        df = feather.read_table(caminho, memory_map=True).to_pandas()
+        os.utime(caminho)  # Marca como usado recentemente (política de despejo LRU)
+        logger.info(f"Features carregadas do cache ({len(df)} linhas): {os.path.basename(caminho)}")
+        return df.set_index(COLUNA_INDICE).rename_axis(None)
+    except Exception as e:
+        logger.warning(f"Cache de features corrompido, será recalculado: {e}")
+        return None
+
+def salvar_cache_features(df, chave):
+    """Materializa as features em Feather (sem compressão, para leitura via mmap) e despeja gerações antigas."""
+    if not PYARROW_DISPONIVEL:
+        logger.debug("pyarrow não instalado. Cache de features desativado.")
+        return
+    caminho = _caminho_cache(chave)
+
+    try:
+        with escrita_atomica(caminho) as temporario:
+            df.rename_axis(COLUNA_INDICE).reset_index().to_feather(temporario, compression='uncompressed')
+        logger.info(f"Features salvas no cache: {os.path.basename(caminho)}")
+    except Exception as e:
+        logger.warning(f"Não foi possível salvar o cache de features: {e}")
+        return
+
+    despejar_geracoes_antigas()
+
+def despejar_geracoes_antigas(manter=None):
+    """Remove as gerações de cache menos usadas recentemente, mantendo as 'manter' mais novas."""
+    if manter is None:
+        manter = config.FEATURE_CACHE_GERACOES
+    arquivos = sorted(
+        glob.glob(os.path.join(config.FEATURE_CACHE_DIR, "features_*.feather")),
+        key=os.path.getmtime, reverse=True
+    )
+    for caminho in arquivos[manter:]:
+        try:
+            os.remove(caminho)
+            logger.info(f"Geração antiga de cache removida: {os.path.basename(caminho)}")
+        except OSError as e:
+            logger.warning(f"Não foi possível remover {caminho}: {e}")
@@ -0,0 +1,155 @@
+import pandas as pd
+import os
+from utils.config import config, logger
+from utils.armazenamento import carregar_tabela
+from utils.acesso_dados import mapa_clubes
+
+# Scouts possíveis no histórico (nem todas as temporadas trazem todos)
+SCOUTS_CARTOLA = ['FD', 'FS', 'CA', 'FC', 'DS', 'FF', 'SG', 'A', 'G', 'I', 'DE', 'GS',
+                  'V', 'PC', 'DP', 'CV', 'FT', 'PP', 'PS', 'GC', 'PI', 'PE']
+
+POSICAO_NOMES = {1: "Goleiro", 2: "Lateral", 3: "Zagueiro", 4: "Meia", 5: "Atacante", 6: "Técnico"}
+
+# Todas as grafias de posição encontradas nos CSVs antigos e novos
+MAPA_POSICOES = {
+    'gol': 1, 'lat': 2, 'zag': 3, 'mei': 4, 'ata': 5, 'tec': 6,
+    'goleiro': 1, 'lateral': 2, 'zagueiro': 3, 'meia': 4, 'atacante': 5, 'técnico': 6, 'tecnico': 6,
+}
+
+# Tipos compactos: ids inteiros estreitos, pontos em float32 (scouts: TIPO_SCOUT)
+TIPOS_COLUNAS = {
+    'ano': 'int16',
+    'rodada': 'int8',
+    'atleta_id': 'int32',
+    'posicao_id': 'int8',
+    'pontuacao': 'float32',
+    'preco_num': 'float32',
+    'variacao_num': 'float32',
+    'media_num': 'float32',
+}
+TIPO_SCOUT = 'int16'
+
+def normalizar_posicao_id(serie):
+    """Converte posições numéricas ou textuais ('gol', 'Meia', '4.0') em ids 1-6 (0 = desconhecida)."""
+    numerico = pd.to_numeric(serie, errors='coerce')
+    if numerico.isna().any():
+        texto = serie.astype(str).str.strip().str.lower().map(MAPA_POSICOES)
+        numerico = numerico.fillna(texto)
+    numerico = numerico.where(numerico.isin(list(POSICAO_NOMES)), 0)
+    return numerico.fillna(0).astype('int8')
+
+def _numerico(serie):
+    """pd.to_numeric tolerante a decimais com vírgula."""
+    if serie.dtype == object:
+        serie = serie.astype(str).str.replace(',', '.', regex=False)
+    return pd.to_numeric(serie, errors='coerce')
+
+def mapa_nomes_clubes(campo='nome_fantasia'):
+    """Retorna {clube_id: nome} a partir do clubes.json (vazio se não existir)."""
+    return mapa_clubes(campo)
+
+def tipar_historico(df, com_nomes=False):
+    """
+    Aplica os tipos compactos a um DataFrame de histórico de jogadores.
+    A posição é normalizada aqui, uma única vez, para que os consumidores não repitam o mapeamento.
+
+    Args:
+        com_nomes (bool): Se True, adiciona as colunas categóricas 'posicao' e 'clube' (nome fantasia).
+    """
+    df = df.copy()
+
+    chaves = [c for c in ['ano', 'rodada', 'atleta_id'] if c in df.columns]
+    for col in chaves:
+        df[col] = _numerico(df[col])
+    invalidas = df[chaves].isna().any(axis=1)
+    if invalidas.any():
+        logger.warning(f"{invalidas.sum()} linhas do histórico sem ano/rodada/atleta_id foram descartadas.")
+        df = df[~invalidas]
+
+    if 'posicao_id' in df.columns:
+        df['posicao_id'] = normalizar_posicao_id(df['posicao_id'])
+
+    for col, tipo in TIPOS_COLUNAS.items():
+        if col not in df.columns or col == 'posicao_id':
+            continue
+        valores = _numerico(df[col])
+        if tipo.startswith('int'):
+            valores = valores.fillna(0)
+        df[col] = valores.astype(tipo)
+
+    # Scouts sem lacunas viram int16; com lacunas ficam float32, pois as médias das features ignoram NaN
+    for col in [c for c in SCOUTS_CARTOLA if c in df.columns]:
+        valores = _numerico(df[col])
+        df[col] = valores.astype(TIPO_SCOUT if valores.notna().all() else 'float32')
+
+    if 'clube_id' in df.columns:
+        clube_num = _numerico(df['clube_id'])
+        if clube_num.notna().all():
+            df['clube_id'] = clube_num.astype('int32')
+        else:
+            # Temporadas antigas trazem abreviações ('FLA'); preservadas para o mapeamento do feature_engineering
+            df['clube_id'] = df['clube_id'].astype(str).astype('category')
+
+    if 'apelido' in df.columns:
+        df['apelido'] = df['apelido'].astype('category')
+
+    if com_nomes:
+        if 'posicao_id' in df.columns:
+            df['posicao'] = pd.Categorical(df['posicao_id'].map(POSICAO_NOMES).fillna("Outros"),
+                                           categories=list(POSICAO_NOMES.values()) + ["Outros"])
+        if 'clube_id' in df.columns:
+            nomes = mapa_nomes_clubes()
+            clube_num = pd.to_numeric(df['clube_id'].astype(str), errors='coerce')
+            df['clube'] = clube_num.map(nomes).fillna("Desconhecido").astype('category')
+
+    return df
+
+def carregar_historico_jogadores(caminho=None, anos=None, com_nomes=False, colunas=None):
+    """
+    Carregador central do histórico de jogadores com tipos compactos.
+
+    Args:
+        caminho (str, optional): CSV específico a ler. Padrão: tabela 'jogadores' do armazém
+            Parquet (ou CSV legado, se o armazém ainda não existir).
+        anos (list, optional): Mantém apenas essas temporadas (partições não lidas no armazém).
+        com_nomes (bool): Adiciona 'posicao' e 'clube' categóricos.
+        colunas (list, optional): Lê apenas essas colunas (ano, rodada e atleta_id sempre vêm).
+
+    Returns:
+        DataFrame tipado ou None se o histórico não existir.
+    """
+    if colunas is not None:
+        colunas = list(dict.fromkeys(['ano', 'rodada', 'atleta_id'] + list(colunas)))
+
+    if caminho is None:
+        df = carregar_tabela('jogadores', colunas=colunas, anos=anos)
+        if df is None:
+            logger.error("Histórico de jogadores não encontrado (armazém ou CSV).")
+            return None
+    else:
+        if not os.path.exists(caminho):
+            logger.error(f"Arquivo '{caminho}' não encontrado.")
+            return None
+        usecols = (lambda c: c.lstrip('\ufeff') in colunas) if colunas is not None else None
+        df = pd.read_csv(caminho, usecols=usecols, low_memory=False, encoding='utf-8-sig')
+        if anos is not None:
+            df = df[pd.to_numeric(df['ano'], errors='coerce').isin(anos)]
+    return tipar_historico(df, com_nomes=com_nomes)
+
+def comparar_memoria_historico(caminho=None):
+    """Compara a memória do histórico lido com pd.read_csv puro vs. o carregador tipado."""
+    if caminho is None:
+        caminho = config.HISTORICAL_DATA_PATH if os.path.exists(config.HISTORICAL_DATA_PATH) else config.HISTORICO_2025_PATH
+
+    df_bruto = pd.read_csv(caminho, low_memory=False)
+    df_tipado = carregar_historico_jogadores(caminho)
+
+    antes = df_bruto.memory_usage(deep=True).sum() / 1024 ** 2
+    depois = df_tipado.memory_usage(deep=True).sum() / 1024 ** 2
+    print(f"Histórico: {os.path.basename(caminho)} ({len(df_bruto)} linhas)")
+    print(f"  pd.read_csv:   {antes:7.2f} MB")
+    print(f"  tipado:        {depois:7.2f} MB ({depois / antes:.0%})")
+    return antes, depois
+
+if __name__ == "__main__":
+    comparar_memoria_historico()
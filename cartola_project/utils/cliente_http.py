@@ -0,0 +1,247 @@
+"""
+Camada HTTP compartilhada pelas coletas.
+
+Sessão única com pool de conexões keep-alive (uma conexão TCP/TLS reaproveitada por host),
+limite de taxa por host (balde de fichas: 'taxa' requisições/s com rajadas de até 'rajada'),
+novas tentativas com backoff exponencial e jitter para falhas transitórias (respeitando o
+Retry-After), timeout padrão e métricas por host (metricas_http). Quem chama não precisa mais
+de pausas fixas entre requisições: a espera só acontece quando o limite do host é atingido.
+
+Requisições condicionais: para cada URL ficam guardados o ETag, o Last-Modified e o hash do último
+corpo processado com sucesso (config.HTTP_VALIDADORES_PATH). A coleta seguinte envia
+If-None-Match / If-Modified-Since; se o servidor responder 304, ou responder 200 com o mesmo corpo
+(servidores que ignoram os cabeçalhos), get_condicional devolve None e o chamador pula a conversão,
+a gravação dos CSVs e, com isso, a invalidação dos caches (acesso_dados, features).
+
+Os validadores só são registrados depois que o chamador processou a resposta
+(registrar_validadores): uma conversão que falhar é refeita na próxima coleta.
+"""
+
+import time
+import random
+import hashlib
+import threading
+import requests
+from datetime import datetime
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from utils.config import config, logger
+from utils.arquivos import salvar_json, trava_arquivo
+from utils.acesso_dados import ler_json
+
+TIMEOUT_SEG = 30
+TENTATIVAS = 4
+ESPERA_BASE_SEG = 0.5  # Backoff exponencial com jitter: 0.5s, 1s, 2s...
+ESPERA_MAXIMA_SEG = 60
+STATUS_REPETIR = {429, 500, 502, 503, 504}
+CONEXOES_POR_HOST = 10
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# host -> (requisições por segundo, rajada). Hosts fora da lista usam LIMITE_PADRAO.
+LIMITES_POR_HOST = {
+    'api.cartolafc.globo.com': (10, 10),
+    'api.globoesporte.globo.com': (5, 5),
+    'api.the-odds-api.com': (1, 2),  # Cota mensal: a taxa baixa evita gastar créditos em rajadas de erro
+    'fbref.com': (1 / 6, 1),  # 1 requisição a cada 6 segundos, sem rajada (bloqueio temporário se exceder)
+}
+LIMITE_PADRAO = (10, 10)
+
+class _BaldeFichas:
+    """Limite de taxa de um host: cada requisição consome uma ficha; as fichas voltam a 'taxa' por segundo."""
+
+    def __init__(self, taxa, rajada):
+        self.taxa = taxa
+        self.rajada = rajada
+        self.fichas = rajada
+        self.atualizado = time.monotonic()
+        self.guarda = threading.Lock()
+
+    def reservar(self):
+        """Consome uma ficha e devolve quantos segundos o chamador deve esperar antes de usá-la."""
+        with self.guarda:
+            agora = time.monotonic()
+            self.fichas = min(self.rajada, self.fichas + (agora - self.atualizado) * self.taxa)
+            self.atualizado = agora
+            self.fichas -= 1  # Pode ficar negativo: a fila de espera é a dívida de fichas
+            return max(0.0, -self.fichas / self.taxa)
+
+_SESSAO = None
+_BALDES = {}
+_METRICAS = {}
+_GUARDA = threading.Lock()
+
+def _host(url):
+    return urlsplit(url).hostname or url
+
+def sessao():
+    """Sessão compartilhada (pool keep-alive por host, sem retentativas próprias: elas são feitas em requisitar)."""
+    global _SESSAO
+    with _GUARDA:
+        if _SESSAO is None:
+            _SESSAO = requests.Session()
+            adaptador = HTTPAdapter(pool_connections=len(LIMITES_POR_HOST) + 4, pool_maxsize=CONEXOES_POR_HOST)
+            _SESSAO.mount('http://', adaptador)
+            _SESSAO.mount('https://', adaptador)
+            _SESSAO.headers['User-Agent'] = USER_AGENT
+        return _SESSAO
+
+def _balde(host):
+    with _GUARDA:
+        if host not in _BALDES:
+            _BALDES[host] = _BaldeFichas(*LIMITES_POR_HOST.get(host, LIMITE_PADRAO))
+        return _BALDES[host]
+
+def _metricas_host(host):
+    return _METRICAS.setdefault(host, {'requisicoes': 0, 'retentativas': 0, 'falhas': 0, 'nao_modificadas': 0,
+                                       'bytes': 0, 'segundos_rede': 0.0, 'segundos_limite': 0.0})
+
+def aguardar_limite(url):
+    """
+    Espera a vez de 'url' no limite de taxa do host (aceita a URL ou só o host).
+    Para acessos que não passam pela sessão (soccerdata, Selenium) mas contam no limite do site.
+    """
+    host = _host(url) if '/' in url else url
+    espera = _balde(host).reservar()
+    if espera > 0:
+        time.sleep(espera)
+    with _GUARDA:
+        _metricas_host(host)['segundos_limite'] += espera
+
+def registrar_requisicao(url, status=None, tamanho=0, segundos=0.0, retentativa=False):
+    """Contabiliza uma requisição feita fora de requisitar (ex: o cliente assíncrono de coleta_concorrente)."""
+    with _GUARDA:
+        metricas = _metricas_host(_host(url))
+        metricas['requisicoes'] += 1
+        metricas['retentativas'] += int(retentativa)
+        metricas['falhas'] += int(status is None or status >= 400)
+        metricas['nao_modificadas'] += int(status == 304)
+        metricas['bytes'] += tamanho
+        metricas['segundos_rede'] += segundos
+
+def _espera_retentativa(resposta, tentativa):
+    retry_after = resposta.headers.get('Retry-After') if resposta is not None else None
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), ESPERA_MAXIMA_SEG)
+    return ESPERA_BASE_SEG * 2 ** tentativa * (1 + random.random())
+
+def requisitar(metodo, url, tentativas=TENTATIVAS, timeout=TIMEOUT_SEG, **kwargs):
+    """
+    Requisição pela sessão compartilhada, dentro do limite do host, com novas tentativas
+    para erros de conexão/timeout e status transitórios (STATUS_REPETIR).
+
+    Returns:
+        requests.Response da última tentativa (o chamador decide sobre raise_for_status).
+        Erros de rede na última tentativa são levantados.
+    """
+    for tentativa in range(tentativas):
+        aguardar_limite(url)
+        inicio = time.perf_counter()
+        try:
+            resposta = sessao().request(metodo, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            registrar_requisicao(url, None, 0, time.perf_counter() - inicio, retentativa=tentativa > 0)
+            if tentativa == tentativas - 1:
+                raise
+            resposta, motivo = None, e
+        else:
+            registrar_requisicao(url, resposta.status_code, len(resposta.content), time.perf_counter() - inicio,
+                                 retentativa=tentativa > 0)
+            if resposta.status_code not in STATUS_REPETIR or tentativa == tentativas - 1:
+                return resposta
+            motivo = f"HTTP {resposta.status_code}"
+        espera = _espera_retentativa(resposta, tentativa)
+        logger.warning(f"{metodo} {_host(url)}: {motivo}. Nova tentativa em {espera:.1f}s.")
+        time.sleep(espera)
+
+def get(url, **kwargs):
+    """GET por requisitar (mesmos argumentos de requests.get)."""
+    return requisitar('GET', url, **kwargs)
+
+def metricas_http():
+    """Métricas acumuladas por host neste processo."""
+    with _GUARDA:
+        return {host: dict(m) for host, m in _METRICAS.items()}
+
+def zerar_metricas_http():
+    with _GUARDA:
+        _METRICAS.clear()
+
+@contextmanager
+def limite_temporario(host, taxa, rajada):
+    """Troca o limite de taxa de 'host' enquanto o contexto estiver aberto (ex: o servidor mock local)."""
+    with _GUARDA:
+        anterior = LIMITES_POR_HOST.get(host)
+        balde = _BALDES.pop(host, None)  # Balde novo, com o limite temporário
+        LIMITES_POR_HOST[host] = (taxa, rajada)
+    try:
+        yield
+    finally:
+        with _GUARDA:
+            if anterior is None:
+                LIMITES_POR_HOST.pop(host, None)
+            else:
+                LIMITES_POR_HOST[host] = anterior
+            _BALDES.pop(host, None)
+            if balde is not None:
+                _BALDES[host] = balde
+
+# --- Requisições condicionais ---
+
+def _validadores():
+    return ler_json(config.HTTP_VALIDADORES_PATH) or {}
+
+def get_condicional(url, forcar=False, timeout=TIMEOUT_SEG, **kwargs):
+    """
+    GET condicional de 'url'.
+
+    Args:
+        forcar (bool): Ignora os validadores guardados (ex: o arquivo derivado foi apagado).
+        **kwargs: Repassados a requisitar (headers, params...).
+
+    Returns:
+        A resposta (requests.Response) se o conteúdo mudou, ou None se é o mesmo da última
+        resposta registrada. Erros HTTP são levantados (raise_for_status).
+    """
+    anterior = {} if forcar else _validadores().get(url, {})
+    headers = dict(kwargs.pop('headers', None) or {})
+    if anterior.get('etag'):
+        headers['If-None-Match'] = anterior['etag']
+    if anterior.get('last_modified'):
+        headers['If-Modified-Since'] = anterior['last_modified']
+
+    resposta = get(url, headers=headers, timeout=timeout, **kwargs)
+    if resposta.status_code == 304:
+        logger.info(f"'{url}' não mudou desde {anterior.get('processado_em')} (304).")
+        return None
+    resposta.raise_for_status()
+    if anterior and hashlib.sha256(resposta.content).hexdigest() == anterior.get('sha256'):
+        logger.info(f"'{url}' não mudou desde {anterior.get('processado_em')} (mesmo conteúdo).")
+        return None
+    return resposta
+
+def registrar_validadores(url, resposta):
+    """Guarda ETag, Last-Modified e hash de 'resposta' depois que ela foi processada com sucesso."""
+    with trava_arquivo(config.HTTP_VALIDADORES_PATH):
+        validadores = _validadores()
+        validadores[url] = {
+            'etag': resposta.headers.get('ETag'),
+            'last_modified': resposta.headers.get('Last-Modified'),
+            'sha256': hashlib.sha256(resposta.content).hexdigest(),
+            'processado_em': datetime.now().isoformat(timespec='seconds'),
+        }
+        salvar_json(validadores, config.HTTP_VALIDADORES_PATH, indent=2)
+
+def esquecer_validadores(url=None):
+    """Descarta os validadores de 'url' (ou de todas as URLs): a próxima coleta baixa e processa tudo."""
+    with trava_arquivo(config.HTTP_VALIDADORES_PATH):
+        validadores = _validadores()
+        if url is None:
+            validadores = {}
+        else:
+            validadores.pop(url, None)
+        salvar_json(validadores, config.HTTP_VALIDADORES_PATH, indent=2)
+
+if __name__ == "__main__":
+    for url, dados in _validadores().items():
+        print(f"{url}: processado em {dados['processado_em']} (ETag {dados['etag']}, Last-Modified {dados['last_modified']})")
@@ -0,0 +1,235 @@
+"""
+Coleta concorrente do /atletas/pontuados de várias rodadas (backfill de temporada).
+
+As requisições rodam em asyncio com concorrência limitada (httpx, se instalado; senão
+requests em threads, pela sessão de utils.cliente_http) e respeitam o limite de taxa do host.
+Cada rodada recebida é arquivada, convertida e entregue a um gravador por uma fila, então a
+gravação das primeiras rodadas acontece enquanto as demais ainda chegam.
+"""
+
+import asyncio
+import time
+import requests
+import pandas as pd
+from utils.config import config, logger
+from utils.armazenamento import salvar_particoes
+from utils.snapshots_api import arquivar_resposta
+from utils.cliente_http import (sessao, aguardar_limite, registrar_requisicao, _espera_retentativa,
+                                TIMEOUT_SEG, TENTATIVAS, STATUS_REPETIR)
+
+try:
+    import httpx
+    HTTPX_DISPONIVEL = True
+except ImportError:
+    HTTPX_DISPONIVEL = False
+
+CONCORRENCIA_PADRAO = 8
+
+# Falhas de rede que valem nova tentativa (além dos status de STATUS_REPETIR)
+ERROS_REPETIR = (OSError, requests.ConnectionError, requests.Timeout)
+if HTTPX_DISPONIVEL:
+    ERROS_REPETIR += (httpx.TransportError,)
+
+async def _buscar(cliente, url, retentativa=False):
+    """GET assíncrono dentro do limite de taxa do host (cliente_http): a resposta (httpx ou requests)."""
+    await asyncio.to_thread(aguardar_limite, url)
+    inicio = time.perf_counter()
+    try:
+        if HTTPX_DISPONIVEL:
+            resposta = await cliente.get(url)
+        else:
+            resposta = await asyncio.to_thread(cliente.get, url, timeout=TIMEOUT_SEG)
+    except Exception:
+        registrar_requisicao(url, None, 0, time.perf_counter() - inicio, retentativa=retentativa)
+        raise
+    registrar_requisicao(url, resposta.status_code, len(resposta.content), time.perf_counter() - inicio,
+                         retentativa=retentativa)
+    return resposta
+
+async def _buscar_com_retentativa(cliente, url, limite):
+    """(status, corpo) com a mesma política de cliente_http.requisitar (incluindo o Retry-After)."""
+    for tentativa in range(TENTATIVAS):
+        try:
+            async with limite:
+                resposta = await _buscar(cliente, url, retentativa=tentativa > 0)
+        except ERROS_REPETIR as e:
+            if tentativa == TENTATIVAS - 1:
+                raise
+            resposta, motivo = None, e
+        else:
+            if resposta.status_code not in STATUS_REPETIR or tentativa == TENTATIVAS - 1:
+                return resposta.status_code, resposta.content
+            motivo = f"HTTP {resposta.status_code}"
+        espera = _espera_retentativa(resposta, tentativa)  # Fora do semáforo: a espera não ocupa uma vaga
+        logger.debug(f"{url}: {motivo}. Nova tentativa em {espera:.1f}s.")
+        await asyncio.sleep(espera)
+
+def _novo_cliente(concorrencia):
+    """Cliente com pool de conexões (httpx do tamanho da concorrência; sem httpx, a sessão compartilhada)."""
+    if HTTPX_DISPONIVEL:
+        return httpx.AsyncClient(timeout=TIMEOUT_SEG, limits=httpx.Limits(max_connections=concorrencia))
+    return sessao()
+
+async def _fechar_cliente(cliente):
+    if HTTPX_DISPONIVEL:
+        await cliente.aclose()  # A sessão compartilhada continua aberta para as próximas coletas
+
+async def buscar_varias_async(urls, concorrencia=CONCORRENCIA_PADRAO):
+    """
+    GET concorrente de várias URLs, com as mesmas retentativas da coleta de rodadas.
+
+    Returns:
+        {url: (status, corpo)}; URLs que falharam em todas as tentativas ficam com (None, None).
+    """
+    limite = asyncio.Semaphore(concorrencia)
+    cliente = _novo_cliente(concorrencia)
+
+    async def buscar(url):
+        try:
+            return url, await _buscar_com_retentativa(cliente, url, limite)
+        except Exception as e:
+            logger.debug(f"{url}: falha definitiva ({e}).")
+            return url, (None, None)
+
+    try:
+        return dict(await asyncio.gather(*(buscar(u) for u in urls)))
+    finally:
+        await _fechar_cliente(cliente)
+
+def buscar_varias(urls, concorrencia=CONCORRENCIA_PADRAO):
+    """Versão síncrona de buscar_varias_async."""
+    return asyncio.run(buscar_varias_async(urls, concorrencia))
+
+async def _coletar_rodada(cliente, limite, fila, gravador, base_url, ano, rodada, arquivar):
+    from utils.coleta_historico import processar_pontuados
+    url = f"{base_url}/atletas/pontuados/{rodada}" if base_url else config.API_URL_PONTUADOS.format(rodada=rodada)
+    try:
+        status, corpo = await _buscar_com_retentativa(cliente, url, limite)
+    except Exception as e:
+        logger.error(f"Rodada {rodada}: falha definitiva na coleta ({e}).")
+        return
+    if status != 200:
+        logger.warning(f"Rodada {rodada}: HTTP {status}. Pulando.")
+        return
+    if arquivar:
+        await asyncio.to_thread(arquivar_resposta, 'pontuados', corpo, ano=ano, rodada=rodada, url=url)
+    try:
+        # Bytes direto para a conversão colunar, fora do loop de eventos
+        df = await asyncio.to_thread(processar_pontuados, corpo, ano, rodada)
+    except Exception as e:
+        logger.error(f"Rodada {rodada}: resposta inválida ({e}). Pulando.")
+        return
+    if df is not None and not await _entregar(fila, (rodada, df), gravador):
+        logger.error(f"Rodada {rodada}: o gravador foi encerrado; rodada descartada.")
+
+async def _entregar(fila, item, gravador):
+    """
+    fila.put que não trava se o gravador tiver terminado (a fila nunca mais seria esvaziada).
+    Retorna False se o item não pôde ser entregue.
+    """
+    if gravador.done():
+        return False
+    colocar = asyncio.ensure_future(fila.put(item))
+    await asyncio.wait({colocar, gravador}, return_when=asyncio.FIRST_COMPLETED)
+    if not colocar.done():
+        colocar.cancel()
+        return False
+    return True
+
+async def _gravador(fila, gravar, coletadas, falhas):
+    """
+    Consome as rodadas na ordem em que chegam e grava cada partição fora do loop de eventos.
+    Uma gravação que falhar é registrada em 'falhas' e a fila continua sendo esvaziada.
+    """
+    while True:
+        item = await fila.get()
+        if item is None:
+            return
+        rodada, df = item
+        if gravar:
+            try:
+                await asyncio.to_thread(salvar_particoes, df, 'jogadores')
+            except Exception as e:
+                logger.error(f"Rodada {rodada}: falha ao gravar no histórico ({e}).")
+                falhas.append(rodada)
+        coletadas.append(df)
+
+async def coletar_pontuados_async(ano, rodadas=None, concorrencia=CONCORRENCIA_PADRAO, base_url=None,
+                                  gravar=True, arquivar=True):
+    """
+    Coleta /atletas/pontuados das rodadas em paralelo (no máximo 'concorrencia' requisições em voo).
+
+    Args:
+        rodadas (iterable, optional): Padrão: 1 a 38.
+        base_url (str, optional): Raiz da API no lugar de config.API_URL_PONTUADOS (ex: a URL de utils.servidor_mock).
+        gravar (bool): Grava cada rodada no histórico assim que ela chega.
+        arquivar (bool): Guarda as respostas brutas no arquivo (snapshots_api).
+
+    Returns:
+        DataFrame com os registros coletados (vazio se nenhuma rodada tinha dados). Rodadas que
+        falharam na coleta, na conversão ou na gravação são registradas no log como erro.
+    """
+    rodadas = list(rodadas or range(1, 39))
+    limite = asyncio.Semaphore(concorrencia)
+    fila = asyncio.Queue(maxsize=concorrencia)  # Contrapressão: a coleta espera se a gravação atrasar
+    coletadas, falhas = [], []
+    gravador = asyncio.create_task(_gravador(fila, gravar, coletadas, falhas))
+
+    cliente = _novo_cliente(concorrencia)
+    try:
+        resultados = await asyncio.gather(*(_coletar_rodada(cliente, limite, fila, gravador, base_url, ano, r, arquivar)
+                                            for r in rodadas), return_exceptions=True)
+        for rodada, resultado in zip(rodadas, resultados):
+            if isinstance(resultado, Exception):
+                logger.error(f"Rodada {rodada}: {resultado}")
+    finally:
+        await _entregar(fila, None, gravador)
+        try:
+            await gravador
+        except Exception as e:
+            logger.error(f"Gravador da coleta encerrado com erro: {e}")
+        await _fechar_cliente(cliente)
+    if falhas:
+        logger.error(f"Rodadas coletadas mas não gravadas no histórico: {sorted(falhas)}")
+
+    if not coletadas:
+        return pd.DataFrame()
+    return pd.concat(coletadas, ignore_index=True).fillna(0).sort_values(['rodada', 'atleta_id'], ignore_index=True)
+
+def coletar_pontuados(ano, rodadas=None, **kwargs):
+    """Versão síncrona de coletar_pontuados_async (mesmos argumentos)."""
+    return asyncio.run(coletar_pontuados_async(ano, rodadas, **kwargs))
+
+def _coletar_sequencial(ano, rodadas, base_url, espera=0.5):
+    """Coleta antiga (uma rodada por vez, com pausa fixa), mantida só como referência do benchmark."""
+    from utils.coleta_historico import processar_pontuados
+    dfs = []
+    for rodada in rodadas:
+        resposta = requests.get(f"{base_url}/atletas/pontuados/{rodada}", timeout=TIMEOUT_SEG)
+        if resposta.status_code == 200 and (df := processar_pontuados(resposta.json(), ano, rodada)) is not None:
+            dfs.append(df)
+        time.sleep(espera)
+    return pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
+
+def benchmark_coleta(ano=None, rodadas=range(1, 39), latencia=0.3, concorrencia=CONCORRENCIA_PADRAO):
+    """Mede a coleta sequencial vs. a concorrente contra o servidor mock (nada é gravado nem arquivado)."""
+    from utils.servidor_mock import servidor_mock
+    if ano is None:
+        ano = config.PREVIOUS_YEAR
+    rodadas = list(rodadas)
+    with servidor_mock(ano, rodadas, latencia=latencia) as base_url:
+        inicio = time.perf_counter()
+        df_seq = _coletar_sequencial(ano, rodadas, base_url)
+        tempo_seq = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        df_conc = coletar_pontuados(ano, rodadas, concorrencia=concorrencia, base_url=base_url, gravar=False, arquivar=False)
+        tempo_conc = time.perf_counter() - inicio
+
+    print(f"Rodadas: {len(rodadas)} | latência: {latencia}s | concorrência: {concorrencia} | cliente: {'httpx' if HTTPX_DISPONIVEL else 'requests+threads'}")
+    print(f"  sequencial:  {tempo_seq:6.2f}s ({len(df_seq)} registros)")
+    print(f"  concorrente: {tempo_conc:6.2f}s ({len(df_conc)} registros) -> {tempo_seq / tempo_conc:.1f}x")
+    return tempo_seq, tempo_conc
+
+if __name__ == "__main__":
+    benchmark_coleta()
@@ -1,12 +1,17 @@
-import requests
+import io
 import pandas as pd
 import os
 import json
-import time
 from datetime import datetime, timedelta
-from tenacity import retry, stop_after_attempt, wait_exponential
 from utils.config import config, logger
 from utils.validacao import validar_dados_rodada, validar_partidas
+from utils.armazenamento import carregar_tabela, salvar_particoes, substituir_tabela
+from utils.arquivos import salvar_csv, salvar_json
+from utils.acesso_dados import carregar_clubes_json, carregar_rodada_atual, carregar_partidas_rodada, carregar_odds
+from utils.snapshots_api import arquivar_resposta, carregar_snapshot, listar_snapshots, rodadas_arquivadas
+from utils.coleta_concorrente import buscar_varias
+from utils.leitura_colunar import mercado_colunar
+from utils.cliente_http import get, get_condicional, registrar_validadores, esquecer_validadores
 
 # --- MAPEAMENTO DE NOMES DE TIMES ---
 # Mapeia nomes da The Odds API para os nomes da API do Cartola FC
@@ -56,107 +61,108 @@ API_URL_PARTIDAS = "https://api.cartolafc.globo.com/partidas"
 ODDS_API_URL = "https://api.the-odds-api.com/v4/sports/soccer_brazil_campeonato/odds"
 GITHUB_BASE_URL = "https://raw.githubusercontent.com/henriquepgomide/caRtola/master/data/{ano}/{arquivo}"
 
+# API do GE (URL em config.GE_URL_JOGOS): ID_CAMPEONATO pode mudar em 2026, mas geralmente é estável.
+# A fase segue o padrão 'fase-unica-campeonato-brasileiro-YYYY'
+ID_CAMPEONATO_GE = "d1a37fa4-e948-43a6-ba53-ab24ab3a45b1"
+JOGOS_POR_RODADA = 10
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-def coletar_dados_rodada_atual():
+
+def coletar_dados_rodada_atual(forcar=False):
     """
     Coleta os dados dos jogadores do mercado e o mapa de clubes.
     Salva 'rodada_atual.csv' e 'clubes.json'.
+
+    A requisição é condicional (cliente_http): se o mercado não mudou desde a última coleta,
+    nada é convertido nem regravado e o 'rodada_atual.csv' existente é devolvido.
     """
     try:
         logger.info(f"Iniciando coleta de dados do mercado: {config.API_URL_MERCADO}")
-        response = requests.get(config.API_URL_MERCADO, timeout=30)
-        response.raise_for_status()
+        forcar = forcar or not (os.path.exists(config.RAW_DATA_PATH) and os.path.exists(config.CLUBS_DATA_PATH))
+        response = get_condicional(config.API_URL_MERCADO, forcar=forcar)
+        if response is None:
+            return carregar_rodada_atual()
         dados = response.json()
-
-        # Salva o mapa de clubes
-        clubes_map = {clube['id']: clube for clube in dados['clubes'].values()}
-        with open(config.CLUBS_DATA_PATH, 'w', encoding='utf8') as f:
-            json.dump(clubes_map, f, ensure_ascii=False, indent=4)
-        logger.info(f"Mapa de clubes salvo em '{config.CLUBS_DATA_PATH}'")
-        
-        # Processa e salva dados dos atletas
-        atletas = dados['atletas']
-        posicoes = {pos['id']: pos for pos in dados['posicoes'].values()}
-        status = {s['id']: s['nome'] for s in dados['status'].values()}
-
-        dados_atletas = []
-        for atleta in atletas:
-            clube = clubes_map.get(atleta['clube_id'], {})
-            posicao = posicoes.get(atleta['posicao_id'], {})
-            
-            item = {
-                'atleta_id': atleta['atleta_id'],
-                'nome': atleta['apelido'],
-                'clube': clube.get('nome', 'Sem Clube'),
-                'clube_id': atleta['clube_id'],
-                'posicao': posicao.get('nome', 'N/A'),
-                'posicao_id': atleta['posicao_id'],
-                'status': status.get(atleta['status_id'], 'N/A'),
-                'pontos_num': atleta['pontos_num'],
-                'preco_num': atleta['preco_num'],
-                'variacao_num': atleta['variacao_num'],
-                'media_num': atleta['media_num'],
-                'jogos_num': atleta['jogos_num'],
-            }
-            
-            # Adiciona os scouts ao dicionário do atleta
-            scouts = atleta.get('scout', {})
-            if scouts:
-                item.update(scouts)
-            
-            dados_atletas.append(item)
-
-        df = pd.DataFrame(dados_atletas)
-        
-        if not validar_dados_rodada(df):
-            logger.error("Dados coletados não passaram na validação de schema.")
-            return None
-
-        # Garante que todas as colunas de scouts existam
-        colunas_scouts = ['G', 'A', 'FT', 'FD', 'FF', 'FS', 'PP', 'I', 'DP', 'CV', 'CA', 'GC', 'SG', 'DE', 'DS', 'GS', 'FC', 'PC']
-        for col in colunas_scouts:
-            if col not in df.columns:
-                df[col] = 0
-            df[col] = df[col].fillna(0)
-
-        df.to_csv(config.RAW_DATA_PATH, index=False, encoding='utf-8-sig')
-        logger.info(f"Dados da rodada atual coletados e salvos em '{config.RAW_DATA_PATH}'")
+        arquivar_resposta('mercado', response.content, rodada=_rodada_mercado(dados), url=config.API_URL_MERCADO)
+        df = processar_mercado(dados)
+        if df is not None:
+            registrar_validadores(config.API_URL_MERCADO, response)
         return df
 
     except Exception as e:
         logger.error(f"Erro em 'coletar_dados_rodada_atual': {e}", exc_info=True)
         raise
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-def coletar_partidas_rodada():
-    """Coleta os dados das partidas da rodada atual. Salva 'partidas_rodada.csv'."""
+def _rodada_mercado(dados):
+    """Rodada da resposta do mercado (cada atleta traz 'rodada_id')."""
+    return next((a.get('rodada_id') for a in dados.get('atletas', []) if a.get('rodada_id')), None)
+
+def processar_mercado(dados):
+    """
+    Converte a resposta de /atletas/mercado em 'clubes.json' e 'rodada_atual.csv'.
+    Usada pela coleta e pela reconstrução a partir do arquivo bruto (snapshots_api).
+    """
+    # Salva o mapa de clubes (só se mudou: regravar invalida o cache de quem lê o clubes.json)
+    clubes_map = {clube['id']: clube for clube in dados['clubes'].values()}
+    if carregar_clubes_json() != clubes_map:
+        salvar_json(clubes_map, config.CLUBS_DATA_PATH, ensure_ascii=False, indent=4)
+        logger.info(f"Mapa de clubes salvo em '{config.CLUBS_DATA_PATH}'")
+    
+    # Processa e salva dados dos atletas
+    atletas = dados['atletas']
+    posicoes = {pos['id']: pos for pos in dados['posicoes'].values()}
+    status = {s['id']: s['nome'] for s in dados['status'].values()}
+
+    # Colunas preenchidas direto em buffers tipados, com todos os scouts (zerados) presentes
+    df = mercado_colunar(atletas, clubes_map, posicoes, status)
+    
+    if not validar_dados_rodada(df):
+        logger.error("Dados coletados não passaram na validação de schema.")
+        return None
+
+    salvar_csv(df, config.RAW_DATA_PATH, index=False, encoding='utf-8-sig')
+    logger.info(f"Dados da rodada atual coletados e salvos em '{config.RAW_DATA_PATH}'")
+    return df
+
+def coletar_partidas_rodada(forcar=False):
+    """
+    Coleta os dados das partidas da rodada atual. Salva 'partidas_rodada.csv'.
+    Requisição condicional, como em coletar_dados_rodada_atual.
+    """
     try:
         logger.info(f"Iniciando coleta de partidas da rodada: {config.API_URL_PARTIDAS}")
-        response = requests.get(config.API_URL_PARTIDAS, timeout=30)
-        response.raise_for_status()
+        forcar = forcar or not os.path.exists(config.MATCHES_DATA_PATH)
+        response = get_condicional(config.API_URL_PARTIDAS, forcar=forcar)
+        if response is None:
+            return carregar_partidas_rodada()
         dados = response.json()
-        
-        rodada_id = dados.get('rodada', 0)
-        partidas = dados['partidas']
-        
-        for p in partidas:
-            p['rodada_id'] = rodada_id
-
-        df_partidas = pd.DataFrame(partidas)
-        if not validar_partidas(df_partidas):
-            logger.error("Partidas coletadas não passaram na validação de schema.")
-            return None
-            
-        df_partidas.to_csv(config.MATCHES_DATA_PATH, index=False, encoding='utf-8-sig')
-        
-        logger.info(f"Dados das partidas salvos em '{config.MATCHES_DATA_PATH}'")
-        return df_partidas
+        arquivar_resposta('partidas', response.content, rodada=dados.get('rodada'), url=config.API_URL_PARTIDAS)
+        df = processar_partidas(dados)
+        if df is not None:
+            registrar_validadores(config.API_URL_PARTIDAS, response)
+        return df
         
     except Exception as e:
         logger.error(f"Erro em 'coletar_partidas_rodada': {e}", exc_info=True)
         raise
 
+def processar_partidas(dados):
+    """Converte a resposta de /partidas em 'partidas_rodada.csv' (coleta e reconstrução offline)."""
+    rodada_id = dados.get('rodada', 0)
+    partidas = dados['partidas']
+    
+    for p in partidas:
+        p['rodada_id'] = rodada_id
+
+    df_partidas = pd.DataFrame(partidas)
+    if not validar_partidas(df_partidas):
+        logger.error("Partidas coletadas não passaram na validação de schema.")
+        return None
+        
+    salvar_csv(df_partidas, config.MATCHES_DATA_PATH, index=False, encoding='utf-8-sig')
+    
+    logger.info(f"Dados das partidas salvos em '{config.MATCHES_DATA_PATH}'")
+    return df_partidas
+
 def coletar_historico_partidas():
     """
     Baixa histórico de partidas do repositório 'adaoduque/Brasileirao_Dataset'.
@@ -166,7 +172,9 @@ def coletar_historico_partidas():
     logger.info(f"Baixando histórico de partidas de: {url}")
     
     try:
-        df_raw = pd.read_csv(url)
+        resposta = get(url, timeout=120)
+        resposta.raise_for_status()
+        df_raw = pd.read_csv(io.BytesIO(resposta.content))
         
         # Mapa manual baseado nos nomes comuns desse dataset
         mapa_nomes = {
@@ -188,16 +196,14 @@ def coletar_historico_partidas():
         }
 
         # Carrega IDs oficiais do Cartola
-        if os.path.exists(config.CLUBS_DATA_PATH):
-            with open(config.CLUBS_DATA_PATH, 'r', encoding='utf8') as f:
-                clubes_cartola = json.load(f)
-                
+        clubes_cartola = carregar_clubes_json()
+        if clubes_cartola:
             nome_para_id = {}
             for cid, dados in clubes_cartola.items():
-                nome_para_id[dados['nome_fantasia']] = int(cid)
-                nome_para_id[dados['nome']] = int(cid)
-                nome_para_id[dados['apelido']] = int(cid)
-                nome_para_id[dados['slug']] = int(cid)
+                nome_para_id[dados['nome_fantasia']] = cid
+                nome_para_id[dados['nome']] = cid
+                nome_para_id[dados['apelido']] = cid
+                nome_para_id[dados['slug']] = cid
         else:
             logger.warning(f"'{config.CLUBS_DATA_PATH}' não encontrado. IDs podem ficar incorretos.")
             nome_para_id = {}
@@ -231,8 +237,8 @@ def coletar_historico_partidas():
         df_final['mandante_id'] = df_final['mandante_id'].astype(int)
         df_final['visitante_id'] = df_final['visitante_id'].astype(int)
         
-        df_final.to_csv(config.HISTORICAL_MATCHES_PATH, index=False)
-        logger.info(f"Histórico de partidas salvo em: {config.HISTORICAL_MATCHES_PATH} ({len(df_final)} jogos)")
+        substituir_tabela(df_final, 'partidas')
+        logger.info(f"Histórico de partidas salvo ({len(df_final)} jogos)")
         
         atualizar_partidas_ge(config.CURRENT_YEAR)
         return df_final
@@ -250,7 +256,7 @@ def coletar_odds_partidas(api_key, force_update=False, cache_duration_hours=3):
         if cache_age < timedelta(hours=cache_duration_hours):
             logger.info("Usando dados de odds em cache.")
             try:
-                return pd.read_csv(config.ODDS_DATA_PATH)
+                return carregar_odds()
             except Exception as e:
                 logger.error(f"Erro ao ler o arquivo de cache de odds: {e}")
 
@@ -262,17 +268,9 @@ def coletar_odds_partidas(api_key, force_update=False, cache_duration_hours=3):
             logger.warning("Arquivos de partidas ou clubes não encontrados para coleta de odds.")
             return None
         
-        df_partidas = pd.read_csv(config.MATCHES_DATA_PATH)
-        with open(config.CLUBS_DATA_PATH, 'r', encoding='utf8') as f:
-            clubes_map = {int(k): v for k, v in json.load(f).items()}
-        
-        confrontos_validos = set()
-        for _, row in df_partidas.iterrows():
-            time_casa = clubes_map.get(row['clube_casa_id'], {}).get('nome_fantasia', '')
-            time_visitante = clubes_map.get(row['clube_visitante_id'], {}).get('nome_fantasia', '')
-            if time_casa and time_visitante:
-                confrontos_validos.add(tuple(sorted((time_casa, time_visitante))))
-        
+        df_partidas = carregar_partidas_rodada()
+        clubes_map = carregar_clubes_json()
+
         params = {
             'apiKey': api_key,
             'regions': 'eu', 
@@ -280,155 +278,250 @@ def coletar_odds_partidas(api_key, force_update=False, cache_duration_hours=3):
             'oddsFormat': 'decimal'
         }
         logger.info(f"Coletando odds da API: {config.ODDS_API_URL}")
-        response = requests.get(config.ODDS_API_URL, params=params, timeout=30)
+        response = get(config.ODDS_API_URL, params=params, tentativas=2)
         response.raise_for_status()
         
         dados_odds = response.json()
-        partidas_data = []
-        for partida in dados_odds:
-            time_casa_raw = partida['home_team']
-            time_visitante_raw = partida['away_team']
-            time_casa_norm = TEAM_NAME_MAP.get(time_casa_raw, time_casa_raw)
-            time_visitante_norm = TEAM_NAME_MAP.get(time_visitante_raw, time_visitante_raw)
-
-            if tuple(sorted((time_casa_norm, time_visitante_norm))) not in confrontos_validos:
-                continue
-
-            bookmaker = partida['bookmakers'][0]
-            odds = bookmaker['markets'][0]['outcomes']
-            
-            partidas_data.append({
-                'time_casa': time_casa_norm,
-                'time_visitante': time_visitante_norm,
-                'odd_casa': odds[0]['price'],
-                'odd_empate': odds[1]['price'],
-                'odd_visitante': odds[2]['price'],
-            })
-
-        if not partidas_data:
-            logger.warning("Nenhuma odd encontrada para os confrontos da rodada.")
-            return None
-
-        df_odds = pd.DataFrame(partidas_data)
-        
-        try:
-            rodada_atual = df_partidas['rodada_id'].iloc[0] if 'rodada_id' in df_partidas.columns else 0
-            ano_atual = datetime.now().year
-            
-            df_odds['rodada_id'] = rodada_atual
-            df_odds['ano'] = ano_atual
-            
-            df_odds.to_csv(config.ODDS_DATA_PATH, index=False, encoding='utf-8-sig')
-            
-            if os.path.exists(config.ODDS_HISTORY_PATH):
-                df_hist = pd.read_csv(config.ODDS_HISTORY_PATH)
-                df_hist = df_hist[~((df_hist['rodada_id'] == rodada_atual) & (df_hist['ano'] == ano_atual))]
-                df_final = pd.concat([df_hist, df_odds], ignore_index=True)
-            else:
-                df_final = df_odds
-            
-            df_final.to_csv(config.ODDS_HISTORY_PATH, index=False, encoding='utf-8-sig')
-            logger.info("Odds e histórico de odds atualizados.")
-            
-        except Exception as e_hist:
-            logger.error(f"Erro ao atualizar histórico de odds: {e_hist}")
-            df_odds.to_csv(config.ODDS_DATA_PATH, index=False, encoding='utf-8-sig')
-
-        return df_odds
+        rodada_atual = int(df_partidas['rodada_id'].iloc[0]) if 'rodada_id' in df_partidas.columns else 0
+        # A Odds API tem cota mensal: a resposta bruta fica arquivada para reprocessamentos
+        arquivar_resposta('odds', response.content, ano=datetime.now().year, rodada=rodada_atual, url=config.ODDS_API_URL)
+        return processar_odds(dados_odds, df_partidas, clubes_map)
 
     except Exception as e:
         logger.error(f"Erro em 'coletar_odds_partidas': {e}", exc_info=True)
         return None
 
+def processar_odds(dados_odds, df_partidas, clubes_map, ano=None):
+    """
+    Converte a resposta da Odds API nas odds dos confrontos da rodada ('odds_rodada.csv' e
+    partição do histórico de odds). Usada pela coleta e pela reconstrução offline.
+    """
+    confrontos_validos = set()
+    for _, row in df_partidas.iterrows():
+        time_casa = clubes_map.get(row['clube_casa_id'], {}).get('nome_fantasia', '')
+        time_visitante = clubes_map.get(row['clube_visitante_id'], {}).get('nome_fantasia', '')
+        if time_casa and time_visitante:
+            confrontos_validos.add(tuple(sorted((time_casa, time_visitante))))
+
+    partidas_data = []
+    for partida in dados_odds:
+        time_casa_raw = partida['home_team']
+        time_visitante_raw = partida['away_team']
+        time_casa_norm = TEAM_NAME_MAP.get(time_casa_raw, time_casa_raw)
+        time_visitante_norm = TEAM_NAME_MAP.get(time_visitante_raw, time_visitante_raw)
+
+        if tuple(sorted((time_casa_norm, time_visitante_norm))) not in confrontos_validos:
+            continue
+
+        bookmaker = partida['bookmakers'][0]
+        odds = bookmaker['markets'][0]['outcomes']
+        
+        partidas_data.append({
+            'time_casa': time_casa_norm,
+            'time_visitante': time_visitante_norm,
+            'odd_casa': odds[0]['price'],
+            'odd_empate': odds[1]['price'],
+            'odd_visitante': odds[2]['price'],
+        })
+
+    if not partidas_data:
+        logger.warning("Nenhuma odd encontrada para os confrontos da rodada.")
+        return None
+
+    df_odds = pd.DataFrame(partidas_data)
+    
+    try:
+        rodada_atual = df_partidas['rodada_id'].iloc[0] if 'rodada_id' in df_partidas.columns else 0
+        ano_atual = ano if ano is not None else datetime.now().year
+        
+        df_odds['rodada_id'] = rodada_atual
+        df_odds['ano'] = ano_atual
+        
+        salvar_csv(df_odds, config.ODDS_DATA_PATH, index=False, encoding='utf-8-sig')
+        
+        # Regrava apenas a partição (ano, rodada) destas odds no histórico
+        salvar_particoes(df_odds, 'odds')
+        logger.info("Odds e histórico de odds atualizados.")
+        
+    except Exception as e_hist:
+        logger.error(f"Erro ao atualizar histórico de odds: {e_hist}")
+        salvar_csv(df_odds, config.ODDS_DATA_PATH, index=False, encoding='utf-8-sig')
+
+    return df_odds
+
 def get_club_id(club_name, clubes_data):
     for club_id, details in clubes_data.items():
         if details['nome_fantasia'] == club_name:
             return club_id
     return None
 
-def atualizar_partidas_ge(ano=None):
+def rodadas_completas_partidas(ano):
+    """
+    Marcador de completude por rodada: rodadas de 'ano' que já têm os JOGOS_POR_RODADA jogos com
+    placar no histórico de partidas. Derivado dos próprios dados, então nunca fica desatualizado.
+    """
+    df = carregar_tabela('partidas', colunas=['ano', 'rodada', 'placar_mandante', 'placar_visitante'], anos=[ano])
+    if df is None or df.empty:
+        return set()
+    com_placar = df.dropna(subset=['placar_mandante', 'placar_visitante'])
+    jogos = com_placar.groupby('rodada').size()
+    return {int(r) for r in jogos[jogos >= JOGOS_POR_RODADA].index}
+
+def _rodada_corrente():
+    """Rodada da última coleta de /partidas (None se desconhecida): rodadas futuras não têm placar."""
+    df_partidas = carregar_partidas_rodada()
+    if df_partidas is None or 'rodada_id' not in df_partidas.columns or df_partidas.empty:
+        return None
+    return int(df_partidas['rodada_id'].max())
+
+def atualizar_partidas_ge(ano=None, forcar=False):
     """
     Busca os dados de partidas de um determinado ano da API do Globo Esporte e anexa ao histórico.
+    Rodadas já completas no histórico são puladas (a menos que forcar=True); as demais são buscadas
+    em paralelo e só as rodadas cujos jogos mudaram são regravadas.
     """
     if ano is None:
         ano = config.CURRENT_YEAR
         
     logger.info(f"Iniciando a atualização das partidas de {ano} via GE...")
     
-    if not os.path.exists(config.CLUBS_DATA_PATH):
+    clubes_data = carregar_clubes_json()
+    if not clubes_data:
         logger.error(f"Arquivo de clubes não encontrado em '{config.CLUBS_DATA_PATH}'.")
         return
-        
-    with open(config.CLUBS_DATA_PATH, 'r', encoding='utf-8') as f:
-        clubes_data = json.load(f)
-
-    if os.path.exists(config.HISTORICAL_MATCHES_PATH):
-        df_historico = pd.read_csv(config.HISTORICAL_MATCHES_PATH)
-    else:
-        df_historico = pd.DataFrame(columns=['ano', 'rodada', 'mandante_id', 'visitante_id', 'placar_mandante', 'placar_visitante'])
-
-    # Remove dados do ano atual para atualizar com os mais recentes
-    df_historico = df_historico[df_historico['ano'] != ano]
-
-    # Configuração da API do GE
-    # Nota: ID_CAMPEONATO pode mudar em 2026, mas geralmente é estável. 
-    # SLUG_FASE segue o padrão 'fase-unica-campeonato-brasileiro-YYYY'
-    ID_CAMPEONATO = "d1a37fa4-e948-43a6-ba53-ab24ab3a45b1"
-    SLUG_FASE = f"fase-unica-campeonato-brasileiro-{ano}"
-    
-    new_data = []
 
-    for rodada in range(1, 39):
-        url = f"https://api.globoesporte.globo.com/tabela/{ID_CAMPEONATO}/fase/{SLUG_FASE}/rodada/{rodada}/jogos"
-        
-        try:
-            response = requests.get(url, timeout=30)
-            if response.status_code == 404:
-                # Se der 404, provavelmente a rodada ou a fase ainda não existem (início de campeonato)
-                continue
-            response.raise_for_status()
-            jogos = response.json()
-
-            if isinstance(jogos, list):
-                for jogo in jogos:
-                    mandante_info = jogo.get('equipes', {}).get('mandante', {})
-                    visitante_info = jogo.get('equipes', {}).get('visitante', {})
-                    
-                    mandante_id = mandante_info.get('id')
-                    visitante_id = visitante_info.get('id')
-                    
-                    placar_m = jogo.get('placar_oficial_mandante')
-                    placar_v = jogo.get('placar_oficial_visitante')
-                    
-                    if placar_m is None or placar_v is None:
-                        continue
-
-                    new_data.append({
-                        'ano': ano,
-                        'rodada': rodada,
-                        'mandante_id': mandante_id,
-                        'visitante_id': visitante_id,
-                        'placar_mandante': int(placar_m),
-                        'placar_visitante': int(placar_v)
-                    })
-            else:
-                 logger.warning(f"Estrutura inesperada para a rodada {rodada}.")
-
-        except Exception as e:
+    completas = set() if forcar else rodadas_completas_partidas(ano)
+    ultima = _rodada_corrente() if ano == config.CURRENT_YEAR else None
+    if ultima is not None and ultima < max(completas, default=0):
+        ultima = None  # partidas_rodada.csv de outra temporada/desatualizado: não limita a busca
+    pendentes = [r for r in range(1, 39) if r not in completas and (ultima is None or r <= ultima)]
+    if not pendentes:
+        logger.info(f"Todas as rodadas de {ano} já estão completas no histórico de partidas.")
+        return
+    logger.info(f"{len(completas)} rodadas completas puladas; buscando {len(pendentes)}: {pendentes}")
+
+    urls = {rodada: config.GE_URL_JOGOS.format(id_campeonato=ID_CAMPEONATO_GE, ano=ano, rodada=rodada) for rodada in pendentes}
+    respostas = buscar_varias(list(urls.values()))
+
+    new_data = []
+    for rodada, url in urls.items():
+        status, corpo = respostas[url]
+        if status == 404:
+            # Se der 404, provavelmente a rodada ou a fase ainda não existem (início de campeonato)
+            continue
+        if status != 200:
             # Em início de temporada, erros aqui são comuns pois a tabela ainda não foi criada na API
-            logger.debug(f"Aviso: Não foi possível buscar dados da rodada {rodada} (Campeonato pode não ter começado): {e}")
+            logger.debug(f"Aviso: Não foi possível buscar dados da rodada {rodada} (HTTP {status}).")
+            continue
+        arquivar_resposta('ge_jogos', corpo, ano=ano, rodada=rodada, url=url)
+        try:
+            new_data.extend(processar_jogos_ge(json.loads(corpo), ano, rodada))
+        except ValueError as e:
+            logger.debug(f"Aviso: resposta inválida do GE para a rodada {rodada}: {e}")
+
+    _salvar_partidas_ge(new_data, ano)
+
+def processar_jogos_ge(jogos, ano, rodada):
+    """Jogos com placar oficial de uma rodada da API do GE, no formato do histórico de partidas."""
+    if not isinstance(jogos, list):
+        logger.warning(f"Estrutura inesperada para a rodada {rodada}.")
+        return []
+
+    registros = []
+    for jogo in jogos:
+        mandante_info = jogo.get('equipes', {}).get('mandante', {})
+        visitante_info = jogo.get('equipes', {}).get('visitante', {})
+        
+        placar_m = jogo.get('placar_oficial_mandante')
+        placar_v = jogo.get('placar_oficial_visitante')
         
-        time.sleep(0.1)
-
-    if new_data:
-        df_new = pd.DataFrame(new_data)
-        df_final = pd.concat([df_historico, df_new], ignore_index=True)
-        df_final.drop_duplicates(subset=['ano', 'rodada', 'mandante_id', 'visitante_id'], keep='last', inplace=True)
-        df_final.to_csv(config.HISTORICAL_MATCHES_PATH, index=False)
-        logger.info(f"Histórico de partidas atualizado com {len(df_new)} novos jogos de {ano}. Total: {len(df_final)} jogos.")
-    else:
+        if placar_m is None or placar_v is None:
+            continue
+
+        registros.append({
+            'ano': ano,
+            'rodada': rodada,
+            'mandante_id': mandante_info.get('id'),
+            'visitante_id': visitante_info.get('id'),
+            'placar_mandante': int(placar_m),
+            'placar_visitante': int(placar_v)
+        })
+    return registros
+
+def _salvar_partidas_ge(new_data, ano):
+    if not new_data:
         logger.info(f"Nenhum dado novo de partidas de {ano} foi encontrado via GE.")
+        return
+
+    df_new = pd.DataFrame(new_data)
+    df_new.drop_duplicates(subset=['ano', 'rodada', 'mandante_id', 'visitante_id'], keep='last', inplace=True)
+
+    # Só as rodadas cujos jogos mudaram (placar novo ou corrigido) são regravadas
+    chaves = ['rodada', 'mandante_id', 'visitante_id', 'placar_mandante', 'placar_visitante']
+    df_atual = carregar_tabela('partidas', colunas=['ano'] + chaves, anos=[ano], rodadas=sorted(df_new['rodada'].unique()))
+    if df_atual is not None and not df_atual.empty:
+        assinatura = lambda df: df[chaves].astype('float64').sort_values(chaves).to_records(index=False).tolist()
+        iguais = [r for r, grupo in df_new.groupby('rodada')
+                  if assinatura(grupo) == assinatura(df_atual[df_atual['rodada'] == r])]
+        df_new = df_new[~df_new['rodada'].isin(iguais)]
+    if df_new.empty:
+        logger.info(f"Partidas de {ano} já estavam atualizadas; nenhuma rodada regravada.")
+        return
 
+    # Só as rodadas de 'ano' com placar são regravadas; as demais partições não são tocadas
+    salvar_particoes(df_new, 'partidas')
+    logger.info(f"Histórico de partidas atualizado com {len(df_new)} jogos de {ano} ({df_new['rodada'].nunique()} rodadas: {sorted(df_new['rodada'].unique())}).")
+
+# --- Reconstrução a partir do arquivo bruto (sem acessar as APIs) ---
+
+def reconstruir_rodada_atual(ano=None, rodada=None):
+    """Regrava 'clubes.json' e 'rodada_atual.csv' a partir do snapshot do mercado (o mais recente, se rodada=None)."""
+    dados = carregar_snapshot('mercado', ano, rodada)
+    if dados is None:
+        logger.error(f"Nenhum snapshot do mercado arquivado para {ano or config.CURRENT_YEAR}/{rodada}.")
+        return None
+    esquecer_validadores(config.API_URL_MERCADO)  # O CSV deixa de refletir a última resposta da API
+    return processar_mercado(dados)
+
+def reconstruir_partidas_rodada(ano=None, rodada=None):
+    """Regrava 'partidas_rodada.csv' a partir do snapshot de /partidas."""
+    dados = carregar_snapshot('partidas', ano, rodada)
+    if dados is None:
+        logger.error(f"Nenhum snapshot de partidas arquivado para {ano or config.CURRENT_YEAR}/{rodada}.")
+        return None
+    esquecer_validadores(config.API_URL_PARTIDAS)
+    return processar_partidas(dados)
+
+def reconstruir_odds(ano=None, rodada=None):
+    """
+    Regrava as odds de uma rodada a partir do snapshot da Odds API, cruzando-as com as partidas
+    e os clubes arquivados até o horário daquela coleta (o mesmo contexto da coleta original).
+    """
+    if ano is None:
+        ano = config.CURRENT_YEAR
+    snapshots = listar_snapshots('odds', ano, rodada)
+    if snapshots.empty:
+        logger.error(f"Nenhum snapshot de odds arquivado para {ano}/{rodada}.")
+        return None
+    ultimo = snapshots.iloc[-1]
+    dados_partidas = carregar_snapshot('partidas', ano, int(ultimo['rodada']), ate=ultimo['coletado_em'])
+    dados_mercado = carregar_snapshot('mercado', ano, ate=ultimo['coletado_em'])
+    if dados_partidas is None or dados_mercado is None:
+        logger.error("Partidas ou mercado da época das odds não estão no arquivo bruto.")
+        return None
+    df_partidas = pd.DataFrame(dados_partidas['partidas']).assign(rodada_id=dados_partidas.get('rodada', 0))
+    clubes_map = {clube['id']: clube for clube in dados_mercado['clubes'].values()}
+    dados_odds = carregar_snapshot('odds', ano, int(ultimo['rodada']))
+    return processar_odds(dados_odds, df_partidas, clubes_map, ano=ano)
+
+def reconstruir_partidas_ge(ano=None):
+    """Regrava as partições do histórico de partidas de 'ano' a partir dos snapshots do GE."""
+    if ano is None:
+        ano = config.CURRENT_YEAR
+    new_data = []
+    for rodada in rodadas_arquivadas('ge_jogos', ano):
+        new_data.extend(processar_jogos_ge(carregar_snapshot('ge_jogos', ano, rodada), ano, rodada))
+    _salvar_partidas_ge(new_data, ano)
 
 if __name__ == "__main__":
     coletar_dados_rodada_atual()
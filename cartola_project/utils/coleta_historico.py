@@ -1,17 +1,20 @@
 import requests
 import pandas as pd
 import os
-import time
 import json
 from tqdm import tqdm
 from utils.config import config
+from utils.armazenamento import carregar_tabela, salvar_particoes
+from utils.snapshots_api import arquivar_resposta, carregar_snapshot, rodadas_arquivadas
+from utils.coleta_concorrente import coletar_pontuados
+from utils.cliente_http import get
+from utils.leitura_colunar import pontuados_colunar, IJSON_DISPONIVEL
+from utils.features_incrementais import atualizar_features_rodada
 
 # --- CAMINHOS E URLs ---
 DATA_DIR = os.path.dirname(config.RAW_DATA_PATH)
 HISTORICAL_DATA_PATH = config.HISTORICO_ATUAL_PATH
 
-API_PONTUADOS_URL = "https://api.cartolafc.globo.com/atletas/pontuados/{rodada}"
-
 def coletar_dados_historicos(ano, total_rodadas=38, rodada_especifica=None):
     """
     Coleta os dados de scout e pontuação de todos os jogadores.
@@ -26,107 +29,32 @@ def coletar_dados_historicos(ano, total_rodadas=38, rodada_especifica=None):
         intervalo = [rodada_especifica]
         print(f"Iniciando atualização INCREMENTAL para a rodada {rodada_especifica} de {ano}...")
     else:
-        intervalo = range(1, total_rodadas + 1)
+        # Temporada inteira: rodadas buscadas em paralelo e gravadas conforme chegam
         print(f"Iniciando a coleta COMPLETA de dados históricos para a temporada de {ano}...")
+        df_novos = coletar_pontuados(ano, range(1, total_rodadas + 1))
+        if df_novos.empty:
+            print("Nenhum dado coletado.")
+            return None
+        print(f"\n✅ Histórico de {ano} atualizado: {len(df_novos)} registros em {df_novos['rodada'].nunique()} rodada(s).")
+        _atualizar_estado_features(df_novos)
+        return df_novos
 
     novos_dados = []
 
     for rodada in intervalo:
         try:
-            url = API_PONTUADOS_URL.format(rodada=rodada)
+            url = config.API_URL_PONTUADOS.format(rodada=rodada)
             print(f"\n🔄 Coletando Rodada {rodada}...")
-            response = requests.get(url)
+            response = get(url)
             response.raise_for_status()
             
-            dados_rodada = response.json()
-            
-            # Salva resposta da API para debug (apenas se for rodada específica)
-            if rodada_especifica:
-                debug_path = os.path.join(DATA_DIR, f"api_rodada{rodada_especifica}_debug.json")
-                try:
-                    with open(debug_path, 'w', encoding='utf-8') as f:
-                        json.dump(dados_rodada, f, indent=2, ensure_ascii=False)
-                    print(f"   💾 Resposta da API salva em: {debug_path}")
-                except Exception as e:
-                    print(f"   ⚠️ Não foi possível salvar debug: {e}")
-            
-            # Verifica se a resposta é válida
-            if not dados_rodada or not isinstance(dados_rodada, dict):
-                print(f"⚠️ Resposta inválida da API para a rodada {rodada}. Tipo recebido: {type(dados_rodada)}. Pulando.")
-                continue
-            
-            atletas = dados_rodada.get('atletas', {})
-            
-            # Verifica se atletas existe e não é None
-            if atletas is None:
-                print(f"⚠️ Rodada {rodada}: A API retornou 'atletas: null'. A rodada pode ainda não ter dados consolidados.")
-                print(f"   URL testada: {url}")
-                continue
-            
-            if not atletas:
-                print(f"⚠️ Rodada {rodada}: Nenhum atleta encontrado na resposta da API. A rodada pode ainda não ter dados consolidados.")
-                print(f"   URL testada: {url}")
-                continue
-            
-            # Garante que atletas é um dicionário iterável
-            if not isinstance(atletas, dict):
-                print(f"⚠️ Rodada {rodada}: Formato inesperado de dados. Esperado dict, recebido {type(atletas)}. Pulando.")
-                continue
+            # Resposta bruta guardada comprimida no arquivo, para reconstruções offline
+            arquivar_resposta('pontuados', response.content, ano=ano, rodada=rodada, url=url)
 
-            # Conta quantos atletas foram encontrados
-            num_atletas = len(atletas)
-            total_api = dados_rodada.get('total_atletas', num_atletas)
-            print(f"✅ Rodada {rodada}: {num_atletas} atletas no dicionário (API reporta {total_api} total). Processando...")
-
-            # Contadores para diagnóstico
-            processados_ok = 0
-            processados_erro = 0
-            
-            for atleta_id, dados_atleta in atletas.items():
-                try:
-                    # Verifica se dados_atleta é válido
-                    if dados_atleta is None or not isinstance(dados_atleta, dict):
-                        print(f"  ⚠️ Dados inválidos para atleta {atleta_id}. Pulando.")
-                        processados_erro += 1
-                        continue
-                    
-                    registro = {
-                        'ano': ano,
-                        'atleta_id': int(atleta_id),
-                        'rodada': rodada,
-                        'apelido': dados_atleta.get('apelido'),
-                        'clube_id': dados_atleta.get('clube_id'),
-                        'posicao_id': dados_atleta.get('posicao_id'),
-                        'pontuacao': dados_atleta.get('pontuacao', 0),
-                    }
-                    
-                    # Trata scout que pode ser None, {} ou um dict válido
-                    scouts = dados_atleta.get('scout')
-                    if scouts is None:
-                        scouts = {}
-                    elif not isinstance(scouts, dict):
-                        scouts = {}
-                    
-                    # Só faz update se scouts for um dict válido
-                    if isinstance(scouts, dict):
-                        registro.update(scouts)
-                    
-                    novos_dados.append(registro)
-                    processados_ok += 1
-                except Exception as e:
-                    processados_erro += 1
-                    apelido = dados_atleta.get('apelido', 'N/A') if dados_atleta and isinstance(dados_atleta, dict) else 'N/A'
-                    print(f"  ⚠️ Erro ao processar atleta {atleta_id} ({apelido}): {e}")
-                    import traceback
-                    print(f"     Traceback: {traceback.format_exc()}")
-                    continue
-            
-            # Resumo do processamento
-            print(f"   ✓ Processados com sucesso: {processados_ok}")
-            if processados_erro > 0:
-                print(f"   ✗ Erros: {processados_erro}")
-            
-            time.sleep(0.5)
+            df_rodada = processar_pontuados(response.content, ano, rodada)
+            if df_rodada is None:
+                continue
+            novos_dados.append(df_rodada)
 
         except requests.exceptions.RequestException as e:
             print(f"❌ Erro ao buscar dados da rodada {rodada}: {e}. Pulando.")
@@ -139,47 +67,128 @@ def coletar_dados_historicos(ano, total_rodadas=38, rodada_especifica=None):
             print(f"   Detalhes: {traceback.format_exc()}")
             continue
 
+    return _salvar_historico(novos_dados, ano, rodada_especifica)
+
+def processar_pontuados(dados_rodada, ano, rodada):
+    """
+    Converte a resposta de /atletas/pontuados/{rodada} em registros do histórico de jogadores.
+    Usada pela coleta e pela reconstrução a partir do arquivo bruto (snapshots_api).
+
+    Args:
+        dados_rodada (dict | bytes): JSON decodificado ou o corpo da resposta (os bytes são
+            percorridos em streaming se o 'ijson' estiver instalado; ver leitura_colunar).
+
+    Returns:
+        DataFrame com os registros (colunas de scout fixas), ou None se a resposta não tiver atletas válidos.
+    """
+    if isinstance(dados_rodada, (bytes, bytearray)) and not IJSON_DISPONIVEL:
+        try:
+            dados_rodada = json.loads(dados_rodada)
+        except ValueError:
+            print(f"⚠️ Rodada {rodada}: a resposta da API não é um JSON válido. Pulando.")
+            return None
+
+    if isinstance(dados_rodada, (bytes, bytearray)):
+        df = pontuados_colunar(dados_rodada, ano, rodada)
+        if df.empty:
+            print(f"⚠️ Rodada {rodada}: Nenhum atleta encontrado na resposta da API. A rodada pode ainda não ter dados consolidados.")
+            return None
+        print(f"✅ Rodada {rodada}: {len(df)} atletas processados.")
+        return df
+
+    # Verifica se a resposta é válida
+    if not dados_rodada or not isinstance(dados_rodada, dict):
+        print(f"⚠️ Resposta inválida da API para a rodada {rodada}. Tipo recebido: {type(dados_rodada)}. Pulando.")
+        return None
+    
+    atletas = dados_rodada.get('atletas', {})
+    
+    # Verifica se atletas existe e não é None
+    if atletas is None:
+        print(f"⚠️ Rodada {rodada}: A API retornou 'atletas: null'. A rodada pode ainda não ter dados consolidados.")
+        print(f"   URL testada: {config.API_URL_PONTUADOS.format(rodada=rodada)}")
+        return None
+    
+    if not atletas:
+        print(f"⚠️ Rodada {rodada}: Nenhum atleta encontrado na resposta da API. A rodada pode ainda não ter dados consolidados.")
+        print(f"   URL testada: {config.API_URL_PONTUADOS.format(rodada=rodada)}")
+        return None
+    
+    # Garante que atletas é um dicionário iterável
+    if not isinstance(atletas, dict):
+        print(f"⚠️ Rodada {rodada}: Formato inesperado de dados. Esperado dict, recebido {type(atletas)}. Pulando.")
+        return None
+
+    # Conta quantos atletas foram encontrados
+    num_atletas = len(atletas)
+    total_api = dados_rodada.get('total_atletas', num_atletas)
+    print(f"✅ Rodada {rodada}: {num_atletas} atletas no dicionário (API reporta {total_api} total). Processando...")
+
+    df = pontuados_colunar(dados_rodada, ano, rodada)
+
+    # Resumo do processamento (atletas com dados inválidos são pulados e registrados no log)
+    print(f"   ✓ Processados com sucesso: {len(df)}")
+    if len(df) < num_atletas:
+        print(f"   ✗ Erros: {num_atletas - len(df)}")
+
+    return df if not df.empty else None
+
+def _atualizar_estado_features(df_novos):
+    """Aplica as rodadas gravadas ao estado das features rolantes, lido depois pelo treino (rodadas já aplicadas são ignoradas)."""
+    try:
+        atualizar_features_rodada(df_novos)
+    except Exception as e:
+        # O histórico já está gravado; o estado pode ser refeito depois com reconstruir_estado_features()
+        print(f"⚠️ Estado incremental de features não atualizado: {e}")
+
+def _salvar_historico(novos_dados, ano, rodada_especifica=None):
+    """Grava as partições das rodadas em 'novos_dados' (lista de DataFrames de processar_pontuados)."""
     if not novos_dados:
         print("Nenhum dado coletado.")
         return None
 
-    df_novos = pd.DataFrame(novos_dados)
-    df_novos.fillna(0, inplace=True)
+    df_novos = pd.concat(novos_dados, ignore_index=True)
+    df_novos.fillna(0, inplace=True)  # Scouts extras presentes só em algumas rodadas
     
-    if not os.path.exists(DATA_DIR):
-        os.makedirs(DATA_DIR)
-
     # --- LÓGICA DE SALVAMENTO ---
-    if rodada_especifica and os.path.exists(HISTORICAL_DATA_PATH):
-        # Carrega arquivo existente
-        df_existente = pd.read_csv(HISTORICAL_DATA_PATH)
-        
-        # Conta quantos registros existiam dessa rodada antes
-        registros_antigos = len(df_existente[(df_existente['ano'] == ano) & (df_existente['rodada'] == rodada_especifica)])
-        
-        # Remove dados antigos dessa mesma rodada para não duplicar
-        df_existente = df_existente[~((df_existente['ano'] == ano) & (df_existente['rodada'] == rodada_especifica))]
-        
-        # Concatena
-        df_final = pd.concat([df_existente, df_novos], ignore_index=True)
-        df_final.sort_values(by=['rodada', 'atleta_id'], inplace=True)
-        
-        modo = "atualizado"
+    # Apenas as partições (ano, rodada) coletadas são regravadas; o restante do histórico não é tocado.
+    rodadas_coletadas = sorted(df_novos['rodada'].unique())
+    df_antigos = carregar_tabela('jogadores', colunas=['atleta_id'], anos=[ano], rodadas=rodadas_coletadas)
+    registros_antigos = len(df_antigos) if df_antigos is not None else 0
+
+    salvar_particoes(df_novos, 'jogadores')
+    _atualizar_estado_features(df_novos)
+
+    if rodada_especifica:
         registros_novos = len(df_novos)
         print(f"\n📊 Resumo da atualização da Rodada {rodada_especifica}:")
         print(f"   - Registros antigos removidos: {registros_antigos}")
         print(f"   - Registros novos adicionados: {registros_novos}")
         if registros_novos == 0:
             print(f"   ⚠️ ATENÇÃO: Nenhum dado novo foi coletado. A API pode ainda não ter os dados consolidados.")
-    else:
-        # Se for coleta completa ou arquivo não existir, sobrescreve/cria
-        df_final = df_novos
-        modo = "criado"
-        
-    df_final.to_csv(HISTORICAL_DATA_PATH, index=False, encoding='utf-8-sig')
-    print(f"\n✅ Arquivo '{HISTORICAL_DATA_PATH}' {modo} com sucesso! Total: {len(df_final)} registros.")
-    
-    return df_final
+
+    print(f"\n✅ Histórico de {ano} atualizado: {len(df_novos)} registros em {len(rodadas_coletadas)} rodada(s).")
+    return df_novos
+
+def reconstruir_historico_jogadores(ano, rodadas=None):
+    """
+    Regrava as partições do histórico de jogadores a partir do arquivo bruto, sem acessar a API.
+
+    Args:
+        ano (int): Temporada.
+        rodadas (list, optional): Rodadas a reconstruir. Padrão: todas as arquivadas.
+    """
+    rodadas = rodadas or rodadas_arquivadas('pontuados', ano)
+    novos_dados = []
+    for rodada in rodadas:
+        dados_rodada = carregar_snapshot('pontuados', ano, rodada)
+        if dados_rodada is None:
+            print(f"⚠️ Rodada {rodada} de {ano} não está no arquivo bruto. Pulando.")
+            continue
+        df_rodada = processar_pontuados(dados_rodada, ano, rodada)
+        if df_rodada is not None:
+            novos_dados.append(df_rodada)
+    return _salvar_historico(novos_dados, ano)
 
 if __name__ == "__main__":
     # Exemplo de uso manual
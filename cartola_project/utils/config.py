@@ -8,9 +8,11 @@ DATA_DIR = os.path.join(PROJECT_ROOT, "data")
 LOG_DIR = os.path.join(PROJECT_ROOT, "logs")
 MODEL_DIR = os.path.join(DATA_DIR, "modelos")
 CACHE_DIR = os.path.join(DATA_DIR, "cache")
+FEATURE_CACHE_DIR = os.path.join(CACHE_DIR, "features")
+WAREHOUSE_DIR = os.path.join(DATA_DIR, "warehouse")
 
 # Cria diretórios se não existirem
-for directory in [DATA_DIR, LOG_DIR, MODEL_DIR, CACHE_DIR]:
+for directory in [DATA_DIR, LOG_DIR, MODEL_DIR, CACHE_DIR, FEATURE_CACHE_DIR, WAREHOUSE_DIR]:
     if not os.path.exists(directory):
         os.makedirs(directory, exist_ok=True)
 
@@ -30,6 +32,7 @@ class Config:
         # Arquivos de Dados
         self.RAW_DATA_PATH = os.path.join(DATA_DIR, "rodada_atual.csv")
         self.PROCESSED_DATA_PATH = os.path.join(DATA_DIR, "rodada_atual_processada.csv")
+        self.EXPLICACOES_PATH = os.path.join(DATA_DIR, "explicacoes_rodada.csv")
         self.CLUBS_DATA_PATH = os.path.join(DATA_DIR, "clubes.json")
         self.MATCHES_DATA_PATH = os.path.join(DATA_DIR, "partidas_rodada.csv")
         self.HISTORICAL_MATCHES_PATH = os.path.join(DATA_DIR, "historico_partidas.csv")
@@ -41,18 +44,36 @@ class Config:
         self.ESTATISTICAS_TIMES_PATH = os.path.join(DATA_DIR, "estatisticas_times.csv")
         self.METRICS_PATH = os.path.join(MODEL_DIR, "metricas.json")
         self.CACHE_DIR_PATH = CACHE_DIR
+        self.FEATURE_STATE_PATH = os.path.join(CACHE_DIR, "estado_features.sqlite")  # Estado das features rolantes (features_incrementais.py)
+        self.FEATURE_CACHE_DIR = FEATURE_CACHE_DIR
+        self.WAREHOUSE_DIR = WAREHOUSE_DIR  # Parquet particionado por ano/rodada (ver utils/armazenamento.py)
+        self.ANALYTICS_DB_PATH = os.path.join(CACHE_DIR, "analitico.sqlite")  # Derivado do armazém (banco_analitico.py)
+        self.TENSORES_DIR = os.path.join(CACHE_DIR, "tensores")  # Arrays .npy (ano, rodada, atleta) das simulações (tensores.py)
+        self.SNAPSHOTS_DIR = os.path.join(DATA_DIR, "raw_api")  # Respostas brutas comprimidas das APIs (snapshots_api.py)
+        self.SNAPSHOTS_INDEX_PATH = os.path.join(DATA_DIR, "raw_api", "indice.sqlite")
+        self.HTTP_VALIDADORES_PATH = os.path.join(CACHE_DIR, "http_validadores.json")  # ETag/Last-Modified das coletas (cliente_http.py)
+        self.FBREF_HTML_DIR = os.path.join(DATA_DIR, "fbref", "html")  # Páginas do FBref comprimidas, por temporada (fbref_html.py)
+        self.FBREF_PROCESSOS = None  # Extração das páginas do FBref: None = um processo por núcleo, limitado às páginas
+        self.FBREF_PARALELO_MIN_PAGINAS = 4  # Abaixo disso a extração é serial
+        self.FEATURE_CACHE_GERACOES = 3
+        self.FEATURE_PROCESSOS = None  # None = um processo por temporada, limitado aos núcleos
+        self.FEATURE_PARALELO_MIN_LINHAS = 150000  # Abaixo disso o custo de subir processos não compensa
 
         # Configurações do Otimizador
         self.ORCAMENTO_PADRAO = 140.0
         self.MAX_JOGADORES_POR_CLUBE = 5
         
-        # Configurações de API
+        # Configurações de API (utils/servidor_mock.apontar_para troca os hosts pelo servidor local)
         self.API_URL_MERCADO = "https://api.cartolafc.globo.com/atletas/mercado"
         self.API_URL_PARTIDAS = "https://api.cartolafc.globo.com/partidas"
+        self.API_URL_PONTUADOS = "https://api.cartolafc.globo.com/atletas/pontuados/{rodada}"
+        self.API_URL_PARCIAIS = "https://api.cartolafc.globo.com/atletas/pontuados"  # Rodada em andamento (parciais.py)
+        self.GE_URL_JOGOS = "https://api.globoesporte.globo.com/tabela/{id_campeonato}/fase/fase-unica-campeonato-brasileiro-{ano}/rodada/{rodada}/jogos"
         self.ODDS_API_URL = "https://api.the-odds-api.com/v4/sports/soccer_brazil_campeonato/odds"
         
         # Configurações de Treinamento
         self.ANO_MINIMO_TREINO = 2022
+        self.JANELA_FORCA_TIMES = 38  # Jogos considerados na força do adversário (as-of)
         self.TEST_SIZE = 0.2
         self.RANDOM_STATE = 42
 
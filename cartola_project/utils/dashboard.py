@@ -1,9 +1,7 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import os
-import json
-from utils.config import config
+from utils.carregamento import carregar_historico_jogadores, mapa_nomes_clubes, POSICAO_NOMES
 
 def render_dashboard():
     st.header("📊 Dashboard Analítico (2024-2026)")
@@ -15,25 +13,17 @@ def render_dashboard():
     # --- Carregamento de Dados ---
     @st.cache_data
     def carregar_dados_dashboard():
-        if os.path.exists(config.HISTORICAL_DATA_PATH):
-            df = pd.read_csv(config.HISTORICAL_DATA_PATH, low_memory=False)
-            # Mapeamento de Posições
-            mapa_posicoes = {
-                1: "Goleiro", 2: "Lateral", 3: "Zagueiro", 
-                4: "Meia", 5: "Atacante", 6: "Técnico"
-            }
-            # Garante que posicao_id seja numérico para o mapeamento
-            df['posicao_id'] = pd.to_numeric(df['posicao_id'], errors='coerce')
-            df['Posicao'] = df['posicao_id'].map(mapa_posicoes).fillna("Desconhecido")
+        df = carregar_historico_jogadores(colunas=['apelido', 'clube_id', 'posicao_id', 'pontuacao', 'G', 'A', 'DS', 'SG'])
+        if df is not None:
+            # Posição já normalizada pelo carregador (0 = desconhecida)
+            df['Posicao'] = pd.Categorical(df['posicao_id'].map(POSICAO_NOMES).fillna("Desconhecido"))
             
-            # Carregar nomes dos clubes
-            try:
-                with open(config.CLUBS_DATA_PATH, 'r', encoding='utf-8') as f:
-                    clubes_json = json.load(f)
-                mapa_clubes = {int(k): v['nome'] for k, v in clubes_json.items()}
-                df['clube_id'] = pd.to_numeric(df['clube_id'], errors='coerce')
-                df['Clube'] = df['clube_id'].map(mapa_clubes).fillna("Outros")
-            except:
+            # Nomes dos clubes
+            mapa_clubes = mapa_nomes_clubes('nome')
+            if mapa_clubes:
+                clube_num = pd.to_numeric(df['clube_id'].astype(str), errors='coerce')
+                df['Clube'] = pd.Categorical(clube_num.map(mapa_clubes).fillna("Outros"))
+            else:
                 df['Clube'] = df['clube_id'].astype(str)
 
             return df
@@ -80,7 +70,7 @@ def render_dashboard():
     st.subheader("💡 Desempenho por Posição")
     
     # Agregação por Posição
-    agg_posicao = df_filtrado.groupby('Posicao').agg({
+    agg_posicao = df_filtrado.groupby('Posicao', observed=True).agg({
         'pontuacao': ['mean', 'max', 'std'],
         'atleta_id': 'count'
     }).reset_index()
@@ -117,7 +107,7 @@ def render_dashboard():
     
     min_jogos = st.slider("Mínimo de Jogos disputados", 1, max(38, qtd_rodadas), int(min_jogos_default))
     
-    agg_jogador = df_filtrado.groupby(['apelido', 'Clube', 'Posicao']).agg({
+    agg_jogador = df_filtrado.groupby(['apelido', 'Clube', 'Posicao'], observed=True).agg({
         'pontuacao': ['mean', 'count', 'sum'],
         'G': 'sum',
         'A': 'sum',
@@ -142,7 +132,7 @@ def render_dashboard():
     st.divider()
     st.subheader("🏟️ Força dos Times (Média de Pontuação Cedida/Conquistada)")
     
-    agg_time = df_filtrado.groupby('Clube').agg({
+    agg_time = df_filtrado.groupby('Clube', observed=True).agg({
         'pontuacao': ['mean', 'sum'],
         'G': 'sum',
         'SG': 'sum'
@@ -0,0 +1,275 @@
+"""
+Cache das páginas do FBref e extração das tabelas de estatísticas.
+
+Cada página baixada é guardada comprimida (gzip) em data/fbref/html/<ano>/, com um índice
+(indice.json) de URL, horário da coleta e clube. Refazer a conversão e a limpeza dos jogadores
+(jogadores_do_cache, limpar_fbref_jogadores.py) usa só o cache, sem acessar o site. A extração
+das páginas dos clubes roda num pool de processos (config.FBREF_PROCESSOS): cada processo recebe
+só o caminho da página comprimida e devolve a tabela de jogadores já limpa.
+
+As tabelas são extraídas numa única passada do lxml sobre o documento, incluindo as que o FBref
+entrega dentro de comentários HTML (carregadas por JavaScript no navegador). O cabeçalho vem da
+última linha do <thead> (sem a linha agrupadora 'Playing Time', 'Performance'...) e as linhas de
+cabeçalho repetidas no meio do <tbody> são descartadas ali mesmo: o CSV sai sem cabeçalhos
+duplicados nem sub-cabeçalhos, sem limpeza posterior.
+"""
+
+import os
+import re
+import gzip
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+import pandas as pd
+from lxml import etree, html as lxml_html
+from utils.config import config, logger
+from utils.arquivos import escrita_atomica, salvar_json, trava_arquivo
+from utils.acesso_dados import ler_json
+from utils.navegadores import obter_html, obter_htmls
+
+VALIDADE_HORAS = 24  # Páginas mais novas que isso não são baixadas de novo numa coleta
+NIVEL_GZIP = 6
+CLASSES_IGNORADAS = ('thead', 'over_header', 'spacer', 'partial_table')  # Linhas de cabeçalho/separadores no <tbody>
+_NUMERO = re.compile(r'^-?[\d,]*\.?\d+$')
+
+def _indice_path():
+    return os.path.join(config.FBREF_HTML_DIR, "indice.json")
+
+def _indice():
+    return ler_json(_indice_path()) or {}
+
+def _arquivo(url, ano):
+    nome = re.sub(r'[^A-Za-z0-9]+', '-', url.split('://')[-1]).strip('-')[-60:]
+    return os.path.join(str(ano), f"{nome}-{hashlib.sha1(url.encode('utf-8')).hexdigest()[:10]}.html.gz")
+
+def guardar_html(url, ano, html, clube=None):
+    """Grava a página comprimida no cache e a registra no índice (com o clube, se for página de clube)."""
+    relativo = _arquivo(url, ano)
+    with escrita_atomica(os.path.join(config.FBREF_HTML_DIR, relativo)) as temporario:
+        with open(temporario, 'wb') as f:
+            f.write(gzip.compress(html.encode('utf-8'), compresslevel=NIVEL_GZIP))
+    with trava_arquivo(_indice_path()):
+        indice = _indice()
+        anterior = indice.setdefault(str(ano), {}).get(url, {})
+        indice[str(ano)][url] = {'arquivo': relativo, 'coletado_em': datetime.now().isoformat(timespec='seconds'),
+                                 'clube': clube or anterior.get('clube')}
+        salvar_json(indice, _indice_path(), indent=2, ensure_ascii=False)
+
+def html_em_cache(url, ano, validade_horas=None):
+    """
+    HTML da página guardada, ou None se ela não estiver no cache.
+    Com 'validade_horas', páginas coletadas há mais tempo que isso também contam como ausentes.
+    """
+    registro = _indice().get(str(ano), {}).get(url)
+    if registro is None:
+        return None
+    if validade_horas is not None and \
+            datetime.now() - datetime.fromisoformat(registro['coletado_em']) > timedelta(hours=validade_horas):
+        return None
+    caminho = os.path.join(config.FBREF_HTML_DIR, registro['arquivo'])
+    if not os.path.exists(caminho):
+        return None
+    return _ler_pagina(caminho)
+
+def _ler_pagina(caminho):
+    with open(caminho, 'rb') as f:
+        return gzip.decompress(f.read()).decode('utf-8')
+
+def paginas_em_cache(ano, apenas_clubes=False):
+    """{url: registro do índice} das páginas guardadas da temporada."""
+    paginas = _indice().get(str(ano), {})
+    return {url: r for url, r in paginas.items() if r.get('clube') or not apenas_clubes}
+
+def temporadas_em_cache():
+    """Temporadas com páginas guardadas, em ordem."""
+    return sorted(int(ano) for ano, paginas in _indice().items() if paginas)
+
+def baixar_html(url, ano, pool=None, forcar=False, clube=None):
+    """HTML de 'url' pelo cache (se coletado há menos de VALIDADE_HORAS) ou pela rede, guardando o resultado."""
+    html = None if forcar else html_em_cache(url, ano, VALIDADE_HORAS)
+    if html is None:
+        html = obter_html(url, pool)
+        if html is not None:
+            guardar_html(url, ano, html, clube)
+    return html
+
+def baixar_htmls(urls, ano, pool=None, forcar=False, clubes=None):
+    """
+    {url: html} de várias páginas: as do cache ainda válidas saem dele, as demais são baixadas
+    juntas (obter_htmls) e guardadas.
+
+    Args:
+        clubes (dict, optional): {url: nome do clube}, registrado no índice com cada página.
+    """
+    clubes = clubes or {}
+    paginas = {url: None if forcar else html_em_cache(url, ano, VALIDADE_HORAS) for url in urls}
+    faltando = [url for url, html in paginas.items() if html is None]
+    if faltando:
+        logger.info(f"FBref: {len(urls) - len(faltando)} página(s) do cache, {len(faltando)} a baixar.")
+        for url, html in obter_htmls(faltando, pool).items():
+            paginas[url] = html
+            if html is not None:
+                guardar_html(url, ano, html, clubes.get(url))
+    return paginas
+
+# --- Extração ---
+
+def _nomes_unicos(nomes):
+    """Nomes vazios viram 'Unnamed: i' e repetidos ganham '.1', '.2'... (como o pandas)."""
+    vistos, unicos = {}, []
+    for i, nome in enumerate(nomes):
+        nome = nome or f"Unnamed: {i}"
+        if nome in vistos:
+            vistos[nome] += 1
+            nome = f"{nome}.{vistos[nome]}"
+        else:
+            vistos[nome] = 0
+        unicos.append(nome)
+    return unicos
+
+def _converter(coluna):
+    """Coluna de texto -> numérica se todos os valores preenchidos forem números (aceita '3,240')."""
+    preenchidos = coluna.dropna()
+    if preenchidos.empty:
+        return coluna.astype(float)
+    if not preenchidos.map(lambda v: bool(_NUMERO.match(v))).all():
+        return coluna
+    return pd.to_numeric(coluna.str.replace(',', '', regex=False))
+
+def _tabela_para_dataframe(tabela):
+    cabecalhos = [tr for tr in tabela.xpath('./thead/tr') if 'over_header' not in (tr.get('class') or '')]
+    if not cabecalhos:
+        return None
+    colunas = _nomes_unicos([c.text_content().strip() for c in cabecalhos[-1] if c.tag in ('th', 'td')])
+    linhas = []
+    for tr in tabela.xpath('./tbody/tr'):
+        if any(classe in (tr.get('class') or '') for classe in CLASSES_IGNORADAS):
+            continue
+        celulas = [c.text_content().strip() or None for c in tr if c.tag in ('th', 'td')]
+        if len(celulas) == len(colunas) and any(celulas) and celulas[0] != colunas[0]:
+            linhas.append(celulas)
+    df = pd.DataFrame(linhas, columns=colunas, dtype=object)
+    return df.apply(_converter).drop(columns=['Matches'], errors='ignore')  # 'Matches' é só o link para os jogos
+
+def _tabelas(documento):
+    yield from documento.iter('table')
+    for comentario in documento.iter(etree.Comment):
+        if comentario.text and '<table' in comentario.text:
+            yield from lxml_html.fragment_fromstring(comentario.text, create_parent='div').iter('table')
+
+def _iterar_tabelas(html):
+    documento = lxml_html.fromstring(html)
+    for n, tabela in enumerate(_tabelas(documento)):
+        if 'stats_table' not in (tabela.get('class') or ''):
+            continue
+        df = _tabela_para_dataframe(tabela)
+        if df is not None and not df.empty:
+            yield tabela.get('id') or f"tabela_{n}", df
+
+def extrair_tabelas(html):
+    """
+    Tabelas de estatísticas (class 'stats_table') da página, visíveis ou em comentários.
+
+    Returns:
+        {id da tabela: DataFrame}, na ordem da página (tabelas sem id recebem 'tabela_<n>').
+    """
+    return dict(_iterar_tabelas(html))
+
+def links_clubes(html):
+    """[{'nome', 'url'}] dos clubes na tabela de classificação da página da liga (sem repetir URLs)."""
+    documento = lxml_html.fromstring(html)
+    tabela = next(iter(documento.xpath('//table[starts-with(@id, "results")]')), None)
+    if tabela is None:
+        tabela = next((t for t in _tabelas(documento) if 'stats_table' in (t.get('class') or '')), None)
+    if tabela is None:
+        return []
+    clubes, vistos = [], set()
+    for link in tabela.xpath('.//a[contains(@href, "/squads/")]'):
+        url = link.get('href')
+        if url.startswith('/'):
+            url = f"https://fbref.com{url}"
+        nome = link.text_content().strip()
+        if nome and url not in vistos:
+            vistos.add(url)
+            clubes.append({'nome': nome, 'url': url})
+    return clubes
+
+def jogadores_de_pagina(html, nome_clube, url_clube):
+    """
+    Tabela de jogadores (estatísticas padrão) da página de um clube, com as colunas Clube e URL_Clube.
+    É a primeira tabela com coluna 'Player' e mais de 5 linhas. Retorna None se não houver.
+    """
+    for _, df in _iterar_tabelas(html):  # Para na primeira: as demais tabelas nem são convertidas
+        if 'Player' in df.columns and len(df) > 5:
+            df = df[df['Player'].notna()].copy()
+            df['Clube'] = nome_clube
+            df['URL_Clube'] = url_clube
+            return df
+    return None
+
+def consolidar_jogadores(dfs):
+    """Junta as tabelas dos clubes numa só, sem jogadores repetidos no mesmo clube."""
+    dfs = [df for df in dfs if df is not None and not df.empty]
+    if not dfs:
+        return None
+    df = pd.concat(dfs, ignore_index=True)
+    return df.drop_duplicates(subset=['Player', 'Clube'], keep='first').reset_index(drop=True)
+
+def _jogadores_do_arquivo(caminho, nome_clube, url_clube):
+    """Worker do pool: lê a página comprimida do cache e extrai os jogadores (só o caminho trafega até o processo)."""
+    return jogadores_de_pagina(_ler_pagina(caminho), nome_clube, url_clube)
+
+def _definir_processos(n_paginas, n_processos=None):
+    """Quantos processos usar: 1 (serial) para poucas páginas."""
+    if n_processos is None:
+        n_processos = config.FBREF_PROCESSOS
+        if n_processos is None:
+            if n_paginas < config.FBREF_PARALELO_MIN_PAGINAS:
+                return 1
+            n_processos = os.cpu_count() or 1
+    return max(1, min(n_processos, n_paginas))
+
+def jogadores_do_cache(ano, clubes=None, n_processos=None):
+    """
+    Tabela consolidada dos jogadores a partir das páginas de clubes guardadas (sem acesso à rede).
+
+    Args:
+        clubes (dict, optional): {url: nome do clube} das páginas a usar. Padrão: todas as
+            páginas de clubes da temporada no cache.
+        n_processos (int, optional): Processos da extração (padrão em config).
+    """
+    registros = _indice().get(str(ano), {})
+    if clubes is None:
+        clubes = {url: r['clube'] for url, r in registros.items() if r.get('clube')}
+    tarefas = []
+    for url, nome in clubes.items():
+        caminho = os.path.join(config.FBREF_HTML_DIR, registros[url]['arquivo']) if url in registros else None
+        if caminho is None or not os.path.exists(caminho):
+            logger.warning(f"FBref: página de {nome} ausente do cache.")
+            continue
+        tarefas.append((caminho, nome, url))
+    if not tarefas:
+        return None
+
+    inicio = time.perf_counter()
+    n_processos = _definir_processos(len(tarefas), n_processos)
+    if n_processos == 1:
+        dfs = [_jogadores_do_arquivo(*tarefa) for tarefa in tarefas]
+    else:
+        with ProcessPoolExecutor(max_workers=n_processos) as pool:
+            dfs = list(pool.map(_jogadores_do_arquivo, *zip(*tarefas)))
+    for (_, nome, _), df in zip(tarefas, dfs):
+        if df is None:
+            logger.warning(f"FBref: nenhum jogador na página de {nome}.")
+    logger.info(f"FBref: {len(tarefas)} páginas de clubes extraídas em {n_processos} processo(s) "
+                f"({time.perf_counter() - inicio:.2f}s).")
+    return consolidar_jogadores(dfs)
+
+if __name__ == "__main__":
+    import sys
+    ano = int(sys.argv[1]) if len(sys.argv) > 1 else max(temporadas_em_cache(), default=config.CURRENT_YEAR)
+    paginas = paginas_em_cache(ano)
+    print(f"{len(paginas)} página(s) do FBref em cache para {ano}:")
+    for url, registro in paginas.items():
+        print(f"  {registro['coletado_em']}  {registro['clube'] or '-':<20} {url}")
@@ -1,18 +1,348 @@
 import pandas as pd
 import numpy as np
 import os
-import json
+import time
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from utils.config import config, logger
+from utils.cache_features import calcular_chave_features, ler_cache_features, salvar_cache_features
+from utils.armazenamento import carregar_tabela
+from utils.acesso_dados import carregar_clubes_json
 
-def preparar_features_historicas(df):
-    """Cria features preditivas baseadas no passado."""
-    logger.info("Engenharia de Features em andamento...")
+try:
+    from pyarrow import feather
+    PYARROW_DISPONIVEL = True
+except ImportError:
+    PYARROW_DISPONIVEL = False
+
+# Scouts detalhados usados nas features históricas
+SCOUTS_ALVO = ['G', 'A', 'DS', 'SG', 'FS', 'FF', 'FD', 'FT', 'I', 'PE', 'DE', 'DP', 'GC', 'CV', 'CA', 'GS', 'PP', 'PS']
+CHAVES_ATLETA = ['ano', 'atleta_id']
+
+# Grupos de modelos: posições atendidas e scouts relevantes (feature selection por posição)
+POSICOES_POR_GRUPO = {'gol': [1], 'def': [2, 3], 'mei': [4], 'ata': [5], 'tec': [6]}
+SCOUTS_POR_GRUPO = {
+    'gol': ['DE', 'GS', 'SG', 'DP', 'PS'],
+    'def': ['SG', 'DS', 'FS', 'G', 'A', 'CA', 'CV', 'GC'],
+    'mei': ['G', 'A', 'DS', 'FS', 'FF', 'FD', 'FT', 'I', 'PP', 'CA'],
+    'ata': ['G', 'A', 'DS', 'FS', 'FF', 'FD', 'FT', 'I', 'PP', 'CA'],
+    'tec': []
+}
+
+def montar_plano_features(grupos=None):
+    """
+    Define quais features precisam ser construídas para os grupos de modelo informados.
+    Sem grupos, o plano cobre todas as posições e todos os scouts (comportamento completo).
+    
+    Returns:
+        dict com 'grupos', 'posicoes' (None = todas), 'scouts' e 'colunas' a serem geradas.
+    """
+    if grupos is None:
+        posicoes, scouts = None, list(SCOUTS_ALVO)
+    else:
+        grupos = sorted(set(grupos))
+        desconhecidos = [g for g in grupos if g not in POSICOES_POR_GRUPO]
+        if desconhecidos:
+            raise ValueError(f"Grupos de modelo desconhecidos: {desconhecidos}")
+        posicoes = sorted({p for g in grupos for p in POSICOES_POR_GRUPO[g]})
+        necessarios = {s for g in grupos for s in SCOUTS_POR_GRUPO[g]}
+        scouts = [s for s in SCOUTS_ALVO if s in necessarios]
+    
+    colunas = ['pontos_last', 'media_3_rodadas', 'media_temporada']
+    for col in scouts:
+        colunas += [f'{col}_last', f'media_{col}_last3', f'media_{col}_season']
+    return {'grupos': grupos, 'posicoes': posicoes, 'scouts': scouts, 'colunas': colunas}
+
+def filtrar_atletas_do_plano(df, plano):
+    """
+    Mantém apenas os atletas (por temporada) que tiveram alguma rodada nas posições do plano.
+    Todas as rodadas desses atletas são preservadas para não alterar as médias rolantes.
+    """
+    if plano['posicoes'] is None or not pd.api.types.is_numeric_dtype(df['posicao_id']):
+        return df
+    chaves_plano = pd.MultiIndex.from_frame(df.loc[df['posicao_id'].isin(plano['posicoes']), CHAVES_ATLETA])
+    return df[pd.MultiIndex.from_frame(df[CHAVES_ATLETA]).isin(chaves_plano)]
+
+def filtrar_linhas_validas(df):
+    """Linhas usadas no treino: posição conhecida (0 = desconhecida) e pontuação registrada e diferente de zero."""
+    return df[(df['posicao_id'] != 0) & df['pontuacao'].notna() & (df['pontuacao'] != 0)]
+
+def calcular_features_rolantes(df, scouts=None):
+    """
+    Calcula as features temporais (pontuação e scouts) de forma vetorizada.
+    
+    Espera o DataFrame ordenado por ['ano', 'atleta_id', 'rodada']. Todas as colunas
+    são processadas em bloco: um único shift agrupado, médias expansivas via
+    cumsum/cumcount agrupados e uma única EWM agrupada sobre a matriz de scouts.
+    """
+    if scouts is None:
+        scouts = SCOUTS_ALVO
+    cols_existentes = [col for col in scouts if col in df.columns]
+    
+    grupos = df.groupby(CHAVES_ATLETA, sort=False).ngroup().to_numpy()
+    
+    # 1. Valores da rodada anterior (um único shift para todas as colunas)
+    origem = ['pontuacao'] + cols_existentes
+    ultimos = df[origem].astype(float).groupby(grupos).shift(1)
+    ultimos.columns = ['pontos_last'] + [f'{col}_last' for col in cols_existentes]
+    
+    # 2. Média móvel exponencial (span=3) em uma única passada agrupada
+    ewm = ultimos.groupby(grupos).ewm(span=3, min_periods=1).mean()
+    ewm = ewm.reset_index(level=0, drop=True).reindex(ultimos.index)
+    
+    # 3. Média expansiva = soma acumulada / quantidade acumulada de valores válidos
+    soma = ultimos.fillna(0).groupby(grupos).cumsum()
+    contagem = ultimos.notna().groupby(grupos).cumsum()
+    expansiva = soma / contagem.where(contagem > 0)
+    
+    novas = {
+        'pontos_last': ultimos['pontos_last'],
+        'media_3_rodadas': ewm['pontos_last'],
+        'media_temporada': expansiva['pontos_last'],
+    }
+    for col in cols_existentes:
+        novas[f'{col}_last'] = ultimos[f'{col}_last']
+        novas[f'media_{col}_last3'] = ewm[f'{col}_last'].fillna(0)
+        novas[f'media_{col}_season'] = expansiva[f'{col}_last'].fillna(0)
+    
+    df = df.drop(columns=[c for c in novas if c in df.columns])
+    return pd.concat([df, pd.DataFrame(novas, index=df.index)], axis=1)
+
+def _calcular_features_rolantes_legado(df, scouts=None):
+    """Implementação original (groupby + lambda por coluna). Mantida como referência para o benchmark."""
+    if scouts is None:
+        scouts = SCOUTS_ALVO
+    df = df.copy()
+    df['pontos_last'] = df.groupby(['ano', 'atleta_id'])['pontuacao'].shift(1)
+    df['media_3_rodadas'] = df.groupby(['ano', 'atleta_id'])['pontos_last'].transform(lambda x: x.ewm(span=3, min_periods=1).mean())
+    df['media_temporada'] = df.groupby(['ano', 'atleta_id'])['pontos_last'].transform(lambda x: x.expanding().mean())
+    
+    for col in [col for col in scouts if col in df.columns]:
+        df[f'{col}_last'] = df.groupby(['ano', 'atleta_id'])[col].shift(1)
+        df[f'media_{col}_last3'] = df.groupby(['ano', 'atleta_id'])[f'{col}_last'].transform(lambda x: x.ewm(span=3, min_periods=1).mean())
+        df[f'media_{col}_season'] = df.groupby(['ano', 'atleta_id'])[f'{col}_last'].transform(lambda x: x.expanding().mean())
+        df[f'media_{col}_last3'] = df[f'media_{col}_last3'].fillna(0)
+        df[f'media_{col}_season'] = df[f'media_{col}_season'].fillna(0)
+    return df
+
+def benchmark_features_rolantes(caminho=None, n_temporadas=4, repeticoes=3):
+    """
+    Compara o motor vetorizado com a implementação legada em um histórico de várias temporadas.
+    Se o histórico tiver apenas uma temporada, ela é replicada para simular 'n_temporadas'.
+    """
+    if caminho is None:
+        caminho = config.HISTORICAL_DATA_PATH if os.path.exists(config.HISTORICAL_DATA_PATH) else config.HISTORICO_2025_PATH
+    df = pd.read_csv(caminho, low_memory=False)
+    
+    if df['ano'].nunique() < n_temporadas:
+        ano_base = df['ano'].max()
+        df = pd.concat([df.assign(ano=ano_base - i) for i in range(n_temporadas)], ignore_index=True)
+    df = df.sort_values(['ano', 'atleta_id', 'rodada']).reset_index(drop=True)
+    
+    tempos = {}
+    for nome, func in [('legado', _calcular_features_rolantes_legado), ('vetorizado', calcular_features_rolantes)]:
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            resultado = func(df)
+        tempos[nome] = (time.perf_counter() - inicio) / repeticoes
+        if nome == 'legado':
+            referencia = resultado
+    
+    colunas = [c for c in referencia.columns if c not in df.columns]
+    diferenca = np.nanmax(np.abs(referencia[colunas].to_numpy(float) - resultado[colunas].to_numpy(float)))
+    iguais = all(referencia[c].isna().equals(resultado[c].isna()) for c in colunas) and diferenca < 1e-9
+    
+    print(f"Histórico: {len(df)} linhas, {df['ano'].nunique()} temporadas, {len(colunas)} features")
+    print(f"  Legado:     {tempos['legado']:.3f}s")
+    print(f"  Vetorizado: {tempos['vetorizado']:.3f}s ({tempos['legado'] / tempos['vetorizado']:.1f}x)")
+    print(f"  Saídas idênticas: {iguais} (diferença máxima {diferenca:.2e})")
+    return tempos, iguais
+
+def _calcular_features_base(df, scouts):
+    """Contexto de partidas + features rolantes para um histórico já ordenado."""
+    df = anexar_contexto_partidas(df)
+    return calcular_features_rolantes(df, scouts=scouts)
+
+def _definir_processos(df, n_processos=None):
+    """Quantos processos usar: 1 (serial) para históricos pequenos ou de uma só temporada."""
+    if n_processos is None:
+        n_processos = config.FEATURE_PROCESSOS
+        if n_processos is None:
+            if len(df) < config.FEATURE_PARALELO_MIN_LINHAS:
+                return 1
+            n_processos = os.cpu_count() or 1
+    if not PYARROW_DISPONIVEL:
+        return 1
+    return max(1, min(n_processos, df['ano'].nunique()))
+
+def _processar_particao_temporada(caminho_entrada, caminho_saida, scouts):
+    """
+    Worker do pool: lê a temporada do arquivo Arrow (memory-mapped), calcula as features e
+    grava o resultado em outro arquivo Arrow. Nenhum DataFrame grande trafega via pickle.
+    """
+    df = feather.read_table(caminho_entrada, memory_map=True).to_pandas()
+    df = _calcular_features_base(df, scouts)
+    df.reset_index(drop=True).to_feather(caminho_saida, compression='uncompressed')
+    return caminho_saida
+
+def _calcular_features_por_temporada(df, scouts, n_processos):
+    """Particiona o histórico por 'ano', processa as temporadas em um pool de processos e concatena."""
+    inicio = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="features_", dir=config.CACHE_DIR_PATH) as pasta:
+        tarefas = []
+        for ano, df_ano in df.groupby('ano', sort=True):
+            entrada = os.path.join(pasta, f"temporada_{ano}.feather")
+            df_ano.reset_index(drop=True).to_feather(entrada, compression='uncompressed')
+            tarefas.append((entrada, os.path.join(pasta, f"features_{ano}.feather")))
+
+        with ProcessPoolExecutor(max_workers=n_processos) as pool:
+            futuros = [pool.submit(_processar_particao_temporada, entrada, saida, scouts) for entrada, saida in tarefas]
+            saidas = [futuro.result() for futuro in futuros]
+
+        partes = [feather.read_table(saida, memory_map=True).to_pandas() for saida in saidas]
+    
+    logger.info(f"Features de {len(partes)} temporadas calculadas em {n_processos} processos ({time.perf_counter() - inicio:.2f}s).")
+    return pd.concat(partes, ignore_index=True)
+
+def preparar_features_historicas(df, usar_cache=True, grupos=None, n_processos=None, usar_estado=True):
+    """
+    Cria features preditivas baseadas no passado.
+    
+    Se 'grupos' for informado (ex: ['gol']), apenas os atletas dessas posições e os scouts
+    usados por esses modelos são processados (ver montar_plano_features).
+    O resultado é reaproveitado do cache em disco quando o histórico recebido, os arquivos
+    de partidas/clubes e o código de features não mudaram.
+    
+    Com 'usar_estado', as features rolantes saem do estado incremental (features_incrementais.py)
+    quando ele corresponde ao histórico recebido: só as rodadas ainda não aplicadas são calculadas.
+    
+    Todas as features por atleta são agrupadas por 'ano', então históricos grandes são
+    divididos por temporada e processados em paralelo (n_processos; padrão em config).
+    """
+    plano = montar_plano_features(grupos)
+    if usar_cache:
+        chave = calcular_chave_features(df, plano['grupos'])
+        df_cache = ler_cache_features(chave)
+        if df_cache is not None:
+            return df_cache
+    
+    rolantes = None
+    if usar_estado:
+        # Import local: features_incrementais importa este módulo
+        from utils.features_incrementais import ler_features_do_estado
+        rolantes = ler_features_do_estado(df, plano['scouts'])
+    
+    logger.info(f"Engenharia de Features em andamento (grupos: {plano['grupos'] or 'todos'})...")
+    df = filtrar_atletas_do_plano(df, plano)
     df = df.sort_values(['ano', 'atleta_id', 'rodada'])
     
+    n_processos = _definir_processos(df, n_processos)
+    if rolantes is not None:
+        df = anexar_contexto_partidas(df)
+        chaves = pd.MultiIndex.from_frame(df[['ano', 'atleta_id', 'rodada']].astype('int64'))
+        novas = rolantes.reindex(chaves).set_axis(df.index)
+        df = pd.concat([df.drop(columns=[c for c in novas.columns if c in df.columns]), novas], axis=1)
+    elif n_processos > 1:
+        df = _calcular_features_por_temporada(df, plano['scouts'], n_processos)
+    else:
+        df = _calcular_features_base(df, plano['scouts'])
+    
+    df = df.dropna(subset=['media_temporada']).copy()
+    if usar_cache:
+        salvar_cache_features(df, chave)
+    return df
+
+# Colunas de força calculadas por time e o valor usado quando não há jogos anteriores
+FORCA_TIMES_PADRAO = {
+    'media_gols_feitos': 1.0,
+    'media_gols_sofridos': 1.0,
+    'aproveitamento': 50.0,
+    'taxa_sg': None,  # Preenchida com a média da liga
+}
+
+def calcular_forca_times(df_partidas, janela=None):
+    """
+    Calcula a força de cada time APÓS cada rodada, com base nos seus últimos 'janela' jogos.
+    Retorna uma linha por (clube_id, ano, rodada) com médias de gols feitos/sofridos,
+    aproveitamento (%) e taxa de jogos sem sofrer gols (%).
+    """
+    if janela is None:
+        janela = config.JANELA_FORCA_TIMES
+    
+    df_jogos = df_partidas.dropna(subset=['placar_mandante', 'placar_visitante', 'mandante_id', 'visitante_id'])
+    colunas = ['ano', 'rodada', 'clube_id', 'gols_pro', 'gols_contra']
+    casa = df_jogos[['ano', 'rodada', 'mandante_id', 'placar_mandante', 'placar_visitante']]
+    fora = df_jogos[['ano', 'rodada', 'visitante_id', 'placar_visitante', 'placar_mandante']]
+    casa.columns = colunas
+    fora.columns = colunas
+    
+    df_times = pd.concat([casa, fora], ignore_index=True)
+    df_times['clube_id'] = df_times['clube_id'].astype(float)
+    df_times['ordem'] = df_times['ano'].astype(int) * 100 + df_times['rodada'].astype(int)
+    df_times = df_times.sort_values(['clube_id', 'ordem'], kind='mergesort').reset_index(drop=True)
+    
+    df_times['jogos'] = 1
+    df_times['pontos'] = np.select(
+        [df_times['gols_pro'] > df_times['gols_contra'], df_times['gols_pro'] == df_times['gols_contra']], [3, 1], 0
+    )
+    df_times['sg'] = (df_times['gols_contra'] == 0).astype(int)
+    
+    # Somas móveis dos últimos 'janela' jogos = cumsum - cumsum deslocado de 'janela'
+    somas = ['jogos', 'gols_pro', 'gols_contra', 'pontos', 'sg']
+    acumulado = df_times.groupby('clube_id')[somas].cumsum()
+    anterior = acumulado.groupby(df_times['clube_id']).shift(janela).fillna(0)
+    movel = acumulado - anterior
+    
+    return pd.DataFrame({
+        'clube_id': df_times['clube_id'],
+        'ordem': df_times['ordem'],
+        'media_gols_feitos': movel['gols_pro'] / movel['jogos'],
+        'media_gols_sofridos': movel['gols_contra'] / movel['jogos'],
+        'aproveitamento': movel['pontos'] / (movel['jogos'] * 3) * 100,
+        'taxa_sg': movel['sg'] / movel['jogos'] * 100,
+    }).drop_duplicates(subset=['clube_id', 'ordem'], keep='last')
+
+def anexar_forca_adversario(df, df_forca):
+    """
+    Anexa a força do adversário com um as-of join ordenado em (ano, rodada): cada linha recebe
+    a força calculada até a última rodada ESTRITAMENTE anterior ao jogo.
+    """
+    nomes = {col: f'adv_{col}' for col in FORCA_TIMES_PADRAO}
+    df_forca = df_forca.rename(columns={'clube_id': 'adversario_id', **nomes}).sort_values('ordem')
+    
+    df = df.drop(columns=[c for c in nomes.values() if c in df.columns])
+    df['ordem'] = df['ano'].astype(int) * 100 + df['rodada'].astype(int)
+    df['adversario_id'] = df['adversario_id'].astype(float)
+    df['_posicao_original'] = np.arange(len(df))
+    indice_original = df.index
+    
+    # Média da liga até cada rodada (padrão das colunas sem valor fixo), também só com rodadas anteriores
+    sem_padrao = [nomes[col] for col, padrao in FORCA_TIMES_PADRAO.items() if padrao is None]
+    acumulado = df_forca.groupby('ordem')[sem_padrao].agg(['sum', 'count']).cumsum()
+    df_liga = pd.DataFrame({f'_liga_{c}': acumulado[(c, 'sum')] / acumulado[(c, 'count')] for c in sem_padrao}).reset_index()
+    
+    df = pd.merge_asof(
+        df.sort_values('ordem', kind='mergesort'), df_forca,
+        on='ordem', by='adversario_id', direction='backward', allow_exact_matches=False
+    )
+    df = pd.merge_asof(df, df_liga, on='ordem', direction='backward', allow_exact_matches=False)
+    df = df.sort_values('_posicao_original').drop(columns=['ordem', '_posicao_original'])
+    df.index = indice_original
+    
+    for col, padrao in FORCA_TIMES_PADRAO.items():
+        if padrao is None:
+            # Sem nenhuma rodada anterior na liga o valor fica ausente (NaN), tratado como faltante pelo XGBoost
+            padrao = df.pop(f'_liga_{nomes[col]}')
+        df[nomes[col]] = df[nomes[col]].fillna(padrao)
+    return df
+
+def anexar_contexto_partidas(df):
+    """Anexa mando de campo, adversário e força do adversário a partir do histórico de partidas."""
     # --- 1. Incorporar Histórico de Partidas (Mando de Campo e Adversário) ---
-    if os.path.exists(config.HISTORICAL_MATCHES_PATH):
+    # Tabela completa: a janela da força do adversário pode atravessar temporadas (ex: times promovidos)
+    df_partidas = carregar_tabela('partidas')
+    if df_partidas is not None:
         try:
-            df_partidas = pd.read_csv(config.HISTORICAL_MATCHES_PATH)
             # Garante tipos para merge
             df_partidas['ano'] = pd.to_numeric(df_partidas['ano'], errors='coerce').fillna(0).astype(int)
             df_partidas['rodada'] = pd.to_numeric(df_partidas['rodada'], errors='coerce').fillna(0).astype(int)
@@ -22,16 +352,14 @@ def preparar_features_historicas(df):
             df['rodada'] = pd.to_numeric(df['rodada'], errors='coerce').fillna(0).astype(int)
             
             # Carrega mapa de clubes
-            if os.path.exists(config.CLUBS_DATA_PATH):
-                with open(config.CLUBS_DATA_PATH, 'r', encoding='utf8') as f:
-                    clubes_json = json.load(f)
-                    
+            clubes_json = carregar_clubes_json()
+            if clubes_json:
                 mapa_abbr_id = {}
                 for cid, dados in clubes_json.items():
                     if 'abreviacao' in dados:
-                        mapa_abbr_id[dados['abreviacao']] = int(cid)
+                        mapa_abbr_id[dados['abreviacao']] = cid
                     if 'nome' in dados:
-                        mapa_abbr_id[dados['nome']] = int(cid)
+                        mapa_abbr_id[dados['nome']] = cid
                 
                 # Mapeamentos manuais para dados legados
                 manual_map = {
@@ -83,44 +411,16 @@ def preparar_features_historicas(df):
             df['adversario_id'] = df['adversario_id_match_h'].fillna(df['adversario_id_match_a'])
             df.drop(columns=['adversario_id_match_h', 'adversario_id_match_a'], inplace=True)
             
-            # Merge com estatísticas de times (Força do Adversário)
-            if os.path.exists(config.ESTATISTICAS_TIMES_PATH):
-                df_stats = pd.read_csv(config.ESTATISTICAS_TIMES_PATH)
-                df_stats_adv = df_stats[['clube_id', 'media_gols_feitos', 'media_gols_sofridos']].rename(columns={
-                    'clube_id': 'adversario_id',
-                    'media_gols_feitos': 'adv_media_gols_feitos',
-                    'media_gols_sofridos': 'adv_media_gols_sofridos'
-                })
-                df = df.merge(df_stats_adv, on='adversario_id', how='left')
-                df['adv_media_gols_feitos'].fillna(1.0, inplace=True)
-                df['adv_media_gols_sofridos'].fillna(1.0, inplace=True)
-            else:
-                df['adv_media_gols_feitos'] = 1.0
-                df['adv_media_gols_sofridos'] = 1.0
+            # Força do Adversário no momento do jogo (as-of join, sem vazamento de rodadas futuras)
+            df = anexar_forca_adversario(df, calcular_forca_times(df_partidas))
                 
         except Exception as e:
             logger.error(f"Erro ao processar histórico de partidas: {e}", exc_info=True)
             df['fl_mandante'] = 0
-            df['adv_media_gols_feitos'] = 1.0
-            df['adv_media_gols_sofridos'] = 1.0
+            # Sem partidas não há média da liga: taxa_sg fica ausente (NaN), que o XGBoost trata como faltante
+            for col, padrao in FORCA_TIMES_PADRAO.items():
+                df[f'adv_{col}'] = padrao if padrao is not None else np.nan
 
-    # Features temporais (Pontuação)
-    df['pontos_last'] = df.groupby(['ano', 'atleta_id'])['pontuacao'].shift(1)
-    df['media_3_rodadas'] = df.groupby(['ano', 'atleta_id'])['pontos_last'].transform(lambda x: x.ewm(span=3, min_periods=1).mean())
-    df['media_temporada'] = df.groupby(['ano', 'atleta_id'])['pontos_last'].transform(lambda x: x.expanding().mean())
-    
-    # Scouts detalhados
-    scouts_alvo = ['G', 'A', 'DS', 'SG', 'FS', 'FF', 'FD', 'FT', 'I', 'PE', 'DE', 'DP', 'GC', 'CV', 'CA', 'GS', 'PP', 'PS']
-    cols_existentes = [col for col in scouts_alvo if col in df.columns]
-    
-    for col in cols_existentes:
-        df[f'{col}_last'] = df.groupby(['ano', 'atleta_id'])[col].shift(1)
-        df[f'media_{col}_last3'] = df.groupby(['ano', 'atleta_id'])[f'{col}_last'].transform(lambda x: x.ewm(span=3, min_periods=1).mean())
-        df[f'media_{col}_season'] = df.groupby(['ano', 'atleta_id'])[f'{col}_last'].transform(lambda x: x.expanding().mean())
-        df[f'media_{col}_last3'] = df[f'media_{col}_last3'].fillna(0)
-        df[f'media_{col}_season'] = df[f'media_{col}_season'].fillna(0)
-    
-    df = df.dropna(subset=['media_temporada']).copy()
     return df
 
 def aplicar_bonus_tatico(row):
@@ -177,3 +477,5 @@ def aplicar_bonus_tatico(row):
 
     return previsao * multiplicador
 
+if __name__ == "__main__":
+    benchmark_features_rolantes()
@@ -0,0 +1,464 @@
+import pandas as pd
+import numpy as np
+import os
+import hashlib
+import sqlite3
+from contextlib import contextmanager
+from utils.config import config, logger
+from utils.armazenamento import carregar_tabela
+from utils.carregamento import tipar_historico
+from utils.feature_engineering import (
+    preparar_features_historicas, anexar_contexto_partidas, filtrar_linhas_validas, SCOUTS_ALVO, CHAVES_ATLETA
+)
+
+# Mesma suavização usada em calcular_features_rolantes (ewm com span=3, adjust=True)
+EWM_SPAN = 3
+EWM_FATOR_PESO = 1.0 - 2.0 / (EWM_SPAN + 1.0)
+
+# Estado guardado para cada série (pontuação e cada scout) de cada (ano, atleta_id):
+# last = último valor, soma/cont = média expansiva, ewm/peso/nobs = estado da EWM do pandas
+CAMPOS_ESTADO = ['last', 'soma', 'cont', 'ewm', 'peso', 'nobs']
+VALORES_INICIAIS = {'last': np.nan, 'soma': 0.0, 'cont': 0.0, 'ewm': np.nan, 'peso': 1.0, 'nobs': 0.0}
+CHAVES_RODADA = ['ano', 'atleta_id', 'rodada']
+
+def _linhas_validas(df):
+    """Mesmos tipos e recorte do histórico de treino (ver treinar_modelo), para o estado valer para ele."""
+    return filtrar_linhas_validas(tipar_historico(df))
+
+def _series_estado(df):
+    """Séries acompanhadas pelo estado: pontuação + scouts presentes no histórico."""
+    return ['pontuacao'] + [col for col in SCOUTS_ALVO if col in df.columns]
+
+def _colunas_features(series):
+    """Colunas rolantes geradas para as séries (mesma ordem de calcular_features_rolantes)."""
+    colunas = ['pontos_last', 'media_3_rodadas', 'media_temporada']
+    for col in series[1:]:
+        colunas += [f'{col}_last', f'media_{col}_last3', f'media_{col}_season']
+    return colunas
+
+def _assinaturas_rodadas(df, series):
+    """
+    Hash das linhas de cada (ano, rodada) nas colunas que alimentam o estado.
+    Os valores passam por float32 (tipo do histórico tipado) para que a mesma rodada,
+    vinda da coleta ou do armazém, tenha a mesma assinatura.
+    """
+    linhas = df[['ano', 'rodada', 'atleta_id']].astype('int64').join(df.reindex(columns=series).astype('float32'))
+    linhas = linhas.sort_values(list(linhas.columns), ignore_index=True)
+    if linhas.empty:
+        return {}
+    hashes = pd.util.hash_pandas_object(linhas, index=False).to_numpy()
+    pares = linhas[['ano', 'rodada']].to_numpy()
+    inicios = np.flatnonzero(np.r_[True, (np.diff(pares, axis=0) != 0).any(axis=1)])
+    fins = np.r_[inicios[1:], len(linhas)]
+    return {
+        (int(linhas['ano'].iat[i]), int(linhas['rodada'].iat[i])): hashlib.sha1(hashes[i:f].tobytes()).hexdigest()
+        for i, f in zip(inicios, fins)
+    }
+
+def _estado_vazio(series):
+    colunas = [f'{serie}|{campo}' for serie in series for campo in CAMPOS_ESTADO]
+    indice = pd.MultiIndex.from_arrays([[], []], names=CHAVES_ATLETA)
+    return pd.DataFrame(columns=colunas, index=indice, dtype=float)
+
+def _ler_estado(estado, chaves, series):
+    """Retorna o estado atual de cada chave como um dict campo -> matriz (linhas x séries)."""
+    atual = estado.reindex(chaves)
+    leitura = {}
+    for campo in CAMPOS_ESTADO:
+        matriz = atual[[f'{serie}|{campo}' for serie in series]].to_numpy(dtype=float)
+        if not np.isnan(VALORES_INICIAIS[campo]):
+            matriz = np.where(np.isnan(matriz), VALORES_INICIAIS[campo], matriz)
+        leitura[campo] = matriz
+    return leitura
+
+def _features_do_estado(leitura, series):
+    """Converte o estado (que já inclui todas as rodadas anteriores) nas features da próxima rodada."""
+    cont = leitura['cont']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        expansiva = np.where(cont > 0, leitura['soma'] / cont, np.nan)
+    ewm = np.where(leitura['nobs'] >= 1, leitura['ewm'], np.nan)
+
+    novas = {
+        'pontos_last': leitura['last'][:, 0],
+        'media_3_rodadas': ewm[:, 0],
+        'media_temporada': expansiva[:, 0],
+    }
+    for j, col in enumerate(series[1:], start=1):
+        novas[f'{col}_last'] = leitura['last'][:, j]
+        novas[f'media_{col}_last3'] = np.nan_to_num(ewm[:, j], nan=0.0)
+        novas[f'media_{col}_season'] = np.nan_to_num(expansiva[:, j], nan=0.0)
+    return novas
+
+def _avancar_estado(leitura, valores):
+    """
+    Incorpora uma rodada (valores: linhas x séries) ao estado.
+    A EWM reproduz passo a passo o algoritmo do pandas (adjust=True, ignore_na=False).
+    """
+    obs = ~np.isnan(valores)
+    ewm, peso = leitura['ewm'], leitura['peso']
+    ewm_valida = ~np.isnan(ewm)
+
+    peso_decaido = np.where(ewm_valida, peso * EWM_FATOR_PESO, peso)
+    atualiza = ewm_valida & obs
+    with np.errstate(invalid='ignore'):
+        media_nova = (peso_decaido * ewm + valores) / (peso_decaido + 1.0)
+    ewm_nova = np.where(atualiza & (ewm != valores), media_nova, ewm)
+    ewm_nova = np.where(~ewm_valida & obs, valores, ewm_nova)
+
+    return {
+        'last': valores,
+        'soma': leitura['soma'] + np.where(obs, valores, 0.0),
+        'cont': leitura['cont'] + obs,
+        'ewm': ewm_nova,
+        'peso': np.where(atualiza, peso_decaido + 1.0, peso_decaido),
+        'nobs': leitura['nobs'] + obs,
+    }
+
+def _gravar_estado(estado, chaves, leitura, series):
+    bloco = pd.DataFrame(
+        {f'{serie}|{campo}': leitura[campo][:, j] for j, serie in enumerate(series) for campo in CAMPOS_ESTADO},
+        index=chaves
+    )
+    estado = estado.drop(index=chaves.intersection(estado.index))
+    return pd.concat([estado, bloco[estado.columns]])
+
+def _processar_lote(df, estado, series):
+    """
+    Gera as features e avança o estado para um lote já ordenado por ['ano', 'atleta_id', 'rodada'].
+    Linhas repetidas do mesmo atleta são processadas em passadas sucessivas (cumcount).
+    """
+    ordem = df.groupby(CHAVES_ATLETA, sort=False).cumcount().to_numpy()
+    valores_lote = df.reindex(columns=series).astype('float32').to_numpy(dtype=float)
+    features = {}
+
+    for passo in range(ordem.max() + 1 if len(df) else 0):
+        posicoes = np.flatnonzero(ordem == passo)
+        chaves = pd.MultiIndex.from_frame(df.iloc[posicoes][CHAVES_ATLETA])
+        leitura = _ler_estado(estado, chaves, series)
+
+        for nome, valores in _features_do_estado(leitura, series).items():
+            features.setdefault(nome, np.full(len(df), np.nan))[posicoes] = valores
+
+        leitura = _avancar_estado(leitura, valores_lote[posicoes])
+        estado = _gravar_estado(estado, chaves, leitura, series)
+
+    return features, estado
+
+def _linhas_features(df, series):
+    """Colunas rolantes de 'df' indexadas por (ano, atleta_id, rodada), como ficam na tabela 'features'."""
+    return df[_colunas_features(series)].set_axis(pd.MultiIndex.from_frame(df[CHAVES_RODADA].astype('int64')))
+
+def _construir(df_historico):
+    """(estado, linhas de features, assinaturas das rodadas) a partir do histórico completo."""
+    df = _linhas_validas(df_historico).sort_values(CHAVES_RODADA)
+    series = _series_estado(df)
+    features, estado = _processar_lote(df, _estado_vazio(series), series)
+    linhas = _linhas_features(df[CHAVES_RODADA].join(pd.DataFrame(features, index=df.index)), series)
+    return estado, linhas, _assinaturas_rodadas(df, series)
+
+def construir_estado_features(df_historico):
+    """Constrói o estado rolante de cada (ano, atleta_id) a partir do histórico completo."""
+    estado, _, _ = _construir(df_historico)
+    logger.info(f"Estado de features construído para {len(estado)} atletas/temporada.")
+    return estado
+
+# O estado fica num SQLite com chave (ano, atleta_id): a cada rodada só as linhas dos atletas que
+# jogaram são lidas e regravadas, e as rodadas já incorporadas ficam em 'rodadas_aplicadas' com a
+# assinatura das linhas usadas. As linhas de features geradas são acrescentadas à tabela 'features',
+# lida por preparar_features_historicas no lugar do recálculo completo.
+@contextmanager
+def _transacao(caminho=None):
+    caminho = caminho or config.FEATURE_STATE_PATH
+    os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+    con = sqlite3.connect(caminho, timeout=30, isolation_level=None)
+    try:
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            yield con
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+        con.execute("COMMIT")
+    finally:
+        con.close()
+
+def _colunas_estado(con):
+    return [linha[1] for linha in con.execute('PRAGMA table_info("estado")')][len(CHAVES_ATLETA):]
+
+def _pares_rodadas(df):
+    """Conjunto de (ano, rodada) presentes em 'df'."""
+    pares = df[['ano', 'rodada']].drop_duplicates().astype(int)
+    return set(zip(pares['ano'].tolist(), pares['rodada'].tolist()))
+
+def _filtrar_rodadas(df, pares):
+    return df[pd.MultiIndex.from_frame(df[['ano', 'rodada']].astype(int)).isin(list(pares))]
+
+def _inserir(con, tabela, linhas):
+    marcadores = ", ".join("?" * len(linhas.columns))
+    con.executemany(f'INSERT OR REPLACE INTO {tabela} VALUES ({marcadores})',
+                    linhas.astype(object).where(linhas.notna(), None).itertuples(index=False, name=None))
+
+def _gravar_linhas(con, estado, rodadas, features=None):
+    """Regrava as linhas de 'estado', registra as rodadas ({(ano, rodada): assinatura}) e acrescenta as features."""
+    linhas = estado.reindex(columns=_colunas_estado(con)).reset_index()
+    linhas[CHAVES_ATLETA] = linhas[CHAVES_ATLETA].astype(int)
+    _inserir(con, 'estado', linhas)
+    con.executemany('INSERT OR IGNORE INTO rodadas_aplicadas VALUES (?, ?, ?)',
+                    sorted((ano, rodada, assinatura) for (ano, rodada), assinatura in rodadas.items()))
+    if features is not None and not features.empty:
+        colunas = [linha[1] for linha in con.execute('PRAGMA table_info("features")')][len(CHAVES_RODADA):]
+        _inserir(con, 'features', features.reindex(columns=colunas).reset_index())
+
+def salvar_estado_features(estado, caminho=None, rodadas=None, features=None):
+    """
+    Grava o estado completo, substituindo o anterior.
+
+    Args:
+        rodadas (dict): (ano, rodada) -> assinatura das linhas já incorporadas ao estado.
+        features (DataFrame, optional): Linhas de features dessas rodadas, indexadas por (ano, atleta_id, rodada).
+    """
+    caminho = caminho or config.FEATURE_STATE_PATH
+    series = [c.split('|')[0] for c in estado.columns[::len(CAMPOS_ESTADO)]]
+    with _transacao(caminho) as con:
+        for tabela in ('estado', 'rodadas_aplicadas', 'features'):
+            con.execute(f'DROP TABLE IF EXISTS {tabela}')
+        colunas = ", ".join(f'"{c}" REAL' for c in estado.columns)
+        con.execute(f'CREATE TABLE estado (ano INTEGER, atleta_id INTEGER, {colunas}, PRIMARY KEY (ano, atleta_id))')
+        con.execute('CREATE TABLE rodadas_aplicadas (ano INTEGER, rodada INTEGER, assinatura TEXT, PRIMARY KEY (ano, rodada))')
+        colunas = ", ".join(f'"{c}" REAL' for c in _colunas_features(series))
+        con.execute(f'CREATE TABLE features (ano INTEGER, atleta_id INTEGER, rodada INTEGER, {colunas}, '
+                    'PRIMARY KEY (ano, rodada, atleta_id))')
+        _gravar_linhas(con, estado, rodadas or {}, features)
+    logger.info(f"Estado de features salvo em '{caminho}'")
+
+def carregar_estado_features(caminho=None, chaves=None):
+    """
+    Estado persistido, indexado por (ano, atleta_id), ou None se ainda não existir.
+
+    Args:
+        chaves (MultiIndex, optional): Lê só estes (ano, atleta_id). Padrão: o estado inteiro.
+    """
+    caminho = caminho or config.FEATURE_STATE_PATH
+    if not os.path.exists(caminho):
+        return None
+    with _transacao(caminho) as con:
+        colunas = _colunas_estado(con)
+        if not colunas:
+            return None
+        if chaves is None:
+            estado = pd.read_sql_query('SELECT * FROM estado', con)
+        else:
+            con.execute('CREATE TEMP TABLE chaves (ano INTEGER, atleta_id INTEGER)')
+            con.executemany('INSERT INTO chaves VALUES (?, ?)', ((int(a), int(b)) for a, b in chaves))
+            estado = pd.read_sql_query('SELECT estado.* FROM estado JOIN chaves USING (ano, atleta_id)', con)
+    estado[colunas] = estado[colunas].astype(float)
+    return estado.set_index(CHAVES_ATLETA)
+
+def rodadas_aplicadas(caminho=None):
+    """Pares (ano, rodada) já incorporados ao estado persistido, ou None se ainda não houver estado."""
+    caminho = caminho or config.FEATURE_STATE_PATH
+    if not os.path.exists(caminho):
+        return None
+    with _transacao(caminho) as con:
+        if not _colunas_estado(con):
+            return None
+        return set(con.execute('SELECT ano, rodada FROM rodadas_aplicadas').fetchall())
+
+def _ler_rodadas_e_series(caminho=None):
+    """({(ano, rodada): assinatura} já aplicadas, séries do estado), ou None se ainda não houver estado."""
+    caminho = caminho or config.FEATURE_STATE_PATH
+    if not os.path.exists(caminho):
+        return None
+    with _transacao(caminho) as con:
+        colunas = _colunas_estado(con)
+        if not colunas:
+            return None
+        rodadas = {(ano, rodada): assinatura for ano, rodada, assinatura in con.execute('SELECT * FROM rodadas_aplicadas')}
+    return rodadas, [c.split('|')[0] for c in colunas[::len(CAMPOS_ESTADO)]]
+
+def _historico_anterior(df_rodada):
+    """Histórico do armazém sem as rodadas de 'df_rodada', ou None se o armazém estiver vazio."""
+    base = carregar_tabela('jogadores')
+    if base is None:
+        return None
+    return base[~pd.MultiIndex.from_frame(base[['ano', 'rodada']].astype(int)).isin(list(_pares_rodadas(df_rodada)))]
+
+def reconstruir_estado_features(df_historico=None, caminho=None):
+    """Recalcula e grava o estado a partir do histórico (padrão: o armazém). Use após corrigir rodadas já aplicadas."""
+    if df_historico is None:
+        df_historico = carregar_tabela('jogadores')
+    if df_historico is None or df_historico.empty:
+        logger.error("Histórico de jogadores indisponível: estado de features não reconstruído.")
+        return None
+    estado, features, rodadas = _construir(df_historico)
+    salvar_estado_features(estado, caminho, rodadas, features)
+    return estado
+
+def _aplicar_lote(df_rodada, estado):
+    """Features (antes do dropna) e novo estado para as linhas, já válidas, de 'df_rodada'."""
+    series = [c.split('|')[0] for c in estado.columns[::len(CAMPOS_ESTADO)]]
+
+    df = df_rodada.sort_values(CHAVES_RODADA)
+    df = anexar_contexto_partidas(df)
+    features, estado = _processar_lote(df, estado, series)
+
+    df = df.drop(columns=[c for c in features if c in df.columns])
+    return pd.concat([df, pd.DataFrame(features, index=df.index)], axis=1), estado
+
+def aplicar_rodada_incremental(df_rodada, estado):
+    """
+    Produz as linhas de features de uma nova rodada usando apenas o estado persistido.
+    Custo proporcional ao número de atletas da rodada.
+
+    Returns:
+        (DataFrame de features no mesmo formato de preparar_features_historicas, novo estado)
+    """
+    df, estado = _aplicar_lote(_linhas_validas(df_rodada), estado)
+    return df.dropna(subset=['media_temporada']).copy(), estado
+
+def verificar_incremental(df_historico, df_rodada, df_incremental, tolerancia=1e-9):
+    """Compara as features incrementais de uma rodada com o recálculo completo do histórico."""
+    df_completo = preparar_features_historicas(pd.concat([df_historico, df_rodada], ignore_index=True),
+                                               usar_cache=False, usar_estado=False)
+    df_ref = df_completo.merge(df_rodada[CHAVES_RODADA].drop_duplicates(), on=CHAVES_RODADA)
+
+    colunas = [c for c in df_incremental.columns if c.endswith(('_last', '_last3', '_season')) or c in ('media_3_rodadas', 'media_temporada')]
+    df_ref = df_ref.sort_values(CHAVES_RODADA).reset_index(drop=True)
+    df_inc = df_incremental.sort_values(CHAVES_RODADA).reset_index(drop=True)
+
+    if len(df_ref) != len(df_inc):
+        logger.error(f"Verificação incremental: {len(df_inc)} linhas incrementais vs {len(df_ref)} no recálculo completo.")
+        return False
+
+    ref = df_ref[colunas].to_numpy(dtype=float)
+    inc = df_inc[colunas].to_numpy(dtype=float)
+    mesmos_nulos = np.array_equal(np.isnan(ref), np.isnan(inc))
+    diferenca = np.nanmax(np.abs(ref - inc)) if ref.size else 0.0
+    ok = mesmos_nulos and diferenca <= tolerancia
+
+    if ok:
+        logger.info(f"Verificação incremental OK ({len(df_inc)} linhas, diferença máxima {diferenca:.2e}).")
+    else:
+        logger.error(f"Verificação incremental FALHOU (nulos iguais: {mesmos_nulos}, diferença máxima {diferenca:.2e}).")
+    return ok
+
+def atualizar_features_rodada(df_rodada, df_historico=None, verificar=False, caminho_estado=None):
+    """
+    Atualiza o estado persistido com as rodadas de 'df_rodada' e devolve as novas linhas de features.
+    Rodadas que já estão no estado são ignoradas, então coletar de novo a mesma rodada não a aplica
+    duas vezes. Só os atletas das rodadas novas são lidos e regravados no estado, e as linhas de
+    features geradas ficam gravadas para preparar_features_historicas.
+
+    Args:
+        df_rodada (DataFrame): Linhas das rodadas recém-coletadas (mesmo formato do histórico).
+        df_historico (DataFrame, optional): Histórico anterior às rodadas. Usado na verificação e para
+            criar o estado na primeira execução (padrão: o armazém, sem as rodadas de 'df_rodada').
+        verificar (bool): Se True, confere o resultado contra o recálculo completo.
+
+    Returns:
+        DataFrame com as features das rodadas novas (vazio se todas já estavam no estado), ou None em caso de falha.
+    """
+    lido = _ler_rodadas_e_series(caminho_estado)
+    if lido is None:
+        base = df_historico if df_historico is not None else _historico_anterior(df_rodada)
+        if base is None:
+            logger.error("Estado de features inexistente e nenhum histórico disponível para construí-lo.")
+            return None
+        if reconstruir_estado_features(base, caminho_estado) is None:
+            return None
+        lido = _ler_rodadas_e_series(caminho_estado)
+    aplicadas, series = set(lido[0]), lido[1]
+
+    pares = _pares_rodadas(df_rodada)
+    if (repetidas := pares & aplicadas):
+        logger.info(f"Rodadas já incorporadas ao estado de features (ignoradas): {sorted(repetidas)}. "
+                    "Para aplicar correções nelas, use reconstruir_estado_features().")
+    novas = pares - aplicadas
+    if not novas:
+        return pd.DataFrame()
+    for ano in {a for a, _ in novas}:
+        ultima = max((r for a, r in aplicadas if a == ano), default=0)
+        if min(r for a, r in novas if a == ano) < ultima:
+            logger.warning(f"Rodadas de {ano} anteriores à rodada {ultima}, já aplicada: as médias móveis ficam fora de ordem. "
+                           "Use reconstruir_estado_features().")
+
+    df_rodada = _linhas_validas(_filtrar_rodadas(df_rodada, novas))
+    if df_rodada.empty:
+        with _transacao(caminho_estado) as con:
+            _gravar_linhas(con, _estado_vazio(series), dict.fromkeys(novas))
+        return pd.DataFrame()
+    chaves = pd.MultiIndex.from_frame(df_rodada[CHAVES_ATLETA].drop_duplicates())
+    estado = carregar_estado_features(caminho_estado, chaves)
+    df_features, estado = _aplicar_lote(df_rodada, estado)
+    linhas = _linhas_features(df_features, series)
+    df_features = df_features.dropna(subset=['media_temporada']).copy()
+
+    if verificar:
+        if df_historico is None:
+            df_historico = _historico_anterior(df_rodada)
+        if df_historico is None:
+            logger.error("Verificação incremental sem histórico anterior (armazém vazio). Estado NÃO foi salvo.")
+            return None
+        if not verificar_incremental(_linhas_validas(df_historico), df_rodada, df_features):
+            logger.error("Estado incremental divergente. Estado NÃO foi salvo.")
+            return None
+
+    # Rodadas sem nenhuma linha válida ficam registradas sem assinatura (ver ler_features_do_estado)
+    assinaturas = _assinaturas_rodadas(df_rodada, series)
+    with _transacao(caminho_estado) as con:
+        _gravar_linhas(con, estado, {par: assinaturas.get(par) for par in novas}, linhas)
+    logger.info(f"Estado de features atualizado: {len(estado)} atletas em {len(novas)} rodada(s).")
+    return df_features
+
+def ler_features_do_estado(df, scouts, caminho=None):
+    """
+    Features rolantes das linhas de 'df' lidas do estado persistido, sem recalcular o histórico.
+    Rodadas de 'df' posteriores às já aplicadas são incorporadas antes (custo proporcional a elas).
+
+    Só vale quando o estado corresponde a 'df': mesmas linhas válidas (mesma assinatura) em todas as
+    rodadas aplicadas e nenhuma rodada aplicada faltando no meio de uma temporada de 'df'.
+
+    Returns:
+        DataFrame indexado por (ano, atleta_id, rodada) com as colunas de 'scouts' presentes em 'df',
+        ou None quando o estado não serve (o chamador recalcula tudo).
+    """
+    lido = _ler_rodadas_e_series(caminho)
+    if lido is None or df.empty:
+        return None
+    aplicadas, series = lido
+    scouts = [s for s in scouts if s in df.columns]
+
+    if len(filtrar_linhas_validas(df)) != len(df) or df.duplicated(CHAVES_RODADA).any():
+        return None
+    if any(s not in series for s in scouts):
+        logger.info("Estado de features sem alguns scouts do plano: recálculo completo.")
+        return None
+
+    assinaturas = _assinaturas_rodadas(df, series)
+    divergentes = [par for par, assinatura in assinaturas.items() if par in aplicadas and aplicadas[par] != assinatura]
+    faltando = [(a, r) for (a, r), assinatura in aplicadas.items() if assinatura is not None and (a, r) not in assinaturas
+                and r <= max((rr for aa, rr in assinaturas if aa == a), default=0)]
+    if divergentes or faltando:
+        logger.info(f"Estado de features não corresponde ao histórico recebido (rodadas divergentes: {sorted(divergentes)[:5]}, "
+                    f"ausentes: {sorted(faltando)[:5]}): recálculo completo.")
+        return None
+
+    novas = set(assinaturas) - set(aplicadas)
+    for ano in {a for a, _ in novas}:
+        if min(r for a, r in novas if a == ano) < max((r for a, r in aplicadas if a == ano), default=0):
+            return None
+    if novas and atualizar_features_rodada(_filtrar_rodadas(df, novas), caminho_estado=caminho) is None:
+        return None
+
+    caminho = caminho or config.FEATURE_STATE_PATH
+    colunas = _colunas_features(['pontuacao'] + scouts)
+    with _transacao(caminho) as con:
+        con.execute('CREATE TEMP TABLE pares (ano INTEGER, rodada INTEGER)')
+        con.executemany('INSERT INTO pares VALUES (?, ?)', sorted(assinaturas))
+        selecao = ", ".join(f'features."{c}"' for c in CHAVES_RODADA + colunas)
+        linhas = pd.read_sql_query(f'SELECT {selecao} FROM features JOIN pares USING (ano, rodada)', con)
+    if len(linhas) != len(df):
+        return None
+    linhas[colunas] = linhas[colunas].astype(float)
+    logger.info(f"Features rolantes lidas do estado ({len(linhas)} linhas, {len(novas)} rodada(s) nova(s) aplicada(s)).")
+    return linhas.set_index(CHAVES_RODADA)
@@ -0,0 +1,187 @@
+"""
+Conversão colunar das respostas grandes das APIs (/atletas/pontuados e /atletas/mercado).
+
+Em vez de montar um dict por atleta (com item.update(scouts)), juntar tudo numa lista e só então
+criar o DataFrame, cada atleta é escrito direto em buffers tipados pré-alocados (array.array, um
+por coluna, convertidos para numpy sem cópia), com as colunas de scout fixas (SCOUTS): só os
+scouts diferentes de zero são visitados. Scouts fora da lista fixa viram colunas extras.
+
+Com o pacote 'ijson' (backend em C) instalado, o objeto 'atletas' de /atletas/pontuados é
+percorrido em streaming a partir dos bytes da resposta, sem materializar o JSON inteiro; sem ele
+(ou com o backend em Python puro, mais lento que o json da biblioteca padrão), a resposta é
+decodificada com json.loads.
+"""
+
+import io
+import os
+import json
+import glob
+import time
+import tracemalloc
+from array import array
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from utils.config import config, logger
+
+try:
+    import ijson
+    IJSON_DISPONIVEL = ijson.backend in ('yajl2_c', 'yajl2_cffi')
+except ImportError:
+    IJSON_DISPONIVEL = False
+
+SCOUTS = ['G', 'A', 'FT', 'FD', 'FF', 'FS', 'PS', 'I', 'PP', 'DP', 'SG', 'DE', 'DS', 'GC', 'CV', 'CA', 'GS', 'PC', 'FC', 'V']
+LOTE_STREAMING = 1024  # Tamanho inicial dos buffers quando o total de atletas não é conhecido
+
+def _buffer(tipo, n):
+    return array(tipo, bytes(array(tipo).itemsize * n)) if tipo else [None] * n
+
+class _Colunas:
+    """Buffers por coluna: 'q' (int64), 'd' (float64) ou None (texto); scouts em float64 zerado."""
+
+    def __init__(self, tipos, n):
+        self.tipos = tipos
+        self.n = n
+        self.buffers = {coluna: _buffer(tipo, n) for coluna, tipo in tipos.items()}
+        self.scouts = {s: _buffer('d', n) for s in SCOUTS}
+
+    def garantir(self, i):
+        """Dobra a capacidade se a linha 'i' não couber (entrada em streaming)."""
+        if i < self.n:
+            return
+        for coluna, buffer in list(self.buffers.items()) + list(self.scouts.items()):
+            buffer.extend(_buffer(self.tipos.get(coluna, 'd'), self.n))
+        self.n *= 2
+
+    def scout(self, i, scouts):
+        for nome, valor in scouts.items():
+            buffer = self.scouts.get(nome)
+            if buffer is None:  # Scout novo (fora de SCOUTS): coluna extra
+                buffer = self.scouts[nome] = _buffer('d', self.n)
+            buffer[i] = valor or 0
+
+    def dataframe(self, linhas):
+        colunas = {}
+        for coluna, buffer in list(self.buffers.items()) + list(self.scouts.items()):
+            if isinstance(buffer, array):
+                colunas[coluna] = np.frombuffer(buffer, dtype=np.int64 if buffer.typecode == 'q' else np.float64)[:linhas]
+            else:
+                colunas[coluna] = buffer[:linhas]
+        return pd.DataFrame(colunas, copy=False)
+
+def _atletas_pontuados(fonte):
+    """(pares (atleta_id, dados), total conhecido ou None) a partir dos bytes ou do JSON decodificado."""
+    if isinstance(fonte, (bytes, bytearray)):
+        if IJSON_DISPONIVEL:
+            return ijson.kvitems(io.BytesIO(fonte), 'atletas', use_float=True), None
+        fonte = json.loads(fonte)
+    atletas = fonte.get('atletas') if isinstance(fonte, dict) else None
+    if not isinstance(atletas, dict):
+        return [], 0
+    return atletas.items(), len(atletas)
+
+def pontuados_colunar(fonte, ano, rodada):
+    """
+    Resposta de /atletas/pontuados/{rodada} -> DataFrame do histórico de jogadores
+    (ano, atleta_id, rodada, apelido, clube_id, posicao_id, pontuacao e os scouts).
+
+    Args:
+        fonte (bytes | dict): Corpo da resposta ou o JSON já decodificado.
+
+    Returns:
+        DataFrame (vazio se a resposta não tiver atletas).
+    """
+    atletas, total = _atletas_pontuados(fonte)
+    colunas = _Colunas({'atleta_id': 'q', 'apelido': None, 'clube_id': 'q', 'posicao_id': 'q', 'pontuacao': 'd'},
+                       total if total is not None else LOTE_STREAMING)
+    atleta_id_, apelido_, clube_id_, posicao_id_, pontuacao_ = (colunas.buffers[c] for c in
+                                                                ['atleta_id', 'apelido', 'clube_id', 'posicao_id', 'pontuacao'])
+    i = 0
+    for atleta_id, atleta in atletas:
+        if not isinstance(atleta, dict):
+            logger.warning(f"Rodada {rodada}: dados inválidos para o atleta {atleta_id}. Pulando.")
+            continue
+        colunas.garantir(i)
+        atleta_id_[i] = int(atleta_id)
+        apelido_[i] = atleta.get('apelido')
+        clube_id_[i] = int(atleta.get('clube_id') or 0)
+        posicao_id_[i] = int(atleta.get('posicao_id') or 0)
+        pontuacao_[i] = atleta.get('pontuacao') or 0
+        scouts = atleta.get('scout')
+        if isinstance(scouts, dict):
+            colunas.scout(i, scouts)
+        i += 1
+
+    df = colunas.dataframe(i)
+    df.insert(0, 'ano', np.full(i, ano, dtype=np.int64))
+    df.insert(2, 'rodada', np.full(i, rodada, dtype=np.int64))
+    return df
+
+def mercado_colunar(atletas, clubes_map, posicoes, status):
+    """
+    Lista 'atletas' de /atletas/mercado -> DataFrame da rodada atual ('rodada_atual.csv'),
+    com nome do clube, posição e status resolvidos pelos mapas da própria resposta.
+    """
+    colunas = _Colunas({'atleta_id': 'q', 'nome': None, 'clube': None, 'clube_id': 'q', 'posicao': None,
+                        'posicao_id': 'q', 'status': None, 'pontos_num': 'd', 'preco_num': 'd', 'variacao_num': 'd',
+                        'media_num': 'd', 'jogos_num': 'q'}, len(atletas))
+    b = colunas.buffers
+    for i, atleta in enumerate(atletas):
+        b['atleta_id'][i] = atleta['atleta_id']
+        b['nome'][i] = atleta['apelido']
+        b['clube'][i] = clubes_map.get(atleta['clube_id'], {}).get('nome', 'Sem Clube')
+        b['clube_id'][i] = atleta['clube_id']
+        b['posicao'][i] = posicoes.get(atleta['posicao_id'], {}).get('nome', 'N/A')
+        b['posicao_id'][i] = atleta['posicao_id']
+        b['status'][i] = status.get(atleta['status_id'], 'N/A')
+        b['pontos_num'][i] = atleta['pontos_num'] or 0
+        b['preco_num'][i] = atleta['preco_num'] or 0
+        b['variacao_num'][i] = atleta['variacao_num'] or 0
+        b['media_num'][i] = atleta['media_num'] or 0
+        b['jogos_num'][i] = atleta['jogos_num'] or 0
+        scouts = atleta.get('scout')
+        if scouts:
+            colunas.scout(i, scouts)
+    return colunas.dataframe(len(atletas))
+
+def _pontuados_por_registros(conteudo, ano, rodada):
+    """Conversão antiga (dict por atleta + lista + DataFrame), mantida só como referência do benchmark."""
+    registros = []
+    for atleta_id, atleta in json.loads(conteudo)['atletas'].items():
+        registro = {'ano': ano, 'atleta_id': int(atleta_id), 'rodada': rodada, 'apelido': atleta.get('apelido'),
+                    'clube_id': atleta.get('clube_id'), 'posicao_id': atleta.get('posicao_id'),
+                    'pontuacao': atleta.get('pontuacao', 0)}
+        registro.update(atleta.get('scout') or {})
+        registros.append(registro)
+    return pd.DataFrame(registros).fillna(0)
+
+def benchmark_leitura(arquivos=None, repeticoes=20):
+    """Tempo e pico de memória das conversões antiga e colunar sobre os JSONs gravados (api_rodada*.json)."""
+    arquivos = arquivos or sorted(glob.glob(os.path.join(config.DATA_DIR, "api_rodada*.json")))
+    conteudos = [(int(''.join(filter(str.isdigit, os.path.basename(a)))), Path(a).read_bytes()) for a in arquivos]
+    if not conteudos:
+        print("Nenhum api_rodada*.json em data/.")
+        return None
+
+    resultados = {}
+    for nome, converter in [('registros', _pontuados_por_registros), ('colunar', pontuados_colunar)]:
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            for rodada, conteudo in conteudos:
+                converter(conteudo, config.PREVIOUS_YEAR, rodada)
+        tempo = (time.perf_counter() - inicio) / repeticoes
+        tracemalloc.start()
+        for rodada, conteudo in conteudos:
+            converter(conteudo, config.PREVIOUS_YEAR, rodada)
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        resultados[nome] = (tempo, pico)
+
+    megabytes = sum(len(c) for _, c in conteudos) / 2**20
+    print(f"{len(conteudos)} arquivos ({megabytes:.2f} MB) | parser: {'ijson' if IJSON_DISPONIVEL else 'json.loads'}")
+    for nome, (tempo, pico) in resultados.items():
+        print(f"  {nome:<10} {tempo * 1000:7.1f} ms por passada  pico {pico / 2**20:6.2f} MB")
+    return resultados
+
+if __name__ == "__main__":
+    benchmark_leitura()
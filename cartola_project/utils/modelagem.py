@@ -2,22 +2,28 @@ import sys
 import os
 import pandas as pd
 import joblib
-from xgboost import XGBRegressor
+from xgboost import XGBRegressor, DMatrix
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, mean_absolute_error
 import numpy as np
-import json
 
 from utils.config import config, logger
-from utils.feature_engineering import preparar_features_historicas, aplicar_bonus_tatico
+from utils.arquivos import escrita_atomica, salvar_csv, salvar_json
+from utils.acesso_dados import ler_json, ler_csv
+from utils.armazenamento import carregar_tabela
+from utils.carregamento import carregar_historico_jogadores
+from utils.feature_engineering import (
+    preparar_features_historicas, filtrar_linhas_validas, aplicar_bonus_tatico, calcular_forca_times, anexar_forca_adversario,
+    POSICOES_POR_GRUPO, SCOUTS_POR_GRUPO, FORCA_TIMES_PADRAO
+)
 
 # Mapeamento de modelos
 MODELOS_CONFIG = {
-    'gol': {'posicoes': [1], 'nome': 'modelo_gol.pkl'},
-    'def': {'posicoes': [2, 3], 'nome': 'modelo_def.pkl'}, # Lat e Zag
-    'mei': {'posicoes': [4], 'nome': 'modelo_mei.pkl'},
-    'ata': {'posicoes': [5], 'nome': 'modelo_ata.pkl'},
-    'tec': {'posicoes': [6], 'nome': 'modelo_tec.pkl'}
+    'gol': {'posicoes': POSICOES_POR_GRUPO['gol'], 'nome': 'modelo_gol.pkl'},
+    'def': {'posicoes': POSICOES_POR_GRUPO['def'], 'nome': 'modelo_def.pkl'}, # Lat e Zag
+    'mei': {'posicoes': POSICOES_POR_GRUPO['mei'], 'nome': 'modelo_mei.pkl'},
+    'ata': {'posicoes': POSICOES_POR_GRUPO['ata'], 'nome': 'modelo_ata.pkl'},
+    'tec': {'posicoes': POSICOES_POR_GRUPO['tec'], 'nome': 'modelo_tec.pkl'}
 }
 
 def treinar_modelo_especifico(df_treino, nome_modelo, posicoes_nome, model_prefix='novo_', use_new_features=True):
@@ -30,18 +36,10 @@ def treinar_modelo_especifico(df_treino, nome_modelo, posicoes_nome, model_prefi
     features_base = ['preco_num', 'media_temporada', 'media_3_rodadas', 'posicao_id']
     if use_new_features:
         logger.info(f"  > [Treino {model_prefix}] Usando features avançadas (mando, adversário).")
-        features_base.extend(['fl_mandante', 'adv_media_gols_feitos', 'adv_media_gols_sofridos'])
+        features_base.extend(['fl_mandante'] + [f'adv_{col}' for col in FORCA_TIMES_PADRAO])
 
     # Feature selection inteligente por posição
-    scouts_relevantes_map = {
-        'gol': ['DE', 'GS', 'SG', 'DP', 'PS'],
-        'def': ['SG', 'DS', 'FS', 'G', 'A', 'CA', 'CV', 'GC'],
-        'mei': ['G', 'A', 'DS', 'FS', 'FF', 'FD', 'FT', 'I', 'PP', 'CA'],
-        'ata': ['G', 'A', 'DS', 'FS', 'FF', 'FD', 'FT', 'I', 'PP', 'CA'],
-        'tec': []
-    }
-    
-    scouts_do_grupo = scouts_relevantes_map.get(posicoes_nome, [])
+    scouts_do_grupo = SCOUTS_POR_GRUPO.get(posicoes_nome, [])
     features_scouts = []
     for col in df_treino.columns:
         if 'media_' in col and ('_last3' in col or '_season' in col) and col not in features_base:
@@ -80,17 +78,22 @@ def treinar_modelo_especifico(df_treino, nome_modelo, posicoes_nome, model_prefi
     logger.info(f"  > [{posicoes_nome} - {model_prefix}] RMSE: {rmse:.4f}")
     
     caminho_modelo = os.path.join(config.MODEL_DIR, f"{model_prefix}{nome_modelo}")
-    joblib.dump(modelo, caminho_modelo)
+    # Atômico: o app pode estar carregando o modelo enquanto o retreino grava
+    with escrita_atomica(caminho_modelo) as temporario:
+        joblib.dump(modelo, temporario)
     
     return modelo, rmse
 
-def treinar_modelo(ano_limite=None, rodada_limite=None):
+def treinar_modelo(ano_limite=None, rodada_limite=None, grupos=None):
+    """
+    Treina os modelos por grupo de posição.
+    Se 'grupos' for informado (ex: ['gol', 'tec']), apenas esses modelos são treinados e
+    apenas as features que eles usam são construídas.
+    """
     try:
-        if not os.path.exists(config.HISTORICAL_DATA_PATH):
-            logger.error(f"Arquivo '{config.HISTORICAL_DATA_PATH}' não encontrado.")
+        df = carregar_historico_jogadores(anos=range(config.ANO_MINIMO_TREINO, config.CURRENT_YEAR + 1))
+        if df is None:
             return False
-
-        df = pd.read_csv(config.HISTORICAL_DATA_PATH)
         
         if ano_limite and rodada_limite:
             mask_limite = (df['ano'] < ano_limite) | ((df['ano'] == ano_limite) & (df['rodada'] <= rodada_limite))
@@ -98,29 +101,25 @@ def treinar_modelo(ano_limite=None, rodada_limite=None):
         
         df = df[df['ano'] >= config.ANO_MINIMO_TREINO].copy()
         
-        # Correção de posições e limpeza
-        mapa_posicoes = {'gol': 1, 'lat': 2, 'zag': 3, 'mei': 4, 'ata': 5, 'tec': 6,
-                         'goleiro': 1, 'lateral': 2, 'zagueiro': 3, 'meia': 4, 'atacante': 5, 'técnico': 6}
-        
-        df['posicao_id'] = pd.to_numeric(df['posicao_id'], errors='coerce')
-        mask_nan = df['posicao_id'].isna()
-        if mask_nan.any():
-            df.loc[mask_nan, 'posicao_id'] = df.loc[mask_nan, 'posicao_id'].astype(str).str.lower().map(mapa_posicoes)
-            
-        df = df.dropna(subset=['posicao_id', 'pontuacao'])
-        df = df[df['pontuacao'] != 0]
+        # Limpeza (posições já normalizadas pelo carregador; 0 = desconhecida)
+        df = filtrar_linhas_validas(df)
         
         # Correção de Data Leakage
         df = df.sort_values(['ano', 'atleta_id', 'rodada'])
         df['preco_num'] = df.groupby(['ano', 'atleta_id'])['preco_num'].shift(1)
         df['preco_num'] = df['preco_num'].fillna(df['preco_num'].mean())
 
-        df_features = preparar_features_historicas(df)
+        df_features = preparar_features_historicas(df, grupos=grupos)
         if df_features.empty:
             return False
 
         metricas = {}
+        if grupos and os.path.exists(config.METRICS_PATH):
+            metricas = ler_json(config.METRICS_PATH)
+
         for nome_grupo, cfg in MODELOS_CONFIG.items():
+            if grupos and nome_grupo not in grupos:
+                continue
             df_grupo = df_features[df_features['posicao_id'].isin(cfg['posicoes'])]
             
             _, rmse_n = treinar_modelo_especifico(df_grupo, cfg['nome'], nome_grupo, 'novo_', True)
@@ -129,8 +128,7 @@ def treinar_modelo(ano_limite=None, rodada_limite=None):
             _, rmse_l = treinar_modelo_especifico(df_grupo, cfg['nome'], nome_grupo, 'legado_', False)
             metricas[f"legado_{nome_grupo}"] = float(rmse_l)
             
-        with open(config.METRICS_PATH, 'w') as f:
-            json.dump(metricas, f, indent=4)
+        salvar_json(metricas, config.METRICS_PATH, indent=4)
             
         return True
 
@@ -138,8 +136,59 @@ def treinar_modelo(ano_limite=None, rodada_limite=None):
         logger.error(f"Erro fatal no treinamento: {e}", exc_info=True)
         return False
 
-def prever_pontuacao(df_rodada_atual, model_prefix='novo_', aplicar_bonus=True):
-    """Aplica o modelo especialista correto para cada jogador."""
+def calcular_contribuicoes(modelo, X_grupo, nome_grupo):
+    """
+    Calcula as contribuições TreeSHAP de cada feature para as previsões de um grupo.
+    Usa uma única chamada em lote ao booster (pred_contribs) para todos os jogadores.
+    """
+    contribs = modelo.get_booster().predict(DMatrix(X_grupo), pred_contribs=True)
+    df_contrib = pd.DataFrame(contribs, index=X_grupo.index, columns=list(X_grupo.columns) + ['bias'])
+    df_contrib.insert(0, 'grupo', nome_grupo)
+    return df_contrib
+
+def salvar_explicacoes(df_rodada_atual, explicacoes, model_prefix='novo_'):
+    """
+    Consolida as contribuições por grupo e salva ao lado das previsões da rodada.
+    Sem contribuições, remove o arquivo da previsão anterior para não exibir explicações de outro time.
+    """
+    if not explicacoes:
+        if os.path.exists(config.EXPLICACOES_PATH):
+            os.remove(config.EXPLICACOES_PATH)
+            logger.info(f"Nenhuma contribuição calculada: '{config.EXPLICACOES_PATH}' da previsão anterior removido.")
+        return None
+
+    df_exp = pd.concat(explicacoes).fillna(0.0)
+    colunas_id = [c for c in ['atleta_id', 'rodada'] if c in df_rodada_atual.columns]
+    df_exp = df_rodada_atual.loc[df_exp.index, colunas_id].join(df_exp)
+    df_exp['modelo'] = model_prefix
+
+    salvar_csv(df_exp, config.EXPLICACOES_PATH, index=False, encoding='utf-8-sig')
+    logger.info(f"Explicações de {len(df_exp)} jogadores salvas em '{config.EXPLICACOES_PATH}'")
+    return df_exp
+
+def carregar_explicacoes():
+    """Carrega as contribuições por jogador calculadas na última previsão."""
+    return ler_csv(config.EXPLICACOES_PATH)
+
+def _forca_na_rodada(df_rodada_atual, coluna_clube, df_forca):
+    """
+    Força (calcular_forca_times) do clube em 'coluna_clube' na rodada de cada linha, com o mesmo as-of
+    join do treino. Sem 'ano'/'rodada', usa a força mais recente.
+    """
+    colunas = df_rodada_atual.columns
+    chaves = pd.DataFrame({
+        'ano': pd.to_numeric(df_rodada_atual['ano'], errors='coerce').fillna(config.CURRENT_YEAR) if 'ano' in colunas else config.CURRENT_YEAR,
+        'rodada': pd.to_numeric(df_rodada_atual['rodada'], errors='coerce').fillna(99) if 'rodada' in colunas else 99,
+        'adversario_id': pd.to_numeric(df_rodada_atual[coluna_clube], errors='coerce'),
+    }, index=df_rodada_atual.index)
+    return anexar_forca_adversario(chaves, df_forca)
+
+def prever_pontuacao(df_rodada_atual, model_prefix='novo_', aplicar_bonus=True, explicar=False):
+    """
+    Aplica o modelo especialista correto para cada jogador.
+    Se 'explicar' for True, calcula também as contribuições de cada feature (TreeSHAP)
+    e salva em 'config.EXPLICACOES_PATH'.
+    """
     X_full = pd.DataFrame()
     X_full['preco_num'] = df_rodada_atual['preco_num']
     X_full['media_temporada'] = df_rodada_atual['media_num']
@@ -147,30 +196,30 @@ def prever_pontuacao(df_rodada_atual, model_prefix='novo_', aplicar_bonus=True):
     X_full['posicao_id'] = df_rodada_atual['posicao_id']
     X_full['fl_mandante'] = (df_rodada_atual['fator_casa'] == 1).astype(int) if 'fator_casa' in df_rodada_atual.columns else 0
     
-    # Estatísticas do adversário e Diferença de Aproveitamento
-    if os.path.exists(config.ESTATISTICAS_TIMES_PATH) and 'adversario_id' in df_rodada_atual.columns:
-        df_stats = pd.read_csv(config.ESTATISTICAS_TIMES_PATH).set_index('clube_id')
+    # Força do adversário (e do próprio clube) igual à do treino: a da última rodada anterior ao jogo
+    df_partidas = carregar_tabela('partidas') if 'adversario_id' in df_rodada_atual.columns else None
+    if df_partidas is not None and not df_partidas.empty:
+        df_forca = calcular_forca_times(df_partidas)
+        forca_adv = _forca_na_rodada(df_rodada_atual, 'adversario_id', df_forca)
+        for col in FORCA_TIMES_PADRAO:
+            df_rodada_atual[f'adv_{col}'] = forca_adv[f'adv_{col}']
+            X_full[f'adv_{col}'] = forca_adv[f'adv_{col}']
         
         # Dados do Time do Jogador
-        df_rodada_atual['clube_aproveitamento'] = df_rodada_atual['clube_id'].map(df_stats['aproveitamento']).fillna(50.0)
-        
-        # Dados do Adversário
-        df_rodada_atual['adv_media_gols_feitos'] = df_rodada_atual['adversario_id'].map(df_stats['media_gols_feitos']).fillna(1.0)
-        df_rodada_atual['adv_media_gols_sofridos'] = df_rodada_atual['adversario_id'].map(df_stats['media_gols_sofridos']).fillna(1.0)
-        df_rodada_atual['adv_aproveitamento'] = df_rodada_atual['adversario_id'].map(df_stats['aproveitamento']).fillna(50.0)
+        if 'clube_id' in df_rodada_atual.columns:
+            df_rodada_atual['clube_aproveitamento'] = _forca_na_rodada(df_rodada_atual, 'clube_id', df_forca)['adv_aproveitamento']
+        else:
+            df_rodada_atual['clube_aproveitamento'] = FORCA_TIMES_PADRAO['aproveitamento']
         
         # Cálculo da DIFERENÇA de Aproveitamento (Nova Feature)
         df_rodada_atual['diff_aproveitamento'] = df_rodada_atual['clube_aproveitamento'] - df_rodada_atual['adv_aproveitamento']
-        
-        X_full['adv_media_gols_feitos'] = df_rodada_atual['adv_media_gols_feitos']
-        X_full['adv_media_gols_sofridos'] = df_rodada_atual['adv_media_gols_sofridos']
         X_full['diff_aproveitamento'] = df_rodada_atual['diff_aproveitamento']
     else:
-        df_rodada_atual['adv_media_gols_feitos'] = 1.0
-        df_rodada_atual['adv_media_gols_sofridos'] = 1.0
+        # Sem partidas não há média da liga: taxa_sg fica ausente (NaN), que o XGBoost trata como faltante
+        for col, padrao in FORCA_TIMES_PADRAO.items():
+            df_rodada_atual[f'adv_{col}'] = padrao if padrao is not None else np.nan
+            X_full[f'adv_{col}'] = df_rodada_atual[f'adv_{col}']
         df_rodada_atual['diff_aproveitamento'] = 0.0
-        X_full['adv_media_gols_feitos'] = 1.0
-        X_full['adv_media_gols_sofridos'] = 1.0
         X_full['diff_aproveitamento'] = 0.0
 
     # Scouts para inferência
@@ -200,6 +249,7 @@ def prever_pontuacao(df_rodada_atual, model_prefix='novo_', aplicar_bonus=True):
             X_full[f'media_{col}_last3'] = media
             
     df_rodada_atual['pontuacao_prevista_base'] = df_rodada_atual['media_num']
+    explicacoes = []
     
     for nome_grupo, cfg in MODELOS_CONFIG.items():
         caminho = os.path.join(config.MODEL_DIR, f"{model_prefix}{cfg['nome']}")
@@ -211,6 +261,11 @@ def prever_pontuacao(df_rodada_atual, model_prefix='novo_', aplicar_bonus=True):
             features = modelo.feature_names_in_ if hasattr(modelo, 'feature_names_in_') else modelo.get_booster().feature_names
             X_grupo = X_full.loc[indices].reindex(columns=features, fill_value=0)
             df_rodada_atual.loc[indices, 'pontuacao_prevista_base'] = modelo.predict(X_grupo)
+            if explicar:
+                explicacoes.append(calcular_contribuicoes(modelo, X_grupo, nome_grupo))
+
+    if explicar:
+        salvar_explicacoes(df_rodada_atual, explicacoes, model_prefix)
 
     df_rodada_atual['pontuacao_prevista'] = df_rodada_atual.apply(aplicar_bonus_tatico, axis=1) if aplicar_bonus else df_rodada_atual['pontuacao_prevista_base']
     df_rodada_atual.loc[df_rodada_atual['pontuacao_prevista'] < 0.5, 'pontuacao_prevista'] = 0.5
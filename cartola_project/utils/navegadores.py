@@ -0,0 +1,246 @@
+"""
+Páginas HTML para os scrapers (FBref): HTTP simples quando basta, navegador quando o site exige.
+
+obter_html/obter_htmls tentam primeiro a sessão HTTP compartilhada (cloudscraper, se instalado).
+Se o host bloquear o acesso simples (403, desafio anti-bot, página sem tabelas), ele passa a ser
+atendido pelo PoolNavegadores: alguns Chrome headless iniciados uma única vez, que consomem as
+páginas de uma fila. Todas as cargas, pelos dois caminhos, respeitam o limite de taxa do host
+(cliente_http.aguardar_limite), então vários navegadores só sobrepõem a renderização das páginas
+com a espera do limite, sem aumentar a taxa de requisições ao site.
+"""
+
+import queue
+import threading
+from concurrent.futures import Future
+from urllib.parse import urlsplit
+from utils.config import logger
+from utils.cliente_http import get, aguardar_limite
+
+try:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    SELENIUM_DISPONIVEL = True
+except ImportError:
+    SELENIUM_DISPONIVEL = False
+
+try:
+    import cloudscraper
+    CLOUDSCRAPER_DISPONIVEL = True
+except ImportError:
+    CLOUDSCRAPER_DISPONIVEL = False
+
+NAVEGADORES_PADRAO = 2  # Com o FBref a 1 página/6s, mais instâncias não aumentam a vazão
+ESPERA_TABELA_SEG = 15
+SELETOR_PRONTO = "table.stats_table"  # A página está pronta quando as tabelas de estatísticas aparecem
+USER_AGENT_NAVEGADOR = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+STATUS_BLOQUEIO = {401, 403}
+MARCAS_DESAFIO = ('challenge-platform', 'cf-chl', 'Just a moment...')  # Página de desafio anti-bot (Cloudflare)
+
+_HOSTS_COM_NAVEGADOR = set()  # Hosts que bloquearam o HTTP simples nesta execução
+_SCRAPER = None
+_SCRAPER_GUARDA = threading.Lock()
+
+def _novo_driver():
+    opcoes = Options()
+    opcoes.add_argument('--headless')
+    opcoes.add_argument('--no-sandbox')
+    opcoes.add_argument('--disable-dev-shm-usage')
+    opcoes.add_argument('--disable-blink-features=AutomationControlled')
+    opcoes.add_experimental_option("excludeSwitches", ["enable-automation"])
+    opcoes.add_experimental_option('useAutomationExtension', False)
+    opcoes.add_argument(f'user-agent={USER_AGENT_NAVEGADOR}')
+    opcoes.page_load_strategy = 'eager'  # Não espera imagens e anúncios: só o DOM com as tabelas
+    return webdriver.Chrome(options=opcoes)
+
+class PoolNavegadores:
+    """
+    Chrome headless reaproveitados entre páginas. Cada navegador roda na sua thread e consome
+    URLs de uma fila comum; um navegador que falhar é recriado na página seguinte. Os navegadores
+    só sobem (em paralelo) na primeira página enfileirada: um pool nunca usado não abre o Chrome.
+
+    Exemplo:
+        with PoolNavegadores(2) as pool:
+            paginas = pool.html_varios(urls)
+    """
+
+    def __init__(self, tamanho=NAVEGADORES_PADRAO, espera_seg=ESPERA_TABELA_SEG, seletor=SELETOR_PRONTO):
+        if not SELENIUM_DISPONIVEL:
+            raise RuntimeError("Selenium não está disponível. Instale com: pip install selenium")
+        self.espera_seg = espera_seg
+        self.seletor = seletor
+        self.tamanho = tamanho
+        self.fila = queue.Queue()
+        self.threads = []
+        self.guarda = threading.Lock()
+
+    def _iniciar(self):
+        with self.guarda:
+            if not self.threads:
+                self.threads = [threading.Thread(target=self._trabalhar, daemon=True) for _ in range(self.tamanho)]
+                for thread in self.threads:
+                    thread.start()
+
+    def _carregar(self, driver, url):
+        aguardar_limite(url)
+        driver.get(url)
+        WebDriverWait(driver, self.espera_seg).until(EC.presence_of_element_located((By.CSS_SELECTOR, self.seletor)))
+        return driver.page_source
+
+    def _trabalhar(self):
+        driver = None
+        try:
+            while True:
+                if driver is None:
+                    try:
+                        driver = _novo_driver()
+                    except Exception as e:
+                        logger.error(f"Não foi possível iniciar o navegador: {e}")
+                tarefa = self.fila.get()
+                if tarefa is None:
+                    return
+                url, futuro = tarefa
+                if not futuro.set_running_or_notify_cancel():
+                    continue
+                if driver is None:
+                    futuro.set_exception(RuntimeError("Navegador indisponível."))
+                    continue
+                try:
+                    futuro.set_result(self._carregar(driver, url))
+                except Exception as e:
+                    futuro.set_exception(e)
+                    driver.quit()  # Sessão possivelmente corrompida: recria antes da próxima página
+                    driver = None
+        finally:
+            if driver is not None:
+                driver.quit()
+
+    def submeter(self, url):
+        """Enfileira uma página; devolve um Future com o HTML."""
+        self._iniciar()
+        futuro = Future()
+        self.fila.put((url, futuro))
+        return futuro
+
+    def html(self, url):
+        """HTML da página (levanta a exceção do navegador em caso de falha)."""
+        return self.submeter(url).result()
+
+    def html_varios(self, urls):
+        """{url: html}, com None nas páginas que falharam. As páginas são distribuídas entre os navegadores."""
+        futuros = {url: self.submeter(url) for url in urls}
+        paginas = {}
+        for url, futuro in futuros.items():
+            try:
+                paginas[url] = futuro.result()
+            except Exception as e:
+                logger.warning(f"Falha ao carregar {url} no navegador: {e}")
+                paginas[url] = None
+        return paginas
+
+    def fechar(self):
+        with self.guarda:
+            threads, self.threads = self.threads, []
+        for _ in threads:
+            self.fila.put(None)
+        for thread in threads:
+            thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+
+def _bloqueio(resposta):
+    """True se a resposta é uma recusa do site ao acesso sem navegador (e não uma falha passageira)."""
+    if resposta.status_code in STATUS_BLOQUEIO:
+        return True
+    if any(marca in resposta.text for marca in MARCAS_DESAFIO):
+        return True
+    return resposta.status_code == 200  # Página servida, mas sem as tabelas (conteúdo montado por JavaScript)
+
+def _html_http(url):
+    """(HTML, bloqueado) pelo caminho HTTP. Sem HTML, 'bloqueado' diz se o site recusou o acesso sem navegador."""
+    global _SCRAPER
+    if CLOUDSCRAPER_DISPONIVEL:
+        with _SCRAPER_GUARDA:
+            if _SCRAPER is None:
+                _SCRAPER = cloudscraper.create_scraper()
+        aguardar_limite(url)
+        resposta = _SCRAPER.get(url, timeout=30)
+    else:
+        resposta = get(url, tentativas=2)
+    if resposta.status_code == 200 and '<table' in resposta.text:
+        return resposta.text, False
+    bloqueado = _bloqueio(resposta)
+    logger.info(f"{urlsplit(url).hostname}: {'acesso sem navegador recusado' if bloqueado else 'falha no acesso sem navegador'} "
+                f"(HTTP {resposta.status_code}).")
+    return None, bloqueado
+
+def _tentar_http(url):
+    """
+    HTML pelo caminho HTTP, ou None. Só um bloqueio de fato passa o host para o navegador de vez;
+    erros de conexão, timeouts e 5xx valem só para esta página.
+    """
+    host = urlsplit(url).hostname
+    if host in _HOSTS_COM_NAVEGADOR:
+        return None
+    try:
+        html, bloqueado = _html_http(url)
+    except Exception as e:
+        logger.info(f"{host}: falha no acesso sem navegador ({e}).")
+        return None
+    if bloqueado:
+        _HOSTS_COM_NAVEGADOR.add(host)
+    return html
+
+def obter_html(url, pool=None):
+    """
+    HTML de 'url': HTTP simples se o host aceitar, senão o navegador ('pool' ou um temporário).
+    Retorna None se nenhum dos caminhos funcionar.
+    """
+    html = _tentar_http(url)
+    if html is not None:
+        return html
+    if pool is not None:
+        return pool.html_varios([url])[url]
+    if not SELENIUM_DISPONIVEL:
+        logger.warning(f"{url} exige navegador, mas o Selenium não está disponível.")
+        return None
+    with PoolNavegadores(1) as temporario:
+        return temporario.html_varios([url])[url]
+
+def obter_htmls(urls, pool=None):
+    """
+    {url: html} de várias páginas. Enquanto o host aceitar HTTP simples as páginas vêm por ele;
+    a partir do primeiro bloqueio, as restantes vão todas para a fila do pool de navegadores.
+    """
+    paginas, futuros = {}, {}
+    for url in urls:
+        html = _tentar_http(url)
+        if html is not None:
+            paginas[url] = html
+        elif pool is not None:
+            futuros[url] = pool.submeter(url)
+        else:
+            paginas[url] = None
+    if pool is None and SELENIUM_DISPONIVEL and any(v is None for v in paginas.values()):
+        pendentes = [u for u, v in paginas.items() if v is None]
+        with PoolNavegadores(min(NAVEGADORES_PADRAO, len(pendentes))) as temporario:
+            paginas.update(temporario.html_varios(pendentes))
+    for url, futuro in futuros.items():
+        try:
+            paginas[url] = futuro.result()
+        except Exception as e:
+            logger.warning(f"Falha ao carregar {url} no navegador: {e}")
+            paginas[url] = None
+    return paginas
+
+if __name__ == "__main__":
+    import sys
+    for url, html in obter_htmls(sys.argv[1:] or ["https://fbref.com/en/comps/24"]).items():
+        print(f"{url}: {'falhou' if html is None else f'{len(html)} caracteres'}")
@@ -0,0 +1,248 @@
+"""
+Acompanhamento ao vivo das parciais da rodada (/atletas/pontuados durante os jogos).
+
+A cada 'intervalo' segundos a API é consultada com If-None-Match (ETag em memória): respostas 304
+ou com o mesmo corpo não são nem decodificadas. Quando o corpo muda, a pontuação e os scouts de
+cada atleta são comparados com a consulta anterior e só as mudanças seguem adiante: o placar da
+escalação (titulares, capitão e banco) só é recalculado se algum atleta dela mudou ou se o jogo
+de algum clube terminou (/partidas, consultado também com ETag).
+"""
+
+import sys
+import time
+import hashlib
+import pandas as pd
+from utils.config import config, logger
+from utils.cliente_http import get
+from utils.snapshots_api import arquivar_resposta
+from utils.acesso_dados import mapa_clubes
+
+INTERVALO_PADRAO_SEG = 30
+MULTIPLICADOR_CAPITAO = 1.5
+_SEM_PARCIAL = {'pontuacao': 0.0, 'scout': {}, 'entrou_em_campo': False}  # Atleta ainda ausente das parciais
+
+def ler_parciais(dados):
+    """Resposta de /atletas/pontuados -> {atleta_id: {'apelido', 'pontuacao', 'scout', 'entrou_em_campo', ...}}."""
+    parciais = {}
+    for atleta_id, atleta in (dados.get('atletas') or {}).items():
+        parciais[int(atleta_id)] = {
+            'apelido': atleta.get('apelido'),
+            'clube_id': atleta.get('clube_id'),
+            'posicao_id': atleta.get('posicao_id'),
+            'pontuacao': float(atleta.get('pontuacao') or 0),
+            'scout': {k: v for k, v in (atleta.get('scout') or {}).items() if v},
+            'entrou_em_campo': bool(atleta.get('entrou_em_campo')),
+        }
+    return parciais
+
+def ler_jogos_encerrados(dados):
+    """Resposta de /partidas -> conjunto de clube_id cujo jogo da rodada já terminou."""
+    encerrados = set()
+    for partida in dados.get('partidas') or []:
+        if partida.get('status_transmissao_tr') == 'ENCERRADA' or partida.get('periodo_tr') == 'POS_JOGO':
+            encerrados |= {int(partida['clube_casa_id']), int(partida['clube_visitante_id'])}
+    return encerrados
+
+def diferencas_parciais(anteriores, atuais):
+    """
+    Mudanças entre duas consultas: atletas com pontuação, scouts ou entrada em campo diferentes
+    (um atleta que aparece pela primeira vez sem nada disso não conta como mudança).
+
+    Returns:
+        Lista de dicts com atleta_id, apelido, pontuacao_anterior, pontuacao, variacao e
+        scouts (variação de cada scout alterado, ex: {'G': 1, 'FS': 2}).
+    """
+    mudancas = []
+    for atleta_id, atual in atuais.items():
+        anterior = anteriores.get(atleta_id, _SEM_PARCIAL)
+        if anterior['pontuacao'] == atual['pontuacao'] and anterior['scout'] == atual['scout'] \
+                and anterior['entrou_em_campo'] == atual['entrou_em_campo']:
+            continue
+        scouts = {s: atual['scout'].get(s, 0) - anterior['scout'].get(s, 0) for s in set(atual['scout']) | set(anterior['scout'])}
+        mudancas.append({
+            'atleta_id': atleta_id, 'apelido': atual['apelido'], 'pontuacao_anterior': anterior['pontuacao'],
+            'pontuacao': atual['pontuacao'], 'variacao': round(atual['pontuacao'] - anterior['pontuacao'], 2),
+            'scouts': {s: v for s, v in scouts.items() if v}, 'entrou_em_campo': atual['entrou_em_campo'],
+        })
+    return mudancas
+
+class EscalacaoAoVivo:
+    """
+    Placar corrente e projeção de uma escalação a partir das parciais.
+
+    Projeção: quem já entrou em campo vale a parcial; quem ainda não entrou vale a pontuação
+    prevista, até o jogo do seu clube terminar (aí vale 0). Regras do banco do Cartola:
+    o reserva da posição só entra no lugar do titular que não entrou em campo depois que o jogo
+    do titular terminou, e o x1.5 vale só para a pontuação do próprio capitão: o reserva que
+    entra no lugar dele não herda a capitania.
+    """
+
+    def __init__(self, time_titular, capitao_id=None, reservas=None, coluna_prevista='pontuacao_prevista'):
+        self.titulares = self._registros(time_titular, coluna_prevista)
+        self.reservas = {} if reservas is None or reservas.empty else \
+            {r['posicao']: r for r in self._registros(reservas, coluna_prevista)}
+        self.capitao_id = capitao_id
+        self.ids = {j['atleta_id'] for j in self.titulares} | {r['atleta_id'] for r in self.reservas.values()}
+        self.parciais = {}  # Só os atletas da escalação
+        self.encerrados = set()  # clube_id com o jogo da rodada já terminado
+        self.resumo = self._calcular()
+
+    @staticmethod
+    def _registros(df, coluna_prevista):
+        colunas = ['atleta_id', 'posicao', coluna_prevista] + (['clube_id'] if 'clube_id' in df.columns else [])
+        return df[colunas].rename(columns={coluna_prevista: 'prevista'}).to_dict('records')
+
+    def _jogo_encerrado(self, jogador):
+        # Clube da escalação (se informado) ou o das parciais, para quem já apareceu nelas
+        clube_id = jogador.get('clube_id')
+        if clube_id is None or pd.isna(clube_id):
+            clube_id = (self.parciais.get(jogador['atleta_id']) or {}).get('clube_id')
+        return clube_id is not None and int(clube_id) in self.encerrados
+
+    def _valor(self, jogador):
+        parcial = self.parciais.get(jogador['atleta_id'])
+        em_campo = parcial is not None and parcial['entrou_em_campo']
+        if em_campo:
+            projecao = parcial['pontuacao']
+        else:
+            projecao = 0.0 if self._jogo_encerrado(jogador) else jogador['prevista']
+        return (parcial['pontuacao'] if parcial else 0.0), projecao, em_campo
+
+    def _calcular(self):
+        parcial_total, projecao_total, em_campo_total, substituicoes = 0.0, 0.0, 0, []
+        for titular in self.titulares:
+            jogador = titular
+            reserva = self.reservas.get(titular['posicao'])
+            if reserva is not None and not self._valor(titular)[2] and self._jogo_encerrado(titular):
+                jogador = reserva
+                substituicoes.append((titular['atleta_id'], reserva['atleta_id']))
+            parcial, projecao, em_campo = self._valor(jogador)
+            fator = MULTIPLICADOR_CAPITAO if jogador['atleta_id'] == self.capitao_id else 1.0
+            parcial_total += parcial * fator
+            projecao_total += projecao * fator
+            em_campo_total += int(em_campo)
+        return {'parcial': round(parcial_total, 2), 'projecao': round(projecao_total, 2),
+                'em_campo': em_campo_total, 'substituicoes': substituicoes}
+
+    def aplicar(self, mudancas, parciais):
+        """Atualiza com as mudanças de uma consulta. Retorna True se o placar da escalação mudou."""
+        relevantes = [m['atleta_id'] for m in mudancas if m['atleta_id'] in self.ids]
+        if not relevantes:
+            return False
+        for atleta_id in relevantes:
+            self.parciais[atleta_id] = parciais[atleta_id]
+        anterior, self.resumo = self.resumo, self._calcular()
+        return self.resumo != anterior
+
+    def atualizar_jogos(self, encerrados):
+        """Atualiza os clubes com jogo encerrado (ler_jogos_encerrados). Retorna True se o placar mudou."""
+        if encerrados == self.encerrados:
+            return False
+        self.encerrados = set(encerrados)
+        anterior, self.resumo = self.resumo, self._calcular()
+        return self.resumo != anterior
+
+def carregar_escalacao(caminho):
+    """
+    Escalação (ou banco de reservas) salva em CSV (ex: 'time_ianova_rodada_34.csv'): colunas atleta_id,
+    posicao e pontuacao_prevista; o capitão é a linha com a coluna 'C' preenchida. Sem 'clube_id',
+    o clube é obtido pelo nome na coluna 'clube' (para saber quando o jogo dele terminou).
+    """
+    df = pd.read_csv(caminho, encoding='utf-8-sig')
+    if 'clube_id' not in df.columns and 'clube' in df.columns:
+        por_nome = {nome: int(cid) for campo in ('nome', 'nome_fantasia') for cid, nome in mapa_clubes(campo).items()}
+        df['clube_id'] = df['clube'].map(por_nome)
+    capitao = df.loc[df['C'].notna(), 'atleta_id'] if 'C' in df.columns else pd.Series(dtype=int)
+    return df, (int(capitao.iloc[0]) if not capitao.empty else None)
+
+def _consultar_jogos(etag):
+    """(etag, clubes com jogo encerrado) de /partidas; clubes None se a resposta não mudou ou a consulta falhou."""
+    try:
+        resposta = get(config.API_URL_PARTIDAS, headers={'If-None-Match': etag} if etag else None, tentativas=2)
+    except Exception as e:
+        logger.warning(f"Partidas: falha na consulta ({e}).")
+        return etag, None
+    if resposta.status_code != 200:
+        return etag, None
+    return resposta.headers.get('ETag'), ler_jogos_encerrados(resposta.json())
+
+def _registrar_escalacao(resumo):
+    logger.info(f"  Escalação: parcial {resumo['parcial']:.2f} | projeção {resumo['projecao']:.2f} "
+                f"| {resumo['em_campo']}/12 em campo")
+
+def acompanhar_parciais(escalacao=None, intervalo=INTERVALO_PADRAO_SEG, ao_mudar=None, max_consultas=None, arquivar=True):
+    """
+    Consulta as parciais a cada 'intervalo' segundos até Ctrl+C (ou 'max_consultas').
+
+    Args:
+        escalacao (EscalacaoAoVivo, optional): Escalação cujo placar é atualizado a cada mudança.
+            Com escalação, /partidas também é consultado para saber quais jogos terminaram.
+        ao_mudar (callable, optional): Chamada com (mudancas, resumo_da_escalacao) quando algo muda
+            (mudancas vazia quando só o fim de um jogo alterou o placar); padrão: registra no log.
+        arquivar (bool): Guarda as respostas que mudaram no arquivo bruto (endpoint 'parciais').
+    """
+    etag, sha_anterior, parciais = None, None, {}
+    etag_jogos = None
+    consultas = 0
+    try:
+        while max_consultas is None or consultas < max_consultas:
+            if consultas:
+                time.sleep(intervalo)
+            consultas += 1
+            if escalacao is not None:
+                etag_jogos, encerrados = _consultar_jogos(etag_jogos)
+                if encerrados is not None and escalacao.atualizar_jogos(encerrados):
+                    if ao_mudar is not None:
+                        ao_mudar([], escalacao.resumo)
+                    else:
+                        logger.info(f"Partidas: {len(encerrados) // 2} jogo(s) encerrado(s).")
+                        _registrar_escalacao(escalacao.resumo)
+            try:
+                resposta = get(config.API_URL_PARCIAIS, headers={'If-None-Match': etag} if etag else None, tentativas=2)
+            except Exception as e:
+                logger.warning(f"Parciais: falha na consulta ({e}).")
+                continue
+            if resposta.status_code == 304:
+                continue
+            if resposta.status_code != 200:
+                logger.warning(f"Parciais: HTTP {resposta.status_code}.")
+                continue
+            etag = resposta.headers.get('ETag')
+            sha = hashlib.sha256(resposta.content).hexdigest()
+            if sha == sha_anterior:
+                continue
+            sha_anterior = sha
+
+            dados = resposta.json()
+            atuais = ler_parciais(dados)
+            if not atuais:
+                logger.info("Parciais: nenhum atleta pontuado (mercado aberto ou rodada ainda não começou).")
+                continue
+            if arquivar:
+                arquivar_resposta('parciais', resposta.content, rodada=dados.get('rodada'), url=config.API_URL_PARCIAIS)
+            mudancas = diferencas_parciais(parciais, atuais)
+            parciais = atuais
+            mudou_escalacao = escalacao.aplicar(mudancas, atuais) if escalacao is not None else False
+            if not mudancas:
+                continue
+            resumo = escalacao.resumo if escalacao is not None else None
+            if ao_mudar is not None:
+                ao_mudar(mudancas, resumo)
+            else:
+                logger.info(f"Parciais: {len(mudancas)} atleta(s) mudaram.")
+                for m in mudancas[:10]:
+                    logger.info(f"  {m['apelido']}: {m['pontuacao_anterior']:.1f} -> {m['pontuacao']:.1f} {m['scouts']}")
+                if mudou_escalacao:
+                    _registrar_escalacao(resumo)
+    except KeyboardInterrupt:
+        logger.info("Acompanhamento das parciais encerrado.")
+    return parciais
+
+if __name__ == "__main__":
+    # Uso: python -m utils.parciais [escalacao.csv [reservas.csv]]
+    escalacao = None
+    if len(sys.argv) > 1:
+        time_titular, capitao_id = carregar_escalacao(sys.argv[1])
+        reservas = carregar_escalacao(sys.argv[2])[0] if len(sys.argv) > 2 else None
+        escalacao = EscalacaoAoVivo(time_titular, capitao_id, reservas)
+    acompanhar_parciais(escalacao)
@@ -1,9 +1,11 @@
 import pandas as pd
 import os
-import json
 import numpy as np
 from utils.config import config, logger
+from utils.arquivos import salvar_csv
 from utils.validacao import validar_dados_rodada, validar_partidas
+from utils.carregamento import carregar_historico_jogadores
+from utils.acesso_dados import carregar_rodada_atual, carregar_partidas_rodada, carregar_clubes_json, carregar_odds
 
 # --- DICIONÁRIO DE FORÇA (SIMULADO) ---
 RANKING_FORCA = {
@@ -38,11 +40,10 @@ def get_forca(nome_clube, tipo):
 
 def calcular_volatilidade():
     """Calcula o desvio padrão das pontuações da temporada atual."""
-    if not os.path.exists(config.HISTORICO_ATUAL_PATH):
-        return {}
-    
     try:
-        df = pd.read_csv(config.HISTORICO_ATUAL_PATH)
+        df = carregar_historico_jogadores(anos=[config.CURRENT_YEAR], colunas=['pontuacao'])
+        if df is None or df.empty:
+            return {}
         volatilidade = df.groupby('atleta_id')['pontuacao'].std().to_dict()
         return volatilidade
     except Exception as e:
@@ -57,16 +58,14 @@ def preprocessar_dados_rodada(alpha=0.2):
             logger.error(f"Arquivo '{config.RAW_DATA_PATH}' não encontrado.")
             return None
             
-        df_jogadores_raw = pd.read_csv(config.RAW_DATA_PATH)
-        df_partidas = pd.read_csv(config.MATCHES_DATA_PATH)
+        df_jogadores_raw = carregar_rodada_atual()
+        df_partidas = carregar_partidas_rodada()
         
         if not validar_dados_rodada(df_jogadores_raw) or not validar_partidas(df_partidas):
             logger.error("Dados de entrada inválidos para pré-processamento.")
             return None
 
-        with open(config.CLUBS_DATA_PATH, 'r', encoding='utf8') as f:
-            clubes_map_str = json.load(f)
-            clubes_map = {int(k): v for k, v in clubes_map_str.items()}
+        clubes_map = carregar_clubes_json()
 
         df_jogadores = df_jogadores_raw[df_jogadores_raw['status'] == 'Provável'].copy()
         
@@ -105,8 +104,8 @@ def preprocessar_dados_rodada(alpha=0.2):
         df_jogadores['volatilidade'] = df_jogadores['atleta_id'].map(mapa_volatilidade).fillna(2.0)
 
         # --- 5. Juntar com Odds (Se existirem) ---
-        if os.path.exists(config.ODDS_DATA_PATH):
-            df_odds = pd.read_csv(config.ODDS_DATA_PATH)
+        df_odds = carregar_odds()
+        if df_odds is not None:
             
             df_jogadores = df_jogadores.merge(
                 df_odds, 
@@ -180,7 +179,7 @@ def preprocessar_dados_rodada(alpha=0.2):
         df_final.replace([np.inf, -np.inf], np.nan, inplace=True)
         df_final.fillna(0, inplace=True)
         
-        df_final.to_csv(config.PROCESSED_DATA_PATH, index=False, encoding='utf-8-sig')
+        salvar_csv(df_final, config.PROCESSED_DATA_PATH, index=False, encoding='utf-8-sig')
         logger.info(f"Pré-processamento concluído. Salvo em '{config.PROCESSED_DATA_PATH}'")
         return df_final
 
@@ -0,0 +1,286 @@
+"""
+Servidor HTTP local que reproduz as APIs das coletas (Cartola, GE e Odds API) para medir e
+testar as coletas sem rede.
+
+O corpus de respostas é o arquivo bruto (snapshots_api), alimentado pelas próprias coletas, por
+gravar_corpus e pelos JSONs de depuração antigos (importar_json_legados). Rodadas sem snapshot de
+/atletas/pontuados ou dos jogos do GE são montadas a partir do armazém. O servidor responde nos
+mesmos caminhos das APIs reais, então basta trocar os hosts das URLs do Config (apontar_para).
+
+Latência, taxa de erros (503) e limite de requisições por segundo (429) são configuráveis e os
+erros vêm de um gerador com semente: duas execuções com os mesmos parâmetros se comportam igual.
+"""
+
+import re
+import json
+import time
+import random
+import hashlib
+import threading
+from collections import deque
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import pandas as pd
+from utils.config import config, logger
+from utils.armazenamento import carregar_tabela
+from utils.snapshots_api import arquivar_resposta, carregar_snapshot
+from utils.cliente_http import limite_temporario
+
+# Limite do cliente para o host do mock: sem limite, para medir o servidor e a ingestão, não o balde de 127.0.0.1
+SEM_LIMITE_CLIENTE = (1e9, 1e9)
+
+SCOUTS_RESPOSTA = ['G', 'A', 'FT', 'FD', 'FF', 'FS', 'PS', 'I', 'PP', 'DP', 'SG', 'DE', 'DS', 'GC', 'CV', 'CA', 'GS', 'PC', 'FC']
+
+# Atributos do Config com URLs de coleta (apontar_para troca o esquema e o host, mantendo o caminho)
+URLS_CONFIG = ['API_URL_MERCADO', 'API_URL_PARTIDAS', 'API_URL_PONTUADOS', 'API_URL_PARCIAIS', 'GE_URL_JOGOS', 'ODDS_API_URL']
+
+# Caminho da requisição -> (endpoint do arquivo bruto, rodada)
+ROTAS = [
+    (re.compile(r"/atletas/mercado"), lambda m: ('mercado', None)),
+    (re.compile(r"/partidas"), lambda m: ('partidas', None)),
+    (re.compile(r"/atletas/pontuados"), lambda m: ('parciais', None)),
+    (re.compile(r"/atletas/pontuados/(\d+)"), lambda m: ('pontuados', int(m.group(1)))),
+    (re.compile(r"/tabela/[^/]+/fase/[^/]+/rodada/(\d+)/jogos"), lambda m: ('ge_jogos', int(m.group(1)))),
+    (re.compile(r"/v4/sports/[^/]+/odds"), lambda m: ('odds', None)),
+]
+
+def _json_bytes(dados):
+    return json.dumps(dados, ensure_ascii=False, default=str).encode('utf-8')
+
+def resposta_pontuados(ano, rodada):
+    """Corpo (bytes) de /atletas/pontuados/{rodada}, ou None se a rodada não estiver disponível."""
+    dados = carregar_snapshot('pontuados', ano, rodada)
+    if dados is None:
+        df = carregar_tabela('jogadores', anos=[ano], rodadas=[rodada])
+        if df is None or df.empty:
+            return None
+        scouts = [c for c in SCOUTS_RESPOSTA if c in df.columns]
+        atletas = {}
+        for linha in df.to_dict('records'):
+            scout = {c: int(linha[c]) for c in scouts if linha[c] == linha[c] and linha[c]}
+            atletas[str(int(linha['atleta_id']))] = {
+                'scout': scout, 'apelido': linha.get('apelido'), 'pontuacao': float(linha.get('pontuacao') or 0),
+                'posicao_id': int(linha.get('posicao_id') or 0), 'clube_id': linha.get('clube_id'), 'entrou_em_campo': True,
+            }
+        dados = {'atletas': atletas, 'rodada': rodada, 'total_atletas': len(atletas)}
+    return _json_bytes(dados)
+
+def resposta_ge_jogos(ano, rodada, partidas=None):
+    """Corpo (bytes) dos jogos de uma rodada na API do GE, ou None se a rodada não estiver disponível."""
+    dados = carregar_snapshot('ge_jogos', ano, rodada)
+    if dados is None:
+        if partidas is None:
+            partidas = carregar_tabela('partidas', anos=[ano], rodadas=[rodada])
+        if partidas is None or partidas.empty:
+            return None
+        jogos = partidas[partidas['rodada'] == rodada]
+        if jogos.empty:
+            return None
+        placar = lambda v: None if pd.isna(v) else int(v)
+        dados = [{'equipes': {'mandante': {'id': int(j.mandante_id)}, 'visitante': {'id': int(j.visitante_id)}},
+                  'placar_oficial_mandante': placar(j.placar_mandante), 'placar_oficial_visitante': placar(j.placar_visitante)}
+                 for j in jogos.itertuples()]
+    return _json_bytes(dados)
+
+def montar_respostas(ano, rodadas=range(1, 39), endpoints=('mercado', 'partidas', 'parciais', 'pontuados', 'ge_jogos', 'odds')):
+    """Corpus de respostas de uma temporada: {(endpoint, rodada): corpo}. Respostas sem rodada usam rodada None."""
+    respostas = {}
+    for endpoint in ('mercado', 'partidas', 'parciais', 'odds'):
+        if endpoint in endpoints and (dados := carregar_snapshot(endpoint, ano)) is not None:
+            respostas[(endpoint, None)] = _json_bytes(dados)
+    partidas = carregar_tabela('partidas', anos=[ano]) if 'ge_jogos' in endpoints else None
+    for rodada in rodadas:
+        if 'pontuados' in endpoints and (corpo := resposta_pontuados(ano, rodada)) is not None:
+            respostas[('pontuados', rodada)] = corpo
+        if 'ge_jogos' in endpoints and (corpo := resposta_ge_jogos(ano, rodada, partidas)) is not None:
+            respostas[('ge_jogos', rodada)] = corpo
+    return respostas
+
+def _rota(caminho):
+    caminho = urlsplit(caminho).path
+    for padrao, chave in ROTAS:
+        if (encontrado := padrao.fullmatch(caminho)):
+            return chave(encontrado)
+    return None
+
+def _criar_handler(respostas, latencia, taxa_erros, limite_rps, semente, contador):
+    sorteio = random.Random(semente)
+    janela = deque()  # Horários das requisições do último segundo (limite_rps)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # Keep-alive, como as APIs reais
+
+        def _responder(self, status, corpo=b'', cabecalhos=None):
+            self.send_response(status)
+            for nome, valor in (cabecalhos or {}).items():
+                self.send_header(nome, valor)
+            self.send_header('Content-Length', str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def do_GET(self):
+            with contador['guarda']:
+                contador['requisicoes'] += 1
+                agora = time.monotonic()
+                while janela and agora - janela[0] >= 1:
+                    janela.popleft()
+                limitada = limite_rps is not None and len(janela) >= limite_rps
+                if not limitada:
+                    janela.append(agora)
+                erro = not limitada and sorteio.random() < taxa_erros
+                contador['limitadas'] += int(limitada)
+                contador['erros'] += int(erro)
+            time.sleep(latencia)
+            if limitada:
+                return self._responder(429, cabecalhos={'Retry-After': '1'})
+            if erro:
+                return self._responder(503)
+
+            chave = _rota(self.path)
+            corpo = respostas.get(chave) if chave else None
+            if corpo is None:
+                return self._responder(404)
+            etag = f'"{hashlib.sha256(corpo).hexdigest()[:16]}"'  # Calculado a cada vez: 'respostas' pode mudar no ar
+            if self.headers.get('If-None-Match') == etag:
+                with contador['guarda']:
+                    contador['nao_modificadas'] += 1
+                return self._responder(304, cabecalhos={'ETag': etag})
+            self._responder(200, corpo, {'Content-Type': 'application/json; charset=utf-8', 'ETag': etag})
+
+        def log_message(self, *args):
+            pass  # Sem uma linha no console por requisição
+
+    return Handler
+
+@contextmanager
+def servidor_mock(ano=None, rodadas=range(1, 39), latencia=0.3, porta=0, taxa_erros=0.0, limite_rps=None, semente=0,
+                  respostas=None, limite_cliente=SEM_LIMITE_CLIENTE):
+    """
+    Sobe o servidor em uma thread e fornece a URL base (no lugar de 'https://api.cartolafc.globo.com').
+
+    Args:
+        latencia (float): Segundos de espera por requisição.
+        taxa_erros (float): Fração das requisições respondidas com 503.
+        limite_rps (int, optional): Requisições por segundo acima das quais o servidor responde 429.
+        respostas (dict, optional): Corpus pronto (montar_respostas); padrão: o da temporada 'ano'.
+            Pode ser alterado com o servidor no ar (ex: parciais que evoluem durante um teste).
+        limite_cliente (tuple): (requisições/s, rajada) do cliente_http para o host do mock enquanto ele
+            estiver no ar. Padrão: sem limite (o limite simulado do servidor é 'limite_rps').
+
+    Exemplo:
+        with servidor_mock(2025, latencia=0.3) as base_url:
+            coletar_pontuados(2025, base_url=base_url, gravar=False)
+    """
+    if ano is None:
+        ano = config.PREVIOUS_YEAR
+    # Respostas montadas antes de subir o servidor: a latência medida é só a artificial
+    if respostas is None:
+        respostas = montar_respostas(ano, rodadas)
+    contador = {'requisicoes': 0, 'erros': 0, 'limitadas': 0, 'nao_modificadas': 0, 'guarda': threading.Lock()}
+    servidor = ThreadingHTTPServer(('127.0.0.1', porta),
+                                   _criar_handler(respostas, latencia, taxa_erros, limite_rps, semente, contador))
+    servidor.daemon_threads = True
+    thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+    thread.start()
+    logger.info(f"Servidor mock em http://127.0.0.1:{servidor.server_port} ({len(respostas)} respostas de {ano}, latência {latencia}s).")
+    try:
+        with limite_temporario('127.0.0.1', *limite_cliente):
+            yield f"http://127.0.0.1:{servidor.server_port}"
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+        resumo = {k: v for k, v in contador.items() if k != 'guarda'}
+        logger.info(f"Servidor mock encerrado: {resumo}.")
+
+@contextmanager
+def apontar_para(base_url):
+    """Troca o esquema e o host das URLs de coleta do Config por 'base_url' (restaura ao sair)."""
+    originais = {nome: getattr(config, nome) for nome in URLS_CONFIG}
+    try:
+        for nome, url in originais.items():
+            partes = urlsplit(url)
+            setattr(config, nome, base_url + url[len(f"{partes.scheme}://{partes.netloc}"):])
+        yield
+    finally:
+        for nome, url in originais.items():
+            setattr(config, nome, url)
+
+def gravar_corpus(rodadas=range(1, 39)):
+    """
+    Grava no arquivo bruto as respostas reais atuais do mercado, das partidas, dos pontuados e dos
+    jogos do GE da temporada corrente (as coletas normais já arquivam o que baixam; isto completa o
+    corpus de uma vez). A Odds API fica de fora por causa da cota mensal.
+    """
+    from utils.cliente_http import get
+    from utils.coleta_concorrente import buscar_varias
+    from utils.coleta_dados import ID_CAMPEONATO_GE, _rodada_mercado
+    ano = config.CURRENT_YEAR
+    gravadas = 0
+    for endpoint, url in [('mercado', config.API_URL_MERCADO), ('partidas', config.API_URL_PARTIDAS)]:
+        resposta = get(url)
+        if resposta.status_code == 200:
+            dados = resposta.json()
+            # Mesma rodada com que as coletas arquivam cada endpoint (reconstruir_* busca por ela)
+            rodada = dados.get('rodada') if endpoint == 'partidas' else _rodada_mercado(dados)
+            gravadas += arquivar_resposta(endpoint, resposta.content, ano=ano, rodada=rodada, url=url) is not None
+
+    urls = {}
+    for rodada in rodadas:
+        urls[config.API_URL_PONTUADOS.format(rodada=rodada)] = ('pontuados', rodada)
+        urls[config.GE_URL_JOGOS.format(id_campeonato=ID_CAMPEONATO_GE, ano=ano, rodada=rodada)] = ('ge_jogos', rodada)
+    for url, (status, corpo) in buscar_varias(list(urls)).items():
+        endpoint, rodada = urls[url]
+        if status != 200 or (endpoint == 'pontuados' and b'"atletas"' not in corpo):
+            continue  # Rodadas ainda não disputadas
+        gravadas += arquivar_resposta(endpoint, corpo, ano=ano, rodada=rodada, url=url) is not None
+    logger.info(f"Corpus de {ano}: {gravadas} respostas gravadas ou já presentes no arquivo bruto.")
+    return gravadas
+
+def benchmark_ingestao(ano=None, latencia=0.1, taxa_erros=0.0, limite_rps=None, semente=0,
+                       limite_cliente=SEM_LIMITE_CLIENTE):
+    """
+    Vazão da ingestão inteira contra o servidor local (nada é gravado nem arquivado): mercado e
+    partidas, pontuados da temporada (coleta concorrente) e jogos do GE (busca concorrente).
+    O limite de taxa do cliente para o mock é 'limite_cliente' (padrão: nenhum), então o tempo
+    medido é o da latência, dos erros e do limite do servidor, e não o do balde de 127.0.0.1.
+    """
+    from utils.cliente_http import get
+    from utils.coleta_concorrente import coletar_pontuados, buscar_varias
+    from utils.coleta_dados import ID_CAMPEONATO_GE, processar_jogos_ge
+    if ano is None:
+        ano = config.PREVIOUS_YEAR
+    respostas = montar_respostas(ano)
+    rodadas = sorted(r for e, r in respostas if e == 'pontuados')
+    rodadas_ge = sorted(r for e, r in respostas if e == 'ge_jogos')
+    resultados = []
+
+    with servidor_mock(ano, latencia=latencia, taxa_erros=taxa_erros, limite_rps=limite_rps, semente=semente,
+                       respostas=respostas, limite_cliente=limite_cliente) as base_url, apontar_para(base_url):
+        inicio = time.perf_counter()
+        registros = 0
+        for url in (config.API_URL_MERCADO, config.API_URL_PARTIDAS):
+            resposta = get(url)
+            if resposta.status_code == 200:
+                dados = resposta.json()
+                registros += len(dados.get('atletas') or dados.get('partidas') or [])
+        resultados.append(('mercado+partidas', 2, time.perf_counter() - inicio, registros))
+
+        inicio = time.perf_counter()
+        df = coletar_pontuados(ano, rodadas, gravar=False, arquivar=False)
+        resultados.append(('pontuados', len(rodadas), time.perf_counter() - inicio, len(df)))
+
+        inicio = time.perf_counter()
+        urls = {config.GE_URL_JOGOS.format(id_campeonato=ID_CAMPEONATO_GE, ano=ano, rodada=r): r for r in rodadas_ge}
+        registros = sum(len(processar_jogos_ge(json.loads(corpo), ano, urls[url]))
+                        for url, (status, corpo) in buscar_varias(list(urls)).items() if status == 200)
+        resultados.append(('ge_jogos', len(urls), time.perf_counter() - inicio, registros))
+
+    cliente = '-' if limite_cliente == SEM_LIMITE_CLIENTE else f"{limite_cliente[0]:g}"
+    print(f"Temporada {ano} | latência {latencia}s | erros {taxa_erros:.0%} | limite {limite_rps or '-'} req/s (cliente {cliente} req/s)")
+    for etapa, requisicoes, segundos, registros in resultados:
+        print(f"  {etapa:<17} {requisicoes:3d} req  {segundos:6.2f}s  {requisicoes / segundos:6.1f} req/s  {registros:7d} registros")
+    return resultados
+
+if __name__ == "__main__":
+    benchmark_ingestao()
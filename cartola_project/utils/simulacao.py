@@ -1,22 +1,24 @@
 import pandas as pd
 import numpy as np
 import os
-import json
 from utils.otimizador import otimizar_escalacao
 from utils.modelagem import prever_pontuacao, preparar_features_historicas
+from utils.carregamento import carregar_historico_jogadores
+from utils.armazenamento import carregar_tabela, tabela_disponivel, anos_disponiveis
+from utils.acesso_dados import HISTORICO_USUARIO_PATH, mapa_clubes, carregar_historico_usuario
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 DATA_DIR = os.path.join(PROJECT_ROOT, "data")
-HISTORICAL_DATA_PATH = os.path.join(DATA_DIR, "historico_jogadores.csv")
-HISTORICAL_ODDS_PATH = os.path.join(DATA_DIR, "historico_odds.csv")
-CLUBS_DATA_PATH = os.path.join(DATA_DIR, "clubes.json")
 
 def _preparar_historico():
     """Helper para carregar e preparar histórico de jogadores."""
-    if not os.path.exists(HISTORICAL_DATA_PATH):
+    # As simulações usam apenas a última temporada: só as partições dela são lidas
+    anos = anos_disponiveis('jogadores')
+    if not anos:
+        return None
+    df_hist = carregar_historico_jogadores(anos=[max(anos)], com_nomes=True)
+    if df_hist is None:
         return None
-
-    df_hist = pd.read_csv(HISTORICAL_DATA_PATH)
     
     # 1. Calcula média acumulada
     df_hist = df_hist.sort_values(['ano', 'atleta_id', 'rodada'])
@@ -24,17 +26,7 @@ def _preparar_historico():
     df_hist['media_num'] = df_hist.groupby(['ano', 'atleta_id'])['pontos_last'].transform(lambda x: x.expanding().mean())
     df_hist['media_num'] = df_hist['media_num'].fillna(0)
 
-    # 2. Mapeia Clubes
-    try:
-        with open(CLUBS_DATA_PATH, 'r', encoding='utf8') as f:
-            clubes_map = json.load(f)
-            id_to_name = {int(k): v['nome_fantasia'] for k, v in clubes_map.items()}
-            df_hist['clube'] = df_hist['clube_id'].map(id_to_name)
-            df_hist['clube'] = df_hist['clube'].fillna("Desconhecido")
-    except Exception as e:
-        print(f"Aviso: Erro clubes: {e}")
-        df_hist['clube'] = "Desconhecido"
-        
+    # 2. Clubes: nome já mapeado pelo carregador ('clube' categórico)
     return df_hist
 
 def simular_melhor_risco(window=10):
@@ -101,21 +93,8 @@ def simular_desempenho_recente(window=3, orcamento=140, formacao="4-3-3", risco=
     if modelo_tipo == "IA Avançada (XGBoost)":
         try:
             # Melhor recarregar o RAW para garantir compatibilidade total com a função de modelagem.
-            df_raw = pd.read_csv(HISTORICAL_DATA_PATH)
-            
-            # --- CORREÇÃO CRÍTICA DE POSIÇÃO (ID Numérico) ---
-            df_raw['posicao_id_temp'] = pd.to_numeric(df_raw['posicao_id'], errors='coerce')
-            if df_raw['posicao_id_temp'].isna().any():
-                 mapa_posicoes = {
-                    'gol': 1, 'lat': 2, 'zag': 3, 'mei': 4, 'ata': 5, 'tec': 6,
-                    'goleiro': 1, 'lateral': 2, 'zagueiro': 3, 'meia': 4, 'atacante': 5, 'técnico': 6
-                }
-                 df_raw['posicao_id'] = df_raw['posicao_id'].astype(str).str.lower().map(mapa_posicoes).fillna(df_raw['posicao_id_temp'])
-            else:
-                 df_raw['posicao_id'] = df_raw['posicao_id_temp']
-            
-            df_raw['posicao_id'] = df_raw['posicao_id'].fillna(0).astype(int)
-            df_raw.drop(columns=['posicao_id_temp'], inplace=True, errors='ignore')
+            # (posição já normalizada para id numérico pelo carregador)
+            df_raw = carregar_historico_jogadores(anos=[ano_max])
             
             df_full_enriched = preparar_features_historicas(df_raw)
             
@@ -135,10 +114,8 @@ def simular_desempenho_recente(window=3, orcamento=140, formacao="4-3-3", risco=
                 
             # Re-aplica mapeamento de clubes para exibição se necessário
             if 'clube' not in df_ano.columns:
-                 with open(CLUBS_DATA_PATH, 'r', encoding='utf8') as f:
-                    clubes_map = json.load(f)
-                    id_to_name = {int(k): v['nome_fantasia'] for k, v in clubes_map.items()}
-                    df_ano['clube'] = df_ano['clube_id'].map(id_to_name).fillna("Desconhecido")
+                 id_to_name = mapa_clubes('nome_fantasia')
+                 df_ano['clube'] = df_ano['clube_id'].map(id_to_name).fillna("Desconhecido")
                     
         except Exception as e:
             print(f"Erro ao preparar features avançadas para simulação: {e}")
@@ -150,9 +127,9 @@ def simular_desempenho_recente(window=3, orcamento=140, formacao="4-3-3", risco=
 
     # Tenta carregar histórico de odds
     df_odds_hist = None
-    if os.path.exists(HISTORICAL_ODDS_PATH):
+    if tabela_disponivel('odds'):
         try:
-            df_odds_hist = pd.read_csv(HISTORICAL_ODDS_PATH)
+            df_odds_hist = carregar_tabela('odds', anos=[ano_max])
         except: pass
 
     for rodada in rodadas_teste:
@@ -204,8 +181,7 @@ def gerar_comparativo_historico(orcamento=140, formacao="4-3-3", risco=0.0):
     2. IA (Simulada) - O que o modelo teria escalado
     3. Máximo Possível (God Mode) - A melhor escalação possível
     """
-    caminho_vini = os.path.join(DATA_DIR, "historico_vini.csv")
-    if not os.path.exists(caminho_vini):
+    if not os.path.exists(HISTORICO_USUARIO_PATH):
         return None, "Arquivo 'historico_vini.csv' não encontrado."
         
     df_hist = _preparar_historico()
@@ -213,7 +189,7 @@ def gerar_comparativo_historico(orcamento=140, formacao="4-3-3", risco=0.0):
     
     # Carrega histórico do usuário
     try:
-        df_vini = pd.read_csv(caminho_vini, sep=';')
+        df_vini = carregar_historico_usuario()
         # Garante tipos
         df_vini['rodada'] = pd.to_numeric(df_vini['rodada'], errors='coerce')
         df_vini['pontuacao'] = pd.to_numeric(df_vini['pontuacao'], errors='coerce')
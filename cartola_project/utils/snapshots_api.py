@@ -0,0 +1,190 @@
+"""
+Arquivo das respostas brutas das APIs (Cartola, GE, The Odds API).
+
+Cada resposta é guardada como veio (bytes do corpo), comprimida com zstd (se o pacote
+'zstandard' estiver instalado) ou gzip, em data/raw_api/<endpoint>/<ano>/. Um índice SQLite
+registra endpoint, temporada, rodada e horário de cada snapshot, então qualquer CSV ou partição
+Parquet derivada pode ser reconstruída offline a partir do bruto (ver as funções reconstruir_*
+em coleta_dados.py e coleta_historico.py), sem chamar a API de novo.
+"""
+
+import os
+import re
+import glob
+import gzip
+import json
+import sqlite3
+import hashlib
+from datetime import datetime
+import pandas as pd
+from utils.config import config, logger
+from utils.arquivos import escrita_atomica
+
+try:
+    import zstandard
+    ZSTD_DISPONIVEL = True
+except ImportError:
+    ZSTD_DISPONIVEL = False
+
+NIVEL_ZSTD = 10
+NIVEL_GZIP = 6
+
+def _conectar():
+    os.makedirs(config.SNAPSHOTS_DIR, exist_ok=True)
+    con = sqlite3.connect(config.SNAPSHOTS_INDEX_PATH, timeout=30)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("CREATE TABLE IF NOT EXISTS snapshots (endpoint TEXT, ano INTEGER, rodada INTEGER, coletado_em TEXT, "
+                "url TEXT, caminho TEXT, bytes INTEGER, bytes_comprimidos INTEGER, sha256 TEXT)")
+    con.execute("CREATE INDEX IF NOT EXISTS idx_snapshots ON snapshots (endpoint, ano, rodada, coletado_em)")
+    return con
+
+def _comprimir(conteudo):
+    if ZSTD_DISPONIVEL:
+        return zstandard.ZstdCompressor(level=NIVEL_ZSTD).compress(conteudo), '.zst'
+    return gzip.compress(conteudo, compresslevel=NIVEL_GZIP), '.gz'
+
+def _descomprimir(caminho):
+    with open(caminho, 'rb') as f:
+        dados = f.read()
+    if caminho.endswith('.zst'):
+        if not ZSTD_DISPONIVEL:
+            raise RuntimeError(f"'{caminho}' foi comprimido com zstd; instale o pacote 'zstandard' para lê-lo.")
+        return zstandard.ZstdDecompressor().decompress(dados)
+    return gzip.decompress(dados)
+
+def arquivar_resposta(endpoint, conteudo, ano=None, rodada=None, url=None, coletado_em=None):
+    """
+    Guarda uma resposta bruta no arquivo e a registra no índice.
+    Se o conteúdo for idêntico ao último snapshot de (endpoint, ano, rodada), nada é gravado
+    (coletas repetidas da mesma rodada não ocupam espaço).
+
+    Args:
+        endpoint (str): Nome lógico da origem ('mercado', 'partidas', 'pontuados', 'ge_jogos', 'odds').
+        conteudo (bytes | dict | list): Corpo da resposta (response.content) ou o JSON já decodificado.
+        ano (int, optional): Temporada. Padrão: config.CURRENT_YEAR.
+        rodada (int, optional): Rodada a que a resposta se refere, se houver.
+        coletado_em (datetime, optional): Horário da coleta. Padrão: agora.
+
+    Returns:
+        Caminho do snapshot (novo ou o já existente), ou None se o arquivamento falhar.
+    """
+    if ano is None:
+        ano = config.CURRENT_YEAR
+    if not isinstance(conteudo, bytes):
+        conteudo = json.dumps(conteudo, ensure_ascii=False).encode('utf-8')
+    coletado_em = (coletado_em or datetime.now()).isoformat(timespec='seconds')
+    sha256 = hashlib.sha256(conteudo).hexdigest()
+
+    try:
+        con = _conectar()
+        try:
+            ultimo = con.execute("SELECT caminho, sha256 FROM snapshots WHERE endpoint = ? AND ano = ? AND rodada IS ? "
+                                 "ORDER BY coletado_em DESC, rowid DESC LIMIT 1", (endpoint, ano, rodada)).fetchone()
+            if ultimo and ultimo[1] == sha256:
+                return os.path.join(config.SNAPSHOTS_DIR, ultimo[0])
+
+            comprimido, extensao = _comprimir(conteudo)
+            rotulo = f"r{rodada:02d}" if rodada is not None else "r--"
+            relativo = os.path.join(endpoint, str(ano), f"{rotulo}-{coletado_em.replace(':', '')}-{sha256[:8]}.json{extensao}")
+            with escrita_atomica(os.path.join(config.SNAPSHOTS_DIR, relativo)) as temporario:
+                with open(temporario, 'wb') as f:
+                    f.write(comprimido)
+            con.execute("INSERT INTO snapshots VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (endpoint, ano, rodada, coletado_em, url, relativo, len(conteudo), len(comprimido), sha256))
+            con.commit()
+        finally:
+            con.close()
+    except Exception as e:
+        # O arquivo bruto é auxiliar: uma falha aqui não pode interromper a coleta
+        logger.warning(f"Não foi possível arquivar a resposta de '{endpoint}': {e}")
+        return None
+    logger.debug(f"Snapshot '{endpoint}' {ano}/{rodada}: {len(conteudo)} -> {len(comprimido)} bytes.")
+    return os.path.join(config.SNAPSHOTS_DIR, relativo)
+
+def listar_snapshots(endpoint=None, ano=None, rodada=None):
+    """Índice dos snapshots (filtros opcionais), do mais antigo ao mais novo."""
+    filtros, parametros = [], []
+    for coluna, valor in [('endpoint', endpoint), ('ano', ano), ('rodada', rodada)]:
+        if valor is not None:
+            filtros.append(f"{coluna} = ?")
+            parametros.append(valor)
+    where = f"WHERE {' AND '.join(filtros)}" if filtros else ""
+    con = _conectar()
+    try:
+        return pd.read_sql_query(f"SELECT * FROM snapshots {where} ORDER BY coletado_em, rowid", con, params=parametros)
+    finally:
+        con.close()
+
+def carregar_snapshot(endpoint, ano=None, rodada=None, ate=None):
+    """
+    JSON decodificado do snapshot mais recente de (endpoint, ano, rodada).
+
+    Args:
+        rodada (int, optional): Rodada do snapshot. Padrão (None): o mais recente de qualquer rodada.
+        ate (datetime | str, optional): Considera só snapshots coletados até esse horário
+            (ex: reconstruir as odds com as partidas vigentes no momento da coleta).
+
+    Returns:
+        Objeto JSON, ou None se não houver snapshot.
+    """
+    if ano is None:
+        ano = config.CURRENT_YEAR
+    sql = "SELECT caminho FROM snapshots WHERE endpoint = ? AND ano = ?"
+    parametros = [endpoint, ano]
+    if rodada is not None:
+        sql += " AND rodada = ?"
+        parametros.append(rodada)
+    if ate is not None:
+        sql += " AND coletado_em <= ?"
+        parametros.append(ate.isoformat(timespec='seconds') if isinstance(ate, datetime) else ate)
+    con = _conectar()
+    try:
+        linha = con.execute(sql + " ORDER BY coletado_em DESC, rowid DESC LIMIT 1", parametros).fetchone()
+    finally:
+        con.close()
+    if linha is None:
+        return None
+    return json.loads(_descomprimir(os.path.join(config.SNAPSHOTS_DIR, linha[0])))
+
+def rodadas_arquivadas(endpoint, ano=None):
+    """Rodadas com ao menos um snapshot de 'endpoint' na temporada."""
+    df = listar_snapshots(endpoint, ano if ano is not None else config.CURRENT_YEAR)
+    return sorted(int(r) for r in df['rodada'].dropna().unique())
+
+def importar_json_legados(ano, remover=False):
+    """
+    Importa os 'api_rodadaXX_debug.json' gravados pelas coletas antigas como snapshots de 'pontuados'.
+    O ano precisa ser informado: a resposta da API não traz a temporada.
+    """
+    antes = listar_snapshots('pontuados', ano)
+    ja_arquivados = set(antes['sha256'])
+    for caminho in sorted(glob.glob(os.path.join(config.DATA_DIR, "api_rodada*.json"))):
+        with open(caminho, 'rb') as f:
+            conteudo = f.read()
+        if hashlib.sha256(conteudo).hexdigest() in ja_arquivados:
+            if remover:
+                os.remove(caminho)
+            continue
+        rodada = json.loads(conteudo).get('rodada') or int(re.search(r"api_rodada(\d+)", caminho).group(1))
+        coletado_em = datetime.fromtimestamp(os.path.getmtime(caminho))
+        if arquivar_resposta('pontuados', conteudo, ano=ano, rodada=rodada, coletado_em=coletado_em) and remover:
+            os.remove(caminho)
+    importados = len(listar_snapshots('pontuados', ano)) - len(antes)
+    logger.info(f"{importados} JSONs legados importados para o arquivo bruto ({ano}).")
+    return importados
+
+def resumo_arquivo():
+    """Snapshots, rodadas e espaço ocupado por endpoint/temporada."""
+    con = _conectar()
+    try:
+        return pd.read_sql_query("""
+            SELECT endpoint, ano, COUNT(*) AS snapshots, COUNT(DISTINCT rodada) AS rodadas,
+                   SUM(bytes) / 1024 AS kb_brutos, SUM(bytes_comprimidos) / 1024 AS kb_comprimidos,
+                   MAX(coletado_em) AS ultimo
+            FROM snapshots GROUP BY endpoint, ano ORDER BY endpoint, ano
+        """, con)
+    finally:
+        con.close()
+
+if __name__ == "__main__":
+    print(resumo_arquivo().to_string(index=False))
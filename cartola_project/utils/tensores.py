@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+import os
+import json
+import shutil
+import time
+import tempfile
+from utils.config import config, logger
+from utils.arquivos import trava_arquivo
+from utils.armazenamento import assinatura_tabela
+from utils.carregamento import carregar_historico_jogadores
+
+# Arrays densos (ano, rodada, índice do atleta): dtype e valor usado quando o atleta não aparece na rodada
+ARRAYS_TENSOR = {
+    'pontuacao': ('float32', np.nan),
+    'preco_num': ('float32', np.nan),
+    'posicao_id': ('int8', 0),
+    'clube_id': ('int32', 0),
+}
+# Rodada r fica no índice r do eixo 1 (índice 0 sem uso), para indexar sem deslocamento
+RODADAS_TENSOR = 39
+ARQUIVO_META = "meta.json"
+ARQUIVO_ATLETAS = "atletas.npy"
+
+def _caminho_tensores():
+    return config.TENSORES_DIR
+
+def construir_tensores(anos=None):
+    """
+    Materializa o histórico de jogadores em arrays densos (ano, rodada, atleta) gravados em .npy,
+    mais o registro de atletas (índice -> atleta_id, ordenado). Os arquivos são lidos com
+    np.load(mmap_mode='r'), então vários processos compartilham as mesmas páginas em memória.
+
+    Args:
+        anos (list, optional): Só essas temporadas. Os tensores ficam marcados como parciais e
+            carregar_tensores() os reconstrói com o histórico inteiro.
+    """
+    destino = _caminho_tensores()
+    # Um único construtor por vez; quem esperou a trava reaproveita os tensores recém-construídos
+    with trava_arquivo(destino):
+        if tensores_atualizados(anos):
+            return carregar_tensores(reconstruir=False)
+        return _construir_tensores(destino, anos)
+
+def _construir_tensores(destino, anos):
+    inicio = time.perf_counter()
+    df = carregar_historico_jogadores(anos=anos, colunas=list(ARRAYS_TENSOR))
+    if df is None or df.empty:
+        logger.error("Histórico vazio. Tensores não construídos.")
+        return None
+
+    df = df[df['rodada'].between(1, RODADAS_TENSOR - 1)]
+    lista_anos = sorted(int(a) for a in df['ano'].unique())
+    atletas = np.sort(df['atleta_id'].unique()).astype('int32')
+
+    i_ano = np.searchsorted(lista_anos, df['ano'].to_numpy())
+    i_rodada = df['rodada'].to_numpy(dtype='int64')
+    i_atleta = np.searchsorted(atletas, df['atleta_id'].to_numpy())
+    forma = (len(lista_anos), RODADAS_TENSOR, len(atletas))
+
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    temporario = tempfile.mkdtemp(dir=os.path.dirname(destino), prefix=".tensores-")
+
+    for nome, (tipo, ausente) in ARRAYS_TENSOR.items():
+        tensor = np.lib.format.open_memmap(os.path.join(temporario, f"{nome}.npy"), mode='w+', dtype=tipo, shape=forma)
+        tensor[:] = ausente
+        if nome in df.columns:
+            # clube_id legado ('FLA') não é numérico e fica como ausente (0)
+            valores = pd.to_numeric(df[nome].astype(str) if nome == 'clube_id' else df[nome], errors='coerce')
+            valores = valores.fillna(ausente) if not np.isnan(ausente) else valores
+            tensor[i_ano, i_rodada, i_atleta] = valores.to_numpy(dtype=tipo)
+        tensor.flush()
+        del tensor
+
+    np.save(os.path.join(temporario, ARQUIVO_ATLETAS), atletas)
+    with open(os.path.join(temporario, ARQUIVO_META), 'w', encoding='utf8') as f:
+        json.dump({'anos': lista_anos, 'forma': forma, 'assinatura': assinatura_tabela('jogadores'),
+                   'anos_pedidos': sorted(int(a) for a in anos) if anos is not None else None}, f)
+
+    # Troca o diretório inteiro por renomeações: leitores nunca veem um tensor pela metade, e quem
+    # já mapeou os arquivos antigos continua lendo-os (o Linux só libera as páginas ao desmapear)
+    antigo = None
+    if os.path.exists(destino):
+        antigo = tempfile.mkdtemp(dir=os.path.dirname(destino), prefix=".tensores-antigo-")
+        os.replace(destino, os.path.join(antigo, "tensores"))
+    os.replace(temporario, destino)
+    if antigo:
+        shutil.rmtree(antigo, ignore_errors=True)
+    logger.info(f"Tensores {forma} construídos em {time.perf_counter() - inicio:.2f}s em '{destino}'.")
+    return carregar_tensores(reconstruir=False)
+
+def tensores_atualizados(anos=None):
+    """
+    True se os tensores existem, foram construídos a partir da versão atual do histórico e cobrem
+    as temporadas pedidas ('anos'; padrão: o histórico inteiro, que um build parcial não cobre).
+    """
+    caminho_meta = os.path.join(_caminho_tensores(), ARQUIVO_META)
+    if not os.path.exists(caminho_meta):
+        return False
+    with open(caminho_meta, 'r', encoding='utf8') as f:
+        meta = json.load(f)
+    if meta.get('assinatura') != assinatura_tabela('jogadores') or 'anos_pedidos' not in meta:
+        return False
+    return meta['anos_pedidos'] is None or (anos is not None and set(anos) <= set(meta['anos_pedidos']))
+
+def carregar_tensores(reconstruir=True):
+    """
+    Abre os tensores memory-mapped (somente leitura).
+
+    Args:
+        reconstruir (bool): Reconstrói antes se não existirem ou se o histórico mudou.
+
+    Returns:
+        dict com 'anos', 'atletas' (registro índice -> atleta_id) e um array
+        (ano, rodada, atleta) por coluna de ARRAYS_TENSOR; None se não houver histórico.
+    """
+    if reconstruir and not tensores_atualizados():
+        return construir_tensores()
+
+    destino = _caminho_tensores()
+    caminho_meta = os.path.join(destino, ARQUIVO_META)
+    if not os.path.exists(caminho_meta):
+        return None
+    with open(caminho_meta, 'r', encoding='utf8') as f:
+        meta = json.load(f)
+
+    tensores = {'anos': meta['anos'], 'atletas': np.load(os.path.join(destino, ARQUIVO_ATLETAS))}
+    for nome in ARRAYS_TENSOR:
+        tensores[nome] = np.load(os.path.join(destino, f"{nome}.npy"), mmap_mode='r')
+    return tensores
+
+def fatia_ano(tensores, ano):
+    """Views (rodada, atleta) de uma temporada, sem cópia. Retorna None se o ano não estiver nos tensores."""
+    if ano not in tensores['anos']:
+        return None
+    i = tensores['anos'].index(ano)
+    return {nome: tensores[nome][i] for nome in ARRAYS_TENSOR}
+
+def indices_atletas(tensores, atleta_ids):
+    """Converte atleta_ids em índices do registro (-1 para atletas fora dos tensores)."""
+    atletas = tensores['atletas']
+    atleta_ids = np.asarray(atleta_ids)
+    pos = np.clip(np.searchsorted(atletas, atleta_ids), 0, max(len(atletas) - 1, 0))
+    return np.where(atletas[pos] == atleta_ids, pos, -1) if len(atletas) else np.full(len(atleta_ids), -1)
+
+if __name__ == "__main__":
+    t = construir_tensores()
+    if t is not None:
+        print(f"Anos: {t['anos']} | Atletas: {len(t['atletas'])} | Forma: {t['pontuacao'].shape}")
@@ -2,11 +2,10 @@ import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 import matplotlib.patheffects as path_effects
 from matplotlib.offsetbox import OffsetImage, AnnotationBbox
-import requests
 from io import BytesIO
 from PIL import Image
-import json
-import os
+from utils.acesso_dados import carregar_clubes_json
+from utils.cliente_http import get
 
 # Cache simples de imagens em memória para não baixar toda hora na mesma sessão
 IMAGE_CACHE = {}
@@ -17,7 +16,7 @@ def carregar_imagem_escudo(url):
     if url in IMAGE_CACHE: return IMAGE_CACHE[url]
     
     try:
-        response = requests.get(url, timeout=2)
+        response = get(url, timeout=2, tentativas=1)
         if response.status_code == 200:
             img = Image.open(BytesIO(response.content))
             IMAGE_CACHE[url] = img
@@ -39,13 +38,7 @@ def desenhar_campo(time_df, formacao_str="4-3-3"):
     """
     Gera uma visualização de campo de futebol estilo Cartola FC.
     """
-    clubes_data = None
-    try:
-        caminho_json = os.path.join(os.path.dirname(__file__), '..', 'data', 'clubes.json')
-        with open(caminho_json, 'r', encoding='utf8') as f:
-            clubes_data = json.load(f)
-    except:
-        pass
+    clubes_data = carregar_clubes_json() or None
 
     fig, ax = plt.subplots(figsize=(10, 13))
     cor_gramado = '#28a745'
@@ -7,27 +7,38 @@ import sys
 sys.path.append(os.path.join(os.getcwd(), 'cartola_project'))
 
 from utils.config import config, logger
+from utils.tensores import carregar_tensores, fatia_ano
 
-def simular_core(df_analise, n_simulacoes, orcamentos, pontos_alvo, top_n=None):
-    """Função base para rodar a simulação de Monte Carlo."""
+def montar_pool(fatia, jogou, media_acumulada, rodada, top_n=None):
+    """Pool (pontuação, preço) de cada posição na rodada, fatiado direto das views do tensor."""
+    pool = {}
+    for pos in [1, 2, 3, 4, 5, 6]:
+        indices = np.flatnonzero(jogou[rodada] & (fatia['posicao_id'][rodada] == pos))
+
+        # Se o filtro Top N estiver ativo, pega apenas os melhores por média acumulada
+        if top_n and len(indices) > top_n:
+            indices = indices[np.argsort(-media_acumulada[rodada, indices], kind='stable')[:top_n]]
+
+        pool[pos] = np.column_stack((fatia['pontuacao'][rodada, indices], fatia['preco_num'][rodada, indices]))
+    return pool
+
+def simular_core(fatia, jogou, media_acumulada, n_simulacoes, orcamentos, pontos_alvo, top_n=None):
+    """
+    Função base para rodar a simulação de Monte Carlo.
+
+    Args:
+        fatia (dict): Views (rodada, atleta) da temporada (ver utils.tensores.fatia_ano).
+        jogou (ndarray): Máscara (rodada, atleta) de quem entrou em campo com preço válido.
+        media_acumulada (ndarray): Média (rodada, atleta) das rodadas anteriores.
+    """
     resultados_rodadas = []
     medias_pontuacao_por_orcamento = {lim: [] for lim in orcamentos}
     
-    rodadas = sorted(df_analise['rodada'].unique())
+    rodadas = np.flatnonzero(jogou.any(axis=1))
     
     for r in rodadas:
-        df_r = df_analise[df_analise['rodada'] == r].copy()
-        
         # Estrutura do Pool
-        pool = {}
-        for pos in [1, 2, 3, 4, 5, 6]:
-            df_pos = df_r[df_r['posicao_normalizada'] == pos]
-            
-            # Se o filtro Top N estiver ativo, pega apenas os melhores por média acumulada
-            if top_n and len(df_pos) > top_n:
-                df_pos = df_pos.sort_values('media_acumulada', ascending=False).head(top_n)
-            
-            pool[pos] = df_pos[['pontuacao', 'preco_num']].values
+        pool = montar_pool(fatia, jogou, media_acumulada, r, top_n)
         
         # Validação de pool mínimo para 4-3-3
         if any(len(pool[pos]) < count for pos, count in {1:1, 2:2, 3:2, 4:3, 5:3, 6:1}.items()):
@@ -61,7 +72,7 @@ def simular_core(df_analise, n_simulacoes, orcamentos, pontos_alvo, top_n=None):
                         if score_final >= alvo:
                             contadores[i, j] += 1
         
-        res_r = {'rodada': r}
+        res_r = {'rodada': int(r)}
         for i, limite in enumerate(orcamentos):
             n_v = total_validos[i] if total_validos[i] > 0 else 1
             medias_pontuacao_por_orcamento[limite].append(soma_pontos_validos[i] / n_v)
@@ -90,25 +101,25 @@ def imprimir_matriz(titulo, df_res, medias_score, orcamentos, pontos_alvo):
 def executar_comparativo(ano=None, n_sim=20000):
     if ano is None:
         ano = config.PREVIOUS_YEAR
-    caminho = config.HISTORICAL_DATA_PATH
-    df = pd.read_csv(caminho, low_memory=False)
-    
-    # Limpeza e Normalização
-    df['pontuacao'] = pd.to_numeric(df['pontuacao'].astype(str).str.replace(',', '.'), errors='coerce').fillna(0)
-    df['preco_num'] = pd.to_numeric(df['preco_num'].astype(str).str.replace(',', '.'), errors='coerce').fillna(0)
-    
-    mapa_pos = {'1':1,'gol':1,'Goleiro':1,'2':2,'lat':2,'Lateral':2,'3':3,'zag':3,'Zagueiro':3,
-                '4':4,'mei':4,'Meia':4,'5':5,'ata':5,'Atacante':5,'6':6,'tec':6,'Técnico':6}
-    df['posicao_normalizada'] = df['posicao_id'].apply(lambda x: mapa_pos.get(str(x).strip(), 0))
+    # Tensores memory-mapped (ano, rodada, atleta): as rodadas e posições viram fatias sem cópia
+    tensores = carregar_tensores()
+    fatia = fatia_ano(tensores, ano) if tensores is not None else None
+    if fatia is None:
+        logger.error(f"Temporada {ano} não encontrada nos tensores do histórico.")
+        return
     
-    df = df[(df['ano'] == ano) & (df['preco_num'] > 0)].copy()
+    pontuacao = np.nan_to_num(fatia['pontuacao'].astype(float))
+    valido = (fatia['posicao_id'] > 0) & (fatia['preco_num'] > 0)
 
-    # Cálculo da Média Acumulada (Ponto chave para o cenário Expert)
-    df = df.sort_values(['atleta_id', 'rodada'])
-    df['media_acumulada'] = df.groupby('atleta_id')['pontuacao'].transform(lambda x: x.shift().expanding().mean()).fillna(0)
+    # Cálculo da Média Acumulada (Ponto chave para o cenário Expert): média das rodadas anteriores válidas
+    pontos_validos = np.where(valido, pontuacao, 0.0)
+    soma_anterior = np.cumsum(pontos_validos, axis=0) - pontos_validos
+    jogos_anteriores = np.cumsum(valido, axis=0) - valido
+    with np.errstate(invalid='ignore', divide='ignore'):
+        media_acumulada = np.where(jogos_anteriores > 0, soma_anterior / jogos_anteriores, 0.0)
     
     # Filtro de quem jogou para a simulação
-    df_jogou = df[df['pontuacao'] != 0].copy()
+    jogou = valido & (pontuacao != 0)
 
     orcamentos = [100, 120, 150]
     pontos_alvo = [80, 90, 100]
@@ -117,11 +128,11 @@ def executar_comparativo(ano=None, n_sim=20000):
     
     # 1. Simulação Aleatória
     print("\n[1/2] Rodando Simulação Aleatória (Sorte Pura)...")
-    res_aleat, med_aleat = simular_core(df_jogou, n_sim, orcamentos, pontos_alvo)
+    res_aleat, med_aleat = simular_core(fatia, jogou, media_acumulada, n_sim, orcamentos, pontos_alvo)
     
     # 2. Simulação Expert (Top 20)
     print("[2/2] Rodando Simulação Expert (Top 20 Médias)...")
-    res_expert, med_expert = simular_core(df_jogou, n_sim, orcamentos, pontos_alvo, top_n=20)
+    res_expert, med_expert = simular_core(fatia, jogou, media_acumulada, n_sim, orcamentos, pontos_alvo, top_n=20)
 
     # Exibição dos Resultados
     imprimir_matriz(f"MATRIZ 1: SORTE PURA (Qualquer jogador que entrou em campo)", res_aleat, med_aleat, orcamentos, pontos_alvo)